@@ -90,26 +90,60 @@ if not os.environ.get('SECRET_KEY') or not os.environ.get('JWT_SECRET_KEY'):
     logger.warning('[Security] SECRET_KEY or JWT_SECRET_KEY not set in environment. Using random keys (sessions will not survive restarts).')
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)  # Extended: was 15 min, now 1 hr to prevent mid-interview expiry
 app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(basedir,"interview_coach.db")}'
+# DATABASE_URL selects SQLite (default file next to app.py) or pooled PostgreSQL
+from db_config import resolve_database_url, engine_options
+app.config['SQLALCHEMY_DATABASE_URI'] = resolve_database_url(basedir)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['JSON_SORT_KEYS'] = False
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
 app.config['SQLALCHEMY_ECHO']         = False   # quiet in production
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'connect_args': {'check_same_thread': False},
-    'pool_pre_ping': True,
-}
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+
+# ── Fast JSON responses (orjson when installed, stdlib otherwise) ─────────────
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class ORJSONProvider(DefaultJSONProvider):
+        """Drop-in jsonify() backend: same output shape, ~5-10x faster encoding."""
+        _OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+        def _dumps_bytes(self, obj, pretty=False):
+            opts = self._OPTS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+            if pretty:
+                opts |= orjson.OPT_INDENT_2
+            # DefaultJSONProvider.default keeps datetime → HTTP-date, Decimal, UUID, dataclass handling
+            return orjson.dumps(obj, default=self.default, option=opts)
+
+        def dumps(self, obj, **kwargs):
+            if kwargs:
+                return super().dumps(obj, **kwargs)
+            return self._dumps_bytes(obj).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            if kwargs:
+                return super().loads(s, **kwargs)
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            pretty = (self.compact is None and self._app.debug) or self.compact is False
+            return self._app.response_class(self._dumps_bytes(obj, pretty), mimetype=self.mimetype)
+
+    app.json = ORJSONProvider(app)
+except ImportError:
+    orjson = None   # stdlib json provider stays in place
+
+# ── SQLite Power-ups: WAL, FK enforcement, busy_timeout, mmap, checkpoints ─────
+# Settings live in sqlite_tuning.py (env-configurable: SQLITE_BUSY_TIMEOUT_MS, ...)
+from sqlite_tuning import sqlite_tuning, is_sqlite_connection, WALCheckpointScheduler
+import interview_archive
 
-# ── SQLite Power-ups: WAL mode + FK enforcement ────────────────────────────────
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")       # concurrent reads
-    cursor.execute("PRAGMA foreign_keys=ON")        # enforce FK contraints
-    cursor.execute("PRAGMA synchronous=NORMAL")     # safe + fast
-    cursor.execute("PRAGMA cache_size=-32000")      # 32 MB page cache
-    cursor.execute("PRAGMA temp_store=MEMORY")      # temp tables in RAM
-    cursor.close()
+    if is_sqlite_connection(dbapi_connection):
+        sqlite_tuning.apply(dbapi_connection)
+        interview_archive.attach(dbapi_connection)     # cold tier as schema "archive"
 
 # ── CORS ──────────────────────────────────────────────────────────────────────
 _allowed_origins = os.environ.get('ALLOWED_ORIGINS', '*').split(',')
@@ -181,10 +215,21 @@ def add_security_headers(response):
     return response
 
 # ── JWT Token Blocklist Check ─────────────────────────────────────────────────
+# Revoked jtis are held in memory (warmed at startup, updated on logout and from
+# token_revocation_log for other workers) so the check is a dict lookup.
+from token_revocation import RevokedTokenCache
+revoked_tokens = RevokedTokenCache()
+REVOCATION_SYNC_SECONDS  = float(os.environ.get('JWT_REVOCATION_SYNC_SECONDS', '2'))
+REVOCATION_PRUNE_SECONDS = float(os.environ.get('JWT_REVOCATION_PRUNE_SECONDS', '3600'))
+REVOCATION_SYNC_OVERLAP  = int(os.environ.get('JWT_REVOCATION_SYNC_OVERLAP', '200'))   # log ids re-read below the last one
+
 @jwt.token_in_blocklist_loader
 def check_if_token_revoked(jwt_header, jwt_payload):
     """Check if a JWT jti is in the blocklist (i.e. user logged out)."""
     jti = jwt_payload['jti']
+    if revoked_tokens.ready:
+        return revoked_tokens.is_revoked(jti)
+    # Cache not warmed yet (or DB was unreachable at startup) — ask the DB
     token = db.session.query(TokenBlocklist.id).filter_by(jti=jti).scalar()
     return token is not None
 
@@ -268,7 +313,41 @@ COMPANY_NAME_MAP = {
     'startup': 'Startup',
 }
 
-class User(db.Model):
+class JSONColumnMixin:
+    """
+    Parse-once access to JSON-encoded TEXT columns.
+
+    The decoded value is memoised per instance together with the raw string it
+    came from; assigning a new string to the column invalidates it on the next
+    read. Callers get a deep copy (nested lists and dicts included) so mutating
+    a returned value never leaks into the cache.
+    """
+
+    def _json_col(self, name, default):
+        raw = getattr(self, name, None) or default
+        cache = self.__dict__.get('_json_cache')
+        if cache is None:
+            cache = self.__dict__['_json_cache'] = {}
+        hit = cache.get(name)
+        if hit is not None and (hit[0] is raw or hit[0] == raw):
+            value = hit[1]
+        else:
+            try: value = json.loads(raw)
+            except (TypeError, ValueError): value = json.loads(default)
+            cache[name] = (raw, value)
+        return _json_copy(value)
+
+
+def _json_copy(value):
+    """Deep copy of decoded JSON; much cheaper than copy.deepcopy for plain lists/dicts."""
+    if isinstance(value, list):
+        return [_json_copy(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _json_copy(v) for k, v in value.items()}
+    return value
+
+
+class User(JSONColumnMixin, db.Model):
     """
     Core user account with full professional profile.
     Everything Mistral needs to personalise questions lives here.
@@ -367,12 +446,16 @@ class User(db.Model):
         self.password_reset_token_expiry = None
 
     def skills_list(self):
-        try: return json.loads(self.skills or '[]')
-        except: return []
+        return self._json_col('skills', '[]')
 
     def dream_companies_list(self):
-        try: return json.loads(self.dream_companies or '[]')
-        except: return []
+        return self._json_col('dream_companies', '[]')
+
+    def education_list(self):
+        return self._json_col('education', '[]')
+
+    def target_roles_list(self):
+        return self._json_col('target_roles', '[]')
 
     def to_dict(self):
         return {
@@ -406,6 +489,24 @@ class TokenBlocklist(db.Model):
     expires_at = db.Column(db.DateTime, nullable=False)
 
 
+class TokenRevocationLog(db.Model):
+    """
+    Append-only change log of revocations. Each worker remembers the last id
+    it applied and pulls newer rows, so a logout on one worker reaches the
+    in-memory caches of all others within JWT_REVOCATION_SYNC_SECONDS.
+    """
+    __tablename__ = 'token_revocation_log'
+    id         = db.Column(db.Integer, primary_key=True)
+    jti        = db.Column(db.String(36), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_revocation_log_expires_at', 'expires_at'),
+        {'sqlite_autoincrement': True},   # never reuse ids — workers track max(id)
+    )
+
+
 class Interview(db.Model):
     """
     A single practice session — the top-level container for questions + answers.
@@ -448,6 +549,11 @@ class Interview(db.Model):
     depth_score        = db.Column(db.Float)
     performance_grade  = db.Column(db.String(2))    # A+ A B C D F
 
+    # Archive tier (interview_archive.py): once set, questions/answers/feedback
+    # live in the archive schema and this row is the compact summary
+    archived_at        = db.Column(db.DateTime)
+    answer_count       = db.Column(db.Integer)      # answers moved with the session
+
     # Relationships
     questions = db.relationship('Question', backref='interview', lazy=True,
                                 cascade='all, delete-orphan',
@@ -489,10 +595,11 @@ class Interview(db.Model):
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'duration_seconds': self.duration_seconds,
+            'archived': self.archived_at is not None,
         }
 
 
-class Question(db.Model):
+class Question(JSONColumnMixin, db.Model):
     """
     A question generated by Mistral (or pulled from the bank) for a session.
     Stores the exact question, expected answer points, and Mistral's context.
@@ -517,6 +624,7 @@ class Question(db.Model):
     expected_points = db.Column(db.Text)             # JSON list of key points Mistral expects
     time_limit_secs = db.Column(db.Integer, default=300)
     source          = db.Column(db.String(30), default='ai_generated')  # ai_generated | bank | user
+    bank_question_id = db.Column(db.Integer)          # question_bank.id when source == 'bank'
 
     # Multiple-choice fields (NEW)
     is_multiple_choice = db.Column(db.Boolean, default=False)  # if true, this question has options
@@ -536,15 +644,14 @@ class Question(db.Model):
         db.Index('ix_questions_field_level',  'field', 'level'),
         db.Index('ix_questions_company',      'company'),
         db.Index('ix_questions_category',     'category'),
+        db.Index('ix_questions_bank_question_id', 'bank_question_id'),
     )
 
     def options_list(self):
-        try: return json.loads(self.options or '[]')
-        except: return []
+        return self._json_col('options', '[]')
     
     def correct_answers_list(self):
-        try: return json.loads(self.correct_answers or '[]')
-        except: return []
+        return self._json_col('correct_answers', '[]')
 
     def to_dict(self):
         return {
@@ -552,7 +659,7 @@ class Question(db.Model):
             'text': self.text, 'category': self.category,
             'field': self.field, 'level': self.level,
             'company': self.company, 'difficulty': self.difficulty or 'medium',
-            'topic_tags': json.loads(self.topic_tags or '[]'),
+            'topic_tags': self._json_col('topic_tags', '[]'),
             'hint': self.hint,
             'time_limit_secs': self.time_limit_secs,
             'question_number': self.question_number,
@@ -564,7 +671,7 @@ class Question(db.Model):
         }
 
 
-class Answer(db.Model):
+class Answer(JSONColumnMixin, db.Model):
     """
     User's answer to a question — stores the text plus ALL AI-scored dimensions.
     This is the core analytics record.
@@ -607,8 +714,7 @@ class Answer(db.Model):
     )
 
     def selected_options_list(self):
-        try: return json.loads(self.selected_options or '[]')
-        except: return []
+        return self._json_col('selected_options', '[]')
 
     def to_dict(self):
         try:
@@ -636,7 +742,7 @@ class Answer(db.Model):
             }
 
 
-class Feedback(db.Model):
+class Feedback(JSONColumnMixin, db.Model):
     """
     Mistral AI's full structured feedback for one answer.
     Includes strengths, weaknesses, improvement plan, and suggested resources.
@@ -666,16 +772,13 @@ class Feedback(db.Model):
     )
 
     def strengths_list(self):
-        try: return json.loads(self.strengths or '[]')
-        except: return []
+        return self._json_col('strengths', '[]')
 
     def improvements_list(self):
-        try: return json.loads(self.improvements or '[]')
-        except: return []
+        return self._json_col('improvements', '[]')
 
     def improvement_plan_list(self):
-        try: return json.loads(self.improvement_plan or '[]')
-        except: return []
+        return self._json_col('improvement_plan', '[]')
 
     def to_dict(self):
         try:
@@ -698,7 +801,7 @@ class Feedback(db.Model):
             }
 
 
-class QuestionBank(db.Model):
+class QuestionBank(JSONColumnMixin, db.Model):
     """
     Global reusable question library independent of any session.
     Mistral-generated and curated, indexed for fast lookup.
@@ -709,6 +812,7 @@ class QuestionBank(db.Model):
     uuid            = db.Column(db.String(36), unique=True, nullable=False,
                                 default=lambda: str(uuid_mod.uuid4()))
     text            = db.Column(db.Text, nullable=False)
+    text_hash       = db.Column(db.String(64))              # question_import.text_hash, unique
     category        = db.Column(db.String(50))
     field           = db.Column(db.String(100))
     level           = db.Column(db.String(50))
@@ -720,8 +824,12 @@ class QuestionBank(db.Model):
     expected_points = db.Column(db.Text)
     sample_answer   = db.Column(db.Text)
     hint            = db.Column(db.Text)
+    mc_options      = db.Column(db.Text)                    # JSON, pre-generated by the importer (--mc)
     times_used      = db.Column(db.Integer, default=0)
     avg_score       = db.Column(db.Float,   default=0.0)
+    score_count     = db.Column(db.Integer, default=0)     # answers behind avg_score
+    popularity      = db.Column(db.Float,   default=0.0)   # see question_stats.popularity
+    calibrated_difficulty = db.Column(db.String(20))       # from observed scores, NULL until calibrated
     is_verified     = db.Column(db.Boolean, default=False)
     created_at      = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -731,6 +839,8 @@ class QuestionBank(db.Model):
         db.Index('ix_qbank_company',       'company'),
         db.Index('ix_qbank_category',      'category'),
         db.Index('ix_qbank_difficulty',    'difficulty'),
+        db.Index('ix_qbank_popularity',    'popularity'),
+        db.Index('ux_qbank_text_hash',     'text_hash', unique=True),
     )
 
     def to_dict(self):
@@ -739,15 +849,17 @@ class QuestionBank(db.Model):
             'text': self.text, 'category': self.category,
             'field': self.field, 'level': self.level,
             'company': self.company, 'difficulty': self.difficulty,
-            'topic_tags': json.loads(self.topic_tags or '[]'),
+            'topic_tags': self._json_col('topic_tags', '[]'),
             'hint': self.hint,
             'times_used': self.times_used,
             'avg_score': round(self.avg_score or 0, 2),
+            'popularity': round(self.popularity or 0, 3),
+            'calibrated_difficulty': self.calibrated_difficulty,
             'is_verified': self.is_verified,
         }
 
 
-class HybridInterviewSession(db.Model):
+class HybridInterviewSession(JSONColumnMixin, db.Model):
     """
     Tracks hybrid loading state: questions from DB are shown immediately,
     while AI loads more advanced questions in the background.
@@ -783,10 +895,7 @@ class HybridInterviewSession(db.Model):
     )
 
     def question_sources_dict(self):
-        try:
-            return json.loads(self.question_sources or '{}')
-        except:
-            return {}
+        return self._json_col('question_sources', '{}')
 
     def to_dict(self):
         return {
@@ -806,7 +915,7 @@ class HybridInterviewSession(db.Model):
 #  USER ANALYTICS & RECOMMENDATION MODELS
 # ==============================================================================
 
-class UserAnalytics(db.Model):
+class UserAnalytics(JSONColumnMixin, db.Model):
     """
     Track user's performance profile for personalized question generation.
     Analyzes strengths/weaknesses by field, level, category, etc.
@@ -846,20 +955,16 @@ class UserAnalytics(db.Model):
     )
     
     def field_scores_dict(self):
-        try: return json.loads(self.field_scores or '{}')
-        except: return {}
+        return self._json_col('field_scores', '{}')
     
     def category_perf_dict(self):
-        try: return json.loads(self.category_performance or '{}')
-        except: return {}
+        return self._json_col('category_performance', '{}')
     
     def weak_topics_list(self):
-        try: return json.loads(self.weak_topics or '[]')
-        except: return []
+        return self._json_col('weak_topics', '[]')
     
     def strong_topics_list(self):
-        try: return json.loads(self.strong_topics or '[]')
-        except: return []
+        return self._json_col('strong_topics', '[]')
 
 
 class QuestionRecommendation(db.Model):
@@ -899,7 +1004,7 @@ class QuestionRecommendation(db.Model):
     )
 
 
-class AnswerCache(db.Model):
+class AnswerCache(JSONColumnMixin, db.Model):
     """
     Cache for answer analysis to speed up feedback generation.
     Stores pre-computed scores and feedback for similar answers.
@@ -928,8 +1033,7 @@ class AnswerCache(db.Model):
     )
     
     def cached_analysis_dict(self):
-        try: return json.loads(self.cached_analysis or '{}')
-        except: return {}
+        return self._json_col('cached_analysis', '{}')
 
 
 # ==============================================================================
@@ -1148,6 +1252,132 @@ _pending_analysis: dict = {}
 _pending_analysis_lock = threading.Lock()
 
 
+# ── Group-commit writer for background analysis results ───────────────────────
+# Background analysis threads enqueue ('scores', answer_uuid, analysis) and
+# ('cache', question, answer, analysis) jobs, request handlers enqueue
+# ('usage', served_bank_ids, bank_scores) for question_stats; one writer thread
+# applies them in batched transactions (ANALYSIS_WRITER_BATCH items or ANALYSIS_WRITER_DELAY_MS).
+from group_commit import GroupCommitWriter
+import question_stats
+
+
+def _apply_answer_scores(jobs):
+    uuids = [j[1] for j in jobs]
+    answers = {a.uuid: a for a in Answer.query.filter(Answer.uuid.in_(uuids)).all()}
+    feedbacks = {}
+    if answers:
+        for fb in Feedback.query.filter(Feedback.answer_id.in_([a.id for a in answers.values()])) \
+                                .order_by(Feedback.id).all():
+            feedbacks.setdefault(fb.answer_id, fb)   # first row per answer, as before
+    bank_ids = {}
+    if answers:
+        bank_ids = dict(db.session.query(Question.id, Question.bank_question_id)
+                        .filter(Question.id.in_({a.question_id for a in answers.values()}),
+                                Question.bank_question_id.isnot(None)).all())
+    bank_scores = []     # (bank_id, new_score - provisional_score)
+    for _, answer_uuid, analysis in jobs:
+        ans = answers.get(answer_uuid)
+        if not ans:
+            continue
+        if ans.question_id in bank_ids:
+            # The provisional score was counted at submit time; adjust by the difference
+            bank_scores.append((bank_ids[ans.question_id], analysis['score'] - (ans.score or 0)))
+        ans.score              = analysis['score']
+        ans.technical_accuracy = analysis['technical_accuracy']
+        ans.depth_score        = analysis.get('depth_score', analysis['score'])
+        ans.clarity_score      = analysis.get('clarity_score', analysis['score'])
+        ans.relevance_score    = analysis.get('relevance_score', analysis['score'])
+        ans.communication_score= analysis.get('communication_score', analysis['score'])
+        ans.confidence_score   = analysis.get('confidence_score', analysis['score'])
+        fb = feedbacks.get(ans.id)
+        if fb:
+            fb.score             = analysis['score']
+            fb.strengths         = json.dumps(analysis.get('strengths', []))
+            fb.improvements      = json.dumps(analysis.get('weaknesses', []))
+            fb.detailed_feedback = analysis.get('feedback', '')
+            fb.improvement_plan  = json.dumps(analysis.get('improvement_plan', []))
+            fb.model_used        = analysis.get('model', mistral_agent.model_name)
+    return bank_scores
+
+
+def _apply_answer_cache(jobs):
+    from hashlib import sha256
+    keyed = {}
+    for _, question, answer, analysis in jobs:
+        key = (sha256(question.lower().encode()).hexdigest(),
+               sha256(answer.lower().encode()).hexdigest(),
+               len(answer.split()) // 10)
+        hits = keyed[key][1] + 1 if key in keyed else 0
+        keyed[key] = (analysis, hits)     # last analysis wins, repeats count as hits
+    existing = {}
+    for row in AnswerCache.query.filter(
+            AnswerCache.question_hash.in_({k[0] for k in keyed}),
+            AnswerCache.answer_hash.in_({k[1] for k in keyed})).all():
+        existing.setdefault((row.question_hash, row.answer_hash, row.answer_length), row)
+    for key, (analysis, extra_hits) in keyed.items():
+        row = existing.get(key)
+        if row:
+            # Update hit-count and refresh cached analysis
+            row.cached_analysis = json.dumps(analysis)
+            row.hit_count       = (row.hit_count or 0) + 1 + extra_hits
+            row.last_accessed   = datetime.utcnow()
+        else:
+            db.session.add(AnswerCache(
+                question_hash   = key[0],
+                answer_hash     = key[1],
+                answer_length   = key[2],
+                cached_analysis = json.dumps(analysis),
+                hit_count       = extra_hits,
+            ))
+
+
+def _apply_analysis_batch(items):
+    """Apply a batch of queued result writes in ONE transaction. Returns number of failed jobs."""
+    def _apply(jobs):
+        score_jobs = [j for j in jobs if j[0] == 'scores']
+        cache_jobs = [j for j in jobs if j[0] == 'cache']
+        usage_jobs = [j for j in jobs if j[0] == 'usage']
+        bank_scores = _apply_answer_scores(score_jobs) if score_jobs else []
+        if cache_jobs:
+            _apply_answer_cache(cache_jobs)
+        if usage_jobs or bank_scores:
+            # ('usage', served_bank_ids, [(bank_id, score), ...]) → one UPDATE per question
+            deltas = question_stats.aggregate(
+                [bid for j in usage_jobs for bid in j[1]],
+                [s for j in usage_jobs for s in j[2]],
+                corrections=bank_scores)
+            question_stats.apply_usage(db.session, deltas)
+        db.session.commit()
+        if usage_jobs:
+            question_sampler.record_usage({bid: d[0] for bid, d in deltas.items()})
+
+    with app.app_context():
+        try:
+            _apply(items)
+            app.logger.info(f"[BG Writer] Committed {len(items)} result write(s) in one transaction")
+            return 0
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"[BG Writer] Batch commit failed ({str(e)[:80]}), retrying one by one")
+        failed = 0
+        for item in items:   # isolate the bad job so the rest still land
+            try:
+                _apply([item])
+            except Exception as e:
+                db.session.rollback()
+                failed += 1
+                app.logger.warning(f"[BG Writer] Dropped {item[0]} write: {str(e)[:80]}")
+        return failed
+
+
+analysis_writer = GroupCommitWriter(
+    _apply_analysis_batch,
+    max_batch=int(os.environ.get('ANALYSIS_WRITER_BATCH', '64')),
+    max_delay=int(os.environ.get('ANALYSIS_WRITER_DELAY_MS', '250')) / 1000,
+    name='analysis-writer',
+)
+
+
 def _build_feedback_points(main_point: str, point_type: str, ta: float, dep: float, cla: float) -> list:
     """
     Build 3 rich feedback points from one Mistral-generated sentence + dimension scores.
@@ -2297,66 +2527,15 @@ IMPROVEMENT_PLAN:
             return self._fallback_analysis(question, answer)
 
     def _update_answer_scores_in_db(self, answer_uuid, analysis):
-        """Update Answer + Feedback rows with real AI scores after background analysis."""
-        try:
-            with app.app_context():
-                ans = Answer.query.filter_by(uuid=answer_uuid).first()
-                if not ans:
-                    return
-                ans.score              = analysis['score']
-                ans.technical_accuracy = analysis['technical_accuracy']
-                ans.depth_score        = analysis.get('depth_score', analysis['score'])
-                ans.clarity_score      = analysis.get('clarity_score', analysis['score'])
-                ans.relevance_score    = analysis.get('relevance_score', analysis['score'])
-                ans.communication_score= analysis.get('communication_score', analysis['score'])
-                ans.confidence_score   = analysis.get('confidence_score', analysis['score'])
-                fb = Feedback.query.filter_by(answer_id=ans.id).first()
-                if fb:
-                    fb.score             = analysis['score']
-                    fb.strengths         = json.dumps(analysis.get('strengths', []))
-                    fb.improvements      = json.dumps(analysis.get('weaknesses', []))
-                    fb.detailed_feedback = analysis.get('feedback', '')
-                    fb.improvement_plan  = json.dumps(analysis.get('improvement_plan', []))
-                    fb.model_used        = analysis.get('model', self.model_name)
-                db.session.commit()
-                app.logger.info(f"[BG Analysis] DB scores updated for answer {answer_uuid[:8]}")
-        except Exception as e:
-            app.logger.warning(f"[BG Analysis] DB update failed: {str(e)[:80]}")
+        """Queue Answer + Feedback score updates for the group-commit writer."""
+        analysis_writer.submit(('scores', answer_uuid, analysis))
 
     def _write_answer_cache(self, question, answer, analysis):
         """
-        Persist AI analysis to AnswerCache so future identical Q+A pairs skip the AI call.
-        Safe to call from background threads — uses its own app_context + session.
+        Queue the AI analysis for AnswerCache so future identical Q+A pairs skip the AI call.
+        Safe to call from background threads — the writer thread owns the session.
         """
-        try:
-            from hashlib import sha256
-            question_hash = sha256(question.lower().encode()).hexdigest()
-            answer_hash   = sha256(answer.lower().encode()).hexdigest()
-            length_bucket = len(answer.split()) // 10
-            with app.app_context():
-                exists = AnswerCache.query.filter_by(
-                    question_hash=question_hash,
-                    answer_hash=answer_hash,
-                    answer_length=length_bucket,
-                ).first()
-                if exists:
-                    # Update hit-count and refresh cached analysis
-                    exists.cached_analysis = json.dumps(analysis)
-                    exists.hit_count       = (exists.hit_count or 0) + 1
-                    exists.last_accessed   = datetime.utcnow()
-                else:
-                    entry = AnswerCache(
-                        question_hash   = question_hash,
-                        answer_hash     = answer_hash,
-                        answer_length   = length_bucket,
-                        cached_analysis = json.dumps(analysis),
-                        hit_count       = 0,
-                    )
-                    db.session.add(entry)
-                db.session.commit()
-                app.logger.info(f"[AnswerCache] Written — q={question_hash[:8]} a={answer_hash[:8]}")
-        except Exception as e:
-            app.logger.warning(f"[AnswerCache] Write failed: {str(e)[:80]}")
+        analysis_writer.submit(('cache', question, answer, analysis))
 
     def _parse_analysis_output(self, text, answer):
         """
@@ -3192,29 +3371,53 @@ Generate now:"""
 
         # ── TIER 1: Try QuestionBank DB ──────────────────────────────────────
         try:
-            base_q = QuestionBank.query.filter(QuestionBank.field.ilike(f'%{field}%'))
             _itype_cat = {'behavioral': 'behavioral', 'system-design': 'system_design', 'hr': 'hr'}
             db_category = _itype_cat.get(itype, 'technical')
-            if itype == 'technical':
-                cat_q = base_q.filter(QuestionBank.category.in_(['technical', 'system_design']))
+            categories = ['technical', 'system_design'] if itype == 'technical' else [db_category]
+
+            # In-memory sampler: k distinct ids in O(k), biased towards rarely used questions.
+            # Prefer the level's difficulty (calibrated from answer scores where known),
+            # then top up from any difficulty.
+            target = DIFFICULTY_MAP.get((level or 'mid').lower(), DIFFICULTY_MAP['default'])[0]
+            target = 'hard' if target == 'expert' else target
+            ids = question_sampler.sample(num, field, categories, difficulty=target)
+            if ids is not None and len(ids) < num:
+                extra = [i for i in question_sampler.sample(num, field, categories) if i not in ids]
+                ids += extra[:num - len(ids)]
+            if ids == []:
+                ids = question_sampler.sample(num, field)
+            if ids is not None:
+                by_id = {q.id: q for q in QuestionBank.query.filter(QuestionBank.id.in_(ids)).all()}
+                bank = [by_id[i] for i in ids if i in by_id]
+                if len(bank) < len(ids):
+                    question_sampler.mark_dirty()       # rows deleted since the last refresh
             else:
-                cat_q = base_q.filter(QuestionBank.category == db_category)
-            bank = cat_q.order_by(db.func.random()).limit(num * 3).all()
-            if not bank:
-                bank = base_q.order_by(db.func.random()).limit(num * 3).all()
-            if bank:
+                # Sampler still warming up: one-off random query
+                field_match = match_expression(field=field) if question_index.enabled else None
+                if field_match:
+                    base_q = QuestionBank.query.filter(QuestionBank.id.in_(question_index.matching_ids(field_match)))
+                else:
+                    base_q = QuestionBank.query.filter(QuestionBank.field.ilike(f'%{field}%'))
+                bank = base_q.filter(QuestionBank.category.in_(categories))\
+                             .order_by(db.func.random()).limit(num * 3).all()
+                if not bank:
+                    bank = base_q.order_by(db.func.random()).limit(num * 3).all()
                 _random.shuffle(bank)
+            if bank:
                 bank = bank[:num]
                 questions = []
                 for q in bank:
                     qdata = {
                         'text': q.text, 'category': q.category,
                         'field': field, 'level': level, 'company': company,
-                        'difficulty': q.difficulty,
-                        'topic_tags': q.topic_tags or json.dumps([field.lower()])
+                        'difficulty': q.calibrated_difficulty or q.difficulty,
+                        'topic_tags': q.topic_tags or json.dumps([field.lower()]),
+                        'bank_question_id': q.id,
                     }
                     if question_type == 'mock':
-                        mc_data = self._generate_fallback_mc_options(q.text)
+                        stored = q._json_col('mc_options', '{}')
+                        mc_data = dict(stored, is_multiple_choice=True) if stored.get('options') \
+                            else self._generate_fallback_mc_options(q.text)
                         if mc_data:
                             qdata.update(mc_data)
                     questions.append(qdata)
@@ -3672,148 +3875,230 @@ Generate now:"""
 mistral_agent = MistralAIAgent()
 
 
-# ── Runtime DB compatibility fixes (adds missing columns / normalises datetimes) ──
+# ── Versioned schema migrations (see schema_migrations.py) ─────────────────────
+from schema_migrations import SchemaMigrator
+
+with app.app_context():
+    schema_migrator = SchemaMigrator(db.engine, db.metadata)
+
+
 def ensure_db_schema_compatibility():
-    """At import/run time ensure the SQLite DB schema contains expected columns
-    and that stored datetime strings are in ISO format. This makes the app
-    tolerant of older databases that lack newly-added columns.
-    
-    Handles all tables: interviews, answers, questions, users, feedback.
-    Adds missing columns for question_type, answer_type, selected_options, etc.
-    Normalizes datetime strings to ISO format (space → 'T').
+    """At import/run time bring the DB up to the latest schema version.
+
+    Pending steps from schema_migrations.py (missing columns, new tables,
+    ISO datetime normalisation) run once each and are recorded in the
+    `schema_version` table; an already-current database costs one SELECT.
     """
     try:
         with app.app_context():
-            inspector = db.inspect(db.engine)
-            table_names = inspector.get_table_names()
-            
-            # Create all tables if DB is empty
-            if 'interviews' not in table_names:
-                app.logger.info('[Schema] Tables missing, creating all from models')
-                db.create_all()
-                return
-
-            # Helper to add column if missing
-            def _add_column_safe(table, col_name, col_type, default_val=None):
-                try:
-                    existing_cols = [c['name'] for c in inspector.get_columns(table)]
-                    if col_name not in existing_cols:
-                        if default_val:
-                            sql = text(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type} DEFAULT '{default_val}'")
-                        else:
-                            sql = text(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
-                        db.session.execute(sql)
-                        db.session.commit()
-                        app.logger.info(f'[Schema] Added column {table}.{col_name}')
-                except Exception as e:
-                    app.logger.debug(f"[Schema] Could not add {table}.{col_name}: {str(e)[:80]}")
+            report = schema_migrator.migrate()
+            app.logger.info(f"[Schema] Database at version {report['version']} "
+                            f"({report['outcome']}, {report['duration_ms']} ms)")
+    except Exception as e:
+        app.logger.error(f"[Schema] ensure_db_schema_compatibility error: {str(e)[:200]}")
 
-            # ── INTERVIEWS TABLE ──────────────────────────────────────────────────────
-            _add_column_safe('interviews', 'question_type', 'TEXT', 'mock')
-            _add_column_safe('interviews', 'answer_type', 'TEXT', 'mock')
-            _add_column_safe('interviews', 'mode', 'TEXT', 'text')
-            _add_column_safe('interviews', 'ai_model_used', 'TEXT')
-            
-            # ── ANSWERS TABLE ──────────────────────────────────────────────────────────
-            _add_column_safe('answers', 'selected_options', 'TEXT')
-            _add_column_safe('answers', 'word_count', 'INTEGER', '0')
-            _add_column_safe('answers', 'score', 'REAL')
-            _add_column_safe('answers', 'technical_accuracy', 'REAL')
-            _add_column_safe('answers', 'depth_score', 'REAL')
-            _add_column_safe('answers', 'clarity_score', 'REAL')
-            _add_column_safe('answers', 'relevance_score', 'REAL')
-            _add_column_safe('answers', 'communication_score', 'REAL')
-            _add_column_safe('answers', 'confidence_score', 'REAL')
-            _add_column_safe('answers', 'time_spent_seconds', 'INTEGER', '0')
-            _add_column_safe('answers', 'submitted_at', 'DATETIME')
-            
-            # ── QUESTIONS TABLE ────────────────────────────────────────────────────────
-            _add_column_safe('questions', 'is_multiple_choice', 'BOOLEAN', '0')
-            _add_column_safe('questions', 'options', 'TEXT')
-            _add_column_safe('questions', 'correct_answers', 'TEXT')
-            _add_column_safe('questions', 'multiple_allowed', 'BOOLEAN', '0')
-            _add_column_safe('questions', 'question_number', 'INTEGER', '1')
-            _add_column_safe('questions', 'source', 'TEXT', 'ai_generated')
-            _add_column_safe('questions', 'topic_tags', 'TEXT')
-            _add_column_safe('questions', 'difficulty', 'TEXT')
-            _add_column_safe('questions', 'hint', 'TEXT')
-            _add_column_safe('questions', 'expected_points', 'TEXT')
-            _add_column_safe('questions', 'time_limit_secs', 'INTEGER', '300')
-            
-            # ── QUESTION_BANK TABLE ────────────────────────────────────────────────────
-            _add_column_safe('question_bank', 'question_type', 'TEXT', 'mock')  # NEW
-            _add_column_safe('question_bank', 'answer_type', 'TEXT', 'mock')    # NEW
-            
-            # ── FEEDBACK TABLE ────────────────────────────────────────────────────────
-            _add_column_safe('feedback', 'score', 'REAL')
-            _add_column_safe('feedback', 'strengths', 'TEXT')
-            _add_column_safe('feedback', 'improvements', 'TEXT')
-            _add_column_safe('feedback', 'detailed_feedback', 'TEXT')
-            _add_column_safe('feedback', 'improvement_plan', 'TEXT')
-            _add_column_safe('feedback', 'model_used', 'TEXT')
-            _add_column_safe('feedback', 'generated_at', 'DATETIME')
-            
-            # ── USERS TABLE ────────────────────────────────────────────────────────────
-            _add_column_safe('users', 'created_at', 'DATETIME')
-            _add_column_safe('users', 'last_login', 'DATETIME')
-            _add_column_safe('users', 'failed_login_attempts', 'INTEGER', '0')
-            _add_column_safe('users', 'account_locked_until', 'DATETIME')
-            _add_column_safe('users', 'last_failed_login', 'DATETIME')
-            _add_column_safe('users', 'password_changed_at', 'DATETIME')
-
-            # ── TOKEN_BLOCKLIST TABLE ──────────────────────────────────────────────────
-            if 'token_blocklist' not in table_names:
-                try:
-                    db.session.execute(text(
-                        "CREATE TABLE IF NOT EXISTS token_blocklist ("
-                        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-                        "jti VARCHAR(36) NOT NULL UNIQUE, "
-                        "token_type VARCHAR(10) NOT NULL, "
-                        "user_id INTEGER, "
-                        "created_at DATETIME, "
-                        "expires_at DATETIME, "
-                        "FOREIGN KEY(user_id) REFERENCES users(id))"
-                    ))
-                    db.session.execute(text(
-                        "CREATE INDEX IF NOT EXISTS ix_token_blocklist_jti ON token_blocklist(jti)"
-                    ))
-                    db.session.commit()
-                    app.logger.info('[Schema] Created token_blocklist table')
-                except Exception as e:
-                    app.logger.debug(f"[Schema] token_blocklist creation note: {str(e)[:80]}")
 
-            # Normalise datetime strings (replace space with 'T') in all datetime columns
-            def _normalise_table_datetime(table, cols_to_fix):
-                try:
-                    existing_cols = [c['name'] for c in inspector.get_columns(table)]
-                    for col in cols_to_fix:
-                        if col in existing_cols:
-                            sql = text(f"UPDATE {table} SET {col} = replace({col}, ' ', 'T') WHERE {col} LIKE '% %' AND {col} NOT LIKE '%T%' AND {col} IS NOT NULL")
-                            db.session.execute(sql)
-                    db.session.commit()
-                except Exception as e:
-                    app.logger.debug(f"[Schema] Datetime normalisation warning for {table}: {str(e)[:80]}")
+# Run compatibility check at import time so endpoints won't error on older DBs
+ensure_db_schema_compatibility()
+
+# FTS5 question search (question_search.py) — falls back to ilike when unavailable
+from question_search import question_index, match_expression
+with app.app_context():
+    if question_index.detect(db.engine):
+        app.logger.info("[Search] Question bank FTS5 index enabled")
+
+
+# ── Fallback question sampler: O(k) random draws instead of ORDER BY random() ──
+from question_sampler import QuestionSampler
+from question_import import text_hash
+
+
+def _load_sampler_rows():
+    with app.app_context():
+        with db.engine.connect() as conn:
+            rows = conn.execution_options(yield_per=20000).execute(text(
+                "SELECT id, field, category, COALESCE(calibrated_difficulty, difficulty), times_used "
+                "FROM question_bank"))
+            for row in rows:
+                yield tuple(row)
+
+
+def _question_bank_signature():
+    with app.app_context():
+        return tuple(db.session.execute(text(
+            "SELECT COUNT(*), MAX(id) FROM question_bank")).one())
+
+
+question_sampler = QuestionSampler(
+    _load_sampler_rows, _question_bank_signature,
+    weighted=os.environ.get('QUESTION_SAMPLER_WEIGHTED', '1') == '1',
+    refresh_interval=float(os.environ.get('QUESTION_SAMPLER_REFRESH_SECONDS', '300')),
+    rebuild_interval=float(os.environ.get('QUESTION_SAMPLER_REBUILD_SECONDS', '3600')),
+)
+
+
+@event.listens_for(QuestionBank, 'before_insert')
+def _question_bank_hash(mapper, connection, target):
+    if not target.text_hash:
+        target.text_hash = text_hash(target.text)
+
+
+@event.listens_for(QuestionBank, 'after_insert')
+@event.listens_for(QuestionBank, 'after_delete')
+def _question_bank_changed(mapper, connection, target):
+    question_sampler.mark_dirty()
+
 
-            # Normalize all datetime columns
-            _normalise_table_datetime('interviews', ['started_at', 'completed_at'])
-            _normalise_table_datetime('users', ['created_at', 'last_login'])
-            _normalise_table_datetime('answers', ['submitted_at'])
-            _normalise_table_datetime('feedback', ['generated_at'])
+@event.listens_for(QuestionBank, 'after_update')
+def _question_bank_updated(mapper, connection, target):
+    # times_used churn reaches the sampler through record_usage() and the slow rebuild
+    state = db.inspect(target)
+    if any(state.attrs[a].history.has_changes() for a in ('field', 'category', 'difficulty')):
+        question_sampler.mark_dirty()
 
-            app.logger.info('[Schema] Database schema compatibility check completed successfully')
 
+question_sampler.start()
+
+
+# ── Token revocation cache: warm-up, cross-worker sync, expiry pruning ─────────
+def warm_revocation_cache():
+    """Load every unexpired revoked jti into memory. Returns False if the DB is unreachable."""
+    try:
+        with app.app_context():
+            # Log position first: a logout committed between the two reads is
+            # then in the blocklist rows or above last_id, never in neither.
+            last_id = db.session.query(db.func.max(TokenRevocationLog.id)).scalar() or 0
+            now = datetime.utcnow()
+            rows = db.session.query(TokenBlocklist.jti, TokenBlocklist.expires_at)\
+                             .filter(TokenBlocklist.expires_at > now).all()
+            count = revoked_tokens.warm(rows, last_event_id=last_id)
+            app.logger.info(f"[Auth] Revocation cache warmed with {count} active jti(s)")
+            return True
     except Exception as e:
-        app.logger.error(f"[Schema] ensure_db_schema_compatibility error: {str(e)[:200]}")
+        app.logger.warning(f"[Auth] Revocation cache warm-up failed, using DB lookups: {str(e)[:120]}")
+        return False
 
 
-# Run compatibility check at import time so endpoints won't error on older DBs
-ensure_db_schema_compatibility()
+def sync_revocation_cache():
+    """
+    Pull revocations written by other workers since the last applied log id.
+    Ids from a sequence can commit out of order, so the last
+    REVOCATION_SYNC_OVERLAP ids are read again; the cache skips jtis it has.
+    """
+    with app.app_context():
+        rows = db.session.query(TokenRevocationLog.id, TokenRevocationLog.jti,
+                                TokenRevocationLog.expires_at)\
+                         .filter(TokenRevocationLog.id > revoked_tokens.last_event_id - REVOCATION_SYNC_OVERLAP)\
+                         .order_by(TokenRevocationLog.id).all()
+        db.session.remove()
+    return revoked_tokens.apply_events(rows)
+
+
+def prune_expired_revocations():
+    """Delete blocklist / log rows whose tokens have expired anyway (idempotent across workers)."""
+    now = datetime.utcnow()
+    with app.app_context():
+        removed = TokenBlocklist.query.filter(TokenBlocklist.expires_at <= now)\
+                                      .delete(synchronize_session=False)
+        TokenRevocationLog.query.filter(TokenRevocationLog.expires_at <= now)\
+                                .delete(synchronize_session=False)
+        db.session.commit()
+        db.session.remove()
+    dropped = revoked_tokens.prune_expired(now)
+    if removed or dropped:
+        app.logger.info(f"[Auth] Pruned {removed} expired blocklist row(s), {dropped} cache entr(ies)")
+    return removed
+
+
+def _revocation_maintenance_loop():
+    last_prune = 0.0
+    while True:
+        time.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            if not revoked_tokens.ready:
+                warm_revocation_cache()
+                continue
+            sync_revocation_cache()
+            if time.time() - last_prune >= REVOCATION_PRUNE_SECONDS:
+                prune_expired_revocations()
+                last_prune = time.time()
+        except Exception as e:
+            app.logger.debug(f"[Auth] Revocation maintenance skipped: {str(e)[:80]}")
+
+
+warm_revocation_cache()
+threading.Thread(target=_revocation_maintenance_loop, daemon=True,
+                 name='revocation-maintenance').start()
+
+
+# ── Background WAL checkpointing (keeps interview_coach.db-wal small) ──────────
+wal_checkpointer = None
+with app.app_context():
+    _db_url = db.engine.url
+if _db_url.get_backend_name() == 'sqlite' and _db_url.database not in (None, '', ':memory:'):
+    wal_checkpointer = WALCheckpointScheduler(_db_url.database, sqlite_tuning)
+    wal_checkpointer.start()
+
+
+# ── Hot/cold interview archive (ARCHIVE_INTERVAL_HOURS=0 leaves it to the CLI) ──
+with app.app_context():
+    interview_archiver = interview_archive.InterviewArchiver(db.engine)
+interview_archiver.start()
+
+
+# ── RAG warm-up (RAG_WARMUP=0 loads the embedding model on the first answer instead) ──
+def _warm_up_rag():
+    try:
+        from rag.rag_engine import rag_engine
+        rag_engine.warm_up()
+    except Exception as e:
+        app.logger.warning(f'[RAG] Warm-up skipped: {str(e)[:80]}')
+
+if os.environ.get('RAG_WARMUP', '1') != '0':
+    _warm_up_rag()
 
 
 # ==============================================================================
 #  HELPER FUNCTIONS — DATA INTEGRITY & STATS RECALCULATION
 # ==============================================================================
 
+def _answer_counts(interviews):
+    """interview id -> answers given. Hot sessions in one GROUP BY, archived ones from the summary."""
+    counts = {i.id: i.answer_count or 0 for i in interviews if i.archived_at}
+    hot = [i.id for i in interviews if not i.archived_at]
+    if hot:
+        counts.update(db.session.query(Answer.interview_id, db.func.count(Answer.id))
+                      .filter(Answer.interview_id.in_(hot)).group_by(Answer.interview_id).all())
+    return counts
+
+
+def _detached(model, rows):
+    """Model instances from archive row dicts, ignoring columns the model does not map
+    (left behind on archive tables by older releases)."""
+    columns = set(model.__table__.columns.keys())
+    return [model(**{k: v for k, v in r.items() if k in columns}) for r in rows]
+
+
+def _interview_records(interview):
+    """(questions, answers, feedback by answer id) for one session from whichever tier holds it.
+    Archived rows come back as detached model instances so callers can use to_dict() as usual."""
+    if interview.archived_at is None:
+        questions = Question.query.filter_by(interview_id=interview.id) \
+                                  .order_by(Question.question_number, Question.id).all()
+        answers   = Answer.query.filter_by(interview_id=interview.id).order_by(Answer.id).all()
+        feedback  = Feedback.query.filter(Feedback.answer_id.in_([a.id for a in answers])) \
+                                  .order_by(Feedback.id).all() if answers else []
+    else:
+        rows      = interview_archive.load_archived(db.session, db.metadata, interview.id)
+        questions = _detached(Question, rows['questions'])
+        answers   = _detached(Answer, rows['answers'])
+        feedback  = _detached(Feedback, rows['feedback'])
+    by_answer = {}
+    for fb in feedback:
+        by_answer.setdefault(fb.answer_id, fb)
+    return questions, answers, by_answer
+
+
 def recalculate_user_stats(user_id):
     """
     Recalculate and sync all user aggregate statistics from actual interview data.
@@ -3848,15 +4133,12 @@ def recalculate_user_stats(user_id):
         # Calculate total practice time from all completed interviews
         total_duration = sum(i.duration_seconds or 0 for i in completed_interviews)
         
-        # Count total questions answered from all completed interviews
-        total_questions = 0
-        for interview in completed_interviews:
-            try:
-                answers = Answer.query.filter_by(interview_id=interview.id).all()
-                total_questions += len(answers)
-            except Exception as e:
-                app.logger.debug(f"[Stats] Could not query answers for interview {interview.id}: {str(e)[:80]}")
-                continue
+        # Count total questions answered from all completed interviews (archived ones included)
+        try:
+            total_questions = sum(_answer_counts(completed_interviews).values())
+        except Exception as e:
+            app.logger.debug(f"[Stats] Could not count answers: {str(e)[:80]}")
+            total_questions = 0
         
         # Get last activity date
         try:
@@ -3939,6 +4221,24 @@ def health_check():
         'status': 'healthy',
         'database': 'connected',
         'mistral': mistral_status,
+        'token_revocation': revoked_tokens.stats(),
+        'analysis_writer': analysis_writer.stats(),
+        'schema': schema_migrator.stats(),
+        'question_search': question_index.stats(),
+        'question_sampler': question_sampler.stats(),
+        'archive': interview_archiver.stats(),
+        # RAG modules load lazily (warm-up or first answer); don't import them just for this
+        'rag': (sys.modules['rag.rag_engine'].rag_engine.status()
+                if 'rag.rag_engine' in sys.modules else None),
+        'vector_store': (sys.modules['rag.vector_store'].vector_store_manager.stats()
+                         if 'rag.vector_store' in sys.modules else None),
+        'embedding_cache': (sys.modules['rag.embedding_service'].embedding_service.cache.stats()
+                            if 'rag.embedding_service' in sys.modules
+                            and sys.modules['rag.embedding_service'].embedding_service.cache else None),
+        'sqlite': {
+            'tuning': sqlite_tuning.to_dict(),
+            'checkpoint': wal_checkpointer.stats(),
+        } if wal_checkpointer else None,
         'version': '3.0.0-enterprise',
         'timestamp': datetime.now().isoformat()
     }), 200
@@ -4271,14 +4571,17 @@ def logout():
         exp_ts     = jwt_data['exp']
         user_id    = get_jwt_identity()
 
+        expires_at = datetime.utcfromtimestamp(exp_ts)
         blocked = TokenBlocklist(
             jti=jti,
             token_type=token_type,
             user_id=int(user_id) if user_id else None,
-            expires_at=datetime.utcfromtimestamp(exp_ts),
+            expires_at=expires_at,
         )
         db.session.add(blocked)
+        db.session.add(TokenRevocationLog(jti=jti, expires_at=expires_at))
         db.session.commit()
+        revoked_tokens.add(jti, expires_at)
         app.logger.info(f"[Auth] Token revoked ({token_type}) for user {user_id}")
         return jsonify({'message': 'Successfully logged out'}), 200
     except Exception as e:
@@ -4299,8 +4602,8 @@ def get_profile():
         profile['linkedin_url']     = user.linkedin_url
         profile['github_url']       = user.github_url
         profile['headline']         = user.headline
-        profile['education']        = json.loads(user.education or '[]')
-        profile['target_roles']     = json.loads(user.target_roles or '[]')
+        profile['education']        = user.education_list()
+        profile['target_roles']     = user.target_roles_list()
         profile['total_questions_answered'] = user.total_questions_answered
         return jsonify(profile), 200
     except Exception as e:
@@ -4414,24 +4717,47 @@ def get_question_library():
         field = request.args.get('field', '')
         difficulty = request.args.get('difficulty', '')
         search = request.args.get('search', '')
-        
-        query = QuestionBank.query
-        
-        if category:
-            query = query.filter(QuestionBank.category.ilike(f'%{category}%'))
-        if field:
-            query = query.filter(QuestionBank.field.ilike(f'%{field}%'))
-        if difficulty:
-            query = query.filter(QuestionBank.difficulty.ilike(f'%{difficulty}%'))
-        if search:
-            query = query.filter(QuestionBank.text.ilike(f'%{search}%'))
-        
-        questions = query.order_by(QuestionBank.times_used.desc()).limit(50).all()
-        
-        return jsonify({
+        want_facets = request.args.get('facets', '').lower() in ('1', 'true', 'yes')
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        facets = None
+
+        match = match_expression(search, category, field, difficulty)
+        if question_index.enabled and (match or want_facets):
+            # FTS5: bm25-ranked when there is free text, most popular first otherwise
+            if match:
+                ids = question_index.search(db.session, match, ranked=bool(search.strip()),
+                                            limit=limit, offset=offset)
+                by_id = {q.id: q for q in QuestionBank.query.filter(QuestionBank.id.in_(ids)).all()}
+                questions = [by_id[i] for i in ids if i in by_id]
+            else:
+                questions = QuestionBank.query.order_by(QuestionBank.popularity.desc(),
+                                                        QuestionBank.times_used.desc())\
+                                              .offset(offset).limit(limit).all()
+            if want_facets:
+                facets = question_index.facets(db.session, match)
+        else:
+            query = QuestionBank.query
+
+            if category:
+                query = query.filter(QuestionBank.category.ilike(f'%{category}%'))
+            if field:
+                query = query.filter(QuestionBank.field.ilike(f'%{field}%'))
+            if difficulty:
+                query = query.filter(QuestionBank.difficulty.ilike(f'%{difficulty}%'))
+            if search:
+                query = query.filter(QuestionBank.text.ilike(f'%{search}%'))
+
+            questions = query.order_by(QuestionBank.popularity.desc(), QuestionBank.times_used.desc())\
+                             .offset(offset).limit(limit).all()
+
+        response = {
             'questions': [q.to_dict() for q in questions],
             'total': len(questions)
-        }), 200
+        }
+        if facets is not None:
+            response['facets'] = facets
+        return jsonify(response), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -4481,10 +4807,11 @@ def get_analytics():
         field_scores = {}
         level_scores = {}
         all_interviews_data = []
+        answer_counts = _answer_counts(interviews)
         
         for i in interviews:
             # Count questions answered for this interview
-            answers_count = len(Answer.query.filter_by(interview_id=i.id).all())
+            answers_count = answer_counts.get(i.id, 0)
             
             interview_data = {
                 'id': i.id,
@@ -4561,7 +4888,7 @@ def get_analytics():
             'average_score': avg_score,
             'best_score': round(best_score, 2) if best_score else 0,
             'total_time_spent': total_time,
-            'total_questions_answered': sum(len(Answer.query.filter_by(interview_id=i.id).all()) for i in interviews),
+            'total_questions_answered': sum(answer_counts.values()),
             'score_distribution': score_dist,
             'field_breakdown': field_breakdown,
             'level_breakdown': level_breakdown,
@@ -4685,7 +5012,8 @@ def start_interview():
                     correct_answers=json.dumps(qdata['correct_answers']) if is_mc and qdata.get('correct_answers') else None,
                     multiple_allowed=qdata.get('multiple_allowed', False),
                     question_number=i + 1,
-                    source='ai_generated',
+                    source='bank' if qdata.get('bank_question_id') else 'ai_generated',
+                    bank_question_id=qdata.get('bank_question_id'),
                 )
                 db.session.add(q)
                 stored_qs.append(q)
@@ -4696,6 +5024,10 @@ def start_interview():
             # ── STEP 4: UPDATE USER STATS AND COMMIT EVERYTHING ──────────────────
             user.total_interviews += 1
             db.session.commit()  # Single commit: questions + user stats
+
+            served = [q.bank_question_id for q in stored_qs if q.bank_question_id]
+            if served:
+                analysis_writer.submit(('usage', served, []))
         except Exception as e:
             db.session.rollback()
             # Clean up orphaned interview
@@ -4985,6 +5317,11 @@ def submit_answer(interview_uuid):
         # ── After commit we have answer.uuid — wire async jobs to it ─────────
         real_uuid = answer.uuid
 
+        # Count the score towards the bank question now; if the AI later replaces a
+        # provisional score, _apply_answer_scores applies the difference
+        if question.bank_question_id:
+            analysis_writer.submit(('usage', [], [(question.bank_question_id, analysis['score'])]))
+
         # For pending async text analysis: fire AI with real UUID now
         if analysis.get('source') == 'heuristic_pending':
             with _pending_analysis_lock:
@@ -5046,6 +5383,8 @@ def submit_answer(interview_uuid):
         # Async task: Save to FAISS in background (non-blocking)
         _q_text_copy, _a_text_copy = question.text, answer.text
         _a_feedback_copy, _a_score_copy, _q_id_copy = analysis['feedback'], analysis['score'], question.id
+        _a_id_copy = answer.id
+        _i_context = {'field': interview.field, 'level': interview.level, 'interview_type': interview.interview_type}
         def save_to_rag_async():
             try:
                 from rag.rag_engine import rag_engine
@@ -5053,7 +5392,7 @@ def submit_answer(interview_uuid):
                     rag_engine.record_session(
                         question=_q_text_copy, user_answer=_a_text_copy,
                         ai_feedback=_a_feedback_copy, rating=_a_score_copy,
-                        question_id=_q_id_copy
+                        question_id=_q_id_copy, answer_id=_a_id_copy, **_i_context
                     )
                     app.logger.info(f"[FAISS] Async session recorded successfully")
             except Exception as e:
@@ -5251,9 +5590,10 @@ def interview_history():
 
         # Enhance session data with answers count and detailed info
         sessions_data = []
+        answer_counts = _answer_counts(sessions)
         for s in sessions:
             session_dict = s.to_dict()
-            answers_count = len(Answer.query.filter_by(interview_id=s.id).all())
+            answers_count = answer_counts.get(s.id, 0)
             session_dict['answers_count'] = answers_count
             session_dict['total_practice_time'] = s.duration_seconds or 0
             session_dict['completed'] = s.status == 'completed'
@@ -5282,11 +5622,12 @@ def full_report(interview_uuid):
         if not interview:   return jsonify({'error': 'Interview not found'}), 404
         if interview.user_id != user_id: return jsonify({'error': 'Unauthorized'}), 403
 
-        answers = Answer.query.filter_by(interview_id=interview.id).all()
+        questions, answers, feedback = _interview_records(interview)
+        questions = {q.id: q for q in questions}
         qa_pairs = []
         for a in answers:
-            question = db.session.get(Question, a.question_id) if a.question_id else None
-            fb       = Feedback.query.filter_by(answer_id=a.id).first()
+            question = questions.get(a.question_id) if a.question_id else None
+            fb       = feedback.get(a.id)
             qa_pairs.append({
                 'question': question.to_dict() if question else None,
                 'answer':   a.to_dict(),
@@ -5340,10 +5681,7 @@ def dashboard_stats():
         real_avg = round(sum(completed_scores) / len(completed_scores), 2) if completed_scores else 0.0
         real_best = round(max(completed_scores), 2) if completed_scores else 0.0
         real_total_time = sum(i.duration_seconds or 0 for i in completed_interviews)
-        real_total_questions = sum(
-            len(Answer.query.filter_by(interview_id=i.id).all()) 
-            for i in completed_interviews
-        )
+        real_total_questions = sum(_answer_counts(completed_interviews).values())
 
         return jsonify({
             'total_interviews':          completed_count,
@@ -5392,10 +5730,7 @@ def refresh_realtime_data():
         # Calculate current metrics
         completed_count = len(completed_interviews)
         scores = [i.overall_score for i in completed_interviews if i.overall_score]
-        total_questions = sum(
-            len(Answer.query.filter_by(interview_id=i.id).all()) 
-            for i in completed_interviews
-        )
+        total_questions = sum(_answer_counts(completed_interviews).values())
         total_time = sum(i.duration_seconds or 0 for i in completed_interviews)
         
         return jsonify({
@@ -5434,11 +5769,8 @@ def get_current_interview_realtime(interview_uuid):
         if interview.user_id != user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Get all answers for this interview
-        answers = Answer.query.filter_by(interview_id=interview.id).all()
-        
-        # Get all questions for this interview
-        questions = Question.query.filter_by(interview_id=interview.id).all()
+        # Get all questions and answers for this interview (either tier)
+        questions, answers, _ = _interview_records(interview)
         
         # Calculate current score if any answers scored
         scored_answers = [a for a in answers if a.score is not None]
@@ -5577,7 +5909,7 @@ if __name__ == '__main__':
     print("\n" + "="*70)
     print("  AI INTERVIEW COACH - ENTERPRISE BACKEND v3.0")
     print("="*70)
-    print(f"  Database: {os.path.join(basedir,'interview_coach.db')}")
+    print(f"  Database: {_db_url.render_as_string(hide_password=True)}")
     print(f"  Mistral:  {'ONLINE' if mistral_agent.is_available else 'OFFLINE (fallback active)'}")
     print(f"  Server:   http://127.0.0.1:5000")
     print("="*70 + "\n")
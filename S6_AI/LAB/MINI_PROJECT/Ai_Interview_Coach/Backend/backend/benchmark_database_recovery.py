@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Database recovery benchmark: per-user loop vs set-based DatabaseRecovery.
+
+The old recalculate_user_stats (one interviews query per user plus one
+COUNT(*) per interview) is timed on a slice of users and extrapolated; the
+set-based version runs the full audit (concurrent integrity checks + stats
+diff + UPDATE ... FROM) over the whole database.
+
+Usage:  python benchmark_database_recovery.py [answers] [loop_users]   (default 1000000, 500)
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+from database_recovery import DatabaseRecovery
+
+ANSWERS    = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+LOOP_USERS = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+INTERVIEWS = ANSWERS // 5
+USERS      = max(INTERVIEWS // 10, 1)
+
+tmp = tempfile.mkdtemp()
+db_path = os.path.join(tmp, 'bench.db')
+conn = sqlite3.connect(db_path)
+conn.executescript("""
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(120), total_interviews INTEGER DEFAULT 0,
+                        total_questions_answered INTEGER DEFAULT 0, total_practice_time INTEGER DEFAULT 0,
+                        average_score FLOAT DEFAULT 0, best_score FLOAT DEFAULT 0, last_activity_date DATE);
+    CREATE TABLE interviews (id INTEGER PRIMARY KEY, user_id INTEGER, status VARCHAR(20),
+                             overall_score FLOAT, duration_seconds INTEGER, completed_at DATETIME);
+    CREATE INDEX ix_interviews_user_id ON interviews (user_id);
+    CREATE INDEX ix_interviews_user_status ON interviews (user_id, status);
+    CREATE TABLE questions (id INTEGER PRIMARY KEY, interview_id INTEGER);
+    CREATE INDEX ix_questions_interview_id ON questions (interview_id);
+    CREATE TABLE answers (id INTEGER PRIMARY KEY, interview_id INTEGER, question_id INTEGER, score FLOAT);
+    CREATE INDEX ix_answers_interview_id ON answers (interview_id);
+    CREATE INDEX ix_answers_question_id ON answers (question_id);
+    CREATE TABLE feedback (id INTEGER PRIMARY KEY, user_id INTEGER, answer_id INTEGER);
+    CREATE INDEX ix_feedback_user_id ON feedback (user_id);
+    CREATE INDEX ix_feedback_answer_id ON feedback (answer_id);
+""")
+rnd = random.Random(1)
+conn.executemany("INSERT INTO users (id, email) VALUES (?, ?)",
+                 ((i, f'user{i}@x.io') for i in range(1, USERS + 1)))
+conn.executemany("INSERT INTO interviews VALUES (?, ?, ?, ?, ?, ?)",
+                 ((i, rnd.randint(1, USERS), 'completed' if rnd.random() < 0.8 else 'in_progress',
+                   round(rnd.uniform(2, 10), 2), rnd.randint(60, 3600),
+                   f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T10:00:00')
+                  for i in range(1, INTERVIEWS + 1)))
+conn.executemany("INSERT INTO questions VALUES (?, ?)", ((i, (i - 1) // 5 + 1) for i in range(1, ANSWERS + 1)))
+conn.executemany("INSERT INTO answers VALUES (?, ?, ?, ?)",
+                 ((i, (i - 1) // 5 + 1, i, rnd.uniform(0, 10)) for i in range(1, ANSWERS + 1)))
+conn.executemany("INSERT INTO feedback VALUES (?, ?, ?)",
+                 ((i, rnd.randint(1, USERS), i) for i in range(1, ANSWERS // 2 + 1)))
+conn.commit()
+
+print("=" * 70)
+print(f"  DATABASE RECOVERY: {USERS:,} users, {INTERVIEWS:,} interviews, {ANSWERS:,} answers")
+print("=" * 70)
+
+# Old approach on a slice of users
+started = time.perf_counter()
+cur = conn.cursor()
+for (user_id,) in cur.execute("SELECT id FROM users LIMIT ?", (LOOP_USERS,)).fetchall():
+    interviews = cur.execute("SELECT id, overall_score, duration_seconds, completed_at FROM interviews "
+                             "WHERE user_id = ? AND status = 'completed'", (user_id,)).fetchall()
+    scores = [s for _, s, _, _ in interviews if s is not None]
+    total_questions = sum(cur.execute("SELECT COUNT(*) FROM answers WHERE interview_id = ?",
+                                      (iid,)).fetchone()[0] for iid, _, _, _ in interviews)
+    cur.execute("UPDATE users SET total_interviews = ?, average_score = ?, best_score = ?, "
+                "total_practice_time = ?, total_questions_answered = ?, last_activity_date = ? WHERE id = ?",
+                (len(interviews), round(sum(scores) / len(scores), 2) if scores else 0.0,
+                 max(scores, default=0.0), sum(d or 0 for _, _, d, _ in interviews), total_questions,
+                 max((c for _, _, _, c in interviews if c), default=None), user_id))
+conn.rollback()
+loop_s = (time.perf_counter() - started) * USERS / LOOP_USERS
+conn.close()
+
+recovery = DatabaseRecovery(db_path, report_path=None, verbose=False)
+started = time.perf_counter()
+recovery.run_full_recovery()
+full_s = time.perf_counter() - started
+timings = recovery.report['timings_ms']
+
+print(f"\n  per-user loop, stats only (extrapolated)  {loop_s:8.2f} s")
+print(f"  set-based, full audit                     {full_s:8.2f} s   {loop_s / full_s:6.1f}x")
+print(f"    integrity checks (concurrent)           {timings['integrity_checks'] / 1000:8.2f} s")
+print(f"    user stats diff + update                {timings['recalculate_user_stats'] / 1000:8.2f} s")
+print(f"  users updated: {recovery.report['fixes'][0]['users_fixed']:,}")
+print("=" * 70)
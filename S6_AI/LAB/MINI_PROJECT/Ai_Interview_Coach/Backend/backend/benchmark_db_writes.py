@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Write-throughput benchmark: SQLite (WAL, tuned PRAGMAs) vs PostgreSQL (pooled).
+
+Each worker thread commits small answer-like transactions through its own
+pooled connection, mimicking concurrent submit_answer requests.
+
+Usage:
+    python benchmark_db_writes.py                                   # SQLite only
+    python benchmark_db_writes.py postgresql://user:pw@localhost/coach_bench
+    BENCH_POSTGRES_URL=postgresql://... python benchmark_db_writes.py [threads] [writes]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from db_config import engine_options
+from sqlite_tuning import sqlite_tuning, is_sqlite_connection
+
+
+@event.listens_for(Engine, "connect")
+def _tune_sqlite(dbapi_connection, connection_record):
+    if is_sqlite_connection(dbapi_connection):
+        sqlite_tuning.apply(dbapi_connection)
+
+
+args = [a for a in sys.argv[1:] if not a.isdigit()]
+nums = [int(a) for a in sys.argv[1:] if a.isdigit()]
+THREADS = nums[0] if len(nums) > 0 else 16
+WRITES  = nums[1] if len(nums) > 1 else 200
+PG_URL  = args[0] if args else os.environ.get('BENCH_POSTGRES_URL')
+
+
+def bench(url, label):
+    engine = create_engine(url, **engine_options(url))
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS bench_writes"))
+        conn.execute(text("CREATE TABLE bench_writes (id INTEGER PRIMARY KEY, "
+                          "interview_id INTEGER, text TEXT, score FLOAT)"
+                          if url.startswith('sqlite') else
+                          "CREATE TABLE bench_writes (id SERIAL PRIMARY KEY, "
+                          "interview_id INTEGER, text TEXT, score DOUBLE PRECISION)"))
+
+    errors = [0]
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        for _ in range(WRITES):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO bench_writes (interview_id, text, score) "
+                                      "VALUES (:i, :t, :s)"),
+                                 {'i': worker_id, 't': 'answer text ' * 20, 's': 7.5})
+            except Exception:
+                with lock:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = time.perf_counter() - started
+
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT COUNT(*) FROM bench_writes")).scalar()
+        conn.execute(text("DROP TABLE bench_writes"))
+    engine.dispose()
+
+    print(f"  {label:22s} rows={rows:6d}  errors={errors[0]:4d}  "
+          f"time={elapsed:6.2f}s  {rows / elapsed:9,.0f} commits/s")
+
+
+print("=" * 78)
+print(f"  DB WRITE THROUGHPUT: {THREADS} threads x {WRITES} single-row transactions")
+print("=" * 78)
+with tempfile.TemporaryDirectory() as tmp:
+    bench(f"sqlite:///{os.path.join(tmp, 'bench.db')}", 'SQLite (WAL)')
+if PG_URL:
+    bench(PG_URL.replace('postgres://', 'postgresql://', 1), 'PostgreSQL (pooled)')
+else:
+    print("  PostgreSQL             skipped — pass a URL or set BENCH_POSTGRES_URL")
+print("=" * 78)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Embedding batcher benchmark: N threads each embedding single texts, calling
+the model directly against going through BatchedEmbeddings
+(rag/embedding_batcher.py).
+
+Reports texts/sec, p50/p95 latency per call, forward passes and CPU
+utilisation (process CPU time / wall time). The model is the ONNX backend when
+it has been exported (python rag/onnx_embeddings.py --export), otherwise a
+numpy stand-in with a fixed per-call cost plus a per-text cost, the shape of
+a transformer forward pass on CPU.
+
+Usage:  python benchmark_embedding_batcher.py [threads] [texts_per_thread]     (default 16, 25)
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from rag.embedding_batcher import BATCH_DELAY, BATCH_MAX, BatchedEmbeddings
+
+THREADS = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+PER_THREAD = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+
+
+class NumpyModel:
+    """~4 ms of matrix work per call plus ~0.3 ms per text, all under one lock like a real session."""
+
+    def __init__(self, dim=384):
+        rng = np.random.default_rng(0)
+        self.setup = rng.standard_normal((256, 256)).astype('float32')
+        self.proj = rng.standard_normal((256, dim)).astype('float32')
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        with self.lock:
+            self.calls += 1
+            m = self.setup
+            for _ in range(12):
+                m = np.tanh(m @ self.setup)
+            x = np.random.default_rng(len(texts)).standard_normal((len(texts), 256)).astype('float32')
+            for _ in range(6):
+                x = np.tanh(x @ self.setup)
+            out = x @ self.proj
+            return (out / np.linalg.norm(out, axis=1, keepdims=True)).tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def load_model():
+    try:
+        from rag.onnx_embeddings import OnnxEmbeddings
+        model = OnnxEmbeddings()
+        model.calls = 0
+        inner = model.embed_documents
+        def counted(texts):
+            model.calls += 1
+            return inner(texts)
+        model.embed_documents = counted
+        return model, 'onnx'
+    except Exception:
+        return NumpyModel(), 'numpy stand-in'
+
+
+def run(embed, texts):
+    latencies = [[] for _ in range(THREADS)]
+    def worker(i):
+        for text in texts[i::THREADS]:
+            started = time.perf_counter()
+            embed(text)
+            latencies[i].append((time.perf_counter() - started) * 1000)
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    wall, cpu = time.perf_counter(), time.process_time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    flat = sorted(x for per_thread in latencies for x in per_thread)
+    return {'per_sec': len(flat) / wall, 'p50': statistics.median(flat), 'p95': flat[int(len(flat) * 0.95) - 1],
+            'cpu_pct': 100 * cpu / wall / (os.cpu_count() or 1)}
+
+
+topics = ['process vs thread', 'CAP theorem', 'class imbalance', 'URL shortener design', 'database indexing']
+texts = [f"How would you explain {topics[i % len(topics)]} to a junior engineer? (variant {i})"
+         for i in range(THREADS * PER_THREAD)]
+model, kind = load_model()
+model.embed_documents(texts[:4])                            # warm-up
+
+rows = {}
+model.calls = 0
+rows['direct'] = dict(run(model.embed_query, texts), passes=model.calls)
+batched = BatchedEmbeddings(model)
+model.calls = 0
+rows['batched'] = dict(run(batched.embed_query, texts), passes=model.calls)
+
+print("=" * 72)
+print(f"  EMBEDDING BATCHER: {kind}, {THREADS} threads x {PER_THREAD} texts, {os.cpu_count()} cores")
+print(f"  max_batch={BATCH_MAX}, delay={BATCH_DELAY * 1000:.1f} ms")
+print("=" * 72)
+print(f"  {'mode':<9}{'texts/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'passes':>9}{'CPU %':>8}")
+for mode, row in rows.items():
+    print(f"  {mode:<9}{row['per_sec']:10.0f}{row['p50']:10.2f}{row['p95']:10.2f}{row['passes']:9d}{row['cpu_pct']:8.0f}")
+stats = batched.stats()
+print("=" * 72)
+print(f"  avg batch {stats['avg_batch_size']}, avg queue wait {stats['avg_wait_ms']} ms, "
+      f"avg forward {stats['avg_forward_ms']} ms")
+print(f"  speed-up {rows['batched']['per_sec'] / rows['direct']['per_sec']:.1f}x")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Embedding backend benchmark: PyTorch (HuggingFaceEmbeddings) against the ONNX
+Runtime backend (rag/onnx_embeddings.py) in fp32 and int8.
+
+Each backend runs in a fresh interpreter and reports model load time,
+resident memory (RSS) once loaded, embeddings/sec for a batch of interview
+records (embed_documents) and the median single-query latency (embed_query).
+The ONNX vectors are compared with the torch vectors (cosine per text), the
+same check as `python rag/onnx_embeddings.py --verify`.
+
+Prepare the ONNX model first: python rag/onnx_embeddings.py --export
+
+Usage:  python benchmark_embeddings.py [texts] [onnx_threads]     (default 512, 0 = one per core)
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from rag.onnx_embeddings import MIN_COSINE, compare
+
+TEXTS   = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+THREADS = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+QUERIES = 50
+
+CHILD = r'''
+import json, statistics, sys, time
+import numpy as np
+sys.path.insert(0, '.')
+
+def rss_mb():
+    with open('/proc/self/status') as fh:
+        for line in fh:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+
+backend, threads, count, queries, out_path = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4]), sys.argv[5]
+topics = ['process vs thread', 'CAP theorem', 'class imbalance', 'URL shortener design', 'a conflict with a teammate',
+          'measuring a feature launch', 'database indexing', 'REST vs gRPC']
+texts = [f"Question: Explain {topics[i % len(topics)]} (variant {i}).\nAnswer: " + "I would start by " * (3 + i % 25)
+         + f"weighing the trade-offs.\nFeedback: Reasonable structure, needs examples.\nScore: {i % 10}/10"
+         for i in range(count)]
+
+started = time.perf_counter()
+if backend == 'torch':
+    from rag.embedding_service import DEFAULT_MODEL_NAME, _import_model_stack
+    model = _import_model_stack()(model_name=DEFAULT_MODEL_NAME)
+else:
+    from rag.onnx_embeddings import OnnxEmbeddings
+    model = OnnxEmbeddings(quantized=backend == 'onnx-int8', threads=threads)
+load_s = time.perf_counter() - started
+loaded_rss = rss_mb()
+
+model.embed_documents(texts[:8])                            # warm-up
+started = time.perf_counter()
+vectors = model.embed_documents(texts)
+batch_s = time.perf_counter() - started
+latencies = []
+for text in texts[:queries]:
+    started = time.perf_counter()
+    model.embed_query(text)
+    latencies.append((time.perf_counter() - started) * 1000)
+np.save(out_path, np.asarray(vectors, dtype='float32'))
+print(json.dumps({'load_s': load_s, 'rss_mb': loaded_rss, 'peak_rss_mb': rss_mb(), 'per_sec': count / batch_s,
+                  'query_ms': statistics.median(latencies)}))
+'''
+
+tmp = tempfile.mkdtemp()
+rows, vectors = {}, {}
+for backend in ('torch', 'onnx-fp32', 'onnx-int8'):
+    out_path = os.path.join(tmp, f'{backend}.npy')
+    proc = subprocess.run([sys.executable, '-c', CHILD, backend, str(THREADS), str(TEXTS), str(QUERIES), out_path],
+                          capture_output=True, text=True, timeout=1800)
+    if proc.returncode:
+        rows[backend] = proc.stderr.strip().splitlines()[-1][:60] if proc.stderr.strip() else 'failed'
+        continue
+    rows[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+    vectors[backend] = np.load(out_path)
+
+print("=" * 84)
+print(f"  EMBEDDING BACKENDS: {TEXTS} records, onnx threads={THREADS or 'default'}, {os.cpu_count()} cores")
+print("=" * 84)
+print(f"  {'backend':<11}{'load s':>8}{'RSS MB':>9}{'peak MB':>9}{'emb/s':>9}{'query ms':>10}"
+      f"{'min cos':>10}{'max |diff|':>12}")
+for backend, row in rows.items():
+    if isinstance(row, str):
+        print(f"  {backend:<11}skipped: {row}")
+        continue
+    agreement = (compare(vectors[backend], vectors['torch'])
+                 if backend != 'torch' and 'torch' in vectors else None)
+    print(f"  {backend:<11}{row['load_s']:8.2f}{row['rss_mb']:9.0f}{row['peak_rss_mb']:9.0f}{row['per_sec']:9.0f}"
+          f"{row['query_ms']:10.2f}"
+          + (f"{agreement['min_cosine']:10.4f}{agreement['max_abs_diff']:12.4f}" if agreement else f"{'-':>10}{'-':>12}"))
+print("=" * 84)
+print(f"  min cos = lowest cosine to the torch vector over all records (--verify requires >= {MIN_COSINE})")
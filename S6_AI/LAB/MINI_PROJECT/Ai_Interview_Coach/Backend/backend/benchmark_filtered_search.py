@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Filtered retrieval benchmark: latency of metadata-filtered searches
+(rag/metadata_filter.py) as the store grows, against post-filtering a larger
+unfiltered result.
+
+Records get a field (x5), level (x4), interview type (x3) and one of 2000
+question ids. Three filters are timed: field + level (~5% of the store),
+field + level + type (~1.7%) and a single question id (~0.05%). The
+post-filter baseline searches 10x k unfiltered and keeps the matches. It
+misses neighbours whenever fewer than k of them survive.
+
+Usage:  python benchmark_filtered_search.py [sizes] [index_type]   (default 10000,100000,1000000 flat)
+"""
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from rag import ann_index
+from rag.metadata_filter import MetadataIndex, search_rows
+
+SIZES      = [int(n) for n in sys.argv[1].split(',')] if len(sys.argv) > 1 else [10_000, 100_000, 1_000_000]
+INDEX_TYPE = sys.argv[2] if len(sys.argv) > 2 else 'flat'
+DIM, K, QUERIES = 384, 3, 200
+FIELDS = ['Software Engineering', 'Data Science', 'Product', 'DevOps', 'Design']
+LEVELS = ['Junior', 'Mid', 'Senior', 'Lead']
+TYPES  = ['technical', 'behavioral', 'system_design']
+rng = np.random.default_rng(11)
+
+FILTERS = {
+    'field+level':      lambda q: {'field': FIELDS[q % 5], 'level': LEVELS[q % 4]},
+    'field+level+type': lambda q: {'field': FIELDS[q % 5], 'level': LEVELS[q % 4], 'interview_type': TYPES[q % 3]},
+    'question':         lambda q: {'question_id': q % 2000},
+}
+
+
+def metadata(i):
+    return {'field': FIELDS[i % 5], 'level': LEVELS[(i // 5) % 4], 'interview_type': TYPES[(i // 20) % 3],
+            'question_id': (i * 7919) % 2000, 'score': float(i % 11)}
+
+
+def matches(m, filters):
+    return all(m[key] == value for key, value in filters.items())
+
+
+print("=" * 78)
+print(f"  FILTERED SEARCH: {INDEX_TYPE} index, d={DIM}, k={K}, {QUERIES} queries per filter")
+print("=" * 78)
+print(f"  {'records':>9}  {'filter':<18}{'matching':>10}{'filtered ms':>13}{'post-filter ms':>16}{'post hits':>11}")
+
+for n in SIZES:
+    data = rng.normal(0, 1, (n, DIM)).astype('float32')
+    index = ann_index.build_index(data, INDEX_TYPE)
+    metadatas = [metadata(i) for i in range(n)]
+    meta = MetadataIndex()
+    meta.add(metadatas)
+    queries = rng.normal(0, 1, (QUERIES, DIM)).astype('float32')
+
+    for name, make in FILTERS.items():
+        filtered_ms, post_ms, post_hits, matching = [], [], 0, 0
+        for q, vector in enumerate(queries):
+            filters = make(q)
+            started = time.perf_counter()
+            rows = meta.candidates(filters)
+            search_rows(index, vector, K, rows)
+            filtered_ms.append((time.perf_counter() - started) * 1000)
+            matching += len(rows)
+
+            started = time.perf_counter()
+            _, positions = index.search(vector[None, :], K * 10)
+            kept = [p for p in positions[0] if p >= 0 and matches(metadatas[p], filters)][:K]
+            post_ms.append((time.perf_counter() - started) * 1000)
+            post_hits += len(kept) == K
+        print(f"  {n:>9,}  {name:<18}{matching // QUERIES:>10,}{np.median(filtered_ms):13.3f}"
+              f"{np.median(post_ms):16.3f}{post_hits / QUERIES:10.0%}")
+    del index, data
+print("=" * 78)
+print("  post hits = share of queries where post-filtering still found k matching records")
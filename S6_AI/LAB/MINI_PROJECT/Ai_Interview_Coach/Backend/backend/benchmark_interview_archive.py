@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Interview archive benchmark: hot-table size and user-scoped query cost before
+and after moving old sessions to the archive tier.
+
+Builds a scratch database with the real schema (interviews spread over two
+years, five answers each), times a per-user answer lookup (the shape of the
+history / report endpoints) against the hot tables, archives everything older
+than ARCHIVE_AFTER_DAYS and times the same lookup again.
+
+Usage:  python benchmark_interview_archive.py [interviews] [older_than_days]   (default 200000, 180)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid as uuid_mod
+from datetime import datetime, timedelta
+
+sys.path.insert(0, '.')
+
+INTERVIEWS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+OLDER_THAN = float(sys.argv[2]) if len(sys.argv) > 2 else 180
+USERS      = max(INTERVIEWS // 20, 1)
+PER        = 5
+LOOKUPS    = 2000
+
+tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+from app import app, db
+from interview_archive import InterviewArchiver
+
+rnd = random.Random(1)
+now = datetime.utcnow()
+
+
+def uid():
+    return str(uuid_mod.uuid4())
+
+
+def lookup_ms(conn, user_ids):
+    started = time.perf_counter()
+    for user_id in user_ids:
+        conn.exec_driver_sql(
+            "SELECT a.id, a.score FROM answers a JOIN interviews i ON i.id = a.interview_id "
+            "WHERE i.user_id = ? ORDER BY a.id DESC LIMIT 50", (user_id,)).fetchall()
+    return (time.perf_counter() - started) * 1000 / len(user_ids)
+
+
+def size_mb(conn, schema='main'):
+    pages = conn.exec_driver_sql(f"PRAGMA {schema}.page_count").scalar()
+    page_size = conn.exec_driver_sql(f"PRAGMA {schema}.page_size").scalar()
+    return pages * page_size / 1e6
+
+
+with app.app_context():
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO users (uuid, email, password_hash) VALUES " +
+                             ", ".join(f"('{uid()}', 'u{i}@x.io', 'x')" for i in range(USERS)))
+        interviews, questions, answers = [], [], []
+        for iid in range(1, INTERVIEWS + 1):
+            done = (now - timedelta(days=rnd.uniform(0, 730))).isoformat()
+            interviews.append((iid, uid(), rnd.randint(1, USERS), 'completed', done, done,
+                               round(rnd.uniform(3, 10), 2), 600, '{"skills": ["python", "sql"]}'))
+            for n in range(PER):
+                qid = (iid - 1) * PER + n + 1
+                questions.append((qid, uid(), iid, f'Question {n} for session {iid}', n + 1))
+                answers.append((qid, uid(), iid, qid, 'An answer of a few dozen words ' * 4, rnd.uniform(0, 10)))
+        conn.exec_driver_sql("INSERT INTO interviews (id, uuid, user_id, status, started_at, completed_at, "
+                             "overall_score, duration_seconds, user_profile_snapshot) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", interviews)
+        conn.exec_driver_sql("INSERT INTO questions (id, uuid, interview_id, text, question_number) "
+                             "VALUES (?, ?, ?, ?, ?)", questions)
+        conn.exec_driver_sql("INSERT INTO answers (id, uuid, interview_id, question_id, text, score) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", answers)
+        conn.exec_driver_sql("INSERT INTO feedback (uuid, user_id, answer_id, detailed_feedback) "
+                             "SELECT lower(hex(randomblob(16))), i.user_id, a.id, 'Solid structure, add detail.' "
+                             "FROM answers a JOIN interviews i ON i.id = a.interview_id")
+
+    print("=" * 70)
+    print(f"  INTERVIEW ARCHIVE: {USERS:,} users, {INTERVIEWS:,} interviews, "
+          f"{INTERVIEWS * PER:,} answers, archive after {OLDER_THAN:g} days")
+    print("=" * 70)
+
+    sample = [rnd.randint(1, USERS) for _ in range(LOOKUPS)]
+    with db.engine.connect() as conn:
+        hot_before = conn.exec_driver_sql("SELECT COUNT(*) FROM answers").scalar()
+        before_ms = lookup_ms(conn, sample)
+
+    archiver = InterviewArchiver(db.engine, older_than_days=OLDER_THAN, batch_size=2000)
+    report = archiver.run()
+
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+        hot_after = conn.exec_driver_sql("SELECT COUNT(*) FROM answers").scalar()
+        after_ms = lookup_ms(conn, sample)
+        main_mb, archive_mb = size_mb(conn), size_mb(conn, 'archive')
+
+    moved = report['archived']
+    print(f"  archived {moved['interviews']:,} interviews / {moved['answers']:,} answers "
+          f"in {report['seconds']:.2f} s ({moved['answers'] / report['seconds']:,.0f} answers/s, "
+          f"{report['batches']} batches)")
+    print(f"  hot answers        {hot_before:>10,} -> {hot_after:,}")
+    print(f"  main / archive     {main_mb:8.1f} MB / {archive_mb:.1f} MB (after VACUUM)")
+    print(f"  per-user lookup    {before_ms:8.3f} ms -> {after_ms:.3f} ms   {before_ms / after_ms:5.1f}x")
+print("=" * 70)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Question import benchmark: row-by-row ORM vs question_import.BulkImporter.
+
+The old populate_question_bank.py loop (filter_by(text=...).first() + add per
+row) is timed on a slice, because its per-row lookup scans the unindexed text
+column; the bulk importer streams the whole JSONL file, then re-imports it to
+time the all-duplicates path. Runs on a scratch database with the real schema
+(FTS triggers included).
+
+Usage:  python benchmark_question_import.py [rows] [row_by_row_rows]   (default 100000, 2000)
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+ROWS     = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+OLD_ROWS = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+from app import app, db, QuestionBank
+from question_import import BulkImporter
+
+FIELDS = ['Software Engineering', 'Data Science', 'Machine Learning', 'DevOps', 'Product Management']
+CATEGORIES = ['technical', 'behavioral', 'system_design', 'hr']
+WORDS = ('latency cache shard replica queue index schema gradient tensor pipeline rollout '
+         'incident stakeholder roadmap backlog experiment cohort retention').split()
+
+rnd = random.Random(1)
+path = os.path.join(tmp, 'questions.jsonl')
+with open(path, 'w') as fh:
+    for i in range(ROWS):
+        fh.write(json.dumps({
+            'text': f"Question {i}: how would you approach {' '.join(rnd.sample(WORDS, 4))}?",
+            'field': rnd.choice(FIELDS), 'category': rnd.choice(CATEGORIES),
+            'difficulty': rnd.choice(['easy', 'medium', 'hard']),
+            'topic_tags': rnd.sample(WORDS, 2)}) + '\n')
+size_mb = os.path.getsize(path) / 1e6
+
+print("=" * 70)
+print(f"  QUESTION IMPORT: {ROWS:,} questions ({size_mb:.1f} MB JSONL)")
+print("=" * 70)
+
+with app.app_context():
+    # Old approach: existence check + ORM add per row, one commit at the end
+    with open(path) as fh:
+        records = [json.loads(next(fh)) for _ in range(min(OLD_ROWS, ROWS))]
+    started = time.perf_counter()
+    for rec in records:
+        if QuestionBank.query.filter_by(text=rec['text']).first():
+            continue
+        db.session.add(QuestionBank(text=rec['text'], field=rec['field'], category=rec['category'],
+                                    difficulty=rec['difficulty'], topic_tags=json.dumps(rec['topic_tags'])))
+    db.session.commit()
+    old_s = time.perf_counter() - started
+    old_rate = len(records) / old_s
+    db.session.execute(db.text("DELETE FROM question_bank"))
+    db.session.commit()
+
+    importer = BulkImporter(db.engine, progress=False)
+    first = importer.import_file(path)
+    rerun = importer.import_file(path)
+
+    print(f"  row-by-row ORM ({len(records):,} rows)    {old_s:8.2f} s   {old_rate:9,.0f} rows/s")
+    print(f"  bulk import (new rows)            {first['seconds']:8.2f} s   "
+          f"{first['rows_per_second']:9,} rows/s   {first['rows_per_second'] / old_rate:6.0f}x")
+    print(f"  bulk re-import (all duplicates)   {rerun['seconds']:8.2f} s   "
+          f"{rerun['rows_per_second']:9,} rows/s")
+    print(f"\n  inserted {first['inserted']:,}, duplicates on re-run {rerun['duplicates']:,}, "
+          f"{first['batches']} batches of {importer.batch_size:,}")
+print("=" * 70)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Fallback question sampling benchmark: ORDER BY random() vs QuestionSampler.
+
+Times the Tier-1 query of _fallback_questions (field LIKE + category IN +
+ORDER BY random() LIMIT k) against in-memory O(k) draws, on a synthetic bank.
+
+Usage:  python benchmark_question_sampling.py [rows] [k]     (default 1000000, 10)
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, '.')
+
+from question_sampler import QuestionSampler
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+K    = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+RUNS = 20
+
+FIELDS = ['Software Engineering', 'Data Science', 'Machine Learning', 'DevOps',
+          'Frontend Development', 'Backend Development', 'Cloud Architecture',
+          'Mobile Development', 'Cybersecurity', 'Product Management']
+CATEGORIES = ['technical', 'behavioral', 'system_design', 'hr']
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+
+def avg_ms(fn):
+    started = time.perf_counter()
+    for _ in range(RUNS):
+        result = fn()
+    return (time.perf_counter() - started) * 1000 / RUNS, result
+
+
+print("=" * 70)
+print(f"  FALLBACK SAMPLING: {ROWS:,} questions, k={K}, avg of {RUNS} runs")
+print("=" * 70)
+
+with tempfile.TemporaryDirectory() as tmp:
+    conn = sqlite3.connect(os.path.join(tmp, 'bench.db'), check_same_thread=False)
+    conn.execute("CREATE TABLE question_bank (id INTEGER PRIMARY KEY, text TEXT, field VARCHAR(100), "
+                 "category VARCHAR(50), difficulty VARCHAR(20), times_used INTEGER DEFAULT 0)")
+    conn.execute("CREATE INDEX ix_qbank_category ON question_bank (category)")
+    rnd = random.Random(1)
+    conn.executemany(
+        "INSERT INTO question_bank (text, field, category, difficulty, times_used) VALUES (?, ?, ?, ?, ?)",
+        ((f"question {i}", rnd.choice(FIELDS), rnd.choice(CATEGORIES), rnd.choice(DIFFICULTIES),
+          rnd.choice([0, 0, 0, 1, 2, 5, 20, 100])) for i in range(ROWS)))
+    conn.commit()
+
+    def order_by_random():
+        return [r[0] for r in conn.execute(
+            "SELECT id FROM question_bank WHERE field LIKE ? AND category IN ('technical', 'system_design') "
+            "ORDER BY random() LIMIT ?", ('%software%', K * 3))]
+
+    sampler = QuestionSampler(
+        lambda: conn.execute("SELECT id, field, category, difficulty, times_used FROM question_bank"),
+        lambda: conn.execute("SELECT COUNT(*), MAX(id), SUM(times_used) FROM question_bank").fetchone())
+    started = time.perf_counter()
+    sampler.refresh()
+    build_ms = (time.perf_counter() - started) * 1000
+
+    base_ms, _ = avg_ms(order_by_random)
+    uniform = QuestionSampler(sampler.load_rows, sampler.signature, weighted=False)
+    uniform.refresh()
+    uni_ms, _ = avg_ms(lambda: uniform.sample(K, 'software', ['technical', 'system_design']))
+    w_ms, ids = avg_ms(lambda: sampler.sample(K, 'software', ['technical', 'system_design']))
+
+    print(f"  ORDER BY random() LIMIT {K * 3:<4d}       {base_ms:9.2f} ms")
+    print(f"  sampler (uniform)                {uni_ms:9.3f} ms   {base_ms / uni_ms:8.0f}x")
+    print(f"  sampler (times_used weighted)    {w_ms:9.3f} ms   {base_ms / w_ms:8.0f}x")
+    print(f"  sampler build (background refresh){build_ms:7.0f} ms")
+
+    # Weighting check: share of never-used questions among draws vs in the bank
+    usage = dict(conn.execute("SELECT id, times_used FROM question_bank"))
+    draws = Counter(usage[q] == 0 for _ in range(2000)
+                    for q in sampler.sample(K, 'software', ['technical', 'system_design']))
+    bank_share = sum(1 for u in usage.values() if u == 0) / len(usage)
+    print(f"\n  unused questions: {bank_share:.0%} of the bank, "
+          f"{draws[True] / sum(draws.values()):.0%} of weighted draws")
+    conn.close()
+print("=" * 70)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Question library search benchmark: ilike('%...%') full scans vs the FTS5 index.
+
+Builds a synthetic question_bank in a scratch SQLite file, then times the
+queries get_question_library / _fallback_questions issue, before and after
+question_search.create_index().
+
+Usage:  python benchmark_question_search.py [rows] [repeats]     (default 1000000, 5)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+
+from question_search import create_index, match_expression, QuestionSearchIndex
+
+ROWS    = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+FIELDS = ['Software Engineering', 'Data Science', 'Machine Learning', 'DevOps',
+          'Frontend Development', 'Backend Development', 'Cloud Architecture',
+          'Mobile Development', 'Cybersecurity', 'Product Management']
+CATEGORIES = ['technical', 'behavioral', 'system_design', 'hr']
+DIFFICULTIES = ['easy', 'medium', 'hard']
+TOPICS = ['python', 'java', 'kubernetes', 'docker', 'react', 'sql', 'caching', 'queues',
+          'distributed', 'consistency', 'latency', 'testing', 'security', 'graphs',
+          'recursion', 'concurrency', 'microservices', 'indexes', 'transactions', 'leadership']
+# A real bank has thousands of distinct terms; pad the 20 common topics with a
+# long tail of rarer ones so most searches are selective, like production traffic
+_SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'ze', 'po', 'qu', 'xi', 'da', 'fe']
+_rnd = random.Random(7)
+RARE_TOPICS = sorted({''.join(_rnd.choice(_SYLLABLES) for _ in range(4)) for _ in range(3000)})
+VERBS = ['Explain', 'Design', 'Describe', 'Compare', 'How would you debug', 'Walk through',
+         'What are the trade-offs of', 'Optimise', 'Implement', 'Scale']
+
+# (label, search, category, field, difficulty)
+SCENARIOS = [
+    ('search rare term',           RARE_TOPICS[100], '', '', ''),
+    ('search prefix "kube" + rare', f'kube {RARE_TOPICS[200][:4]}', '', '', ''),
+    ('search broad "distributed"', 'distributed', '', '', ''),
+    ('field + category filter',    '', 'technical', 'software', ''),
+    ('field + difficulty filter',  '', '', 'data science', 'hard'),
+    ('search + all filters',       'concurrency', 'technical', 'backend', 'medium'),
+]
+
+
+def synthetic_rows(n):
+    rnd = random.Random(42)
+    for i in range(n):
+        a = rnd.choice(TOPICS)
+        b = rnd.choice(RARE_TOPICS)
+        yield {
+            'uuid': f'bench-{i}',
+            'text': f"{rnd.choice(VERBS)} {a} and {b} in a production system #{i}",
+            'category': rnd.choice(CATEGORIES),
+            'field': rnd.choice(FIELDS),
+            'difficulty': rnd.choice(DIFFICULTIES),
+            'topic_tags': f'["{a}", "{b}"]',
+            'times_used': rnd.randint(0, 500),
+        }
+
+
+def ilike_query(conn, search, category, field, difficulty):
+    clauses, params = [], {}
+    for col, value in (('category', category), ('field', field),
+                       ('difficulty', difficulty), ('text', search)):
+        if value:
+            clauses.append(f"{col} LIKE :{col}")       # SQLite LIKE is what ilike() compiles to
+            params[col] = f'%{value}%'
+    where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    return conn.execute(text(f"SELECT id FROM question_bank {where} "
+                             f"ORDER BY times_used DESC LIMIT 50"), params).scalars().all()
+
+
+def timed(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+print("=" * 78)
+print(f"  QUESTION SEARCH: {ROWS:,} questions, best of {REPEATS}")
+print("=" * 78)
+
+with tempfile.TemporaryDirectory() as tmp:
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    with engine.begin() as conn:
+        conn.execute(text("""CREATE TABLE question_bank (
+            id INTEGER PRIMARY KEY, uuid VARCHAR(36) UNIQUE NOT NULL, text TEXT NOT NULL,
+            category VARCHAR(50), field VARCHAR(100), difficulty VARCHAR(20),
+            topic_tags TEXT, times_used INTEGER DEFAULT 0, popularity REAL DEFAULT 0)"""))
+        for col in ('category', 'field', 'difficulty'):
+            conn.execute(text(f"CREATE INDEX ix_qbank_{col} ON question_bank ({col})"))
+
+    started = time.perf_counter()
+    insert = text("INSERT INTO question_bank (uuid, text, category, field, difficulty, topic_tags, "
+                  "times_used) VALUES (:uuid, :text, :category, :field, :difficulty, :topic_tags, :times_used)")
+    rows = synthetic_rows(ROWS)
+    with engine.begin() as conn:
+        while True:
+            chunk = [r for _, r in zip(range(50_000), rows)]
+            if not chunk:
+                break
+            conn.execute(insert, chunk)
+    print(f"  Loaded rows in {time.perf_counter() - started:.1f}s")
+
+    with engine.connect() as conn:
+        baseline = {label: timed(lambda s=s, c=c, f=f, d=d: ilike_query(conn, s, c, f, d))
+                    for label, s, c, f, d in SCENARIOS}
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        create_index(conn)
+    print(f"  Built FTS5 index in {time.perf_counter() - started:.1f}s")
+
+    index = QuestionSearchIndex()
+    index.detect(engine)
+    print()
+    print(f"  {'scenario':30s} {'ilike ms':>10s} {'fts5 ms':>10s} {'speedup':>9s} {'hits':>6s}")
+    print("  " + "-" * 70)
+    with engine.connect() as conn:
+        for label, s, c, f, d in SCENARIOS:
+            match = match_expression(s, c, f, d)
+            fts_ms, ids = timed(lambda: index.search(conn, match, ranked=bool(s)))
+            base_ms, _ = baseline[label]
+            print(f"  {label:30s} {base_ms:10.1f} {fts_ms:10.1f} {base_ms / fts_ms:8.1f}x {len(ids):6d}")
+
+        match = match_expression(field='machine learning', difficulty='hard')
+        facet_ms, facets = timed(lambda: index.facets(conn, match))
+        print(f"\n  facets (field=machine learning, difficulty=hard): {facet_ms:.1f} ms "
+              f"-> {sum(facets['category'].values()):,} matches")
+    engine.dispose()
+print("=" * 78)
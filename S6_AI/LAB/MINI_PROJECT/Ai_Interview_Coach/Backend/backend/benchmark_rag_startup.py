@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+RAG startup benchmark: what importing the RAG package costs, and what the
+deferred model / index load costs when it finally happens.
+
+Each run is a fresh interpreter. It measures the time and resident memory
+(RSS) after each step:
+
+    import        import rag.rag_engine (should be milliseconds, no model)
+    load          vector_store_manager.load(): LangChain, sentence-transformers,
+                  torch, the embedding model and the FAISS index
+    first query   one embed_query() + search_similar() on the loaded model
+
+The import step also lists which heavy modules it pulled in (there should be none).
+
+Usage:  python benchmark_rag_startup.py [runs]        (default 3)
+"""
+import json
+import subprocess
+import sys
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+HEAVY = ('numpy', 'faiss', 'openai', 'torch', 'sentence_transformers', 'langchain_community')
+
+CHILD = r'''
+import json, sys, time
+sys.path.insert(0, '.')
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as fh:
+            for line in fh:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return None
+
+out = {'baseline': {'ms': 0.0, 'rss_mb': rss_mb()}}
+started = time.perf_counter()
+from rag.rag_engine import rag_engine
+from rag.vector_store import vector_store_manager
+out['import'] = {'ms': (time.perf_counter() - started) * 1000, 'rss_mb': rss_mb(),
+                 'heavy': [m for m in HEAVY if m in sys.modules]}
+
+started = time.perf_counter()
+ready = vector_store_manager.load()
+out['load'] = {'ms': (time.perf_counter() - started) * 1000, 'rss_mb': rss_mb(), 'ready': ready}
+
+if ready and vector_store_manager.embeddings is not None:
+    started = time.perf_counter()
+    vector_store_manager.search_similar('Explain the difference between a process and a thread.', top_k=3)
+    out['first query'] = {'ms': (time.perf_counter() - started) * 1000, 'rss_mb': rss_mb()}
+print(json.dumps(out))
+'''.replace('HEAVY', repr(HEAVY))
+
+
+def run_once():
+    proc = subprocess.run([sys.executable, '-c', CHILD], capture_output=True, text=True, timeout=600)
+    if proc.returncode:
+        sys.exit(f"benchmark child failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+runs = [run_once() for _ in range(RUNS)]
+steps = [step for step in runs[0] if step != 'baseline']
+
+print("=" * 64)
+print(f"  RAG STARTUP: {RUNS} fresh interpreters, median of each step")
+print("=" * 64)
+print(f"  {'step':<14}{'time ms':>12}{'RSS MB':>12}{'RSS +MB':>12}")
+previous = sorted(r['baseline']['rss_mb'] for r in runs)[RUNS // 2]
+print(f"  {'interpreter':<14}{'':>12}{previous:12.1f}{'':>12}")
+for step in steps:
+    ms = sorted(r[step]['ms'] for r in runs)[RUNS // 2]
+    rss = sorted(r[step]['rss_mb'] for r in runs)[RUNS // 2]
+    print(f"  {step:<14}{ms:12.1f}{rss:12.1f}{rss - previous:12.1f}")
+    previous = rss
+print("=" * 64)
+print(f"  modules loaded by the import: {', '.join(runs[0]['import']['heavy']) or 'none of ' + ', '.join(HEAVY)}")
+if not runs[0]['load']['ready']:
+    print("  RAG unavailable here (LangChain / model missing): load measures only the lookup")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: 50-interview analytics / full-report payload.
+
+BEFORE : every *_list() / topic_tags access runs json.loads, stdlib json encoder
+AFTER  : parse-once JSON columns (JSONColumnMixin) + app.json provider (orjson if installed)
+
+Usage:  python benchmark_serialization.py [rounds]
+"""
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, '.')
+
+from app import app, Interview, Question, Answer, Feedback, User
+
+N_INTERVIEWS = 50
+N_QUESTIONS  = 5
+
+
+def build_payload_objects():
+    user = User(id=1, email='bench@example.com',
+                skills=json.dumps(['Python', 'SQL', 'Docker', 'React', 'AWS']),
+                dream_companies=json.dumps(['Google', 'Meta']))
+    rows = []
+    now = datetime.utcnow()
+    for i in range(N_INTERVIEWS):
+        iv = Interview(id=i + 1, uuid=f'iv-{i}', user_id=1, field='Software Engineering',
+                       level='Mid', company='Google', status='completed',
+                       overall_score=7.4, technical_score=7.1, communication_score=7.9,
+                       started_at=now - timedelta(days=i), completed_at=now - timedelta(days=i),
+                       duration_seconds=900)
+        qa = []
+        for n in range(N_QUESTIONS):
+            q = Question(id=i * 10 + n, uuid=f'q-{i}-{n}', text=f'Question {n} of interview {i}',
+                         category='technical', difficulty='medium', question_number=n + 1,
+                         topic_tags=json.dumps(['arrays', 'hashing', 'complexity']),
+                         is_multiple_choice=True,
+                         options=json.dumps([f'Option {c} with a realistic amount of text' for c in 'ABCD']),
+                         correct_answers=json.dumps([1]))
+            a = Answer(id=i * 10 + n, uuid=f'a-{i}-{n}', interview_id=i + 1, question_id=q.id,
+                       text='x' * 400, selected_options=json.dumps([1]), score=8.0,
+                       technical_accuracy=8.0, depth_score=7.0, clarity_score=7.5,
+                       submitted_at=now)
+            fb = Feedback(id=i * 10 + n, uuid=f'f-{i}-{n}', score=8.0,
+                          strengths=json.dumps(['Clear structure', 'Correct complexity', 'Good example']),
+                          improvements=json.dumps(['Mention edge cases', 'Discuss trade-offs']),
+                          improvement_plan=json.dumps(['Review hashing', 'Practice', 'Time yourself']),
+                          detailed_feedback='Solid answer overall.' * 5, generated_at=now)
+            qa.append((q, a, fb))
+        rows.append((iv, qa))
+    return user, rows
+
+
+def serialize(user, rows):
+    return {
+        'user': user.to_dict(),
+        'interviews': [{
+            'interview': iv.to_dict(),
+            'qa_pairs': [{'question': q.to_dict(), 'answer': a.to_dict(), 'feedback': fb.to_dict()}
+                         for q, a, fb in qa],
+        } for iv, qa in rows],
+    }
+
+
+def all_objects(user, rows):
+    yield user
+    for iv, qa in rows:
+        for triple in qa:
+            yield from triple
+
+
+def run(rounds):
+    user, rows = build_payload_objects()
+    objs = list(all_objects(user, rows))
+
+    # BEFORE: drop memoised JSON each round (old behaviour) + stdlib encoder
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for o in objs:
+            o.__dict__.pop('_json_cache', None)
+        body_before = json.dumps(serialize(user, rows), separators=(',', ':'), sort_keys=True)
+    before = (time.perf_counter() - t0) / rounds
+
+    # AFTER: parse-once columns + configured Flask JSON provider
+    with app.app_context():
+        serialize(user, rows)  # warm
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            body_after = app.json.dumps(serialize(user, rows))
+        after = (time.perf_counter() - t0) / rounds
+
+    assert json.loads(body_before) == json.loads(body_after), 'payload mismatch'
+
+    print("=" * 70)
+    print(f"  SERIALIZATION BENCHMARK — {N_INTERVIEWS} interviews x {N_QUESTIONS} Q/A/feedback")
+    print("=" * 70)
+    print(f"  JSON provider : {type(app.json).__name__}")
+    print(f"  Payload size  : {len(body_after) / 1024:.1f} KB")
+    print(f"  Before        : {before * 1000:8.2f} ms / payload")
+    print(f"  After         : {after * 1000:8.2f} ms / payload")
+    print(f"  Speed-up      : {before / after:8.2f}x")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
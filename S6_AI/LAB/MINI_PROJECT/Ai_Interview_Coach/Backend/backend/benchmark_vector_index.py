@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Vector index benchmark: recall@k, query latency, build time and size of each
+FAISS_INDEX_TYPE (rag/ann_index.py) on synthetic embedding-like data.
+
+Vectors are drawn around a few thousand cluster centres in 384 dimensions
+(all-MiniLM-L6-v2's size) and normalised, so neighbourhoods look like those of
+sentence embeddings rather than uniform noise. Recall is measured against an
+exact flat search. Queries are timed one at a time, as the RAG engine issues them.
+
+Usage:  python benchmark_vector_index.py [sizes] [types]   (default 10000,100000,1000000 and all types)
+        python benchmark_vector_index.py 10000,100000 flat,hnsw,ivf
+"""
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+import faiss
+import numpy as np
+
+from rag import ann_index
+
+SIZES   = [int(n) for n in sys.argv[1].split(',')] if len(sys.argv) > 1 else [10_000, 100_000, 1_000_000]
+TYPES   = sys.argv[2].split(',') if len(sys.argv) > 2 else list(ann_index.INDEX_TYPES)
+DIM     = 384
+K       = 10
+QUERIES = 500
+rng = np.random.default_rng(7)
+
+
+def synthetic(n, centres):
+    """n unit vectors scattered around random cluster centres."""
+    out = np.empty((n, DIM), dtype='float32')
+    for start in range(0, n, 100_000):
+        stop = min(n, start + 100_000)
+        picks = centres[rng.integers(0, len(centres), stop - start)]
+        out[start:stop] = picks + rng.normal(0, 0.35, (stop - start, DIM)).astype('float32')
+    faiss.normalize_L2(out)
+    return out
+
+
+def query_latencies(index, queries):
+    times, found = [], []
+    for q in queries:
+        started = time.perf_counter()
+        _, ids = index.search(q[None, :], K)
+        times.append((time.perf_counter() - started) * 1000)
+        found.append(ids[0])
+    return np.array(times), np.array(found)
+
+
+def recall(found, truth):
+    return np.mean([len(set(f) & set(t)) / K for f, t in zip(found, truth)])
+
+
+print("=" * 86)
+print(f"  VECTOR INDEX: d={DIM}, recall@{K} over {QUERIES} queries, faiss {faiss.__version__}, "
+      f"{faiss.omp_get_max_threads()} threads")
+print("=" * 86)
+
+for n in SIZES:
+    centres = rng.normal(0, 1, (max(n // 200, 50), DIM)).astype('float32')
+    data = synthetic(n, centres)
+    queries = synthetic(QUERIES, centres)
+    exact = faiss.IndexFlatL2(DIM)
+    exact.add(data)
+    _, truth = exact.search(queries, K)
+
+    print(f"\n  {n:,} vectors ({data.nbytes / 1e6:,.0f} MB raw)")
+    print(f"  {'type':<8}{'spec':<20}{'build s':>9}{'size MB':>10}{'recall':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for index_type in TYPES:
+        started = time.perf_counter()
+        index = ann_index.build_index(data, index_type)
+        build_s = time.perf_counter() - started
+        size_mb = len(faiss.serialize_index(index)) / 1e6
+        times, found = query_latencies(index, queries)
+        spec = ann_index.factory_spec(index_type, n, DIM)
+        print(f"  {index_type:<8}{spec:<20}{build_s:9.2f}{size_mb:10.1f}{recall(found, truth):9.3f}"
+              f"{np.percentile(times, 50):9.3f}{np.percentile(times, 95):9.3f}")
+        del index
+print("=" * 86)
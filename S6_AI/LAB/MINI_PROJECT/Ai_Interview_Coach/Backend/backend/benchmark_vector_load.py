@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Vector store load benchmark: what a worker pays to open the interview index,
+LangChain's pickled format against faiss_store.MappedFAISS (mmap'd
+index.faiss + docstore.sqlite).
+
+Each store size is written once in both formats; every load runs in a fresh
+interpreter and reports the load time, the first search, RSS and the private
+(unshareable) memory once loaded. Mapped index pages are file-backed and
+clean, so every worker on the host shares them; the pickled store is private
+heap in each worker.
+
+Without langchain_community installed the pickled format is reproduced with
+the same layout (faiss.write_index + a pickled {id: Document} dict).
+
+Usage:  python benchmark_vector_load.py [records ...] [--dim D]     (default 10000 100000, 384)
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from rag import ann_index
+from rag.faiss_store import Document, MappedFAISS
+
+parser = argparse.ArgumentParser()
+parser.add_argument('records', nargs='*', type=int, default=[10000, 100000])
+parser.add_argument('--dim', type=int, default=384)
+args = parser.parse_args()
+DIM, SIZES = args.dim, args.records
+
+CHILD = r'''
+import json, os, pickle, sys, time
+sys.path.insert(0, '.')
+import numpy as np
+from rag import ann_index
+ann_index.load_faiss()
+
+def memory():
+    out = {}
+    with open('/proc/self/status') as fh:
+        for line in fh:
+            if line.startswith('VmRSS:'):
+                out['rss_mb'] = int(line.split()[1]) / 1024
+    with open('/proc/self/smaps_rollup') as fh:
+        out['private_mb'] = sum(int(line.split()[1]) for line in fh if line.startswith('Anonymous:')) / 1024
+    return out
+
+fmt, path, dim = sys.argv[1], sys.argv[2], int(sys.argv[3])
+query = np.random.default_rng(1).normal(0, 1, dim).astype('float32')
+before = memory()
+started = time.perf_counter()
+if fmt == 'mapped':
+    from rag.faiss_store import MappedFAISS
+    search = MappedFAISS.load_local(path).similarity_search_by_vector
+else:
+    try:
+        from langchain_community.vectorstores import FAISS
+        search = FAISS.load_local(path, embeddings=None, allow_dangerous_deserialization=True) \
+            .similarity_search_by_vector
+    except ImportError:
+        index = ann_index.faiss.read_index(os.path.join(path, 'index.faiss'))
+        with open(os.path.join(path, 'index.pkl'), 'rb') as fh:
+            docs, ids = pickle.load(fh)
+        search = lambda vector, k: [docs[ids[int(r)]] for r in index.search(np.asarray([vector], 'float32'), k)[1][0]]
+load_ms = (time.perf_counter() - started) * 1000
+started = time.perf_counter()
+search(query.tolist(), k=3)
+search_ms = (time.perf_counter() - started) * 1000
+after = memory()
+print(json.dumps({'load_ms': load_ms, 'search_ms': search_ms, 'rss_mb': after['rss_mb'] - before['rss_mb'],
+                  'private_mb': after['private_mb'] - before['private_mb']}))
+'''
+
+
+def write_stores(n, root):
+    ann_index.load_faiss()
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(0, 1, (n, DIM)).astype('float32')
+    texts = [f"Question: sample {i}\nAnswer: " + "a reasonable answer " * 20 for i in range(n)]
+    metadatas = [{'type': 'interview_qa', 'question_id': i % 500, 'score': float(i % 11)} for i in range(n)]
+
+    mapped = os.path.join(root, 'mapped')
+    store = MappedFAISS.from_embeddings(zip(texts, vectors), None, metadatas=metadatas)
+    store.save_local(mapped)
+
+    pickled = os.path.join(root, 'pickled')
+    try:
+        from langchain_community.vectorstores import FAISS
+        FAISS.from_embeddings(list(zip(texts, vectors.tolist())), embedding=None, metadatas=metadatas) \
+            .save_local(pickled)
+    except ImportError:
+        os.makedirs(pickled)
+        ann_index.faiss.write_index(store.index, os.path.join(pickled, 'index.faiss'))
+        with open(os.path.join(pickled, 'index.pkl'), 'wb') as fh:
+            pickle.dump(({str(i): Document(t, m) for i, (t, m) in enumerate(zip(texts, metadatas))},
+                         {i: str(i) for i in range(n)}), fh)
+    return {'langchain': pickled, 'mapped': mapped}
+
+
+rows = []
+for n in SIZES:
+    root = tempfile.mkdtemp()
+    try:
+        for fmt, path in write_stores(n, root).items():
+            proc = subprocess.run([sys.executable, '-c', CHILD, fmt, path, str(DIM)],
+                                  capture_output=True, text=True, timeout=600)
+            if proc.returncode:
+                print(proc.stderr.strip().splitlines()[-1])
+                continue
+            rows.append((n, fmt, json.loads(proc.stdout.strip().splitlines()[-1])))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+print("=" * 72)
+print(f"  VECTOR STORE LOAD: dim {DIM}, fresh interpreter per load")
+print("=" * 72)
+print(f"  {'records':>9}  {'format':<10}{'load ms':>10}{'1st search':>12}{'RSS MB':>9}{'private MB':>12}")
+for n, fmt, row in rows:
+    print(f"  {n:>9,}  {fmt:<10}{row['load_ms']:10.1f}{row['search_ms']:12.1f}{row['rss_mb']:9.1f}"
+          f"{row['private_mb']:12.1f}")
+print("=" * 72)
+print("  private MB = anonymous memory after the first search: what each extra worker costs")
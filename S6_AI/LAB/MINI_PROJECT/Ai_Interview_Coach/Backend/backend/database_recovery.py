@@ -6,313 +6,397 @@
 
 This script performs a comprehensive database audit and recovery:
 1. Validates referential integrity (no orphaned records)
-2. Recalculates all user aggregate statistics
-3. Fixes missing or corrupted data
-4. Recovers session data
-5. Generates a detailed report
+2. Verifies completed interviews have scores
+3. Recalculates all user aggregate statistics
+4. Generates a detailed JSON report
+
+Every step is a handful of set-based statements, not a loop per user or per
+interview, so the cost grows with table size rather than with round trips:
+
+    integrity checks : independent read-only COUNT / NOT EXISTS queries, run
+                       concurrently on separate connections (WAL readers do
+                       not block each other; sqlite3 releases the GIL)
+    user stats       : one aggregate over interviews + answers into a temp
+                       table, one diff query against users, one UPDATE ... FROM
+                       for the rows that actually changed (SQLite >= 3.33 or
+                       PostgreSQL)
 
 Usage:
-    python database_recovery.py
+    python database_recovery.py                        # DATABASE_URL or interview_coach.db
+    python database_recovery.py --dry-run              # report the diff, write nothing
+    python database_recovery.py --db other.db --report out.json --workers 8
 """
 
-import sqlite3
 import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+from db_config import engine_options, is_sqlite_url, resolve_database_url
+
+SAMPLE_LIMIT = 10          # ids / diffs kept per finding in the report
+
+# name -> (description, table, foreign key, parent table); orphans are rows whose
+# non-NULL foreign key has no parent
+ORPHAN_CHECKS = {
+    'interviews_without_users':     ('interviews with missing users',     'interviews', 'user_id',      'users'),
+    'questions_without_interviews': ('questions with missing interviews', 'questions',  'interview_id', 'interviews'),
+    'answers_without_interviews':   ('answers with missing interviews',   'answers',    'interview_id', 'interviews'),
+    'answers_without_questions':    ('answers with missing questions',    'answers',    'question_id',  'questions'),
+    'feedback_without_users':       ('feedback with missing users',       'feedback',   'user_id',      'users'),
+    'feedback_without_answers':     ('feedback with missing answers',     'feedback',   'answer_id',    'answers'),
+}
+
+# name -> (description, SQL with a {sel} slot)
+ROW_CHECKS = {
+    'completed_interviews_without_scores': (
+        'completed interviews missing overall_score',
+        "SELECT {sel} FROM interviews t WHERE t.status = 'completed' AND t.overall_score IS NULL"),
+}
+
+
+def _orphan_sql(dialect, table, fk, parent):
+    # SQLite turns NOT IN (SELECT pk) into one rowid probe per row; PostgreSQL
+    # plans NOT EXISTS as a hash anti-join
+    if dialect == 'sqlite':
+        return f"SELECT {{sel}} FROM {table} t WHERE t.{fk} IS NOT NULL AND t.{fk} NOT IN (SELECT id FROM {parent})"
+    return (f"SELECT {{sel}} FROM {table} t WHERE t.{fk} IS NOT NULL "
+            f"AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE p.id = t.{fk})")
+
+
+def integrity_checks(dialect):
+    """name -> (description, SQL with a {sel} slot), in report order."""
+    checks = {name: (description, _orphan_sql(dialect, table, fk, parent))
+              for name, (description, table, fk, parent) in ORPHAN_CHECKS.items()}
+    checks.update(ROW_CHECKS)
+    return checks
+
+
+STAT_COLUMNS = ('total_interviews', 'average_score', 'best_score', 'total_practice_time',
+                'total_questions_answered', 'last_activity_date')
+
+
+def _answered_sql(archived):
+    """Answers per user over completed interviews; archived sessions carry their own count."""
+    counts = "(SELECT interview_id, COUNT(*) AS n FROM answers GROUP BY interview_id)"
+    if not archived:
+        return f"""SELECT i.user_id, SUM(c.n) AS answered
+                   FROM {counts} c
+                   JOIN interviews i ON i.id = c.interview_id
+                   WHERE i.status = 'completed' GROUP BY i.user_id"""
+    return f"""SELECT i.user_id,
+                          SUM(CASE WHEN i.archived_at IS NULL THEN COALESCE(c.n, 0)
+                                   ELSE COALESCE(i.answer_count, 0) END) AS answered
+                   FROM interviews i
+                   LEFT JOIN {counts} c ON c.interview_id = i.id
+                   WHERE i.status = 'completed' GROUP BY i.user_id"""
+
+
+def _user_stats_sql(dialect, archived=False):
+    """Recomputed stats for every user (same rules as app.recalculate_user_stats)."""
+    as_date = "date(iv.last_completed)" if dialect == 'sqlite' else "CAST(iv.last_completed AS DATE)"
+    completed = "CASE WHEN status = 'completed' THEN {} END"
+    return f"""
+        SELECT u.id AS user_id,
+               COALESCE(iv.n, 0)                                        AS total_interviews,
+               COALESCE(ROUND(CAST(iv.avg_score AS NUMERIC), 2), 0.0)   AS average_score,
+               COALESCE(ROUND(CAST(iv.best_score AS NUMERIC), 2), 0.0)  AS best_score,
+               COALESCE(iv.duration, 0)                                 AS total_practice_time,
+               COALESCE(an.answered, 0)                                 AS total_questions_answered,
+               COALESCE({as_date}, u.last_activity_date)                AS last_activity_date
+        FROM users u
+        LEFT JOIN (SELECT user_id,
+                          COUNT({completed.format('1')})                          AS n,
+                          AVG({completed.format('overall_score')})               AS avg_score,
+                          MAX({completed.format('overall_score')})               AS best_score,
+                          SUM({completed.format('COALESCE(duration_seconds, 0)')}) AS duration,
+                          MAX(completed_at)                                      AS last_completed
+                   FROM interviews GROUP BY user_id) iv
+               ON iv.user_id = u.id
+        LEFT JOIN ({_answered_sql(archived)}) an
+               ON an.user_id = u.id"""
+
+
+def _changed(dialect, left, right):
+    """NULL-safe 'differs' predicate across all stat columns."""
+    op = 'IS NOT' if dialect == 'sqlite' else 'IS DISTINCT FROM'
+    return ' OR '.join(f"{left}.{c} {op} {right}.{c}" for c in STAT_COLUMNS)
+
 
 class DatabaseRecovery:
-    def __init__(self, db_path='interview_coach.db'):
-        self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+    def __init__(self, db_path=None, dry_run=False, workers=4, report_path='database_recovery_report.json',
+                 verbose=True):
+        basedir = os.path.dirname(os.path.abspath(__file__))
+        if db_path and '://' not in db_path:
+            db_path = f'sqlite:///{os.path.abspath(db_path)}'
+        self.url = db_path or resolve_database_url(basedir)
+        self.dry_run = dry_run
+        self.workers = workers
+        self.report_path = report_path
+        self.verbose = verbose
+        self.engine = None
+        self.dialect = None
+        self.archived = False      # interviews carry archive-tier summaries (interview_archive.py)
+        self._started = None
         self.report = {
             'timestamp': datetime.now().isoformat(),
-            'database': db_path,
+            'database': self.url,
+            'dry_run': dry_run,
             'checks': [],
             'fixes': [],
+            'diffs': [],
             'warnings': [],
-            'errors': []
+            'errors': [],
+            'timings_ms': {},
         }
-    
+
+    def log(self, message):
+        if self.verbose:
+            elapsed = time.perf_counter() - self._started if self._started else 0.0
+            print(f"[{elapsed:7.2f}s] {message}", flush=True)
+
     def connect(self):
-        """Connect to database"""
-        if not Path(self.db_path).exists():
-            print(f"❌ Database not found: {self.db_path}")
-            return False
-        
+        """Create the engine and check the core tables exist"""
+        if is_sqlite_url(self.url):
+            path = self.url[len('sqlite:///'):]
+            if not os.path.exists(path):
+                print(f"❌ Database not found: {path}")
+                return False
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.cursor = self.conn.cursor()
-            print(f"✅ Connected to database: {self.db_path}")
+            self.engine = create_engine(self.url, **engine_options(self.url))
+            self.dialect = self.engine.dialect.name
+            self.report['database'] = self.engine.url.render_as_string(hide_password=True)
+            inspector = inspect(self.engine)
+            missing = {'users', 'interviews', 'questions', 'answers', 'feedback'} \
+                - set(inspector.get_table_names())
+            if missing:
+                print(f"❌ Missing tables: {', '.join(sorted(missing))}")
+                return False
+            self.archived = 'archived_at' in {c['name'] for c in inspector.get_columns('interviews')}
+            print(f"✅ Connected to database: {self.engine.url.render_as_string(hide_password=True)}")
             return True
         except Exception as e:
             print(f"❌ Connection failed: {e}")
             return False
-    
+
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
-    
-    def execute_query(self, query, params=None):
-        """Execute query safely"""
-        try:
-            if params:
-                self.cursor.execute(query, params)
+        """Dispose of the connection pool"""
+        if self.engine:
+            self.engine.dispose()
+
+    def _timed(self, name, started):
+        self.report['timings_ms'][name] = round((time.perf_counter() - started) * 1000, 1)
+
+    # ── Read-only checks ──────────────────────────────────────────────────────
+
+    def _run_check(self, name):
+        description, sql = integrity_checks(self.dialect)[name]
+        started = time.perf_counter()
+        with self.engine.connect() as conn:
+            if self.dialect == 'sqlite':
+                conn.exec_driver_sql("PRAGMA query_only = ON")
             else:
-                self.cursor.execute(query)
-            return self.cursor.fetchall()
-        except Exception as e:
-            self.report['errors'].append(f"Query execution error: {e}")
-            return None
-    
-    def check_table_exists(self, table_name):
-        """Check if table exists"""
-        result = self.execute_query(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (table_name,)
-        )
-        return result is not None and len(result) > 0
-    
+                conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+            try:
+                found = conn.execute(text(sql.format(sel='COUNT(*)'))).scalar()
+                sample = conn.execute(text(sql.format(sel='t.id') + f" LIMIT {SAMPLE_LIMIT}")) \
+                             .scalars().all() if found else []
+            finally:
+                if self.dialect == 'sqlite':
+                    conn.exec_driver_sql("PRAGMA query_only = OFF")
+                conn.rollback()
+        return {'name': name, 'description': description, 'found': found, 'sample_ids': sample,
+                'ms': round((time.perf_counter() - started) * 1000, 1)}
+
     def check_referential_integrity(self):
-        """Check for orphaned records"""
+        """Run every integrity check concurrently on its own read-only connection"""
         print("\n🔍 Checking Referential Integrity...")
-        
-        checks = {
-            'interviews_without_users': (
-                "SELECT COUNT(*) FROM interviews WHERE user_id NOT IN (SELECT id FROM users)",
-                'interviews with missing users'
-            ),
-            'answers_without_interviews': (
-                "SELECT COUNT(*) FROM answers WHERE interview_id NOT IN (SELECT id FROM interviews)",
-                'answers with missing interviews'
-            ),
-            'answers_without_questions': (
-                "SELECT COUNT(*) FROM answers WHERE question_id NOT IN (SELECT id FROM questions)",
-                'answers with missing questions'
-            ),
-            'feedback_without_users': (
-                "SELECT COUNT(*) FROM feedback WHERE user_id NOT IN (SELECT id FROM users)",
-                'feedback with missing users'
-            ),
-            'feedback_without_answers': (
-                "SELECT COUNT(*) FROM feedback WHERE answer_id NOT IN (SELECT id FROM answers)",
-                'feedback with missing answers'
-            ),
-        }
-        
-        for check_name, (query, description) in checks.items():
-            result = self.execute_query(query)
-            if result:
-                count = result[0][0]
-                check = {
-                    'name': check_name,
-                    'query': query,
-                    'found': count,
-                    'description': description
-                }
+        started = time.perf_counter()
+        names = list(integrity_checks(self.dialect))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='recovery-check') as pool:
+            futures = {pool.submit(self._run_check, name): name for name in names}
+            for done, future in enumerate(as_completed(futures), 1):
+                name = futures[future]
+                try:
+                    check = future.result()
+                except Exception as e:
+                    self.report['errors'].append(f"{name}: {str(e)[:200]}")
+                    self.log(f"[{done}/{len(names)}] ❌ {name}: {str(e)[:80]}")
+                    continue
                 self.report['checks'].append(check)
-                
-                if count > 0:
-                    print(f"   ⚠️  {count} {description}")
-                    self.report['warnings'].append(f"{check_name}: {count} issues found")
+                if check['found']:
+                    self.report['warnings'].append(f"{name}: {check['found']} issues found")
+                    self.log(f"[{done}/{len(names)}] ⚠️  {check['found']} {check['description']} ({check['ms']} ms)")
                 else:
-                    print(f"   ✅ No orphaned {description}")
-    
+                    self.log(f"[{done}/{len(names)}] ✅ No {check['description']} ({check['ms']} ms)")
+        self.report['checks'].sort(key=lambda c: names.index(c['name']))
+        self._timed('integrity_checks', started)
+
+    def verify_completed_interviews(self):
+        """Verify all completed interviews have valid scores (runs with the integrity checks)"""
+        check = next((c for c in self.report['checks']
+                      if c['name'] == 'completed_interviews_without_scores'), None)
+        if check is None:
+            check = self._run_check('completed_interviews_without_scores')
+            self.report['checks'].append(check)
+        if check['found']:
+            # These should ideally be recalculated from answers
+            print(f"\n✓ {check['found']} completed interviews missing overall_score")
+        return True
+
+    # ── Set-based stat recalculation ──────────────────────────────────────────
+
     def recalculate_user_stats(self):
-        """Recalculate all user statistics"""
-        print("\n📊 Recalculating User Statistics...")
-        
+        """Recalculate all user statistics with one diff query and one UPDATE ... FROM"""
+        print(f"\n📊 Recalculating User Statistics{' (dry run)' if self.dry_run else ''}...")
+        started = time.perf_counter()
+        cols = ', '.join(f'u.{c} AS old_{c}, s.{c} AS new_{c}' for c in STAT_COLUMNS)
+        diff_from = (f"FROM users u JOIN recovery_user_stats s ON s.user_id = u.id "
+                     f"WHERE {_changed(self.dialect, 'u', 's')}")
         try:
-            # Get all users
-            users = self.execute_query("SELECT id, email FROM users")
-            
-            if not users:
-                print("   ℹ️  No users found")
-                return True
-            
-            fixed_count = 0
-            
-            for user_id, email in users:
-                try:
-                    # Get completed interviews
-                    interviews = self.execute_query(
-                        """SELECT id, overall_score, duration_seconds, completed_at 
-                           FROM interviews 
-                           WHERE user_id = ? AND status = 'completed'""",
-                        (user_id,)
-                    )
-                    
-                    total_interviews = len(interviews) if interviews else 0
-                    
-                    # Calculate stats
-                    scores = []
-                    total_duration = 0
-                    latest_date = None
-                    
-                    if interviews:
-                        for interview_id, score, duration, completed_at in interviews:
-                            if score is not None:
-                                scores.append(score)
-                            total_duration += duration or 0
-                            if completed_at and (not latest_date or completed_at > latest_date):
-                                latest_date = completed_at
-                    
-                    average_score = round(sum(scores) / len(scores), 2) if scores else 0.0
-                    best_score = round(max(scores), 2) if scores else 0.0
-                    
-                    # Count total questions answered
-                    total_questions = 0
-                    if interviews:
-                        for interview_id, _, _, _ in interviews:
-                            q_result = self.execute_query(
-                                "SELECT COUNT(*) FROM answers WHERE interview_id = ?",
-                                (interview_id,)
-                            )
-                            if q_result:
-                                total_questions += q_result[0][0]
-                    
-                    # Update user stats
-                    update_query = """
-                        UPDATE users 
-                        SET total_interviews = ?,
-                            average_score = ?,
-                            best_score = ?,
-                            total_practice_time = ?,
-                            total_questions_answered = ?,
-                            last_activity_date = ?
-                        WHERE id = ?
-                    """
-                    
-                    self.cursor.execute(update_query, (
-                        total_interviews,
-                        average_score,
-                        best_score,
-                        total_duration,
-                        total_questions,
-                        latest_date,
-                        user_id
-                    ))
-                    
-                    fixed_count += 1
-                    print(f"   ✅ {email:35} | interviews={total_interviews:2} | avg={average_score:.2f} | best={best_score:.2f} | Q={total_questions}")
-                    
-                except Exception as e:
-                    self.report['errors'].append(f"Error processing user {user_id}: {e}")
-                    print(f"   ❌ {email:35} | Error: {e}")
-            
-            self.conn.commit()
-            
+            with self.engine.begin() as conn:
+                conn.execute(text("DROP TABLE IF EXISTS recovery_user_stats"))
+                conn.execute(text(f"CREATE TEMP TABLE recovery_user_stats AS {_user_stats_sql(self.dialect, self.archived)}"))
+                total_users = conn.execute(text("SELECT COUNT(*) FROM recovery_user_stats")).scalar()
+                self.log(f"Aggregated stats for {total_users:,} users")
+                changed = conn.execute(text(f"SELECT COUNT(*) {diff_from}")).scalar()
+                self.log(f"{changed:,} of {total_users:,} users have stale stats")
+                sample = conn.execute(text(
+                    f"SELECT u.id, u.email, {cols} {diff_from} ORDER BY u.id LIMIT {SAMPLE_LIMIT}")).mappings().all()
+                self.report['diffs'] = [self._diff_row(row) for row in sample]
+
+                updated = 0
+                if changed and not self.dry_run:
+                    assignments = ', '.join(f'{c} = s.{c}' for c in STAT_COLUMNS)
+                    updated = conn.execute(text(
+                        f"UPDATE users SET {assignments} FROM recovery_user_stats s "
+                        f"WHERE s.user_id = users.id AND ({_changed(self.dialect, 'users', 's')})")).rowcount
+                    self.log(f"Updated {updated:,} users in one statement")
+                conn.execute(text("DROP TABLE recovery_user_stats"))
+
             self.report['fixes'].append({
                 'action': 'recalculate_user_stats',
-                'users_fixed': fixed_count,
-                'total_users': len(users)
+                'users_fixed': updated,
+                'users_stale': changed,
+                'total_users': total_users,
+                'applied': not self.dry_run,
             })
-            
-            print(f"\n   📈 Fixed stats for {fixed_count}/{len(users)} users")
+            print(f"\n   📈 {'Would fix' if self.dry_run else 'Fixed'} stats for "
+                  f"{changed if self.dry_run else updated}/{total_users} users")
             return True
-            
         except Exception as e:
             self.report['errors'].append(f"Failed to recalculate user stats: {e}")
             print(f"   ❌ Error: {e}")
             return False
-    
-    def verify_completed_interviews(self):
-        """Verify all completed interviews have valid scores"""
-        print("\n✓ Verifying Completed Interviews...")
-        
-        try:
-            # Find completed interviews without scores
-            result = self.execute_query("""
-                SELECT COUNT(*) FROM interviews 
-                WHERE status = 'completed' AND overall_score IS NULL
-            """)
-            
-            missing_scores = result[0][0] if result else 0
-            
-            if missing_scores > 0:
-                print(f"   ⚠️  {missing_scores} completed interviews missing overall_score")
-                self.report['warnings'].append(f"Completed interviews without scores: {missing_scores}")
-                # Note: These should ideally be recalculated from answers
-            else:
-                print(f"   ✅ All completed interviews have scores")
-            
-            return True
-            
-        except Exception as e:
-            self.report['errors'].append(f"Failed to verify interviews: {e}")
-            return False
-    
+        finally:
+            self._timed('recalculate_user_stats', started)
+
+    @staticmethod
+    def _diff_row(row):
+        changes = {}
+        for c in STAT_COLUMNS:
+            old, new = row[f'old_{c}'], row[f'new_{c}']
+            if old != new:
+                changes[c] = {'old': old, 'new': new}
+        return {'user_id': row['id'], 'email': row['email'], 'changes': changes}
+
+    # ── Report ────────────────────────────────────────────────────────────────
+
     def generate_summary(self):
         """Generate and display recovery summary"""
         print("\n" + "="*80)
         print("📋 DATABASE RECOVERY SUMMARY")
         print("="*80)
-        
+
         print(f"\n📅 Timestamp: {self.report['timestamp']}")
-        print(f"📦 Database: {self.report['database']}")
-        
+        print(f"📦 Database: {self.engine.url.render_as_string(hide_password=True)}")
+        if self.dry_run:
+            print("🧪 Dry run: no changes written")
+
         print(f"\n✅ Checks Performed: {len(self.report['checks'])}")
         for check in self.report['checks']:
             status = "✅" if check['found'] == 0 else "⚠️ "
             print(f"   {status} {check['name']}: {check['found']} issues")
-        
-        print(f"\n🔧 Fixes Applied: {len(self.report['fixes'])}")
+
+        print(f"\n🔧 Fixes {'Planned' if self.dry_run else 'Applied'}: {len(self.report['fixes'])}")
         for fix in self.report['fixes']:
-            print(f"   ✅ {fix['action']}: {list(fix.values())[1:]}")
-        
+            details = ', '.join(f"{k}={v}" for k, v in fix.items() if k != 'action')
+            print(f"   ✅ {fix['action']}: {details}")
+        for diff in self.report['diffs'][:5]:
+            changes = ', '.join(f"{c} {v['old']} → {v['new']}" for c, v in diff['changes'].items())
+            print(f"      {diff['email']:35} | {changes}")
+
         if self.report['warnings']:
             print(f"\n⚠️  Warnings: {len(self.report['warnings'])}")
             for warning in self.report['warnings']:
                 print(f"   ⚠️  {warning}")
-        
+
         if self.report['errors']:
             print(f"\n❌ Errors: {len(self.report['errors'])}")
             for error in self.report['errors']:
                 print(f"   ❌ {error}")
-        
+
+        print(f"\n⏱️  Timings (ms): {self.report['timings_ms']}")
         print("\n" + "="*80)
-        
-        # Save report
-        report_file = 'database_recovery_report.json'
-        with open(report_file, 'w') as f:
-            json.dump(self.report, f, indent=2, default=str)
-        
-        print(f"📄 Report saved to: {report_file}")
-    
+
+        if self.report_path:
+            with open(self.report_path, 'w') as f:
+                json.dump(self.report, f, indent=2, default=str)
+            print(f"📄 Report saved to: {self.report_path}")
+
     def run_full_recovery(self):
         """Run complete recovery process"""
         print("\n╔════════════════════════════════════════════════════════╗")
         print("║         STARTING DATABASE RECOVERY PROCESS             ║")
         print("╚════════════════════════════════════════════════════════╝")
-        
+
         if not self.connect():
             return False
-        
+
+        self._started = time.perf_counter()
         try:
             self.check_referential_integrity()
             self.verify_completed_interviews()
-            self.recalculate_user_stats()
+            ok = self.recalculate_user_stats()
+            self._timed('total', self._started)
             self.generate_summary()
-            
-            print("\n✅ DATABASE RECOVERY COMPLETED SUCCESSFULLY\n")
-            return True
-            
+
+            if ok and not self.report['errors']:
+                print(f"\n✅ DATABASE RECOVERY {'DRY RUN ' if self.dry_run else ''}COMPLETED SUCCESSFULLY\n")
+                return True
+            print("\n⚠️  DATABASE RECOVERY FINISHED WITH ERRORS\n")
+            return False
+
         except Exception as e:
             print(f"\n❌ Recovery failed: {e}")
             return False
-        
+
         finally:
             self.close()
 
 
-def main():
+def main(argv=None):
     """Main entry point"""
-    recovery = DatabaseRecovery()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Audit and repair interview coach data.')
+    parser.add_argument('--db', help='SQLite file or database URL (default: DATABASE_URL / interview_coach.db)')
+    parser.add_argument('--dry-run', action='store_true', help='report stale stats without writing')
+    parser.add_argument('--report', default='database_recovery_report.json', help='JSON report path')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent integrity checks')
+    parser.add_argument('--quiet', action='store_true', help='no per-step progress lines')
+    args = parser.parse_args(argv)
+
+    recovery = DatabaseRecovery(args.db, dry_run=args.dry_run, workers=args.workers,
+                                report_path=args.report, verbose=not args.quiet)
     success = recovery.run_full_recovery()
-    
+
     return 0 if success else 1
 
 
 if __name__ == '__main__':
-    exit(main())
+    sys.exit(main())
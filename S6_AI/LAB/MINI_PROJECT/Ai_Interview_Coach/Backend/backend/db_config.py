@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Database Configuration
+Resolves the SQLAlchemy URL and engine options from the environment so the
+same code runs on the bundled SQLite file or a pooled PostgreSQL server.
+
+    DATABASE_URL       sqlite:///interview_coach.db (default) | postgresql://user:pw@host/db
+    DB_POOL_SIZE       persistent connections per worker (PostgreSQL)   (10)
+    DB_MAX_OVERFLOW    extra connections allowed under burst load        (20)
+    DB_POOL_RECYCLE    seconds before a connection is replaced           (1800)
+    DB_POOL_TIMEOUT    seconds to wait for a free pooled connection      (30)
+"""
+
+import os
+
+DEFAULT_SQLITE_FILE = 'interview_coach.db'
+
+
+def resolve_database_url(basedir):
+    """Return the database URL. Relative SQLite paths are anchored at basedir (next to app.py)."""
+    url = (os.environ.get('DATABASE_URL') or '').strip()
+    if not url:
+        return f'sqlite:///{os.path.join(basedir, DEFAULT_SQLITE_FILE)}'
+    if url.startswith('postgres://'):           # Heroku-style scheme SQLAlchemy no longer accepts
+        url = 'postgresql://' + url[len('postgres://'):]
+    if url.startswith('sqlite:///') and not url.startswith('sqlite:////'):
+        path = url[len('sqlite:///'):]
+        if path and path != ':memory:' and not os.path.isabs(path):
+            url = f'sqlite:///{os.path.join(basedir, path)}'
+    return url
+
+
+def is_sqlite_url(url):
+    return url.startswith('sqlite')
+
+
+def engine_options(url):
+    """SQLAlchemy engine options for the given URL."""
+    if is_sqlite_url(url):
+        return {
+            'connect_args': {'check_same_thread': False},
+            'pool_pre_ping': True,
+        }
+    return {
+        'pool_size':     int(os.environ.get('DB_POOL_SIZE', '10')),
+        'max_overflow':  int(os.environ.get('DB_MAX_OVERFLOW', '20')),
+        'pool_recycle':  int(os.environ.get('DB_POOL_RECYCLE', '1800')),
+        'pool_timeout':  int(os.environ.get('DB_POOL_TIMEOUT', '30')),
+        'pool_pre_ping': True,
+    }
+
+
+def column_type(dialect_name, sqlite_type):
+    """Map the SQLite type names used by the schema fixer to the active dialect."""
+    if dialect_name == 'postgresql':
+        return {
+            'DATETIME': 'TIMESTAMP',
+            'REAL':     'DOUBLE PRECISION',
+        }.get(sqlite_type, sqlite_type)
+    return sqlite_type
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Group-Commit Writer
+A single background thread drains a queue of write jobs and hands them to
+an apply function in batches, so N background results cost one transaction
+(one fsync) instead of N.
+
+A batch is flushed when either trigger fires:
+    - size : max_batch items are waiting
+    - time : max_delay seconds have passed since the first item of the batch
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """Queue + single writer thread. apply_batch(items) must commit atomically."""
+
+    _FLUSH = object()   # sentinel: flush now and signal the attached Event
+
+    def __init__(self, apply_batch, max_batch=64, max_delay=0.25, name='group-commit'):
+        self.apply_batch = apply_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'submitted': 0, 'written': 0, 'failed': 0, 'flushes': 0,
+            'max_batch_size': 0, 'last_batch_size': 0,
+            'total_flush_ms': 0.0, 'max_flush_ms': 0.0, 'last_flush_ms': 0.0,
+        }
+        atexit.register(self.flush, 5.0)
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def submit(self, item):
+        self._ensure_started()
+        with self._stats_lock:
+            self._stats['submitted'] += 1
+        self._queue.put(item)
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far has been applied. Returns True on success."""
+        if not self._thread or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put((self._FLUSH, done))
+        return done.wait(timeout)
+
+    # ── Writer thread ─────────────────────────────────────────────────────────
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            batch, waiters = [], []
+            self._take(first, batch, waiters)
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch and not waiters:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self._take(self._queue.get(timeout=remaining), batch, waiters)
+                except queue.Empty:
+                    break
+            if batch:
+                self._apply(batch)
+            for w in waiters:
+                w.set()
+
+    def _take(self, item, batch, waiters):
+        if isinstance(item, tuple) and len(item) == 2 and item[0] is self._FLUSH:
+            waiters.append(item[1])
+        else:
+            batch.append(item)
+
+    def _apply(self, batch):
+        started = time.perf_counter()
+        try:
+            failed = self.apply_batch(batch) or 0
+        except Exception as e:
+            failed = len(batch)
+            logger.warning(f"[{self.name}] Batch of {len(batch)} failed: {str(e)[:120]}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            s = self._stats
+            s['flushes'] += 1
+            s['written'] += len(batch) - failed
+            s['failed'] += failed
+            s['last_batch_size'] = len(batch)
+            s['max_batch_size'] = max(s['max_batch_size'], len(batch))
+            s['last_flush_ms'] = round(elapsed_ms, 2)
+            s['max_flush_ms'] = round(max(s['max_flush_ms'], elapsed_ms), 2)
+            s['total_flush_ms'] += elapsed_ms
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    def stats(self):
+        with self._stats_lock:
+            data = dict(self._stats)
+        flushes = data['flushes']
+        data['avg_batch_size'] = round((data['written'] + data['failed']) / flushes, 2) if flushes else 0
+        data['avg_flush_ms'] = round(data.pop('total_flush_ms') / flushes, 2) if flushes else 0
+        data['queue_depth'] = self._queue.qsize()
+        data['running'] = bool(self._thread and self._thread.is_alive())
+        return data
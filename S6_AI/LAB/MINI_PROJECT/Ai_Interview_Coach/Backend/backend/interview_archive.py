@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Interview Archive
+Hot/cold tiering for old sessions. Completed interviews older than
+ARCHIVE_AFTER_DAYS have their questions, answers and feedback moved out of
+the hot tables into an archive tier. The interviews row stays behind as the
+compact summary (scores, duration, answer_count, archived_at), so dashboards,
+streaks and user aggregates never touch the cold tier; only the per-session
+report reads it.
+
+    SQLite      the archive tables live in a separate file ATTACHed to every
+                connection as schema "archive" (ARCHIVE_DATABASE_PATH,
+                default <database>_archive.db next to the main file)
+    PostgreSQL  the archive tables live in an "archive" schema of the same
+                database, so the same schema-qualified SQL runs on both
+
+Each batch is one transaction of set-based INSERT ... SELECT / DELETE
+statements. Re-running after a crash is safe: the archive copy of a batch is
+replaced, and a session only counts as archived once archived_at is set on
+its hot row.
+
+    ARCHIVE_AFTER_DAYS      age (by completed_at) before a session moves   (180)
+    ARCHIVE_BATCH_SIZE      interviews moved per transaction               (500)
+    ARCHIVE_INTERVAL_HOURS  background run interval in the app, 0 = off    (0)
+    ARCHIVE_DATABASE_PATH   SQLite archive file
+
+Usage:
+    python interview_archive.py                          # configured age
+    python interview_archive.py --older-than-days 90 --dry-run
+    python interview_archive.py --report archive_report.json
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import MetaData, bindparam, inspect, select, text
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = 'archive'
+
+# Copy order (parents first); deletes run in reverse
+TABLES = ('interviews', 'questions', 'answers', 'feedback')
+
+# table -> rows belonging to the batch of interview ids (:ids), {s} = schema prefix
+_BATCH_FILTERS = {
+    'interviews': "id IN :ids",
+    'questions':  "interview_id IN :ids",
+    'answers':    "interview_id IN :ids",
+    'feedback':   "answer_id IN (SELECT id FROM {s}answers WHERE interview_id IN :ids)",
+}
+
+# SQLite archive indexes (PostgreSQL copies the hot indexes with LIKE ... INCLUDING INDEXES)
+_ARCHIVE_INDEXES = (
+    ('interviews', 'id', True), ('interviews', 'user_id', False),
+    ('questions', 'id', True),  ('questions', 'interview_id', False),
+    ('answers', 'id', True),    ('answers', 'interview_id', False),
+    ('feedback', 'id', True),   ('feedback', 'answer_id', False),
+)
+
+
+def archive_path(main_path):
+    """SQLite archive file for the given main database file (None for in-memory)."""
+    if not main_path or main_path == ':memory:':
+        return None
+    configured = os.environ.get('ARCHIVE_DATABASE_PATH')
+    if configured:
+        return os.path.abspath(configured)
+    root, _ = os.path.splitext(main_path)
+    return f'{root}_archive.db'
+
+
+def attach(dbapi_connection):
+    """ATTACH the archive file to a new sqlite3 connection (connect-event hook)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        schemas = {row[1]: row[2] for row in cursor.execute("PRAGMA database_list")}
+        path = archive_path(schemas.get('main'))
+        if path is None or ARCHIVE_SCHEMA in schemas:
+            return False
+        cursor.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+        cursor.execute(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode=WAL")
+        cursor.execute(f"PRAGMA {ARCHIVE_SCHEMA}.synchronous=NORMAL")
+        return True
+    except Exception as e:
+        logger.warning(f"[Archive] Could not attach archive database: {str(e)[:80]}")
+        return False
+    finally:
+        cursor.close()
+
+
+_archive_metadata = MetaData()
+_archive_lock = threading.Lock()
+
+
+def archive_table(table):
+    """Typed copy of a hot Table bound to the archive schema, for reads."""
+    key = f'{ARCHIVE_SCHEMA}.{table.name}'
+    with _archive_lock:
+        existing = _archive_metadata.tables.get(key)
+        return existing if existing is not None else table.to_metadata(_archive_metadata,
+                                                                       schema=ARCHIVE_SCHEMA)
+
+
+def load_archived(session, metadata, interview_id):
+    """Archived questions, answers and feedback rows (as dicts) of one interview."""
+    questions, answers, feedback = (archive_table(metadata.tables[name])
+                                    for name in ('questions', 'answers', 'feedback'))
+    answer_ids = select(answers.c.id).where(answers.c.interview_id == interview_id)
+    rows = lambda stmt: [dict(r) for r in session.execute(stmt).mappings()]
+    return {
+        'questions': rows(select(questions).where(questions.c.interview_id == interview_id)
+                          .order_by(questions.c.question_number, questions.c.id)),
+        'answers':   rows(select(answers).where(answers.c.interview_id == interview_id)
+                          .order_by(answers.c.id)),
+        'feedback':  rows(select(feedback).where(feedback.c.answer_id.in_(answer_ids))
+                          .order_by(feedback.c.id)),
+    }
+
+
+def ensure_archive_tables(conn):
+    """Create the archive tables (and any columns added to the hot tables since)."""
+    is_sqlite = conn.dialect.name == 'sqlite'
+    if not is_sqlite:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    inspector = inspect(conn)
+    existing = set(inspector.get_table_names(schema=ARCHIVE_SCHEMA))
+    for table in TABLES:
+        if table not in existing:
+            if is_sqlite:
+                conn.execute(text(f"CREATE TABLE {ARCHIVE_SCHEMA}.{table} AS SELECT * FROM main.{table} WHERE 0"))
+            else:
+                conn.execute(text(f"CREATE TABLE {ARCHIVE_SCHEMA}.{table} "
+                                  f"(LIKE {table} INCLUDING DEFAULTS INCLUDING INDEXES)"))
+            continue
+        have = {c['name'] for c in inspector.get_columns(table, schema=ARCHIVE_SCHEMA)}
+        for col in inspector.get_columns(table):
+            if col['name'] not in have:
+                conn.execute(text(f"ALTER TABLE {ARCHIVE_SCHEMA}.{table} ADD COLUMN {col['name']} "
+                                  f"{col['type'].compile(dialect=conn.dialect)}"))
+    if is_sqlite:
+        for table, column, unique in _ARCHIVE_INDEXES:
+            conn.execute(text(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS "
+                              f"{ARCHIVE_SCHEMA}.ix_archive_{table}_{column} ON {table} ({column})"))
+
+
+class InterviewArchiver:
+    """Moves old completed sessions to the archive tier in batched transactions."""
+
+    def __init__(self, engine, older_than_days=None, batch_size=None, dry_run=False, progress=False,
+                 interval_hours=None):
+        env = os.environ.get
+        self.engine = engine
+        self.older_than_days = float(older_than_days if older_than_days is not None
+                                     else env('ARCHIVE_AFTER_DAYS', '180'))
+        self.batch_size = int(batch_size or env('ARCHIVE_BATCH_SIZE', '500'))
+        self.interval = float(interval_hours if interval_hours is not None
+                              else env('ARCHIVE_INTERVAL_HOURS', '0')) * 3600
+        self.dry_run = dry_run
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._stats = {
+            'runs': 0, 'interviews_archived': 0, 'answers_archived': 0, 'errors': 0,
+            'last_run_at': None, 'last_duration_ms': None, 'last_error': None,
+        }
+
+    @property
+    def is_sqlite(self):
+        return self.engine.dialect.name == 'sqlite'
+
+    def _cutoff(self, now=None):
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.older_than_days)
+        # SQLite holds both 'YYYY-MM-DD HH:MM:SS' and ISO 'T' strings; julianday() reads both
+        if self.is_sqlite:
+            return cutoff, "julianday(completed_at) < julianday(:cutoff)", cutoff.isoformat()
+        return cutoff, "completed_at < :cutoff", cutoff
+
+    @contextmanager
+    def _write_transaction(self):
+        # A batch reads then writes; on SQLite take the write lock up front so a
+        # concurrent writer makes it wait (busy_timeout) instead of failing with SQLITE_BUSY
+        with self.engine.connect() as conn:
+            if self.is_sqlite:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+
+    def _eligible_sql(self, where):
+        return (f"SELECT id FROM interviews WHERE status = 'completed' AND archived_at IS NULL "
+                f"AND completed_at IS NOT NULL AND {where}")
+
+    def _dry_run_counts(self, conn, where, cutoff):
+        # Same selection as a real run, counted in place without writing anything
+        eligible = self._eligible_sql(where)
+        counts = {'interviews': conn.execute(text(f"SELECT COUNT(*) FROM ({eligible}) c"),
+                                             {'cutoff': cutoff}).scalar()}
+        for table in TABLES[1:]:
+            condition = _BATCH_FILTERS[table].format(s='').replace(':ids', f'({eligible})')
+            counts[table] = conn.execute(text(f"SELECT COUNT(*) FROM {table} WHERE {condition}"),
+                                         {'cutoff': cutoff}).scalar()
+        return counts
+
+    def _move_batch(self, conn, ids, now, columns, has_recommendations):
+        params = {'ids': ids}
+
+        def stmt(sql):
+            return text(sql).bindparams(bindparam('ids', expanding=True))
+
+        # Replace any copy left by an interrupted run, then copy parents first
+        for table in reversed(TABLES):
+            condition = _BATCH_FILTERS[table].format(s=f'{ARCHIVE_SCHEMA}.')
+            conn.execute(stmt(f"DELETE FROM {ARCHIVE_SCHEMA}.{table} WHERE {condition}"), params)
+        moved = {}
+        for table in TABLES:
+            cols = ', '.join(columns[table])
+            condition = _BATCH_FILTERS[table].format(s='')
+            moved[table] = conn.execute(stmt(
+                f"INSERT INTO {ARCHIVE_SCHEMA}.{table} ({cols}) SELECT {cols} FROM {table} WHERE {condition}"),
+                params).rowcount
+
+        # Hot row becomes the summary: keep scores, record the answer count, drop the bulky context
+        conn.execute(stmt(
+            "UPDATE interviews SET archived_at = :now, "
+            "answer_count = (SELECT COUNT(*) FROM answers a WHERE a.interview_id = interviews.id), "
+            "user_profile_snapshot = NULL, question_prompt = NULL WHERE id IN :ids"), {**params, 'now': now})
+        if has_recommendations:
+            conn.execute(stmt(
+                "UPDATE question_recommendations SET question_id = NULL "
+                "WHERE question_id IN (SELECT id FROM questions WHERE interview_id IN :ids)"), params)
+        for table in reversed(TABLES[1:]):
+            conn.execute(stmt(f"DELETE FROM {table} WHERE {_BATCH_FILTERS[table].format(s='')}"), params)
+        return moved
+
+    def run(self, now=None):
+        """Archive every eligible interview. Returns a report dict."""
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        cutoff, where, cutoff_param = self._cutoff(now)
+        report = {'cutoff': cutoff.isoformat(), 'older_than_days': self.older_than_days,
+                  'dry_run': self.dry_run, 'batches': 0, 'archived': dict.fromkeys(TABLES, 0)}
+        try:
+            if self.dry_run:
+                with self.engine.connect() as conn:
+                    report['archived'] = self._dry_run_counts(conn, where, cutoff_param)
+            else:
+                with self.engine.begin() as conn:
+                    ensure_archive_tables(conn)
+                    inspector = inspect(conn)
+                    columns = {t: [c['name'] for c in inspector.get_columns(t)] for t in TABLES}
+                    has_recommendations = 'question_recommendations' in inspector.get_table_names()
+                batch_sql = text(self._eligible_sql(where) + " ORDER BY id LIMIT :limit")
+                while True:
+                    with self._write_transaction() as conn:
+                        ids = conn.execute(batch_sql, {'cutoff': cutoff_param,
+                                                       'limit': self.batch_size}).scalars().all()
+                        if not ids:
+                            break
+                        moved = self._move_batch(conn, ids, now, columns, has_recommendations)
+                    report['batches'] += 1
+                    for table, n in moved.items():
+                        report['archived'][table] += n
+                    if self.progress:
+                        print(f"  batch {report['batches']}: {moved['interviews']} interviews, "
+                              f"{moved['answers']} answers archived", flush=True)
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += 1
+                self._stats['last_error'] = str(e)[:120]
+            raise
+        finally:
+            report['seconds'] = round(time.perf_counter() - started, 3)
+        if not self.dry_run:
+            with self._lock:
+                s = self._stats
+                s['runs'] += 1
+                s['interviews_archived'] += report['archived']['interviews']
+                s['answers_archived'] += report['archived']['answers']
+                s['last_run_at'] = time.time()
+                s['last_duration_ms'] = round(report['seconds'] * 1000, 1)
+        return report
+
+    def start(self):
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name='interview-archive')
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                report = self.run()
+                if report['archived']['interviews']:
+                    logger.info(f"[Archive] Moved {report['archived']['interviews']} interviews "
+                                f"to the archive tier in {report['seconds']}s")
+            except Exception as e:
+                logger.warning(f"[Archive] Run failed: {str(e)[:80]}")
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'older_than_days': self.older_than_days,
+                    'batch_size': self.batch_size, 'interval_hours': self.interval / 3600}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Move old completed interviews to the archive tier.')
+    parser.add_argument('--older-than-days', type=float, help='default: ARCHIVE_AFTER_DAYS (180)')
+    parser.add_argument('--batch-size', type=int, help='default: ARCHIVE_BATCH_SIZE (500)')
+    parser.add_argument('--dry-run', action='store_true', help='count what would move, write nothing')
+    parser.add_argument('--report', help='write the JSON report to this file')
+    parser.add_argument('--quiet', action='store_true', help='no progress output')
+    args = parser.parse_args(argv)
+
+    from app import app, db                         # importing app migrates the schema
+
+    with app.app_context():
+        archiver = InterviewArchiver(db.engine, args.older_than_days, args.batch_size,
+                                     args.dry_run, progress=not args.quiet)
+        report = archiver.run()
+
+    moved = report['archived']
+    print(f"\n{'=' * 60}")
+    print(f"  {'Would archive' if args.dry_run else 'Archived'} sessions completed before {report['cutoff']}")
+    print(f"  interviews {moved['interviews']:,}  questions {moved['questions']:,}  "
+          f"answers {moved['answers']:,}  feedback {moved['feedback']:,}")
+    print(f"  {report['batches']} batches in {report['seconds']}s")
+    print('=' * 60)
+    if args.report:
+        with open(args.report, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
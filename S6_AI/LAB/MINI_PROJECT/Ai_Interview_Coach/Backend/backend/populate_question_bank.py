@@ -9,6 +9,9 @@ Features:
 - Pre-computed difficulty ratings
 - Hint and expected points for better feedback
 - Verified == true for hand-curated questions
+
+Inserted through question_import.BulkImporter; for large libraries use
+`python question_import.py questions.jsonl` directly.
 """
 
 import sys
@@ -16,7 +19,7 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from app import app, db, QuestionBank
-from datetime import datetime
+from question_import import BulkImporter
 import json
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -253,60 +256,25 @@ QUESTION_LIBRARY = [
 ]
 
 def populate_question_bank():
-    """Insert all questions into QuestionBank"""
+    """Insert all curated questions into QuestionBank (existing texts are skipped by text_hash)"""
     with app.app_context():
         print(f"\n{'='*80}")
         print("  POPULATING QUESTION BANK")
         print(f"{'='*80}\n")
-        
+
         existing_count = db.session.query(QuestionBank).count()
         print(f"Current questions in bank: {existing_count}")
-        
-        inserted = 0
-        skipped = 0
-        
-        for q_data in QUESTION_LIBRARY:
-            # Check if question already exists
-            existing = QuestionBank.query.filter_by(text=q_data['text']).first()
-            if existing:
-                skipped += 1
-                print(f"  ⊘ Skipped (exists): {q_data['text'][:60]}...")
-                continue
-            
-            # Create question bank entry
-            q = QuestionBank(
-                text=q_data['text'],
-                field=q_data.get('field', 'Software Engineering'),
-                level=q_data.get('level', 'Mid'),
-                company=q_data.get('company', 'Tech Company'),
-                category=q_data.get('category', 'technical'),
-                difficulty=q_data.get('difficulty', 'medium'),
-                topic_tags=q_data.get('topic_tags', json.dumps([])),
-                hint=q_data.get('hint', ''),
-                sample_answer=q_data.get('sample_answer', ''),
-                expected_points=q_data.get('expected_points', json.dumps([])),
-                is_verified=True,
-                times_used=0,
-                avg_score=0.0,
-                created_at=datetime.utcnow(),
-            )
-            db.session.add(q)
-            inserted += 1
-            print(f"  [OK] Added: {q_data['field']:25} | {q_data['level']:8} | {q_data['text'][:50]}...")
-        
-        try:
-            db.session.commit()
-            print(f"\n{'='*80}")
-            print(f"  INSERTION COMPLETE")
-            print(f"{'='*80}")
-            print(f"  Inserted:  {inserted}")
-            print(f"  Skipped:   {skipped} (already exist)")
-            print(f"  Total now: {db.session.query(QuestionBank).count()}")
-            print(f"{'='*80}\n")
-        except Exception as e:
-            db.session.rollback()
-            print(f"\n❌ ERROR during commit: {e}\n")
-            raise
+
+        report = BulkImporter(db.engine, progress=False).run(
+            dict(q_data, is_verified=True) for q_data in QUESTION_LIBRARY)
+
+        print(f"\n{'='*80}")
+        print(f"  INSERTION COMPLETE")
+        print(f"{'='*80}")
+        print(f"  Inserted:  {report['inserted']}")
+        print(f"  Skipped:   {report['duplicates']} (already exist)")
+        print(f"  Total now: {db.session.query(QuestionBank).count()}")
+        print(f"{'='*80}\n")
 
 if __name__ == '__main__':
     populate_question_bank()
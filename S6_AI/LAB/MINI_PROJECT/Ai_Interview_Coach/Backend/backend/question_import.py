@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Question Bank Importer
+Streams questions from JSONL or CSV into question_bank in batched
+transactions. Duplicates are detected by text_hash (SHA-256 of the
+lower-cased, whitespace-collapsed text, unique-indexed), so re-running an
+import only adds what is new and never loads the whole file or bank.
+
+    per batch : one SELECT of the batch's hashes, one executemany INSERT
+                (ON CONFLICT DO NOTHING guards against concurrent importers)
+    large     : from the second batch on, the FTS sync triggers are dropped
+                and the index is rebuilt once at the end (SQLite)
+    enrich    : optional, for the newly inserted rows only, in a worker pool
+                --mc     multiple-choice options from Mistral -> mc_options
+                --embed  embeddings added to the RAG FAISS index
+
+Input fields (JSONL keys / CSV header): text (required), category, field,
+level, company, difficulty, question_type, topic_tags, expected_points,
+sample_answer, hint, is_verified. List values (topic_tags, expected_points)
+may be JSON arrays, or ';'-separated in CSV.
+
+Usage:
+    python question_import.py questions.jsonl
+    python question_import.py questions.csv --batch-size 10000
+    python question_import.py questions.jsonl --mc --embed --workers 8
+    python question_import.py questions.jsonl --dry-run --report import_report.json
+"""
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+import uuid as uuid_mod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import bindparam, text
+
+import question_search
+
+try:
+    from tqdm import tqdm
+except ImportError:                         # plain progress line instead
+    tqdm = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+LOOKUP_CHUNK       = 500                    # hashes per IN (...) lookup, under old SQLite bind limits
+EMBED_CHUNK        = 256
+
+COLUMNS = ('uuid', 'text', 'text_hash', 'category', 'field', 'level', 'company', 'difficulty',
+           'question_type', 'answer_type', 'topic_tags', 'expected_points', 'sample_answer',
+           'hint', 'is_verified', 'times_used', 'avg_score', 'score_count', 'popularity',
+           'created_at')
+
+_HASH = COLUMNS.index('text_hash')
+
+_PLACEHOLDER = {'qmark': '?', 'numeric': '?', 'format': '%s', 'pyformat': '%s'}
+
+_EXISTING = text("SELECT text_hash FROM question_bank WHERE text_hash IN :hashes")\
+    .bindparams(bindparam('hashes', expanding=True))
+
+_NEW_IDS = text("SELECT id, text, difficulty, question_type FROM question_bank WHERE text_hash IN :hashes")\
+    .bindparams(bindparam('hashes', expanding=True))
+
+
+def text_hash(question_text):
+    """Dedup key: case and whitespace differences do not make a new question."""
+    normalised = ' '.join((question_text or '').lower().split())
+    return hashlib.sha256(normalised.encode('utf-8')).hexdigest()
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+
+class _ByteCounter:
+    """Wraps a binary file, decoding lines and counting bytes for the progress bar."""
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.bytes_read = 0
+
+    def __iter__(self):
+        for raw in self.fh:
+            self.bytes_read += len(raw)
+            yield raw.decode('utf-8-sig')
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    raise ValueError(f"Cannot infer format from '{ext}', pass --format jsonl|csv")
+
+
+def read_records(lines, fmt, errors):
+    """Yield raw dicts from decoded lines; malformed JSONL lines are appended to errors."""
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+        return
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            errors.append({'line': lineno, 'error': str(e)[:80]})
+            continue
+        if isinstance(record, dict):
+            yield record
+        else:
+            errors.append({'line': lineno, 'error': 'not a JSON object'})
+
+
+def _json_list(value):
+    if value is None or value == '':
+        return '[]'
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value))
+    value = str(value).strip()
+    if value.startswith('['):
+        return value
+    return json.dumps([v.strip() for v in value.split(';') if v.strip()])
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in ('1', 'true', 'yes', 'y')
+
+
+def normalise(record, now=None):
+    """Map an input record onto a question_bank row tuple (COLUMNS order); None if it has no text."""
+    question_text = (record.get('text') or record.get('question') or '').strip()
+    if not question_text:
+        return None
+    question_type = (record.get('question_type') or 'mock').strip().lower()
+    return (
+        str(uuid_mod.uuid4()),
+        question_text,
+        text_hash(question_text),
+        (record.get('category') or 'technical').strip().lower(),
+        (record.get('field') or 'Software Engineering').strip(),
+        (record.get('level') or 'Mid').strip(),
+        (record.get('company') or 'Tech Company').strip(),
+        (record.get('difficulty') or 'medium').strip().lower(),
+        question_type,
+        question_type,                                  # answer_type
+        _json_list(record.get('topic_tags')),
+        _json_list(record.get('expected_points')),
+        record.get('sample_answer') or '',
+        record.get('hint') or '',
+        _flag(record.get('is_verified')),
+        0, 0.0, 0, 0.0,                                 # times_used, avg_score, score_count, popularity
+        now or datetime.utcnow(),
+    )
+
+
+# ── Progress ──────────────────────────────────────────────────────────────────
+
+class _Progress:
+    def __init__(self, total_bytes, enabled):
+        self.bar = None
+        self.enabled = enabled
+        self.last = 0
+        if enabled and tqdm is not None and total_bytes:
+            self.bar = tqdm(total=total_bytes, unit='B', unit_scale=True, desc='Importing')
+
+    def update(self, bytes_read, report):
+        if not self.enabled:
+            return
+        if self.bar is not None:
+            self.bar.update(bytes_read - self.last)
+            self.bar.set_postfix(inserted=report['inserted'], duplicates=report['duplicates'])
+            self.last = bytes_read
+        else:
+            print(f"\r  read {report['read']:,}  inserted {report['inserted']:,}  "
+                  f"duplicates {report['duplicates']:,}", end='', file=sys.stderr, flush=True)
+
+    def close(self):
+        if self.bar is not None:
+            self.bar.close()
+        elif self.enabled:
+            print(file=sys.stderr)
+
+
+# ── Import ────────────────────────────────────────────────────────────────────
+
+class BulkImporter:
+    """
+    engine      : SQLAlchemy engine with a migrated question_bank (text_hash unique index)
+    batch_size  : rows per transaction
+    dry_run     : dedup and count, write nothing
+    """
+
+    def __init__(self, engine, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, progress=True):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.progress = progress
+        # Driver-level executemany with positional rows: skips SQLAlchemy's
+        # per-row parameter processing, which otherwise dominates the import
+        mark = _PLACEHOLDER.get(engine.dialect.paramstyle, '?')
+        self._insert_sql = (f"INSERT INTO question_bank ({', '.join(COLUMNS)}) "
+                            f"VALUES ({', '.join([mark] * len(COLUMNS))}) "
+                            f"ON CONFLICT (text_hash) DO NOTHING")
+
+    def _existing(self, conn, hashes):
+        found = set()
+        for i in range(0, len(hashes), LOOKUP_CHUNK):
+            found.update(conn.execute(_EXISTING, {'hashes': hashes[i:i + LOOKUP_CHUNK]}).scalars())
+        return found
+
+    def _new_rows(self, conn, hashes):
+        rows = []
+        for i in range(0, len(hashes), LOOKUP_CHUNK):
+            rows.extend(tuple(r) for r in conn.execute(_NEW_IDS, {'hashes': hashes[i:i + LOOKUP_CHUNK]}))
+        return rows
+
+    def _suspend_fts(self):
+        if self.dry_run or self.engine.dialect.name != 'sqlite':
+            return False
+        with self.engine.begin() as conn:
+            return question_search.suspend_triggers(conn)
+
+    def _write_batch(self, batch, report, collect_new):
+        hashes = [row[_HASH] for row in batch]
+        with self.engine.begin() as conn:
+            existing = self._existing(conn, hashes)
+            fresh = [row for row in batch if row[_HASH] not in existing]
+            report['duplicates'] += len(batch) - len(fresh)
+            written = len(fresh)
+            if fresh and not self.dry_run:
+                written = conn.exec_driver_sql(self._insert_sql, fresh).rowcount
+                if written < 0:                     # driver doesn't report executemany counts
+                    written = len(fresh)
+                # Rows a concurrent writer added since _existing() hit ON CONFLICT DO NOTHING
+                report['duplicates'] += len(fresh) - written
+                if collect_new:
+                    report['new_rows'].extend(self._new_rows(conn, [row[_HASH] for row in fresh]))
+            report['inserted'] += written
+        report['batches'] += 1
+
+    def run(self, records, total_bytes=None, position=None, collect_new=False):
+        """
+        Import an iterable of raw records. Returns the report dict; with
+        collect_new, report['new_rows'] lists (id, text, difficulty, question_type)
+        of inserted rows for enrich(). position() -> bytes consumed, for progress.
+        """
+        started = time.perf_counter()
+        report = {'read': 0, 'inserted': 0, 'duplicates': 0, 'invalid': 0, 'batches': 0,
+                  'dry_run': self.dry_run, 'errors': [], 'new_rows': []}
+        progress = _Progress(total_bytes, self.progress)
+        seen, batch, now = set(), [], datetime.utcnow()
+        fts_suspended = False
+        try:
+            for record in records:
+                report['read'] += 1
+                row = normalise(record, now)
+                if row is None:
+                    report['invalid'] += 1
+                    continue
+                if row[_HASH] in seen:                # duplicate inside the file itself
+                    report['duplicates'] += 1
+                    continue
+                seen.add(row[_HASH])
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    if report['batches'] == 1 and not fts_suspended:
+                        fts_suspended = self._suspend_fts()
+                    self._write_batch(batch, report, collect_new)
+                    batch = []
+                    progress.update(position() if position else 0, report)
+            if batch:
+                self._write_batch(batch, report, collect_new)
+            progress.update(total_bytes or 0, report)
+        finally:
+            progress.close()
+            if fts_suspended:
+                with self.engine.begin() as conn:
+                    question_search.create_index(conn)
+        report['seconds'] = round(time.perf_counter() - started, 3)
+        report['rows_per_second'] = int(report['read'] / report['seconds']) if report['seconds'] else None
+        return report
+
+    def import_file(self, path, fmt=None, collect_new=False):
+        fmt = fmt or detect_format(path)
+        errors = []
+        with open(path, 'rb') as fh:
+            if fmt == 'jsonl':
+                lines = _ByteCounter(fh)
+                position = lambda: lines.bytes_read
+            else:
+                lines = io.TextIOWrapper(fh, encoding='utf-8-sig', newline='')
+                position = fh.tell                  # approximate: the wrapper reads ahead
+            report = self.run(read_records(lines, fmt, errors), os.path.getsize(path),
+                              position, collect_new)
+        report['invalid'] += len(errors)
+        report['errors'] = errors[:100]
+        return report
+
+
+# ── Enrichment (new rows only) ────────────────────────────────────────────────
+
+def enrich(engine, new_rows, generate_mc=None, embeddings=None, vector_store=None,
+           workers=4, batch_size=200):
+    """
+    generate_mc(text, difficulty) -> dict | None, run for 'mock' questions and
+    stored as JSON in question_bank.mc_options. embeddings.embed_documents is
+    run per EMBED_CHUNK texts and the vectors are added to vector_store in one
+    save. Both run in a thread pool (Mistral calls are I/O bound and torch
+    releases the GIL). Returns counts.
+    """
+    done = {'mc_options': 0, 'mc_failed': 0, 'embedded': 0}
+
+    if generate_mc is not None:
+        mock_rows = [r for r in new_rows if (r[3] or 'mock') == 'mock']
+        pending = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='import-mc') as pool:
+            for (qid, _, _, _), mc in zip(mock_rows, pool.map(lambda r: generate_mc(r[1], r[2] or 'medium'),
+                                                                mock_rows)):
+                if mc and mc.get('options'):
+                    pending.append({'id': qid, 'mc': json.dumps({k: mc[k] for k in
+                                    ('options', 'correct_answers', 'multiple_allowed') if k in mc})})
+                else:
+                    done['mc_failed'] += 1
+                if len(pending) >= batch_size:
+                    _store_mc(engine, pending)
+                    done['mc_options'] += len(pending)
+                    pending = []
+        if pending:
+            _store_mc(engine, pending)
+            done['mc_options'] += len(pending)
+
+    if embeddings is not None and vector_store is not None and new_rows:
+        chunks = [new_rows[i:i + EMBED_CHUNK] for i in range(0, len(new_rows), EMBED_CHUNK)]
+        texts, vectors, metadatas = [], [], []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='import-embed') as pool:
+            for chunk, chunk_vectors in zip(chunks, pool.map(
+                    lambda c: embeddings.embed_documents([r[1] for r in c]), chunks)):
+                texts.extend(r[1] for r in chunk)
+                vectors.extend(chunk_vectors)
+                metadatas.extend({'type': 'question_bank', 'bank_question_id': r[0]} for r in chunk)
+        vector_store.add_embedded(texts, vectors, metadatas)
+        done['embedded'] = len(texts)
+    return done
+
+
+def _store_mc(engine, rows):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE question_bank SET mc_options = :mc WHERE id = :id"), rows)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Bulk-import interview questions into question_bank.')
+    parser.add_argument('path', help='JSONL or CSV file')
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help='default: from the file extension')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help='count new/duplicate rows, write nothing')
+    parser.add_argument('--mc', action='store_true', help='generate MC options for new mock questions (Mistral)')
+    parser.add_argument('--embed', action='store_true', help='add new questions to the RAG vector index')
+    parser.add_argument('--workers', type=int, default=4, help='enrichment worker threads')
+    parser.add_argument('--report', help='write the JSON report to this file')
+    parser.add_argument('--quiet', action='store_true', help='no progress output')
+    args = parser.parse_args(argv)
+
+    from app import app, db, mistral_agent         # importing app migrates the schema
+
+    with app.app_context():
+        engine = db.engine
+        importer = BulkImporter(engine, args.batch_size, args.dry_run, progress=not args.quiet)
+        enriching = (args.mc or args.embed) and not args.dry_run
+        report = importer.import_file(args.path, args.format, collect_new=enriching)
+        new_rows = report.pop('new_rows')
+
+        if enriching and new_rows:
+            generate_mc = embeddings = vector_store = None
+            if args.mc:
+                if mistral_agent.is_available:
+                    generate_mc = lambda q, d: (mistral_agent._generate_multiple_choice_options(q, d)
+                                                if mistral_agent.is_available else None)
+                else:
+                    print("  Mistral offline: skipping MC options (generated at serve time instead)")
+            if args.embed:
+                from rag.vector_store import vector_store_manager
+                if vector_store_manager.load():
+                    embeddings, vector_store = vector_store_manager.embeddings, vector_store_manager
+                else:
+                    print("  RAG unavailable: skipping embeddings")
+            started = time.perf_counter()
+            report['enrichment'] = enrich(engine, new_rows, generate_mc, embeddings, vector_store,
+                                          workers=args.workers)
+            report['enrichment']['seconds'] = round(time.perf_counter() - started, 3)
+
+    print(f"\n{'=' * 60}")
+    print(f"  IMPORT {'DRY RUN ' if args.dry_run else ''}COMPLETE: {args.path}")
+    print(f"{'=' * 60}")
+    print(f"  Read:        {report['read']:,}")
+    print(f"  Inserted:    {report['inserted']:,}" + ("  (not written)" if args.dry_run else ""))
+    print(f"  Duplicates:  {report['duplicates']:,}")
+    print(f"  Invalid:     {report['invalid']:,}")
+    print(f"  Time:        {report['seconds']}s ({report['rows_per_second'] or 0:,} rows/s)")
+    if 'enrichment' in report:
+        print(f"  Enrichment:  {report['enrichment']}")
+    print(f"{'=' * 60}\n")
+
+    if args.report:
+        with open(args.report, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
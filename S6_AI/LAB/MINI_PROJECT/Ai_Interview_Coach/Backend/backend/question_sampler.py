@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Question Bank Sampler
+In-memory id arrays per (field, category, difficulty) bucket so the offline
+fallback can draw k distinct random questions in O(k) instead of running
+ORDER BY random() (a sort of the whole filtered set) on every session start.
+
+    uniform   : every question in the matching buckets is equally likely
+    weighted  : weight = 1 / (1 + times_used), so rarely served questions are
+                preferred and usage spreads across the bank. Draws use Vose
+                alias tables (O(1) per draw, built with the arrays on refresh)
+
+The arrays are rebuilt by a background thread when the bank changes:
+mark_dirty() (wired to QuestionBank ORM events) wakes it immediately, and a
+cheap COUNT/MAX signature check every refresh_interval seconds catches
+inserts and deletes from other processes (importer CLI, other workers).
+
+times_used changes on every served question, so it is not part of the
+signature. record_usage() folds this process's committed usage into the
+weights of the affected buckets (their alias tables are rebuilt on the next
+draw from them), and a full rebuild every rebuild_interval seconds picks up
+usage and calibrated difficulty written elsewhere.
+"""
+
+import logging
+import random
+import threading
+import time
+from array import array
+
+logger = logging.getLogger(__name__)
+
+
+def _build_alias(weights):
+    """Vose alias method: O(n) build, O(1) weighted draw."""
+    n = len(weights)
+    total = float(sum(weights))
+    prob = [w * n / total for w in weights]
+    alias = [0] * n
+    small = [i for i, p in enumerate(prob) if p < 1.0]
+    large = [i for i, p in enumerate(prob) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        alias[s] = l
+        prob[l] = prob[l] + prob[s] - 1.0
+        (small if prob[l] < 1.0 else large).append(l)
+    for i in small + large:
+        prob[i] = 1.0
+    return prob, alias
+
+
+def _alias_draw(rnd, table):
+    prob, alias = table
+    i = int(rnd.random() * len(prob))
+    return i if rnd.random() < prob[i] else alias[i]
+
+
+class _Bucket:
+    __slots__ = ('ids', 'usage', 'total_weight', 'alias', 'stale')
+
+    def __init__(self):
+        self.ids = array('q')
+        self.usage = array('l')
+        self.total_weight = 0.0
+        self.alias = None
+        self.stale = False
+
+    def add(self, qid, times_used):
+        self.ids.append(qid)
+        self.usage.append(times_used)
+        self.total_weight += 1.0 / (1 + times_used)
+
+    def bump(self, pos, served):
+        used = self.usage[pos]
+        self.usage[pos] = used + served
+        self.total_weight += 1.0 / (1 + used + served) - 1.0 / (1 + used)
+        self.stale = True
+
+    def build_alias(self):
+        self.alias = _build_alias([1.0 / (1 + u) for u in self.usage])
+        self.stale = False
+
+    def draw(self, rnd):
+        if self.alias is None:
+            return self.ids[int(rnd.random() * len(self.ids))]
+        return self.ids[_alias_draw(rnd, self.alias)]
+
+
+class QuestionSampler:
+    """
+    load_rows()  -> iterable of (id, field, category, difficulty, times_used)
+    signature()  -> any value that changes when the bank changes
+    """
+
+    def __init__(self, load_rows, signature, weighted=True, refresh_interval=300, rebuild_interval=3600):
+        self.load_rows = load_rows
+        self.signature = signature
+        self.weighted = weighted
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._buckets = {}              # (field_lower, category, difficulty) -> _Bucket
+        self._positions = {}            # question id -> (bucket, index in bucket)
+        self._usage_lock = threading.Lock()
+        self._field_cache = {}          # requested field -> matching field keys
+        self._signature = None
+        self._dirty = threading.Event()
+        self._thread = None
+        self._rnd = random.Random()
+        self._stats = {'refreshes': 0, 'samples': 0, 'usage_updates': 0, 'last_refresh_ms': None,
+                       'last_refresh_at': None, 'last_error': None}
+
+    @property
+    def ready(self):
+        return self._signature is not None
+
+    # ── Building ──────────────────────────────────────────────────────────────
+
+    def refresh(self):
+        started = time.perf_counter()
+        signature = self.signature()
+        buckets, positions = {}, {}
+        for qid, field, category, difficulty, times_used in self.load_rows():
+            key = ((field or '').lower(), category or '', difficulty or '')
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket()
+            positions[qid] = (bucket, len(bucket.ids))
+            bucket.add(qid, times_used or 0)
+        if self.weighted:
+            for bucket in buckets.values():
+                bucket.build_alias()
+        # Swap in one assignment: readers see either the old or the new buckets
+        with self._usage_lock:
+            self._buckets, self._positions, self._field_cache = buckets, positions, {}
+        self._signature = signature
+        self._stats['refreshes'] += 1
+        self._stats['last_refresh_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self._stats['last_refresh_at'] = time.time()
+        return sum(len(b.ids) for b in buckets.values())
+
+    def mark_dirty(self):
+        self._dirty.set()
+
+    def record_usage(self, served):
+        """Fold {question id: times served} (already committed) into the weights without a rebuild."""
+        if not self.weighted:
+            return 0
+        touched = 0
+        with self._usage_lock:
+            for qid, count in served.items():
+                found = self._positions.get(qid)
+                if found is not None and count:
+                    found[0].bump(found[1], count)
+                    touched += 1
+        self._stats['usage_updates'] += touched
+        return touched
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._dirty.set()               # first pass builds immediately
+        self._thread = threading.Thread(target=self._run, daemon=True, name='question-sampler')
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            forced = self._dirty.wait(self.refresh_interval)
+            self._dirty.clear()
+            try:
+                due = self._stats['last_refresh_at'] is None or \
+                    time.time() - self._stats['last_refresh_at'] >= self.rebuild_interval
+                if forced or due or not self.ready or self.signature() != self._signature:
+                    count = self.refresh()
+                    logger.info(f"[Sampler] Indexed {count} questions in "
+                                f"{len(self._buckets)} buckets ({self._stats['last_refresh_ms']} ms)")
+            except Exception as e:
+                self._stats['last_error'] = str(e)[:120]
+                logger.debug(f"[Sampler] Refresh failed: {str(e)[:80]}")
+            time.sleep(1)               # coalesce bursts of bank writes
+
+    # ── Sampling ──────────────────────────────────────────────────────────────
+
+    def _fields_matching(self, field):
+        """Field keys containing `field` (same semantics as field.ilike('%field%'))."""
+        needle = (field or '').lower()
+        cached = self._field_cache.get(needle)
+        if cached is None:
+            cached = {key[0] for key in self._buckets if needle in key[0]}
+            self._field_cache[needle] = cached
+        return cached
+
+    def buckets_for(self, field, categories=None, difficulty=None):
+        fields = self._fields_matching(field)
+        return [b for (f, c, d), b in self._buckets.items()
+                if f in fields
+                and (categories is None or c in categories)
+                and (difficulty is None or d == difficulty)]
+
+    def sample(self, k, field='', categories=None, difficulty=None):
+        """Up to k distinct question ids, or None if the sampler has not been built yet."""
+        if not self.ready:
+            return None
+        buckets = self.buckets_for(field, categories, difficulty)
+        population = sum(len(b.ids) for b in buckets)
+        self._stats['samples'] += 1
+        if population == 0:
+            return []
+        if k >= population:
+            ids = [qid for b in buckets for qid in b.ids]
+            self._rnd.shuffle(ids)
+            return ids
+
+        # Pick a bucket in proportion to its size (or total weight), then draw
+        # inside it; reject duplicates. Expected O(k) while k << population.
+        rnd = self._rnd
+        if self.weighted:
+            with self._usage_lock:
+                for bucket in buckets:
+                    if bucket.stale:
+                        bucket.build_alias()
+        bucket_table = _build_alias([b.total_weight if self.weighted else len(b.ids)
+                                     for b in buckets])
+        chosen, order = set(), []
+        attempts = 0
+        while len(order) < k and attempts < k * 20:
+            attempts += 1
+            qid = buckets[_alias_draw(rnd, bucket_table)].draw(rnd)
+            if qid not in chosen:
+                chosen.add(qid)
+                order.append(qid)
+        if len(order) < k:
+            # Heavily skewed weights: top up uniformly from what is left
+            rest = [qid for b in buckets for qid in b.ids if qid not in chosen]
+            order.extend(rnd.sample(rest, k - len(order)))
+        return order
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    def stats(self):
+        data = dict(self._stats)
+        data['ready'] = self.ready
+        data['weighted'] = self.weighted
+        data['buckets'] = len(self._buckets)
+        data['questions'] = sum(len(b.ids) for b in self._buckets.values())
+        if data['last_refresh_at']:
+            data['seconds_since_refresh'] = round(time.time() - data['last_refresh_at'], 1)
+        data.pop('last_refresh_at')
+        return data
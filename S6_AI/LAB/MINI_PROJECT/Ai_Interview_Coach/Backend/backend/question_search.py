@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Question Bank Full-Text Search (SQLite FTS5)
+`question_bank_fts` is an external-content FTS5 index over question_bank,
+kept in sync by AFTER INSERT / DELETE / UPDATE triggers, so library search
+and fallback lookups no longer full-scan the table with ilike('%...%').
+
+    free text   -> every word must match text or topic_tags, last-word prefix
+                   style ("kube"* matches "kubernetes"), ranked with bm25
+    filters     -> category / field / difficulty as column-scoped phrase
+                   prefixes ("software eng"* matches "Software Engineering")
+    facets      -> counts per category / field / difficulty over the matches
+
+Databases without FTS5 (PostgreSQL, SQLite builds without the extension)
+report enabled=False and callers keep their ilike queries.
+"""
+
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE   = 'question_bank_fts'
+FTS_COLUMNS = ('text', 'topic_tags', 'category', 'field', 'difficulty')
+# bm25 column weights, same order as FTS_COLUMNS: a hit in the question text
+# outranks one in the tags, which outranks a category/field/difficulty hit
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 1.0, 1.0)
+FACET_COLUMNS = ('category', 'field', 'difficulty')
+
+_TOKEN = re.compile(r'[^\W_]+')     # same word boundaries as the unicode61 tokenizer
+
+
+def fts5_available(conn):
+    options = {row[0] for row in conn.execute(text("PRAGMA compile_options"))}
+    return 'ENABLE_FTS5' in options
+
+
+def create_index(conn):
+    """Create the FTS table + sync triggers and index existing rows. Idempotent."""
+    cols = ', '.join(FTS_COLUMNS)
+    new_vals = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+    old_vals = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+    statements = [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                {cols}, content='question_bank', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON question_bank BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_vals});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON question_bank BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+            END""",
+        # Only indexed columns: times_used / avg_score updates never touch the index
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON question_bank BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+                INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_vals});
+            END""",
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ]
+    for sql in statements:
+        conn.execute(text(sql))
+
+
+def suspend_triggers(conn):
+    """
+    Drop the sync triggers for a bulk load; create_index() restores them and
+    rebuilds, which is much cheaper than per-row trigger inserts. Returns
+    False if there was no index to suspend.
+    """
+    names = [f'{FTS_TABLE}_{suffix}' for suffix in ('ai', 'ad', 'au')]
+    present = conn.execute(text(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (:a, :b, :c)"),
+        dict(zip('abc', names))).scalar()
+    if not present:
+        return False
+    for name in names:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    return True
+
+
+def _tokens(value):
+    return _TOKEN.findall((value or '').lower())
+
+
+def _phrase(value):
+    """'Software Eng' -> '"software eng"*' (contiguous words, prefix on the last)."""
+    words = _tokens(value)
+    return f'"{" ".join(words)}"*' if words else None
+
+
+def match_expression(search='', category='', field='', difficulty=''):
+    """Build an FTS5 MATCH string, or None when there is nothing to match on."""
+    parts = [f'{{text topic_tags}} : "{word}"*' for word in _tokens(search)]
+    for column, value in (('category', category), ('field', field), ('difficulty', difficulty)):
+        phrase = _phrase(value)
+        if phrase:
+            parts.append(f'{column} : {phrase}')
+    return ' AND '.join(parts) or None
+
+
+class QuestionSearchIndex:
+    """Query side of the FTS index. enabled is resolved once per process by detect()."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {'searches': 0, 'facet_queries': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+
+    def detect(self, engine):
+        try:
+            with engine.connect() as conn:
+                self.enabled = engine.dialect.name == 'sqlite' and conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"),
+                    {'n': FTS_TABLE}).first() is not None
+        except Exception as e:
+            self.enabled = False
+            logger.debug(f"[Search] FTS detection failed: {str(e)[:80]}")
+        return self.enabled
+
+    def matching_ids(self, match):
+        """Subquery of question_bank ids for use in Column.in_()."""
+        return text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match")\
+            .bindparams(match=match)
+
+    def search(self, session, match, ranked=True, limit=50, offset=0):
+        """Matching question ids, best first: bm25 for free text, else most popular."""
+        started = time.perf_counter()
+        if ranked:
+            weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+            sql = (f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+                   f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT :limit OFFSET :offset")
+        else:
+            sql = (f"SELECT id FROM question_bank WHERE id IN "
+                   f"(SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match) "
+                   f"ORDER BY popularity DESC, times_used DESC, id LIMIT :limit OFFSET :offset")
+        ids = session.execute(text(sql), {'match': match, 'limit': limit, 'offset': offset})\
+                     .scalars().all()
+        self._record('searches', started)
+        return ids
+
+    def facets(self, session, match=None):
+        """{column: {value: count}} over the matching questions (whole bank if match is None)."""
+        started = time.perf_counter()
+        where = (f"WHERE id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match)"
+                 if match else "")
+        # One pass over the matches; the (category, field, difficulty) combinations are few
+        cols = ', '.join(FACET_COLUMNS)
+        rows = session.execute(text(
+            f"SELECT {cols}, COUNT(*) FROM question_bank {where} GROUP BY {cols}"),
+            {'match': match}).all()
+        result = {column: {} for column in FACET_COLUMNS}
+        for row in rows:
+            count = row[-1]
+            for column, value in zip(FACET_COLUMNS, row[:-1]):
+                key = value or 'unknown'
+                result[column][key] = result[column].get(key, 0) + count
+        result = {column: dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+                  for column, counts in result.items()}
+        self._record('facet_queries', started)
+        return result
+
+    def _record(self, counter, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats[counter] += 1
+            self._stats['total_ms'] += elapsed_ms
+            self._stats['max_ms'] = max(self._stats['max_ms'], elapsed_ms)
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+        queries = data['searches'] + data['facet_queries']
+        data['avg_ms'] = round(data.pop('total_ms') / queries, 2) if queries else 0
+        data['max_ms'] = round(data['max_ms'], 2)
+        data['enabled'] = self.enabled
+        return data
+
+
+question_index = QuestionSearchIndex()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Question Bank Usage Statistics
+Serve counts and answer scores for bank questions are queued on the
+background writer and folded into question_bank in one batched UPDATE, so
+the library and the fallback sampler rank by precomputed columns instead of
+aggregating answers per request.
+
+    times_used             questions served from the bank
+    avg_score / score_count running mean of final answer scores
+    popularity             log1p(times_used) scaled by a Bayesian-smoothed
+                           score, so heavily used *and* well-answered
+                           questions rank first (indexed: ix_qbank_popularity)
+    calibrated_difficulty  easy / medium / hard from observed scores once a
+                           question has QUESTION_CALIBRATION_MIN answers
+
+Tunables (environment):
+    QUESTION_SCORE_PRIOR_MEAN    prior mean score for the Bayesian average (6.0)
+    QUESTION_SCORE_PRIOR_WEIGHT  pseudo-answers behind that prior           (5)
+    QUESTION_CALIBRATION_MIN     answers needed before calibrating           (5)
+"""
+
+import math
+import os
+
+from sqlalchemy import bindparam, text
+
+PRIOR_MEAN      = float(os.environ.get('QUESTION_SCORE_PRIOR_MEAN', '6.0'))
+PRIOR_WEIGHT    = float(os.environ.get('QUESTION_SCORE_PRIOR_WEIGHT', '5'))
+CALIBRATION_MIN = int(os.environ.get('QUESTION_CALIBRATION_MIN', '5'))
+
+# Observed average score -> difficulty (scores are 0-10)
+CALIBRATION_BANDS = ((7.5, 'easy'), (5.0, 'medium'), (0.0, 'hard'))
+
+
+def popularity(times_used, avg_score, score_count):
+    count = score_count or 0
+    quality = ((avg_score or 0.0) * count + PRIOR_WEIGHT * PRIOR_MEAN) / (count + PRIOR_WEIGHT)
+    return round(math.log1p(times_used or 0) * (0.5 + quality / 10.0), 4)
+
+
+def calibrated_difficulty(avg_score, score_count):
+    if (score_count or 0) < CALIBRATION_MIN or avg_score is None:
+        return None
+    for threshold, label in CALIBRATION_BANDS:
+        if avg_score >= threshold:
+            return label
+    return 'hard'
+
+
+def aggregate(served_ids, scores, corrections=()):
+    """
+    Collapse raw events into {bank_id: [served, score_sum, score_count]}.
+
+    scores      : (bank_id, score) for a newly answered question
+    corrections : (bank_id, new_score - old_score) when a provisional score
+                  (heuristic) is replaced by the AI score; adjusts the sum only
+    """
+    deltas = {}
+    for bank_id in served_ids:
+        deltas.setdefault(bank_id, [0, 0.0, 0])[0] += 1
+    for bank_id, score in scores:
+        if score is None:
+            continue
+        d = deltas.setdefault(bank_id, [0, 0.0, 0])
+        d[1] += float(score)
+        d[2] += 1
+    for bank_id, delta in corrections:
+        if delta:
+            deltas.setdefault(bank_id, [0, 0.0, 0])[1] += float(delta)
+    return deltas
+
+
+_UPDATE_COUNTERS = text("""
+    UPDATE question_bank SET
+        avg_score   = COALESCE((COALESCE(avg_score, 0) * COALESCE(score_count, 0) + :total)
+                                   / NULLIF(COALESCE(score_count, 0) + :cnt, 0), avg_score),
+        score_count = COALESCE(score_count, 0) + :cnt,
+        times_used  = COALESCE(times_used, 0) + :served
+    WHERE id = :id
+""")
+
+_UPDATE_RANKING = text("""
+    UPDATE question_bank SET popularity = :popularity, calibrated_difficulty = :calibrated
+    WHERE id = :id
+""")
+
+
+def apply_usage(session, deltas):
+    """Fold aggregated deltas into question_bank. Caller commits. Returns rows touched."""
+    if not deltas:
+        return 0
+    session.execute(_UPDATE_COUNTERS, [
+        {'id': bank_id, 'served': served, 'total': total, 'cnt': cnt}
+        for bank_id, (served, total, cnt) in deltas.items()])
+    return refresh_ranking(session, list(deltas))
+
+
+def refresh_ranking(session, ids=None):
+    """Recompute popularity / calibrated_difficulty for ids (all used questions if None)."""
+    if ids is None:
+        rows = session.execute(text(
+            "SELECT id, times_used, avg_score, score_count FROM question_bank "
+            "WHERE COALESCE(times_used, 0) > 0 OR COALESCE(score_count, 0) > 0")).all()
+    else:
+        rows = session.execute(text(
+            "SELECT id, times_used, avg_score, score_count FROM question_bank WHERE id IN :ids")
+            .bindparams(bindparam('ids', expanding=True)), {'ids': ids}).all()
+    if rows:
+        session.execute(_UPDATE_RANKING, [
+            {'id': r[0], 'popularity': popularity(r[1], r[2], r[3]),
+             'calibrated': calibrated_difficulty(r[2], r[3])} for r in rows])
+    return len(rows)
@@ -0,0 +1,195 @@
+"""
+Index types for the interview vector store.
+
+LangChain's FAISS wrapper always starts with an exact IndexFlatL2: every search
+scans every vector and each vector costs d * 4 bytes. FAISS_INDEX_TYPE picks
+what the store switches to once it holds FAISS_ANN_MIN_VECTORS records:
+
+    flat    exact search, no training (default; right for small stores)
+    hnsw    graph index, no training, fast and high recall, ~1.1x flat memory
+    ivf     inverted lists over k-means cells (IVF-Flat), nprobe cells searched
+    ivfpq   IVF with product-quantised vectors, ~15x less memory, lower recall
+
+The switch happens once, automatically, from the vectors already in the flat
+index. IVF cells are trained on the store as it was then; as it grows, run the
+rebuild command to retrain (ivfpq stores only compressed vectors, so its
+rebuild re-embeds the original texts with --reembed).
+
+Usage:
+    python rag/ann_index.py                               # show the current index
+    python rag/ann_index.py --rebuild                     # retrain as FAISS_INDEX_TYPE
+    python rag/ann_index.py --rebuild --index-type ivfpq --reembed
+    python rag/ann_index.py --compact                     # drop deleted / replaced / duplicate vectors
+"""
+import importlib.util
+import logging
+import math
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+# faiss + numpy cost ~200 ms to import; they are bound on first use (load_faiss)
+FAISS_AVAILABLE = importlib.util.find_spec('faiss') is not None
+faiss = None
+np = None
+
+INDEX_TYPES = ('flat', 'hnsw', 'ivf', 'ivfpq')
+
+INDEX_TYPE      = os.environ.get('FAISS_INDEX_TYPE', 'flat').lower()
+ANN_MIN_VECTORS = int(os.environ.get('FAISS_ANN_MIN_VECTORS', '25000'))  # stay exact below this
+IVF_NLIST       = int(os.environ.get('FAISS_IVF_NLIST', '0'))            # 0 = 4 * sqrt(n)
+IVF_NPROBE      = int(os.environ.get('FAISS_IVF_NPROBE', '16'))          # cells searched per query
+HNSW_M          = int(os.environ.get('FAISS_HNSW_M', '32'))              # graph neighbours per node
+HNSW_EF_SEARCH  = int(os.environ.get('FAISS_HNSW_EF_SEARCH', '64'))
+PQ_M            = int(os.environ.get('FAISS_PQ_M', '96'))                # sub-quantisers (bytes per vector)
+
+MIN_POINTS_PER_LIST = 39       # below this FAISS k-means warns and cells are poor
+MAX_POINTS_PER_LIST = 256      # training sample cap per cell; more only slows training
+
+
+def load_faiss():
+    """Imports faiss and numpy into this module. False when faiss is not installed."""
+    global faiss, np
+    if faiss is None and FAISS_AVAILABLE:
+        import faiss as faiss_module
+        import numpy as numpy_module
+        np, faiss = numpy_module, faiss_module
+    return faiss is not None
+
+
+def choose_nlist(n):
+    """Number of IVF cells for n vectors: 4*sqrt(n), but never fewer than 39 vectors per cell."""
+    nlist = IVF_NLIST or int(4 * math.sqrt(n))
+    return max(1, min(nlist, n // MIN_POINTS_PER_LIST))
+
+
+def pq_subquantizers(d, m=None):
+    """Largest divisor of d that is <= m (default FAISS_PQ_M); PQ needs d % m == 0."""
+    m = m or PQ_M
+    return max(k for k in range(1, min(m, d) + 1) if d % k == 0)
+
+
+def factory_spec(index_type, n, d):
+    """faiss.index_factory string for index_type sized for n vectors of dimension d."""
+    if index_type == 'hnsw':
+        return f'HNSW{HNSW_M},Flat'
+    if index_type == 'ivf':
+        return f'IVF{choose_nlist(n)},Flat'
+    if index_type == 'ivfpq':
+        return f'IVF{choose_nlist(n)},PQ{pq_subquantizers(d)}'
+    return 'Flat'
+
+
+def kind(index):
+    """'flat' / 'hnsw' / 'ivf' / 'ivfpq' for a FAISS index, None if unknown."""
+    if index is None or not load_faiss():
+        return None
+    if isinstance(index, faiss.IndexFlat):
+        return 'flat'
+    if isinstance(index, faiss.IndexHNSW):
+        return 'hnsw'
+    if isinstance(index, faiss.IndexIVFPQ):
+        return 'ivfpq'
+    if isinstance(index, faiss.IndexIVF):
+        return 'ivf'
+    return None
+
+
+def tune(index):
+    """Applies the search-time parameters (nprobe / efSearch) for index's type."""
+    index_kind = kind(index)
+    if index_kind in ('ivf', 'ivfpq'):
+        faiss.ParameterSpace().set_index_parameter(index, 'nprobe', IVF_NPROBE)
+        _ensure_direct_map(index)               # filtered search reconstructs rows by position
+    elif index_kind == 'hnsw':
+        faiss.ParameterSpace().set_index_parameter(index, 'efSearch', HNSW_EF_SEARCH)
+    return index
+
+
+def should_upgrade(index, index_type):
+    """True when a flat index has grown past the point where index_type pays off."""
+    return (FAISS_AVAILABLE and index_type != 'flat' and kind(index) == 'flat'
+            and index.ntotal >= ANN_MIN_VECTORS)
+
+
+def _ensure_direct_map(index):
+    """IVF indexes can only reconstruct rows by position once they keep a direct map."""
+    if kind(index) in ('ivf', 'ivfpq'):
+        ivf = faiss.extract_index_ivf(index)
+        if ivf.direct_map.type == faiss.DirectMap.NoMap:
+            ivf.make_direct_map()
+
+
+def vectors_of(index, start=0):
+    """Stored vectors [start, ntotal) as a float32 array (approximate for ivfpq)."""
+    _ensure_direct_map(index)
+    return index.reconstruct_n(start, index.ntotal - start)
+
+
+def vectors_of_rows(index, rows):
+    """Stored vectors at the given row positions (approximate for ivfpq)."""
+    _ensure_direct_map(index)
+    return index.reconstruct_batch(np.asarray(rows, dtype='int64'))
+
+
+def build_index(vectors, index_type, seed=1234):
+    """A trained index of index_type holding vectors (row order = docstore order)."""
+    load_faiss()
+    vectors = np.ascontiguousarray(vectors, dtype='float32')
+    n, d = vectors.shape
+    index = faiss.index_factory(d, factory_spec(index_type, n, d), faiss.METRIC_L2)
+    if not index.is_trained:
+        nlist = faiss.extract_index_ivf(index).nlist
+        sample = vectors
+        if n > nlist * MAX_POINTS_PER_LIST:
+            rows = np.random.default_rng(seed).choice(n, nlist * MAX_POINTS_PER_LIST, replace=False)
+            sample = vectors[np.sort(rows)]
+        index.train(sample)
+    index.add(vectors)
+    return tune(index)
+
+
+def describe(index):
+    """Type, size and search parameters of a FAISS index, for stats()."""
+    index_kind = kind(index)
+    if index_kind is None:
+        return None
+    info = {'type': index_kind, 'vectors': index.ntotal, 'dimension': index.d}
+    if index_kind in ('ivf', 'ivfpq'):
+        ivf = faiss.extract_index_ivf(index)
+        info.update(nlist=ivf.nlist, nprobe=ivf.nprobe)
+    elif index_kind == 'hnsw':
+        info.update(m=HNSW_M, ef_search=index.hnsw.efSearch)
+    return info
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description='Show or rebuild the FAISS interview index.')
+    parser.add_argument('--rebuild', action='store_true', help='retrain the index from its vectors')
+    parser.add_argument('--index-type', choices=INDEX_TYPES, default=None,
+                        help='target type (default FAISS_INDEX_TYPE)')
+    parser.add_argument('--reembed', action='store_true',
+                        help='re-embed the stored texts instead of reusing vectors (needed after ivfpq)')
+    parser.add_argument('--compact', action='store_true',
+                        help='rebuild without deleted, replaced or duplicate records; reports size before/after')
+    args = parser.parse_args()
+
+    from rag.vector_store import vector_store_manager
+    if not vector_store_manager.load() or vector_store_manager.vector_store is None:
+        print("No FAISS index loaded (RAG unavailable or nothing recorded yet).")
+        sys.exit(1)
+    if args.compact:
+        report = vector_store_manager.compact(reembed=args.reembed)
+        print(json.dumps(report, indent=2))
+    elif args.rebuild:
+        report = vector_store_manager.rebuild_index(args.index_type, reembed=args.reembed)
+        print(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(describe(vector_store_manager.vector_store.index), indent=2))
@@ -0,0 +1,166 @@
+"""
+Keyword (BM25) index over the interview vector store, and the reciprocal-rank
+fusion that combines it with FAISS.
+
+Dense search finds records that read alike, which for a short technical
+answer is often a different question on a neighbouring topic. BM25 ranks by
+the rare terms a query shares with a record (an API name, "deadlock",
+"B-tree"), which dense search weighs loosely. VectorStoreManager.search_hybrid()
+takes the top HYBRID_CANDIDATES rows of each and fuses the two rankings:
+
+    rrf(row) = sum over rankings of 1 / (RRF_K + rank of row)
+
+A record near the top of both lists beats one that only one retriever likes,
+without having to calibrate BM25 scores against L2 distances.
+
+BM25Index keeps, per term, the rows containing it and the term's frequency in
+each (Okapi BM25, k1 = BM25_K1, b = BM25_B), keyed by FAISS row position like
+metadata_filter.MetadataIndex. Rows are appended as the store grows; for an
+index loaded from disk it is built on first use (or by the manager's warm-up).
+The labels of the record template (Question:, Answer:, ...) and common English
+words are not indexed.
+"""
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+
+from . import ann_index
+
+np = None               # bound from ann_index on first search
+
+BM25_K1           = float(os.environ.get('BM25_K1', '1.2'))
+BM25_B            = float(os.environ.get('BM25_B', '0.75'))
+RRF_K             = int(os.environ.get('RRF_K', '60'))                 # rank damping in the fusion
+HYBRID_CANDIDATES = int(os.environ.get('HYBRID_CANDIDATES', '20'))    # rows taken from each retriever
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")           # keeps c++ / c#; node.js -> node, js
+
+STOPWORDS = frozenset("""
+    a an and are as at be but by can do does for from has have how i if in into is it its of on or so such
+    that the their then there these they this to was we what when where which while who why will with you
+    your question answer feedback score
+""".split())
+
+
+def tokenize(text):
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def reciprocal_rank_fusion(rankings, top_k, k=RRF_K):
+    """Rows of several best-first rankings, ordered by sum(1 / (k + rank)); ties keep first-seen order."""
+    fused = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, 1):
+            row = int(row)
+            fused[row] = fused.get(row, 0.0) + 1.0 / (k + rank)
+    return sorted(fused, key=fused.get, reverse=True)[:top_k]
+
+
+class BM25Index:
+    """Term -> (rows, term frequencies) postings and per-row lengths, for one FAISS index."""
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1, self.b = k1, b
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._postings = {}                     # term -> (array('I') rows, array('H') frequencies)
+        self._lengths = array('I')              # indexed tokens per row
+        self._total = 0                         # indexed tokens in all rows
+        self._count = 0                         # postings in all lists
+        self._source = None                     # store to read the texts from on first use
+
+    def __len__(self):
+        self.prepare()
+        return len(self._lengths)
+
+    def add(self, texts):
+        """Appends rows in index order (call under the store's write lock, with the rows' index.add)."""
+        self.prepare()
+        self._append(texts)
+
+    def _append(self, texts):
+        for text in texts:
+            row = len(self._lengths)
+            tokens = tokenize(text or '')
+            for term, count in Counter(tokens).items():
+                posting = self._postings.get(term)
+                if posting is None:
+                    posting = self._postings[term] = (array('I'), array('H'))
+                posting[0].append(row)
+                posting[1].append(min(count, 0xFFFF))
+                self._count += 1
+            self._lengths.append(len(tokens))
+            self._total += len(tokens)
+
+    def rebuild(self, store):
+        """Re-reads every row's text from a FAISS store (after load_local)."""
+        self._postings, self._lengths, self._total, self._count = {}, array('I'), 0, 0
+        if hasattr(store, 'contents'):
+            self._append(store.contents())      # faiss_store.MappedFAISS: one SQLite scan
+        else:
+            self._append(store.docstore.search(store.index_to_docstore_id[row]).page_content
+                         for row in range(store.index.ntotal))
+        self._source = None
+
+    def defer(self, store):
+        """Like rebuild(store), but on first use."""
+        self.clear()
+        self._source = store
+
+    def prepare(self):
+        """Builds a deferred index now. Call with the store's lock held (read or write)."""
+        if self._source is None:
+            return
+        with self._lock:
+            if self._source is not None:
+                self.rebuild(self._source)
+
+    def search(self, query, k, rows=None, dead=None):
+        """(scores, positions) of the k best BM25 rows, best first; rows sharing no term are not returned.
+
+        rows (sorted int64 positions) restricts the search to those rows; dead
+        rows are skipped otherwise.
+        """
+        global np
+        if np is None and ann_index.load_faiss():
+            np = ann_index.np
+        self.prepare()
+        n = len(self._lengths)
+        terms = [t for t in set(tokenize(query)) if t in self._postings]
+        if not n or not terms:
+            return np.empty(0, dtype='float32'), np.empty(0, dtype='int64')
+        lengths = np.frombuffer(self._lengths, dtype='uint32')     # no copy; dropped before returning
+        norm = self.k1 * (1 - self.b + self.b * lengths / (self._total / n or 1))
+        matched, weights = [], []
+        for term in terms:
+            posting_rows, frequencies = self._postings[term]
+            found = np.frombuffer(posting_rows, dtype='uint32').astype('int64')
+            tf = np.frombuffer(frequencies, dtype='uint16').astype('float32')
+            idf = math.log(1 + (n - len(found) + 0.5) / (len(found) + 0.5))
+            matched.append(found)
+            weights.append(idf * tf * (self.k1 + 1) / (tf + norm[found]))
+        del lengths
+        scores = np.bincount(np.concatenate(matched), weights=np.concatenate(weights), minlength=n)
+        if rows is not None:
+            candidates = rows[rows < n]
+            scores = scores[candidates]
+        else:
+            candidates = None
+            if dead is not None and len(dead):
+                scores[dead[dead < n]] = 0
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        positions = candidates[hits] if candidates is not None else hits
+        return scores[hits].astype('float32'), positions.astype('int64')
+
+    def stats(self):
+        return {'rows': len(self._lengths), 'terms': len(self._postings), 'postings': self._count,
+                'memory_mb': round((self._count * 6 + len(self._lengths) * 4) / 2 ** 20, 2),
+                'deferred': self._source is not None}
@@ -0,0 +1,168 @@
+"""
+Dynamic batching for the embedding model.
+
+Single-text embeds arrive from many threads at once: searches from request
+threads, interview records from the FAISS writer, question imports. Running
+each as its own forward pass leaves the CPU mostly in per-call overhead.
+BatchedEmbeddings puts every text on one queue; a worker thread takes what
+has arrived within EMBEDDING_BATCH_DELAY_MS of the first (up to
+EMBEDDING_BATCH_MAX texts) and embeds them in one embed_documents() call.
+Each caller blocks only until its own vector is ready.
+
+Lists of EMBEDDING_BATCH_MAX or more texts are already a batch and go to the
+model directly.
+
+    EMBEDDING_BATCHER         1 = on (default), 0 = call the model directly
+    EMBEDDING_BATCH_MAX       texts per forward pass  (32)
+    EMBEDDING_BATCH_DELAY_MS  wait for company after the first text (5)
+"""
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+try:
+    from langchain_core.embeddings import Embeddings as _EmbeddingsBase   # LangChain's FAISS checks isinstance
+except ImportError:
+    _EmbeddingsBase = object
+
+BATCHER_ENABLED = os.environ.get('EMBEDDING_BATCHER', '1') != '0'
+BATCH_MAX       = int(os.environ.get('EMBEDDING_BATCH_MAX', '32'))
+BATCH_DELAY     = float(os.environ.get('EMBEDDING_BATCH_DELAY_MS', '5')) / 1000
+
+
+class _Request:
+    __slots__ = ('text', 'kind', 'queued_at', 'done', 'vector', 'error')
+
+    def __init__(self, text, kind):
+        self.text, self.kind = text, kind
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.vector = self.error = None
+
+
+class BatchedEmbeddings(_EmbeddingsBase):
+    """embed_documents / embed_query that share forward passes across threads.
+
+    symmetric=True means the model embeds a query exactly as a document
+    (true of HuggingFaceEmbeddings and OnnxEmbeddings), so queries and
+    documents go into the same pass; otherwise queries use embed_query.
+    """
+
+    def __init__(self, embeddings, max_batch=BATCH_MAX, max_delay=BATCH_DELAY, symmetric=True,
+                 name='embedding-batcher'):
+        self.embeddings = embeddings
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.symmetric = symmetric
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'texts': 0, 'direct_texts': 0, 'batches': 0, 'max_batch_size': 0, 'errors': 0,
+            'total_wait_ms': 0.0, 'total_forward_ms': 0.0, 'busy_sec': 0.0,
+        }
+        self._started_at = time.monotonic()
+
+    # ── Callers ───────────────────────────────────────────────────────────────
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        if len(texts) >= self.max_batch:
+            with self._stats_lock:
+                self._stats['direct_texts'] += len(texts)
+            return self.embeddings.embed_documents(texts)
+        return self._submit(texts, 'doc')
+
+    def embed_query(self, text):
+        return self._submit([text], 'query')[0]
+
+    def _submit(self, texts, kind):
+        if not texts:
+            return []
+        self._ensure_started()
+        requests = [_Request(text, kind) for text in texts]
+        for request in requests:
+            self._queue.put(request)
+        for request in requests:
+            request.done.wait()
+            if request.error is not None:
+                raise request.error
+        return [request.vector for request in requests]
+
+    # ── Worker thread ─────────────────────────────────────────────────────────
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())      # already waiting: no need to sleep
+                    continue
+                except queue.Empty:
+                    pass
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._forward(batch)
+
+    def _forward(self, batch):
+        started = time.perf_counter()
+        together = batch if self.symmetric else [r for r in batch if r.kind == 'doc']
+        failed = False
+        try:
+            if together:
+                for request, vector in zip(together, self.embeddings.embed_documents([r.text for r in together])):
+                    request.vector = vector
+            for request in batch:
+                if request.vector is None:
+                    request.vector = self.embeddings.embed_query(request.text)
+        except Exception as e:
+            failed = True
+            logger.warning(f"[{self.name}] Batch of {len(batch)} failed: {str(e)[:120]}")
+            for request in batch:
+                request.error = e
+        finished = time.perf_counter()
+        for request in batch:
+            request.done.set()
+        with self._stats_lock:
+            s = self._stats
+            s['texts'] += len(batch)
+            s['batches'] += 1
+            s['errors'] += failed
+            s['max_batch_size'] = max(s['max_batch_size'], len(batch))
+            s['total_wait_ms'] += sum(started - r.queued_at for r in batch) * 1000
+            s['total_forward_ms'] += (finished - started) * 1000
+            s['busy_sec'] += finished - started
+
+    # ── Metrics ───────────────────────────────────────────────────────────────
+
+    def stats(self):
+        with self._stats_lock:
+            data = dict(self._stats)
+        batches, texts = data['batches'], data['texts']
+        data['avg_batch_size'] = round(texts / batches, 2) if batches else 0
+        data['avg_wait_ms'] = round(data.pop('total_wait_ms') / texts, 2) if texts else 0
+        data['avg_forward_ms'] = round(data.pop('total_forward_ms') / batches, 2) if batches else 0
+        data['busy_pct'] = round(100 * data.pop('busy_sec') / max(time.monotonic() - self._started_at, 1e-9), 1)
+        data['queue_depth'] = self._queue.qsize()
+        data['max_batch'], data['max_delay_ms'] = self.max_batch, round(self.max_delay * 1000, 2)
+        return data
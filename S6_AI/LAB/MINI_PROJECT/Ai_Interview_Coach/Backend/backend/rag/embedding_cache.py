@@ -0,0 +1,237 @@
+"""
+Persistent, content-addressed embedding cache.
+
+Every text is keyed by a hash of its normalised form (Unicode NFC, runs of
+whitespace collapsed) plus whether it was embedded as a document or a query.
+Vectors live in a memory-mapped float32 file (vectors.f32, one row per
+entry) and the hash -> row index in a small SQLite file next to it, so the
+cache is shared by every process and survives restarts. Each embedding model
+gets its own directory under EMBEDDING_CACHE_DIR, and a meta.json records the
+model name, dimension and format version. A different model never reads
+another model's vectors, and a mismatch (or vectors of a new dimension) wipes
+the directory.
+
+Writers allocate rows inside BEGIN IMMEDIATE and write the vectors before
+committing the index rows, so a reader in another process never sees a row
+whose vector is not on disk yet.
+
+    EMBEDDING_CACHE               1 = on (default), 0 = embed every time
+    EMBEDDING_CACHE_DIR           root directory   (data/embedding_cache)
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from langchain_core.embeddings import Embeddings as _EmbeddingsBase   # LangChain's FAISS checks isinstance
+except ImportError:
+    _EmbeddingsBase = object
+
+CACHE_ENABLED = os.environ.get('EMBEDDING_CACHE', '1') != '0'
+CACHE_DIR     = os.environ.get('EMBEDDING_CACHE_DIR',
+                               os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'embedding_cache'))
+FORMAT_VERSION   = 1
+INITIAL_CAPACITY = 4096          # rows; the vectors file doubles when full
+_LOOKUP_CHUNK    = 500           # hashes per SELECT ... IN (...)
+
+
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def text_key(text, kind='doc'):
+    """16-byte key for text embedded as kind ('doc' or 'query')."""
+    return hashlib.blake2b(f'{kind}\0{normalize(text)}'.encode('utf-8'), digest_size=16).digest()
+
+
+def _slug(model_name):
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', model_name).strip('_') or 'model'
+
+
+class EmbeddingCache:
+    """hash -> vector store for one embedding model. Thread-safe; safe across processes."""
+
+    def __init__(self, model_name, path=CACHE_DIR, initial_capacity=INITIAL_CAPACITY):
+        self.model_name = model_name
+        self.dir = os.path.join(path, _slug(model_name))
+        self.initial_capacity = initial_capacity
+        self.dim = None
+        self._vectors = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stored': 0}
+        os.makedirs(self.dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.dir, 'index.sqlite'), timeout=30,
+                                   check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS entries (hash BLOB PRIMARY KEY, row INTEGER NOT NULL) "
+                         "WITHOUT ROWID")
+        self._read_meta()
+
+    # ── Files ─────────────────────────────────────────────────────────────────
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.dir, 'meta.json')
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.dir, 'vectors.f32')
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_path) as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if meta.get('model') != self.model_name or meta.get('format') != FORMAT_VERSION:
+            logger.info(f"[EmbeddingCache] {self.dir} was built for {meta.get('model')!r} "
+                        f"(format {meta.get('format')}); starting over")
+            self._wipe()
+            return
+        self.dim = meta['dim']
+
+    def _init_dim(self, dim):
+        """First write fixes the dimension for this model's cache."""
+        self.dim = dim
+        tmp = f'{self._meta_path}.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump({'model': self.model_name, 'dim': dim, 'format': FORMAT_VERSION}, fh)
+        os.replace(tmp, self._meta_path)
+
+    def _wipe(self):
+        self._vectors = None
+        self.dim = None
+        self._db.execute("DELETE FROM entries")
+        for name in ('vectors.f32', 'meta.json'):
+            try:
+                os.remove(os.path.join(self.dir, name))
+            except FileNotFoundError:
+                pass
+
+    def _map(self, rows_needed=0):
+        """Memory map covering at least rows_needed rows, growing the file (x2) if required."""
+        row_bytes = self.dim * 4
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        if size < rows_needed * row_bytes:
+            capacity = max(self.initial_capacity, size // row_bytes)
+            while capacity < rows_needed:
+                capacity *= 2
+            with open(self._vectors_path, 'ab') as fh:
+                fh.truncate(capacity * row_bytes)
+            size = capacity * row_bytes
+        if self._vectors is None or len(self._vectors) * row_bytes != size:
+            self._vectors = np.memmap(self._vectors_path, dtype='float32', mode='r+',
+                                      shape=(size // row_bytes, self.dim))
+        return self._vectors
+
+    # ── Lookups ───────────────────────────────────────────────────────────────
+
+    def get_many(self, keys):
+        """Vectors (float32 arrays) for keys, None where not cached."""
+        found = {}
+        with self._lock:
+            if self.dim is not None:
+                for start in range(0, len(keys), _LOOKUP_CHUNK):
+                    chunk = keys[start:start + _LOOKUP_CHUNK]
+                    found.update(self._db.execute(
+                        f"SELECT hash, row FROM entries WHERE hash IN ({','.join('?' * len(chunk))})",
+                        chunk).fetchall())
+                if found:
+                    vectors = self._map(max(found.values()) + 1)    # another process may have grown it
+                    found = {key: np.array(vectors[row]) for key, row in found.items()}
+            self._stats['hits'] += len(found)
+            self._stats['misses'] += len(keys) - len(found)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, keys, vectors):
+        """Stores vectors under keys; keys already present are left as they are."""
+        vectors = np.asarray(vectors, dtype='float32')
+        if not len(keys):
+            return 0
+        with self._lock:
+            if self.dim is not None and vectors.shape[1] != self.dim:
+                logger.info(f"[EmbeddingCache] dimension changed {self.dim} -> {vectors.shape[1]}; starting over")
+                self._wipe()
+            if self.dim is None:
+                self._init_dim(vectors.shape[1])
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                present = set()
+                for start in range(0, len(keys), _LOOKUP_CHUNK):
+                    chunk = keys[start:start + _LOOKUP_CHUNK]
+                    present.update(key for (key,) in self._db.execute(
+                        f"SELECT hash FROM entries WHERE hash IN ({','.join('?' * len(chunk))})", chunk))
+                new = {}
+                for key, vector in zip(keys, vectors):
+                    if key not in present and key not in new:
+                        new[key] = vector
+                if new:
+                    first = self._db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM entries").fetchone()[0]
+                    mapped = self._map(first + len(new))
+                    mapped[first:first + len(new)] = np.stack(list(new.values()))
+                    mapped.flush()                                  # vectors on disk before the index rows
+                    self._db.executemany("INSERT INTO entries (hash, row) VALUES (?, ?)",
+                                         ((key, first + i) for i, key in enumerate(new)))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._stats['stored'] += len(new)
+        return len(new)
+
+    def clear(self):
+        with self._lock:
+            self._wipe()
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = s['hits'] + s['misses']
+        s.update(model=self.model_name, dim=self.dim, entries=entries,
+                 hit_rate=round(s['hits'] / lookups, 4) if lookups else None,
+                 file_mb=round(os.path.getsize(self._vectors_path) / 1e6, 1)
+                 if os.path.exists(self._vectors_path) else 0.0)
+        return s
+
+
+class CachedEmbeddings(_EmbeddingsBase):
+    """Wraps a LangChain Embeddings object: cached texts are not embedded again,
+    and repeats inside one batch are embedded once."""
+
+    def __init__(self, embeddings, cache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def _embed(self, texts, kind, embed_fn):
+        keys = [text_key(t, kind) for t in texts]
+        vectors = self.cache.get_many(keys)
+        missing = {}
+        for i, (key, vector) in enumerate(zip(keys, vectors)):
+            if vector is None:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            fresh = embed_fn([texts[rows[0]] for rows in missing.values()])
+            try:
+                self.cache.put_many(list(missing), fresh)
+            except Exception as e:                          # a full disk must not break embedding
+                logger.warning(f"[EmbeddingCache] store failed: {str(e)[:80]}")
+            for rows, vector in zip(missing.values(), fresh):
+                for i in rows:
+                    vectors[i] = vector
+        return [v.tolist() if isinstance(v, np.ndarray) else list(v) for v in vectors]
+
+    def embed_documents(self, texts):
+        return self._embed(list(texts), 'doc', self.embeddings.embed_documents)
+
+    def embed_query(self, text):
+        return self._embed([text], 'query', lambda ts: [self.embeddings.embed_query(ts[0])])[0]
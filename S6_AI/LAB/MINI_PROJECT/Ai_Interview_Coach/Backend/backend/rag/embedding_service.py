@@ -1,10 +1,25 @@
 """
 Provides the embedding model used for the RAG pipeline.
+
+EMBEDDING_BACKEND picks the implementation: 'torch' (default,
+HuggingFaceEmbeddings) or 'onnx' (onnx_embeddings.py: int8 ONNX Runtime, no
+torch). Nothing heavy happens at import. The model is loaded by the first
+get_embeddings() call, or ahead of time by warm_up() on a background thread;
+status() reports which stage it is in for /api/health.
+
+get_embeddings() returns the model wrapped in the persistent embedding cache
+(embedding_cache.py), so a text that was embedded once - by the app, the
+vector store or update_vectors.py - is never embedded again by this model.
+Cache misses go through the dynamic batcher (embedding_batcher.py), which
+merges concurrent single-text calls into one forward pass. embed_batch()
+embeds a list in one call.
 """
-import os
+import importlib.util
 import logging
+import os
+import threading
+import time
 import warnings
-import sys
 
 logger = logging.getLogger(__name__)
 
@@ -21,36 +36,39 @@ warnings.filterwarnings("ignore", message=".*deprecated.*", category=Deprecation
 warnings.filterwarnings("ignore", category=UserWarning, message=".*Core Pydantic V1.*")
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", message=".*torch.*")
 
-# Gracefully handle missing langchain libraries
-LANGCHAIN_AVAILABLE = False
-try:
-    from langchain_community.embeddings import HuggingFaceEmbeddings
-    LANGCHAIN_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"LangChain not available: {e}. RAG embeddings will be disabled.")
-    HuggingFaceEmbeddings = None
-
-# Additional warning suppression for sentence-transformers and torch
-if LANGCHAIN_AVAILABLE:
-    try:
-        import sentence_transformers
-        warnings.filterwarnings("ignore", message=".*position_ids.*")
-        warnings.filterwarnings("ignore", message=".*UNEXPECTED.*")
-    except:
-        pass
-    
-    try:
-        import torch
-        warnings.filterwarnings("ignore", message=".*torch.*")
-    except:
-        pass
-    
+# 'torch' = HuggingFaceEmbeddings (sentence-transformers); 'onnx' = onnx_embeddings.OnnxEmbeddings
+EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND', 'torch').lower()
+
+# Only look the packages up here: importing langchain_community, sentence-transformers
+# and torch takes seconds and hundreds of MB, so it happens on first use (_import_model_stack)
+LANGCHAIN_AVAILABLE = importlib.util.find_spec('langchain_community') is not None
+if EMBEDDING_BACKEND == 'onnx':
+    BACKEND_AVAILABLE = all(importlib.util.find_spec(name) for name in ('onnxruntime', 'tokenizers'))
+else:
+    BACKEND_AVAILABLE = LANGCHAIN_AVAILABLE
+if not BACKEND_AVAILABLE:
+    logger.warning(f"Embedding backend {EMBEDDING_BACKEND!r} not installed. RAG embeddings will be disabled.")
+HuggingFaceEmbeddings = None
+
+
+def _import_model_stack():
+    """Imports HuggingFaceEmbeddings (and with it sentence-transformers / torch) once."""
+    global HuggingFaceEmbeddings
+    if HuggingFaceEmbeddings is not None:
+        return HuggingFaceEmbeddings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        from langchain_community.embeddings import HuggingFaceEmbeddings as embeddings_class
     try:
         import langchain.core._api.deprecation
         langchain.core._api.deprecation._warn_deprecated = lambda **kwargs: None
     except:
         pass
+    HuggingFaceEmbeddings = embeddings_class
+    return HuggingFaceEmbeddings
+
 
 # Default model: lightweight, fast, and good for semantic search
 DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
@@ -69,37 +87,90 @@ class EmbeddingService:
         if self._initialized:
             return
         self.model_name = model_name
+        self.backend = EMBEDDING_BACKEND
         self.embeddings = None
-        self.available = LANGCHAIN_AVAILABLE
-        if self.available:
-            self._initialize()
-        else:
+        self.batcher = None
+        self.cache = None
+        self.available = BACKEND_AVAILABLE
+        self.state = 'not_loaded' if self.available else 'unavailable'
+        self.load_seconds = None
+        self._load_lock = threading.Lock()
+        if not self.available:
             logger.info("LangChain not available - RAG embeddings disabled")
         self._initialized = True
 
     def _initialize(self):
-        """Initialize embeddings if langchain is available."""
-        if not LANGCHAIN_AVAILABLE:
-            logger.warning("Cannot initialize embeddings - LangChain not installed")
-            return
-            
+        """Loads the model (and wraps it in the embedding cache). Runs once, under _load_lock."""
+        cache_name = self.model_name
         try:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            # Suppress ALL warnings during initialization
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                self.embeddings = HuggingFaceEmbeddings(model_name=self.model_name)
+            logger.info(f"Loading embedding model: {self.model_name} ({self.backend})")
+            if self.backend == 'onnx':
+                from .onnx_embeddings import OnnxEmbeddings
+                self.embeddings = OnnxEmbeddings()
+                # int8 vectors differ slightly from torch's: they get their own cache
+                cache_name = f"{self.model_name}@onnx-{'int8' if 'int8' in self.embeddings.model_path else 'fp32'}"
+            else:
+                # Suppress ALL warnings during initialization
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    self.embeddings = _import_model_stack()(model_name=self.model_name)
             logger.info("[OK] Embedding model loaded successfully (cached for reuse)")
         except Exception as e:
             logger.warning(f"Failed to load embedding model: {e}. RAG will be unavailable.")
             self.embeddings = None
             self.available = False
+            return
+
+        from .embedding_batcher import BATCHER_ENABLED, BatchedEmbeddings
+        if BATCHER_ENABLED:                         # concurrent single texts share one forward pass
+            self.batcher = BatchedEmbeddings(self.embeddings)
+            self.embeddings = self.batcher
+
+        from .embedding_cache import CACHE_ENABLED, CachedEmbeddings, EmbeddingCache
+        if CACHE_ENABLED:                           # outermost: cache hits never wait for a batch
+            try:
+                self.cache = EmbeddingCache(cache_name)
+                self.embeddings = CachedEmbeddings(self.embeddings, self.cache)
+            except Exception as e:                          # read-only disk etc.: embed uncached
+                logger.warning(f"[EmbeddingCache] disabled: {str(e)[:80]}")
+                self.cache = None
+
+    def load(self):
+        """Loads the model now if nobody has yet; concurrent callers wait for the one load."""
+        if self.state != 'not_loaded' and self.state != 'loading':
+            return self.embeddings is not None
+        with self._load_lock:
+            if self.state == 'not_loaded':
+                self.state = 'loading'
+                started = time.perf_counter()
+                self._initialize()
+                self.load_seconds = round(time.perf_counter() - started, 2)
+                self.state = 'ready' if self.embeddings is not None else 'failed'
+        return self.embeddings is not None
+
+    def warm_up(self):
+        """Starts loading the model on a daemon thread; returns immediately."""
+        if self.state == 'not_loaded':
+            threading.Thread(target=self.load, daemon=True, name='embedding-warmup').start()
+
+    def status(self):
+        return {'state': self.state, 'model': self.model_name, 'backend': self.backend,
+                'load_seconds': self.load_seconds, 'batcher': self.batcher.stats() if self.batcher else None}
 
     def get_embeddings(self):
-        """Returns the cached HuggingFaceEmbeddings instance, or None if unavailable."""
-        if not self.available or not self.embeddings:
+        """Returns the cached HuggingFaceEmbeddings instance (behind the embedding cache), or None if unavailable.
+        The first call loads the model unless warm_up() already has."""
+        if not self.available or not self.load():
             return None
         return self.embeddings
 
+    def embed_batch(self, texts):
+        """Vectors for texts in one call: cached ones from the cache, the rest in shared forward passes.
+        None if embeddings are unavailable."""
+        embeddings = self.get_embeddings()
+        if embeddings is None:
+            return None
+        return embeddings.embed_documents(list(texts))
+
 # Singleton instance for easy import - gracefully handles missing langchain
 embedding_service = EmbeddingService()
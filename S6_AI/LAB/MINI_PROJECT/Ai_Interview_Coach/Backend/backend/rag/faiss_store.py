@@ -0,0 +1,294 @@
+"""
+Pickle-free, memory-mapped storage for the interview vector store.
+
+LangChain's FAISS.save_local() pickles the docstore to index.pkl, so every
+load_local() executes whatever that file contains, and it reads all of
+index.faiss and every document into each worker's memory before the first
+search. MappedFAISS keeps the interface VectorStoreManager uses
+(from_embeddings / add_embeddings / similarity_search_by_vector / save_local /
+load_local, .index, .docstore, .index_to_docstore_id) over two files:
+
+    index.faiss       the FAISS index, opened with IO_FLAG_MMAP_IFC: vectors are
+                      paged in on demand from the page cache, which every
+                      gunicorn worker on the host shares
+    docstore.sqlite   one row per vector (row, content, metadata as JSON), read
+                      one hit at a time; nothing is deserialised at load, plus
+                      the rows deleted since the last compaction (tombstones)
+
+Opening both is constant-time whatever the size of the store. A worker that
+adds records copies the index into its own memory on the first add (a mapped
+index is read-only) and keeps the new documents in memory until the next
+save_local(), which copies the saved docstore with SQLite's backup API and
+appends them.
+
+A directory in the old LangChain format (index.pkl beside index.faiss) is
+converted in place the first time it is loaded: the pickle is read once,
+through LangChain, and deleted once docstore.sqlite is on disk. To convert
+ahead of a deploy instead:
+
+    python rag/faiss_store.py --migrate [index_dir]
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag import ann_index
+
+logger = logging.getLogger(__name__)
+
+try:
+    from langchain_core.documents import Document
+except ImportError:
+    class Document:
+        """Stand-in for langchain_core's Document when LangChain is not installed."""
+
+        def __init__(self, page_content, metadata=None):
+            self.page_content, self.metadata = page_content, metadata or {}
+
+INDEX_FILE    = 'index.faiss'
+DOCSTORE_FILE = 'docstore.sqlite'
+LEGACY_FILE   = 'index.pkl'
+
+
+def _read_flags():
+    """Flags for faiss.read_index: mmap the vectors where this faiss build can (>= 1.11)."""
+    return getattr(ann_index.faiss, 'IO_FLAG_MMAP_IFC', 0)
+
+
+def _fsync(path):
+    with open(path, 'rb') as fh:
+        os.fsync(fh.fileno())
+
+
+class SqliteDocstore:
+    """Documents by FAISS row position: the saved ones in a read-only SQLite file, new ones in memory."""
+
+    def __init__(self, path=None):
+        self._lock = threading.Lock()
+        self._db = None
+        self._saved = 0                         # rows held by the file
+        self._pending = {}                      # row -> Document added since the file was written
+        self._deleting = set()                  # rows deleted since the file was written
+        self._has_deleted = False               # files written before deletes existed have no such table
+        if path:
+            self.attach(path)
+
+    def attach(self, path):
+        """Serves saved rows from path (a file save_local() just wrote) and drops the ones it now holds."""
+        # immutable: no locks, journal or WAL are opened, only this one file, which is never
+        # modified after it is written, and stays readable after the directory swap unlinks it
+        db = sqlite3.connect(f'file:{path}?mode=ro&immutable=1', uri=True, check_same_thread=False)
+        saved = db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM docs").fetchone()[0]
+        has_deleted = db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'deleted'").fetchone()
+        with self._lock:
+            old, self._db, self._saved = self._db, db, saved
+            self._pending = {row: doc for row, doc in self._pending.items() if row >= saved}
+            self._deleting.clear()
+            self._has_deleted = has_deleted is not None
+        if old is not None:
+            old.close()
+
+    def __len__(self):
+        with self._lock:
+            return max(self._saved, max(self._pending, default=-1) + 1)
+
+    def add(self, documents):
+        """documents: {row: Document} for rows just added to the index."""
+        with self._lock:
+            self._pending.update(documents)
+
+    def delete(self, rows):
+        """Marks rows deleted: their documents stay readable, metadatas() reports them as None."""
+        with self._lock:
+            self._deleting.update(int(row) for row in rows)
+
+    def contents(self):
+        """Every row's text in row order, in one pass (for building the keyword index)."""
+        with self._lock:
+            saved = self._db.execute("SELECT content FROM docs ORDER BY row").fetchall() if self._db else []
+            pending = [self._pending[row] for row in sorted(self._pending)]
+        return [content for (content,) in saved] + [doc.page_content for doc in pending]
+
+    def deleted(self):
+        """Sorted positions of every deleted row, saved or not."""
+        with self._lock:
+            saved = self._db.execute("SELECT row FROM deleted").fetchall() if self._has_deleted else []
+            return sorted(self._deleting.union(row for (row,) in saved))
+
+    def search(self, row):
+        with self._lock:
+            doc = self._pending.get(row)
+            if doc is not None:
+                return doc
+            found = (self._db.execute("SELECT content, metadata FROM docs WHERE row = ?", (int(row),)).fetchone()
+                     if self._db is not None and row < self._saved else None)
+        if found is None:
+            raise KeyError(f"No document for row {row}")
+        return Document(page_content=found[0], metadata=json.loads(found[1]))
+
+    def metadatas(self):
+        """Every row's metadata in row order, in one pass (for rebuilding the filter index); None if deleted."""
+        with self._lock:
+            if self._db is None:
+                saved = []
+            elif self._has_deleted:
+                saved = self._db.execute("SELECT docs.row, metadata, deleted.row IS NOT NULL FROM docs LEFT JOIN "
+                                         "deleted ON deleted.row = docs.row ORDER BY docs.row").fetchall()
+            else:
+                saved = self._db.execute("SELECT row, metadata, 0 FROM docs ORDER BY row").fetchall()
+            pending = sorted(self._pending.items())
+            deleting = set(self._deleting)
+        return ([None if gone or row in deleting else json.loads(m) for row, m, gone in saved] +
+                [None if row in deleting else doc.metadata for row, doc in pending])
+
+    def write(self, path):
+        """Writes every row, saved and pending, and every deletion to a new SQLite file at path."""
+        if os.path.exists(path):
+            os.remove(path)
+        out = sqlite3.connect(path)
+        try:
+            with self._lock:
+                if self._db is not None:
+                    self._db.backup(out)        # page copy: no row is decoded
+                pending = sorted(self._pending.items())
+                deleting = sorted(self._deleting)
+            out.execute("CREATE TABLE IF NOT EXISTS docs (row INTEGER PRIMARY KEY, content TEXT NOT NULL, "
+                        "metadata TEXT NOT NULL)")
+            out.execute("CREATE TABLE IF NOT EXISTS deleted (row INTEGER PRIMARY KEY)")
+            out.executemany("INSERT INTO docs (row, content, metadata) VALUES (?, ?, ?)",
+                            [(row, doc.page_content, json.dumps(doc.metadata, default=str))
+                             for row, doc in pending])
+            out.executemany("INSERT OR IGNORE INTO deleted (row) VALUES (?)", [(row,) for row in deleting])
+            out.commit()
+        finally:
+            out.close()
+
+
+class _RowIds:
+    """index_to_docstore_id for MappedFAISS: documents are keyed by their row position."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, row):
+        return int(row)
+
+    def __len__(self):
+        return self._store.index.ntotal
+
+
+class MappedFAISS:
+    """The subset of LangChain's FAISS vector store the interview store uses, without pickle."""
+
+    def __init__(self, index, docstore, embedding_function=None, mapped=False):
+        self.index = index
+        self.docstore = docstore
+        self.embedding_function = embedding_function
+        self.index_to_docstore_id = _RowIds(self)
+        self._mapped = index if mapped else None    # read-only while it is still this object
+
+    @classmethod
+    def from_embeddings(cls, text_embeddings, embedding, metadatas=None):
+        ann_index.load_faiss()
+        pairs = list(text_embeddings)
+        store = cls(ann_index.faiss.IndexFlatL2(len(pairs[0][1])), SqliteDocstore(), embedding)
+        store.add_embeddings(pairs, metadatas=metadatas)
+        return store
+
+    def add_embeddings(self, text_embeddings, metadatas=None):
+        pairs = list(text_embeddings)
+        metadatas = metadatas or [{} for _ in pairs]
+        if self.index is self._mapped:
+            # A mapped index cannot grow; copy it into this process (once)
+            faiss = ann_index.faiss
+            self.index = ann_index.tune(faiss.deserialize_index(faiss.serialize_index(self.index)))
+            self._mapped = None
+        start = self.index.ntotal
+        self.index.add(ann_index.np.asarray([vector for _, vector in pairs], dtype='float32'))
+        self.docstore.add({start + i: Document(page_content=text, metadata=metadata)
+                           for i, ((text, _), metadata) in enumerate(zip(pairs, metadatas))})
+        return list(range(start, start + len(pairs)))
+
+    def similarity_search_by_vector(self, embedding, k=4):
+        _, positions = self.index.search(ann_index.np.asarray([embedding], dtype='float32'), k)
+        return [self.docstore.search(int(p)) for p in positions[0] if p >= 0]
+
+    def metadatas(self):
+        return self.docstore.metadatas()
+
+    def contents(self):
+        return self.docstore.contents()
+
+    def delete_rows(self, rows):
+        """Tombstones rows in the docstore (saved with it); the vectors stay until the store is compacted."""
+        self.docstore.delete(rows)
+
+    def deleted_rows(self):
+        return self.docstore.deleted()
+
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+        ann_index.faiss.write_index(self.index, os.path.join(folder_path, INDEX_FILE))
+        self.docstore.write(os.path.join(folder_path, DOCSTORE_FILE))
+
+    def saved(self, folder_path):
+        """Called once save_local()'s copy is in place at folder_path: documents are read from there now."""
+        self.docstore.attach(os.path.join(folder_path, DOCSTORE_FILE))
+
+    @classmethod
+    def load_local(cls, folder_path, embeddings=None, **kwargs):
+        """Opens a saved store: the index mapped, the docstore unread. Converts an index.pkl first."""
+        ann_index.load_faiss()
+        if not os.path.exists(os.path.join(folder_path, DOCSTORE_FILE)):
+            if os.path.exists(os.path.join(folder_path, LEGACY_FILE)):
+                migrate(folder_path)
+            else:
+                raise FileNotFoundError(f"No {DOCSTORE_FILE} in {folder_path}")
+        index = ann_index.faiss.read_index(os.path.join(folder_path, INDEX_FILE), _read_flags())
+        docstore = SqliteDocstore(os.path.join(folder_path, DOCSTORE_FILE))
+        if len(docstore) != index.ntotal:
+            raise ValueError(f"{DOCSTORE_FILE} has {len(docstore):,} documents for {index.ntotal:,} vectors")
+        if os.path.exists(os.path.join(folder_path, LEGACY_FILE)):
+            os.remove(os.path.join(folder_path, LEGACY_FILE))       # converted, then interrupted
+        return cls(index, docstore, embeddings, mapped=bool(_read_flags()))
+
+
+def migrate(folder_path):
+    """Writes docstore.sqlite for a directory saved by LangChain's FAISS, then deletes its index.pkl."""
+    from langchain_community.vectorstores import FAISS as LangChainFAISS
+
+    logger.warning(f"Converting the pickled FAISS docstore in {folder_path} to {DOCSTORE_FILE} (one-off).")
+    legacy = LangChainFAISS.load_local(folder_path=folder_path, embeddings=None,
+                                       allow_dangerous_deserialization=True)
+    docstore = SqliteDocstore()
+    docstore.add({row: legacy.docstore.search(legacy.index_to_docstore_id[row])
+                  for row in range(legacy.index.ntotal)})
+    tmp = os.path.join(folder_path, f'{DOCSTORE_FILE}.tmp')
+    docstore.write(tmp)
+    _fsync(tmp)
+    os.replace(tmp, os.path.join(folder_path, DOCSTORE_FILE))
+    os.remove(os.path.join(folder_path, LEGACY_FILE))
+    logger.info(f"Converted {legacy.index.ntotal:,} documents in {folder_path}.")
+    return legacy.index.ntotal
+
+
+if __name__ == '__main__':
+    import argparse
+    from rag.vector_store import FAISS_INDEX_PATH
+
+    parser = argparse.ArgumentParser(description='Convert a pickled LangChain FAISS index to docstore.sqlite.')
+    parser.add_argument('--migrate', nargs='?', const=FAISS_INDEX_PATH, metavar='INDEX_DIR', required=True)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if os.path.exists(os.path.join(args.migrate, DOCSTORE_FILE)):
+        print(f"{args.migrate} is already converted.")
+    elif not os.path.exists(os.path.join(args.migrate, LEGACY_FILE)):
+        sys.exit(f"No {LEGACY_FILE} in {args.migrate}.")
+    else:
+        print(f"Converted {migrate(args.migrate):,} documents.")
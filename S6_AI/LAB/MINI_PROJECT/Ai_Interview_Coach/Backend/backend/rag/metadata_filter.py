@@ -0,0 +1,241 @@
+"""
+Metadata-filtered search over the interview vector store.
+
+MetadataIndex keeps, per filterable key and value, the FAISS row positions of
+the matching records (a posting list) plus a score per row. A filter turns
+into the intersection of a few posting lists, so its cost depends on how many
+records match, not on the size of the store. The search then runs only over
+those rows:
+
+    - small candidate sets (<= FILTER_EXACT_MAX rows) are scored exactly
+      against their reconstructed vectors: a per-partition brute force;
+    - larger ones go through the index itself with an IDSelector, so
+      non-matching rows are skipped inside FAISS. For IVF and HNSW, nprobe and
+      efSearch are raised with the filter's selectivity (capped) so a narrow
+      filter still finds k neighbours.
+
+Nothing is post-filtered from a bigger k.
+
+Records are identified by their answer_id (ID_KEY). Adding a record whose id
+is already in the index supersedes the old row, and deleted ids leave their
+rows behind as tombstones: both are dropped from every candidate set and, for
+unfiltered searches, skipped inside FAISS by search_excluding(), until the
+store is compacted.
+
+For an index loaded from disk the posting lists are built on first use (or by
+the manager's warm-up), not during the load.
+"""
+import math
+import os
+import threading
+from array import array
+
+from . import ann_index
+
+faiss = None            # bound from ann_index on first use, like ann_index itself
+np = None
+
+FILTER_KEYS = ('type', 'question_id', 'field', 'level', 'interview_type')
+ID_KEY      = 'answer_id'       # a record's stable id: adding it again replaces the old row
+
+FILTER_EXACT_MAX = int(os.environ.get('FAISS_FILTER_EXACT_MAX', '4096'))   # rows scored by brute force
+MAX_WIDEN        = 8        # nprobe / efSearch grow at most this much for a selective filter
+
+
+def _load():
+    global faiss, np
+    if faiss is None and ann_index.load_faiss():
+        faiss, np = ann_index.faiss, ann_index.np
+
+
+def normalize(key, value):
+    """Posting-list key for one metadata value: text is case- and space-insensitive."""
+    if isinstance(value, str):
+        value = ' '.join(value.split()).lower()
+    return key, value
+
+
+class MetadataIndex:
+    """Posting lists (key, value) -> row positions, and a per-row score, for one FAISS index."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._postings = {}
+        self._scores = array('f')
+        self._source = None                     # store to read the rows from on first use
+        self._rows_by_id = {}                   # str(answer_id) -> its current row
+        self._dead = set()                      # superseded or deleted rows (tombstones)
+        self._dead_sorted = None
+
+    def __len__(self):
+        self.prepare()
+        return len(self._scores)
+
+    def add(self, metadatas):
+        """Appends rows in index order (call under the store's write lock, right after index.add).
+        Returns the rows these replace: earlier rows with the same answer_id."""
+        self.prepare()
+        return self._append(metadatas)
+
+    def _append(self, metadatas):
+        replaced = []
+        for metadata in metadatas:
+            row = len(self._scores)
+            if metadata is None:                # deleted in the docstore
+                self._kill(row)
+                self._scores.append(math.nan)
+                continue
+            record_id = metadata.get(ID_KEY)
+            if record_id is not None:
+                previous = self._rows_by_id.get(str(record_id))
+                if previous is not None:
+                    self._kill(previous)
+                    replaced.append(previous)
+                self._rows_by_id[str(record_id)] = row
+            for key in FILTER_KEYS:
+                value = metadata.get(key)
+                if value is not None and value != '':
+                    self._postings.setdefault(normalize(key, value), array('q')).append(row)
+            score = metadata.get('score')
+            self._scores.append(float(score) if score is not None else math.nan)
+        return replaced
+
+    def _kill(self, row):
+        self._dead.add(row)
+        self._dead_sorted = None
+
+    def remove_ids(self, record_ids):
+        """Tombstones the current rows of these answer_ids; returns those rows (under the write lock)."""
+        self.prepare()
+        rows = [self._rows_by_id.pop(str(record_id), None) for record_id in record_ids]
+        rows = [row for row in rows if row is not None]
+        for row in rows:
+            self._kill(row)
+        return rows
+
+    def row_of(self, record_id):
+        """The live row holding answer_id record_id, or None."""
+        self.prepare()
+        return self._rows_by_id.get(str(record_id))
+
+    def record_ids(self):
+        """The answer_ids with a live row (as strings)."""
+        self.prepare()
+        return set(self._rows_by_id)
+
+    def dead_rows(self):
+        """Sorted int64 positions of the tombstoned rows.
+
+        While the lists are deferred these are the store's saved deletions, so an
+        unfiltered search does not build the posting lists.
+        """
+        _load()
+        if self._dead_sorted is None:
+            source = self._source
+            if source is not None and hasattr(source, 'deleted_rows'):
+                self._dead_sorted = np.array(source.deleted_rows(), dtype='int64')
+            else:
+                self.prepare()
+                self._dead_sorted = np.array(sorted(self._dead), dtype='int64')
+        return self._dead_sorted
+
+    def rebuild(self, store):
+        """Re-reads every row's metadata from a FAISS store (after load_local)."""
+        self._postings, self._scores = {}, array('f')
+        self._rows_by_id, self._dead, self._dead_sorted = {}, set(), None
+        if hasattr(store, 'metadatas'):
+            self._append(store.metadatas())     # faiss_store.MappedFAISS: one SQLite scan
+        else:
+            self._append(store.docstore.search(store.index_to_docstore_id[row]).metadata
+                         for row in range(store.index.ntotal))
+        self._source = None
+
+    def defer(self, store):
+        """Like rebuild(store), but on first use: keeps loading the index constant-time."""
+        self.clear()
+        self._source = store
+
+    def prepare(self):
+        """Builds deferred posting lists now. Call with the store's lock held (read or write)."""
+        if self._source is None:
+            return
+        with self._lock:
+            if self._source is not None:
+                store = self._source
+                self.rebuild(store)             # clears _source only once the lists are complete
+
+    def candidates(self, filters=None, min_score=None):
+        """Sorted row positions matching every filter, or None when nothing is filtered.
+
+        filters maps a FILTER_KEYS key to a value or a list of values (any of them).
+        """
+        _load()
+        self.prepare()
+        rows = None
+        for key, wanted in (filters or {}).items():
+            if key not in FILTER_KEYS:
+                raise ValueError(f"Cannot filter on {key!r}; filterable keys: {', '.join(FILTER_KEYS)}")
+            values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            lists = [self._postings.get(normalize(key, v)) for v in values]
+            matched = [np.array(p, dtype='int64') for p in lists if p]
+            if not matched:
+                return np.empty(0, dtype='int64')
+            matched = matched[0] if len(matched) == 1 else np.unique(np.concatenate(matched))
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+            if not len(rows):
+                return rows
+        if min_score is not None:
+            scores = np.frombuffer(self._scores, dtype='float32')     # no copy; dropped before returning
+            if rows is None:
+                rows = np.flatnonzero(scores >= min_score)
+            else:
+                rows = rows[scores[rows] >= min_score]
+        if self._dead and rows is not None and len(rows):
+            rows = np.setdiff1d(rows, self.dead_rows(), assume_unique=True)
+        return rows
+
+    def stats(self):
+        return {'rows': len(self._scores), 'posting_lists': len(self._postings), 'deferred': self._source is not None,
+                'record_ids': len(self._rows_by_id), 'dead_rows': len(self._dead)}
+
+
+def search_rows(index, vector, k, rows):
+    """(distances, positions) of the k nearest rows among `rows` (sorted int64 positions)."""
+    _load()
+    query = np.asarray([vector], dtype='float32')
+    if len(rows) <= FILTER_EXACT_MAX:
+        vectors = ann_index.vectors_of_rows(index, rows)
+        distances = ((vectors - query) ** 2).sum(axis=1)
+        order = np.argsort(distances)[:k]
+        return distances[order], rows[order]
+
+    selector = faiss.IDSelectorBatch(rows)
+    widen = min(MAX_WIDEN, max(1, int(index.ntotal / len(rows))))
+    return _search(index, query, k, selector, widen)
+
+
+def search_excluding(index, vector, k, dead):
+    """(distances, positions) of the k nearest rows that are not in `dead` (tombstoned rows)."""
+    _load()
+    query = np.asarray([vector], dtype='float32')
+    excluded = faiss.IDSelectorBatch(dead)      # kept referenced here for the whole search
+    selector = faiss.IDSelectorNot(excluded)
+    live = max(1, index.ntotal - len(dead))
+    return _search(index, query, k, selector, min(MAX_WIDEN, max(1, int(index.ntotal / live))))
+
+
+def _search(index, query, k, selector, widen):
+    index_kind = ann_index.kind(index)
+    if index_kind in ('ivf', 'ivfpq'):
+        nprobe = faiss.extract_index_ivf(index).nprobe
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe * widen)
+    elif index_kind == 'hnsw':
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(k, index.hnsw.efSearch * widen))
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    distances, positions = index.search(query, k, params=params)
+    found = positions[0] >= 0
+    return distances[0][found], positions[0][found]
@@ -1,22 +1,33 @@
 """
 Orchestrates the RAG flow: Retrieval from VectorStore -> Prompt Building -> Generation via OpenAI(Mistral)
+
+Importing this module does no I/O: the Mistral reachability check runs the
+first time is_available is read, and the embedding model / index load on
+first use. warm_up() does all of that on a background thread at startup.
 """
 import os
 import logging
-from openai import OpenAI
+import threading
 from .vector_store import vector_store_manager, LANGCHAIN_AVAILABLE
 from .prompt_builder import prompt_builder
 
 logger = logging.getLogger(__name__)
 
+# Dropped one at a time (most specific first) when a filtered search finds nothing
+RELAX_ORDER = ('question_id', 'min_score', 'interview_type', 'level', 'field')
+
+RETRIEVAL_MODE = os.environ.get('RAG_RETRIEVAL', 'hybrid').lower()   # hybrid (FAISS + BM25) / dense / bm25
+CONTEXT_DOCS   = int(os.environ.get('RAG_CONTEXT_DOCS', '2'))       # past sessions put in each prompt
+
+
 class RAGEngine:
     def __init__(self):
         self.base_url = os.environ.get('MISTRAL_BASE_URL', 'http://127.0.0.1:1234/v1')
         self.model_name = os.environ.get('MISTRAL_MODEL_NAME', 'mistral-7b-instruct-v0.2')
-        api_key = os.environ.get('MISTRAL_API_KEY', 'lm-studio')
         
         # RAG is only available if both Mistral AND langchain are available
-        self.is_available = False
+        self._available = None                  # unknown until the first check
+        self._check_lock = threading.Lock()
         self.vector_store_manager = vector_store_manager
         self.prompt_builder = prompt_builder
         self.langchain_available = LANGCHAIN_AVAILABLE
@@ -24,13 +35,24 @@ class RAGEngine:
         # Check if langchain is available
         if not self.langchain_available:
             logger.warning("LangChain not available. RAG features will be disabled, using Mistral-only mode.")
-            return
+            self._available = False
+
+    @property
+    def is_available(self):
+        """Mistral is reachable (and LangChain installed). The first read pings the model."""
+        if self._available is None:
+            with self._check_lock:
+                if self._available is None:
+                    self._available = self._check_online()
+        return self._available
 
+    def _check_online(self):
         try:
+            from openai import OpenAI
             # Create client with proper timeout configuration for LLM operations
             self.client = OpenAI(
                 base_url=self.base_url, 
-                api_key=api_key,
+                api_key=os.environ.get('MISTRAL_API_KEY', 'lm-studio'),
                 timeout=120.0  # 2-minute timeout for client initialization
             )
             # Simple check to ensure model is online (30 second timeout)
@@ -40,16 +62,61 @@ class RAGEngine:
                 max_tokens=5,
                 timeout=30.0
             )
-            self.is_available = True
             logger.info("RAG Engine (Mistral API + LangChain) is ONLINE.")
+            return True
         except Exception as e:
-            self.is_available = False
             logger.warning(f"RAG Engine unavailable: {e}. Using Mistral-only fallback.")
+            return False
+
+    def warm_up(self):
+        """Loads the embedding model and index and pings Mistral on a daemon thread, so the
+        first submitted answer does not pay for it. Returns immediately."""
+        if not self.langchain_available:
+            return
+
+        def run():
+            self.vector_store_manager.load()
+            self.is_available                   # first read pings Mistral
+
+        threading.Thread(target=run, daemon=True, name='rag-warmup').start()
+
+    def status(self):
+        """Readiness for /api/health; never triggers a load or a ping."""
+        from .vector_store import embedding_service
+        return {
+            'mistral': {None: 'unchecked', True: 'online', False: 'offline'}[self._available],
+            'index': self.vector_store_manager.state,
+            'embedding_model': embedding_service.status() if embedding_service else None,
+        }
+
+    def retrieve_context(self, query_text: str, top_k: int = CONTEXT_DOCS, filters: dict = None,
+                         min_score: float = None, mode: str = None):
+        """Past sessions similar to query_text, restricted by filters / min_score, ranked by
+        mode (default RAG_RETRIEVAL). If nothing matches, the most specific constraint is
+        dropped and the search repeated."""
+        filters = {k: v for k, v in (filters or {}).items() if v not in (None, '')}
+        mode = mode or RETRIEVAL_MODE
+        while True:
+            docs = self.vector_store_manager.search_hybrid(query_text, top_k=top_k, filters=filters,
+                                                           min_score=min_score, mode=mode)
+            if docs or (not filters and min_score is None):
+                return docs
+            for key in RELAX_ORDER:
+                if key == 'min_score' and min_score is not None:
+                    min_score = None
+                    break
+                if key in filters:
+                    del filters[key]
+                    break
+            else:
+                filters = {}
 
-    def generate_feedback_rag(self, current_question: str, current_answer: str, company_context: str = "") -> str:
+    def generate_feedback_rag(self, current_question: str, current_answer: str, company_context: str = "",
+                              field: str = None, level: str = None, interview_type: str = None,
+                              question_id: int = None, min_score: float = None) -> str:
         """
         Executes the full RAG pipeline to generate feedback.
-        1. Query FAISS
+        1. Query FAISS (same question / field / level / interview type first)
         2. Build Prompt
         3. Call Mistral API
         """
@@ -58,9 +125,12 @@ class RAGEngine:
             raise ConnectionError("RAG Engine not available")
 
         try:
-            # 1. Retrieve context (top_k=3 balances relevance vs latency)
+            # 1. Retrieve context (RAG_CONTEXT_DOCS hybrid-ranked sessions: each costs prompt prefill)
             query_text = f"Question: {current_question}\nAnswer: {current_answer}"
-            retrieved_docs = self.vector_store_manager.search_similar(query_text, top_k=3)
+            retrieved_docs = self.retrieve_context(query_text, min_score=min_score, filters={
+                'type': 'interview_qa', 'question_id': question_id, 'field': field,
+                'level': level, 'interview_type': interview_type,
+            })
 
             logger.info(f"RAG retrieved {len(retrieved_docs)} context documents from previous sessions.")
 
@@ -87,14 +157,17 @@ class RAGEngine:
             logger.warning(f"RAG generation error: {e}. Falling back to Mistral-only mode.")
             raise e
 
-    def record_session(self, question: str, user_answer: str, ai_feedback: str, rating: float, question_id: int):
-        """Asynchronously (or fire&forget) add completed session to FAISS for future learning."""
+    def record_session(self, question: str, user_answer: str, ai_feedback: str, rating: float, question_id: int,
+                       field: str = None, level: str = None, interview_type: str = None, answer_id: int = None):
+        """Asynchronously (or fire&forget) add completed session to FAISS for future learning.
+        answer_id identifies the record: recording the same answer again replaces it."""
         if not self.langchain_available or not self.is_available:
             logger.debug("Skipping FAISS recording - RAG not available")
             return
             
         try:
-            metadata = {'question_id': question_id}
+            metadata = {'question_id': question_id, 'field': field, 'level': level,
+                        'interview_type': interview_type, 'answer_id': answer_id}
             self.vector_store_manager.add_interview_record(
                 question=question,
                 user_answer=user_answer,
@@ -0,0 +1,116 @@
+"""
+LRU cache of search_similar() / search_hybrid() results.
+
+Candidates answering the same bank question send near-identical retrieval
+queries, and between two writes the index gives them the same answer. Each
+result list is stored under (normalised query, filters, k, min_score, search
+mode, index_version). VectorStoreManager bumps index_version under its write lock
+whenever the index changes (an applied add, a rebuild, a reset), so an entry
+can only be found while the index still holds exactly what it was computed
+from. A store of a newer version drops every older entry at once; they could
+never be hit again.
+
+Queries are normalised like embedding_cache keys (Unicode NFC, whitespace
+collapsed) and filter values like the metadata posting lists (case- and
+space-insensitive, a list of values in any order), so spellings that search
+the same rows share an entry.
+
+    RETRIEVAL_CACHE           1 = on (default), 0 = search every time
+    RETRIEVAL_CACHE_SIZE      result lists kept  (1024)
+"""
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from .metadata_filter import normalize as normalize_filter
+
+CACHE_ENABLED = os.environ.get('RETRIEVAL_CACHE', '1') != '0'
+CACHE_SIZE    = int(os.environ.get('RETRIEVAL_CACHE_SIZE', '1024'))
+
+
+def normalize_query(text):
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def cache_key(query, top_k, filters=None, min_score=None, mode='dense'):
+    """Hashable key for one search, without the index version."""
+    frozen = []
+    for key, wanted in (filters or {}).items():
+        values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+        frozen.append((key, frozenset(normalize_filter(key, v)[1] for v in values)))
+    return (normalize_query(query), int(top_k), frozenset(frozen),
+            None if min_score is None else float(min_score), mode)
+
+
+def _copy(results):
+    return [{'content': r['content'], 'metadata': dict(r['metadata'])} for r in results]
+
+
+class RetrievalCache:
+    """Thread-safe LRU of result lists for one index. Returns copies, so callers may edit them."""
+
+    def __init__(self, capacity=CACHE_SIZE, enabled=CACHE_ENABLED):
+        self.capacity = capacity
+        self.enabled = enabled and capacity > 0
+        self._entries = OrderedDict()           # key -> (results, ms it took to compute)
+        self._version = 0                       # newest index_version stored
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evictions': 0, 'invalidations': 0,
+                       'saved_ms': 0.0, 'total_hit_ms': 0.0, 'total_miss_ms': 0.0}
+
+    def get(self, key, version):
+        """The cached results for key at index_version, or None."""
+        if not self.enabled:
+            return None
+        started = time.perf_counter()
+        with self._lock:
+            entry = self._entries.get((version, key))
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end((version, key))
+            results, cost_ms = entry
+            copied = _copy(results)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats['hits'] += 1
+            self._stats['total_hit_ms'] += elapsed_ms
+            self._stats['saved_ms'] += max(cost_ms - elapsed_ms, 0.0)
+        return copied
+
+    def put(self, key, version, results, cost_ms):
+        """Stores results computed against index_version in cost_ms (embedding + search)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._stats['total_miss_ms'] += cost_ms
+            if version < self._version:
+                return                          # the index changed while this search ran
+            if version > self._version:
+                if self._entries:
+                    self._stats['invalidations'] += 1
+                self._entries.clear()
+                self._version = version
+            self._entries[(version, key)] = (_copy(results), cost_ms)
+            self._entries.move_to_end((version, key))
+            self._stats['stored'] += 1
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+            data['entries'] = len(self._entries)
+        hits, misses = data['hits'], data['misses']
+        data['hit_rate'] = round(hits / (hits + misses), 3) if hits + misses else 0
+        data['avg_hit_ms'] = round(data.pop('total_hit_ms') / hits, 3) if hits else 0
+        data['avg_miss_ms'] = round(data.pop('total_miss_ms') / misses, 2) if misses else 0
+        data['saved_ms'] = round(data['saved_ms'], 1)
+        data['enabled'], data['capacity'] = self.enabled, self.capacity
+        return data
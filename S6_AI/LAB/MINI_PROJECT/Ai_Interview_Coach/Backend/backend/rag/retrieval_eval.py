@@ -0,0 +1,160 @@
+"""
+Retrieval evaluation: hit quality of dense, BM25 and hybrid search on the
+interview vector store, against a labelled set.
+
+A labelled set is JSON Lines, one query per line:
+
+    {"query": "Question: ...\\nAnswer: ...", "relevant": [answer_id, ...],
+     "filters": {"field": "Software Engineering"}, "exclude": [answer_id]}
+
+relevant names the records that are good context for the query. filters is
+optional and passed to the search. exclude is optional and drops records from
+the results before scoring, e.g. the answer the query was taken from.
+
+--sample N builds a set from the index itself. N stored answers become queries
+(their question and answer text), the other records for the same bank
+question are relevant, and the answer itself is excluded. --save keeps the
+set for later runs.
+
+For each mode and k the report gives:
+
+    hit@k        queries with a relevant record in the top k
+    precision    relevant share of the records returned (what reaches the prompt)
+    recall       share of the relevant records found, capped at k per query
+    MRR          1 / rank of the first relevant record, 0 when none in the top k
+    context      characters of context a prompt spends on the top k
+                 (PromptBuilder keeps 300 per record)
+
+Usage:
+    python rag/retrieval_eval.py --sample 200 --k 2 3 [--save data/retrieval_eval.jsonl]
+    python rag/retrieval_eval.py data/retrieval_eval.jsonl --k 2 3 --modes dense hybrid
+"""
+import json
+import os
+import random
+import sys
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES         = ('dense', 'bm25', 'hybrid')
+CONTEXT_CHARS = 300          # PromptBuilder.build_rag_prompt truncates each record to this
+
+
+def load_labelled(path):
+    with open(path) as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def save_labelled(path, labelled):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as fh:
+        for item in labelled:
+            fh.write(json.dumps(item) + '\n')
+
+
+def query_text(content):
+    """The question and answer of a stored record, as RAGEngine queries with them."""
+    return content.split('\nFeedback:')[0]
+
+
+def sample_labelled(manager, n, seed=0):
+    """n queries taken from stored answers; relevant = the other records for the same question."""
+    records = manager.get_records(sorted(manager.record_ids()))
+    by_question = {}
+    for answer_id, record in records.items():
+        question_id = record['metadata'].get('question_id')
+        if question_id is not None:
+            by_question.setdefault(question_id, []).append(answer_id)
+    pool = sorted(answer_id for ids in by_question.values() if len(ids) > 1 for answer_id in ids)
+    labelled = []
+    for answer_id in random.Random(seed).sample(pool, min(n, len(pool))):
+        record = records[answer_id]
+        relevant = [other for other in by_question[record['metadata']['question_id']] if other != answer_id]
+        labelled.append({'query': query_text(record['content']), 'relevant': relevant, 'exclude': [answer_id]})
+    return labelled
+
+
+def _answer_id(doc):
+    answer_id = doc['metadata'].get('answer_id')
+    return None if answer_id is None else str(answer_id)
+
+
+def score(found, relevant, k):
+    """hit, precision, recall and reciprocal rank of one ranked list of answer_ids at k."""
+    top = found[:k]
+    ranks = [rank for rank, answer_id in enumerate(top, 1) if answer_id in relevant]
+    return {
+        'hit': 1.0 if ranks else 0.0,
+        'precision': len(ranks) / len(top) if top else 0.0,
+        'recall': len(ranks) / min(k, len(relevant)) if relevant else 0.0,
+        'mrr': 1.0 / ranks[0] if ranks else 0.0,
+    }
+
+
+def evaluate(manager, labelled, ks=(3,), modes=MODES):
+    """{mode: {k: {'hit', 'precision', 'recall', 'mrr', 'context_chars', 'ms'}}} averaged over the queries."""
+    report = {}
+    depth = max(ks)
+    for mode in modes:
+        totals = {k: {'hit': 0.0, 'precision': 0.0, 'recall': 0.0, 'mrr': 0.0, 'context_chars': 0.0}
+                  for k in ks}
+        elapsed = 0.0
+        for item in labelled:
+            exclude = {str(answer_id) for answer_id in item.get('exclude', ())}
+            relevant = {str(answer_id) for answer_id in item['relevant']}
+            started = time.perf_counter()
+            docs = manager.search_hybrid(item['query'], top_k=depth + len(exclude), filters=item.get('filters'),
+                                         mode=mode)
+            elapsed += time.perf_counter() - started
+            docs = [doc for doc in docs if _answer_id(doc) not in exclude][:depth]
+            found = [_answer_id(doc) for doc in docs]
+            for k in ks:
+                for name, value in score(found, relevant, k).items():
+                    totals[k][name] += value
+                totals[k]['context_chars'] += sum(min(len(doc['content']), CONTEXT_CHARS) for doc in docs[:k])
+        count = max(len(labelled), 1)
+        report[mode] = {k: {**{name: round(value / count, 4) for name, value in totals[k].items()},
+                            'ms': round(elapsed * 1000 / count, 2)} for k in ks}
+    return report
+
+
+def print_report(report, queries):
+    print("=" * 72)
+    print(f"  RETRIEVAL EVAL: {queries} labelled queries")
+    print("=" * 72)
+    print(f"  {'mode':<8}{'k':>3}{'hit@k':>9}{'precision':>11}{'recall':>9}{'MRR':>8}{'context':>10}{'ms/query':>10}")
+    for mode, by_k in report.items():
+        for k, row in by_k.items():
+            print(f"  {mode:<8}{k:>3}{row['hit']:9.3f}{row['precision']:11.3f}{row['recall']:9.3f}{row['mrr']:8.3f}"
+                  f"{row['context_chars']:10.0f}{row['ms']:10.2f}")
+    print("=" * 72)
+    print("  context = characters of retrieved records per prompt (300 kept per record)")
+
+
+if __name__ == '__main__':
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description='Evaluate dense / BM25 / hybrid retrieval against a labelled set.')
+    parser.add_argument('labelled', nargs='?', help='JSON Lines labelled set')
+    parser.add_argument('--sample', type=int, metavar='N', help='build N labelled queries from the index instead')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', metavar='PATH', help='write the sampled set here')
+    parser.add_argument('--k', type=int, nargs='+', default=[3])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+    if not args.labelled and not args.sample:
+        parser.error('give a labelled set or --sample N')
+    logging.basicConfig(level=logging.WARNING)
+
+    from rag.vector_store import vector_store_manager
+    if not vector_store_manager.load() or vector_store_manager.vector_store is None:
+        print("No FAISS index loaded (RAG unavailable or nothing recorded yet).")
+        sys.exit(1)
+    labelled = sample_labelled(vector_store_manager, args.sample, args.seed) if args.sample \
+        else load_labelled(args.labelled)
+    if args.save:
+        save_labelled(args.save, labelled)
+    print_report(evaluate(vector_store_manager, labelled, args.k, args.modes), len(labelled))
@@ -1,65 +1,242 @@
 """
-Utility script to seed the FAISS vector database with all existing completed interview answers and feedback from the SQLite database.
+Utility script to seed the FAISS vector database with all existing completed interview answers and feedback from the SQL database.
 Run this script manually whenever you want to hard-sync the FAISS index from the SQL DB.
+
+Scored answers are read with one joined query (answer + question text + first
+feedback) in keyset-paginated chunks, embedded one chunk per call and added
+to the in-memory index. The index is written to disk at checkpoints and once
+at the end, not per record. Sessions moved to the archive tier
+(interview_archive.py) are included.
+
+A checkpoint file beside the index directory (not inside it: saves swap the
+whole directory) records the last answer id that is safely on disk, so an
+interrupted run resumes where it stopped.
+
+Records are keyed by answer_id, so re-running is idempotent: an answer already
+in the index with the same text is skipped before embedding, a changed one
+replaces its old record. --prune deletes the records of answers that no longer
+exist in either tier; `python rag/ann_index.py --compact` then reclaims them.
+
+Usage:
+    python rag/update_vectors.py                       # resume from the checkpoint (or start)
+    python rag/update_vectors.py --fresh               # rebuild the index from scratch
+    python rag/update_vectors.py --chunk-size 512 --checkpoint-every 20000
+    python rag/update_vectors.py --prune               # also drop records of deleted answers
 """
+import json
 import os
 import sys
+import time
+from datetime import datetime
 
 # Ensure backend root is in the python path to allow imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app, db, Answer, Feedback, Question
-from rag.vector_store import vector_store_manager
+from sqlalchemy import inspect, text
+
+from rag.vector_store import FAISS_INDEX_PATH, format_interview_record
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def update_all_vectors():
-    """Fetches all past answers and feedback and ingests them into FAISS."""
+CHECKPOINT_PATH        = f'{FAISS_INDEX_PATH}_seed_checkpoint.json'   # outside the index dir (swapped on save)
+DEFAULT_CHUNK_SIZE     = 256          # rows per query and per embed_documents() call
+DEFAULT_CHECKPOINT_EVERY = 10000      # records between index saves
+
+_RECORD_COLUMNS = """a.id AS answer_id, a.question_id, a.interview_id, a.text AS answer, a.score,
+                     q.text AS question, f.detailed_feedback AS feedback,
+                     i.field, i.level, i.interview_type"""
+
+
+def _source_sql(schema=''):
+    """Scored answers after :after with their question, first feedback and interview context, from one tier."""
+    return f"""SELECT {_RECORD_COLUMNS}
+               FROM {schema}answers a
+               LEFT JOIN {schema}questions q ON q.id = a.question_id
+               LEFT JOIN {schema}interviews i ON i.id = a.interview_id
+               LEFT JOIN {schema}feedback f
+                      ON f.id = (SELECT MIN(id) FROM {schema}feedback WHERE answer_id = a.id)
+               WHERE a.score IS NOT NULL AND a.id > :after
+               ORDER BY a.id LIMIT :limit"""
+
+
+def records_sql(include_archive=False):
+    """Next chunk of records in answer id order, across the hot and archive tiers."""
+    if not include_archive:
+        return _source_sql()
+    return f"""SELECT * FROM (SELECT * FROM ({_source_sql()}) h
+                              UNION ALL
+                              SELECT * FROM ({_source_sql('archive.')}) c) r
+               ORDER BY r.answer_id LIMIT :limit"""
+
+
+def _has_archive(conn):
+    try:
+        return {'answers', 'questions', 'feedback', 'interviews'} <= set(inspect(conn).get_table_names(schema='archive'))
+    except Exception:
+        return False                        # archive not attached / schema missing
+
+
+def iter_chunks(engine, after_id=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of record rows in answer id order, starting after after_id."""
+    with engine.connect() as conn:
+        sql = text(records_sql(_has_archive(conn)))
+        while True:
+            rows = conn.execute(sql, {'after': after_id, 'limit': chunk_size}).mappings().all()
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1]['answer_id']
+
+
+def existing_answer_ids(engine):
+    """Ids of every answer still stored, in the hot and archive tiers."""
+    with engine.connect() as conn:
+        sql = "SELECT id FROM answers"
+        if _has_archive(conn):
+            sql += " UNION SELECT id FROM archive.answers"
+        return {row[0] for row in conn.execute(text(sql))}
+
+
+def prune_vectors(engine, store):
+    """Deletes the records whose answer is gone from the database. Returns how many were deleted."""
+    existing = {str(answer_id) for answer_id in existing_answer_ids(engine)}
+    stale = sorted(store.record_ids() - existing)
+    return store.delete_records(stale) if stale else 0
+
+
+def to_document(row):
+    """(text, metadata) for one record row, as add_interview_record would store it."""
+    content = format_interview_record(
+        question=row['question'] or "Unknown question",
+        user_answer=row['answer'],
+        ai_feedback=row['feedback'] or "No detailed feedback available.",
+        rating=row['score'],
+    )
+    metadata = {
+        'type': 'interview_qa',
+        'score': row['score'],
+        'answer_id': row['answer_id'],
+        'question_id': row['question_id'],
+        'interview_id': row['interview_id'],
+        'field': row['field'],
+        'level': row['level'],
+        'interview_type': row['interview_type'],
+    }
+    return content, metadata
+
+
+def read_checkpoint(path=CHECKPOINT_PATH):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def write_checkpoint(path, state):
+    """Atomic replace so a crash never leaves a half-written checkpoint."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(state, fh)
+    os.replace(tmp, path)
+
+
+def seed_vectors(engine, store, embeddings, after_id=0, chunk_size=DEFAULT_CHUNK_SIZE,
+                 checkpoint_every=DEFAULT_CHECKPOINT_EVERY, checkpoint_path=CHECKPOINT_PATH, progress=True):
+    """Embed and add every scored answer after after_id. Returns a report dict.
+
+    The store is saved (and the checkpoint advanced) every checkpoint_every
+    records and once at the end; the checkpoint only ever names an answer id
+    whose vectors are already on disk.
+    """
+    started = time.perf_counter()
+    report = {'resumed_from': after_id, 'records': 0, 'unchanged': 0, 'chunks': 0, 'saves': 0,
+              'last_answer_id': after_id}
+    since_save = 0
+
+    def checkpoint():
+        store.save()
+        report['saves'] += 1
+        if checkpoint_path:
+            write_checkpoint(checkpoint_path, {'last_answer_id': report['last_answer_id'],
+                                               'updated_at': datetime.utcnow().isoformat()})
+
+    for rows in iter_chunks(engine, after_id, chunk_size):
+        texts, metadatas = store.filter_unchanged(*zip(*(to_document(row) for row in rows)))
+        if texts:
+            vectors = embeddings.embed_documents(texts)
+            store.add_embedded(texts, vectors, metadatas, save=False)
+        report['chunks'] += 1
+        report['records'] += len(texts)
+        report['unchanged'] += len(rows) - len(texts)
+        report['last_answer_id'] = rows[-1]['answer_id']
+        since_save += len(texts)
+        if checkpoint_every and since_save >= checkpoint_every:
+            checkpoint()
+            since_save = 0
+        if progress:
+            elapsed = time.perf_counter() - started
+            logger.info(f"{report['records']:,} records ({report['records'] / elapsed:,.0f}/s), "
+                        f"answer id {report['last_answer_id']}")
+    if since_save:
+        checkpoint()
+
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    report['records_per_second'] = round(report['records'] / report['seconds']) if report['seconds'] else 0
+    return report
+
+
+def update_all_vectors(fresh=False, chunk_size=DEFAULT_CHUNK_SIZE, checkpoint_every=DEFAULT_CHECKPOINT_EVERY,
+                       progress=True, prune=False):
+    """Fetches all past answers and feedback and ingests them into FAISS (prune: and deletes stale ones)."""
+    from app import app, db
+    from rag.vector_store import vector_store_manager
+
+    if not vector_store_manager.load() or vector_store_manager.embeddings is None:
+        logger.info("RAG/FAISS unavailable (LangChain or embedding model missing). Nothing to seed.")
+        return None
+
+    after_id = 0
+    if fresh:
+        vector_store_manager.reset()
+        if os.path.exists(CHECKPOINT_PATH):
+            os.remove(CHECKPOINT_PATH)
+    else:
+        state = read_checkpoint()
+        if state:
+            after_id = state['last_answer_id']
+            logger.info(f"Resuming after answer id {after_id} (checkpoint {state['updated_at']})")
+
     with app.app_context():
-        # Get all completed answers that have a score (implies feedback was generated)
-        answers = Answer.query.filter(Answer.score.isnot(None)).all()
-        
-        if not answers:
-            logger.info("No scored answers found in the SQLite database to seed FAISS.")
-            return
-
-        logger.info(f"Found {len(answers)} past answers. Processing embeddings...")
-
-        success_count = 0
-        
-        # We process them one by one for simplicity (FAISS supports batching, but we reuse the manager methods)
-        for ans in answers:
-            try:
-                # Need the original question text
-                question = db.session.get(Question, ans.question_id) if ans.question_id else None
-                q_text = question.text if question else "Unknown question"
-                
-                # Need the AI feedback
-                feedback = Feedback.query.filter_by(answer_id=ans.id).first()
-                f_text = feedback.detailed_feedback if feedback else "No detailed feedback available."
-                
-                # Add to FAISS via manager
-                metadata = {
-                    'answer_id': ans.id,
-                    'question_id': ans.question_id,
-                    'interview_id': ans.interview_id
-                }
-                
-                vector_store_manager.add_interview_record(
-                    question=q_text,
-                    user_answer=ans.text,
-                    ai_feedback=f_text,
-                    rating=ans.score,
-                    metadata=metadata
-                )
-                
-                success_count += 1
-            except Exception as e:
-                logger.error(f"Failed to process answer ID {ans.id}: {e}")
-
-        logger.info(f"Successfully seeded {success_count}/{len(answers)} records into FAISS vector database.")
+        report = seed_vectors(db.engine, vector_store_manager, vector_store_manager.embeddings, after_id,
+                              chunk_size, checkpoint_every, progress=progress)
+        if prune:
+            report['pruned'] = prune_vectors(db.engine, vector_store_manager)
+            if report['pruned']:
+                vector_store_manager.save()
+                logger.info(f"Deleted {report['pruned']:,} records of answers that no longer exist.")
+
+    if report['records']:
+        logger.info(f"Successfully seeded {report['records']:,} records into FAISS vector database in "
+                    f"{report['seconds']}s ({report['records_per_second']:,} records/s, {report['saves']} saves).")
+    else:
+        logger.info("No new scored answers to seed FAISS.")
+    return report
+
 
 if __name__ == "__main__":
-    update_all_vectors()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Seed the FAISS index from scored interview answers.')
+    parser.add_argument('--fresh', action='store_true', help='ignore the checkpoint and rebuild the index')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--checkpoint-every', type=int, default=DEFAULT_CHECKPOINT_EVERY,
+                        help='records between index saves (0 = only at the end)')
+    parser.add_argument('--quiet', action='store_true', help='no per-chunk progress')
+    parser.add_argument('--prune', action='store_true', help='delete records of answers no longer in the database')
+    args = parser.parse_args()
+    update_all_vectors(args.fresh, args.chunk_size, args.checkpoint_every, progress=not args.quiet,
+                       prune=args.prune)
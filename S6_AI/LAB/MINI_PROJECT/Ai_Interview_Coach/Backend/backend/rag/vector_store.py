@@ -1,36 +1,199 @@
 """
 Manages the FAISS vector database for persistent storage and retrieval of interview sessions.
+
+Mutations are serialised: add_documents() queues records for one writer
+thread (group_commit.GroupCommitWriter), which embeds a whole batch in one
+call and applies it under the write side of a readers-writer lock. Searches
+and saves take the read side, so they run concurrently with each other and
+never see a half-applied add.
+
+The index is persisted write-behind: a background
+flusher saves once FAISS_FLUSH_EVERY records are pending, FAISS_FLUSH_SECONDS
+after the first pending record, or at interpreter exit. A save writes a
+complete copy next to the index and swaps directories, so a crash mid-save
+leaves either the old or the new index on disk, never a torn one.
+
+Past FAISS_ANN_MIN_VECTORS records the exact flat index is swapped for the
+approximate type named by FAISS_INDEX_TYPE (see ann_index.py). Searches can
+be restricted by metadata (question, field, level, interview type, minimum
+score) inside the index; see metadata_filter.py.
+
+search_hybrid() fuses the FAISS ranking with a BM25 keyword ranking kept
+alongside it (bm25_index.py) by reciprocal rank, so a record has to read
+alike and share the query's rare terms to rank first.
+
+Search results are cached (retrieval_cache.py) under the index_version they
+were computed at. Every change to the index bumps index_version under the
+write lock, so a cached result is only returned while it is still exact.
+
+Records carry their answer_id, which makes writes idempotent: adding an
+answer_id again replaces its old record, delete_records() removes records by
+id, and both leave tombstones that searches skip. compact() rebuilds the
+index from the live records only.
+
+On disk the index is faiss_store.MappedFAISS: index.faiss opened memory-mapped
+and the documents in docstore.sqlite, read per hit. Loading unpickles nothing
+and takes the same time however large the store is.
+
+The module-level manager is lazy: the embedding model and the index are
+loaded by the first add or search (or by warm_up() on a background thread),
+not at import.
 """
+import atexit
+import importlib.util
 import os
+import shutil
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from typing import List, Dict, Any
 
+from group_commit import GroupCommitWriter
+from . import ann_index, bm25_index, metadata_filter, retrieval_cache
+
 logger = logging.getLogger(__name__)
 
-# Gracefully handle missing langchain libraries
-try:
-    from langchain_community.vectorstores import FAISS
-    from langchain_core.documents import Document
+# Gracefully handle missing langchain libraries. They are only looked up here and
+# imported by the first load() (see _import_langchain), so importing this module is cheap.
+LANGCHAIN_AVAILABLE = all(importlib.util.find_spec(name) for name in ('langchain_community', 'langchain_core'))
+if LANGCHAIN_AVAILABLE:
     from .embedding_service import embedding_service
-    LANGCHAIN_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"LangChain not available: {e}. RAG features will be disabled.")
-    LANGCHAIN_AVAILABLE = False
-    FAISS = None
-    Document = None
+else:
+    logger.warning("LangChain not available. RAG features will be disabled.")
     embedding_service = None
+FAISS = None
+Document = None
+
+
+def _import_langchain():
+    global FAISS, Document
+    if FAISS is None:
+        from langchain_core.documents import Document as document
+        from .faiss_store import MappedFAISS
+        FAISS, Document = MappedFAISS, document
 
 # Define where the FAISS index will be saved locally
 FAISS_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'interview_vectors')
 
-class VectorStoreManager:
+FLUSH_EVERY   = int(os.environ.get('FAISS_FLUSH_EVERY', '100'))       # pending records that force a save
+FLUSH_SECONDS = float(os.environ.get('FAISS_FLUSH_SECONDS', '30'))    # max age of a pending record
+WRITE_BATCH   = int(os.environ.get('FAISS_WRITE_BATCH', '64'))        # queued records per embed + add
+WRITE_DELAY   = float(os.environ.get('FAISS_WRITE_DELAY', '0.05'))    # seconds the writer waits to fill a batch
+
+
+def format_interview_record(question: str, user_answer: str, ai_feedback: str, rating: float) -> str:
+    """The text that gets embedded for one answered question."""
+    return f"Question: {question}\nAnswer: {user_answer}\nFeedback: {ai_feedback}\nScore: {rating}/10"
+
+
+class _ReadWriteLock:
+    """Many readers or one writer. Waiting writers block new readers (no writer starvation)."""
+
     def __init__(self):
-        self.index_path = FAISS_INDEX_PATH
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class VectorStoreManager:
+    def __init__(self, index_path=FAISS_INDEX_PATH, flush_every=FLUSH_EVERY, flush_seconds=FLUSH_SECONDS,
+                 write_batch=WRITE_BATCH, write_delay=WRITE_DELAY, index_type=ann_index.INDEX_TYPE, lazy=False):
+        self.index_path = index_path
+        if index_type not in ann_index.INDEX_TYPES:
+            logger.warning(f"Unknown FAISS_INDEX_TYPE {index_type!r}; using flat.")
+            index_type = 'flat'
+        self.index_type = index_type
         self.vector_store = None
         self.embeddings = None
-        
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._rw = _ReadWriteLock()             # index: searches / saves read, adds / reset write
+        self._lock = threading.Lock()           # pending-record counters
+        self._save_lock = threading.Lock()      # one save at a time (they share the .tmp dir)
+        self._rebuild_lock = threading.Lock()
+        self._rebuilds = {'rebuilds': 0, 'last_rebuild_sec': None, 'last_rebuild_error': None}
+        self._metadata = metadata_filter.MetadataIndex()     # row positions by field / level / ...
+        self._bm25 = bm25_index.BM25Index()                  # keyword postings for search_hybrid
+        self.index_version = 0                  # bumped under the write lock on every index change
+        self.retrieval_cache = retrieval_cache.RetrievalCache()
+        self._wake = threading.Event()
+        self._flusher = None
+        self._unflushed = 0
+        self._unflushed_since = None
+        self._persist_stats = {
+            'flushes': 0, 'records_flushed': 0, 'errors': 0, 'last_error': None,
+            'last_flush_ms': None, 'max_flush_ms': 0.0, 'last_flush_at': None,
+        }
+        atexit.register(self.flush)
+        self._writer = GroupCommitWriter(self._apply_adds, max_batch=write_batch, max_delay=write_delay,
+                                         name='faiss-writer')
+        self.langchain_enabled = False
+        self.state = 'not_loaded'
+        self.load_seconds = None
+        self._load_lock = threading.Lock()
+        if not lazy:
+            self.load()
+
+    def load(self):
+        """Loads LangChain, the embedding model and the index on first call; later calls return at once.
+        True when RAG is usable."""
+        if self.state != 'not_loaded' and self.state != 'loading':
+            return self.langchain_enabled
+        with self._load_lock:
+            if self.state == 'not_loaded':
+                self.state = 'loading'
+                started = time.perf_counter()
+                self._initialize()
+                self.load_seconds = round(time.perf_counter() - started, 2)
+                self.state = 'ready' if self.langchain_enabled else 'unavailable'
+        return self.langchain_enabled
+
+    def warm_up(self):
+        """Starts load() on a daemon thread; returns immediately."""
+        if self.state == 'not_loaded':
+            threading.Thread(target=self._warm, daemon=True, name='faiss-warmup').start()
+
+    def _warm(self):
+        if self.load():
+            with self._rw.read():
+                self._metadata.prepare()        # so the first filtered search does not build it
+                self._bm25.prepare()            # nor the first hybrid search
+
+    def _initialize(self):
         if LANGCHAIN_AVAILABLE:
             try:
+                _import_langchain()
                 self.embeddings = embedding_service.get_embeddings()
                 self._load_or_create_index()
                 self.langchain_enabled = True
@@ -47,15 +210,19 @@ class VectorStoreManager:
         """Loads an existing FAISS index from disk, or prepares an empty state if none exists."""
         if not LANGCHAIN_AVAILABLE or self.embeddings is None:
             return
-            
+
+        self._recover_interrupted_save()
         if os.path.exists(os.path.join(self.index_path, "index.faiss")):
             try:
                 logger.info(f"Loading existing FAISS index from {self.index_path}")
                 self.vector_store = FAISS.load_local(
                     folder_path=self.index_path, 
                     embeddings=self.embeddings,
-                    allow_dangerous_deserialization=True
                 )
+                ann_index.tune(getattr(self.vector_store, 'index', None))
+                if ann_index.kind(getattr(self.vector_store, 'index', None)):
+                    self._metadata.defer(self.vector_store)     # built on first filtered search / add
+                    self._bm25.defer(self.vector_store)
             except Exception as e:
                 logger.warning(f"Error loading FAISS index: {e}. Starting fresh.")
                 self.vector_store = None
@@ -64,8 +231,8 @@ class VectorStoreManager:
             self.vector_store = None
 
     def add_documents(self, documents: List[Dict[str, Any]]):
-        """Adds documents to the FAISS index and saves to disk."""
-        if not LANGCHAIN_AVAILABLE or not documents:
+        """Queues documents for the writer thread, which embeds and adds them in batches."""
+        if not LANGCHAIN_AVAILABLE or not documents or not self.load():
             return
             
         try:
@@ -79,28 +246,391 @@ class VectorStoreManager:
                     ))
                 else:
                     lang_docs.append(doc)
-            
+            self._writer.submit(lang_docs)
+        except Exception as e:
+            logger.warning(f"Failed to add documents to FAISS index: {e}")
+
+    def _apply_adds(self, batches):
+        """GroupCommitWriter apply function: one embedding call and one index add per batch."""
+        docs = [doc for batch in batches for doc in batch]
+        texts = [doc.page_content for doc in docs]
+        vectors = self.embeddings.embed_documents(texts)        # outside the lock: searches keep running
+        self._add_vectors(texts, vectors, [doc.metadata for doc in docs])
+        logger.info(f"Added {len(docs)} documents to FAISS vector store ({len(batches)} queued adds).")
+
+    def _add_vectors(self, texts, vectors, metadatas):
+        pairs = list(zip(texts, vectors))
+        with self._rw.write():
+            self._metadata.prepare()            # from the rows already there, before these are added
+            self._bm25.prepare()
             if self.vector_store is None:
                 logger.info("Initializing new FAISS vector store.")
-                self.vector_store = FAISS.from_documents(lang_docs, self.embeddings)
+                self.vector_store = FAISS.from_embeddings(pairs, self.embeddings, metadatas=metadatas)
+                self._metadata.clear()
+                self._bm25.clear()
             else:
-                logger.info(f"Adding {len(lang_docs)} new documents to existing FAISS vector store.")
-                self.vector_store.add_documents(lang_docs)
-            
-            # Save the updated index to disk immediately
-            os.makedirs(self.index_path, exist_ok=True)
-            self.vector_store.save_local(self.index_path)
-            logger.info(f"Successfully saved FAISS index to {self.index_path}")
+                self.vector_store.add_embeddings(pairs, metadatas=metadatas)
+            self._bm25.add(texts)
+            replaced = self._metadata.add(metadatas)     # earlier rows with the same answer_id
+            if replaced and hasattr(self.vector_store, 'delete_rows'):
+                self.vector_store.delete_rows(replaced)
+            self.index_version += 1
+            due = self._mark_unflushed(len(pairs))
+            upgrade = (ann_index.should_upgrade(getattr(self.vector_store, 'index', None), self.index_type)
+                       and not self._rebuilds['last_rebuild_error'])     # after a failure, rebuild by hand
+        self._ensure_flusher()
+        if due:
+            self._wake.set()                    # re-arm the age timer / flush now
+        if upgrade:
+            self.rebuild_index()
+
+    def add_embedded(self, texts: List[str], vectors: List[List[float]], metadatas: List[Dict[str, Any]],
+                     save: bool = True):
+        """Adds pre-computed embeddings (e.g. from a bulk import) and saves to disk once.
+        Applied synchronously under the write lock, so it is ordered with queued adds.
+        save=False leaves the write to the flusher or a later save() (bulk seeding saves at checkpoints)."""
+        if not LANGCHAIN_AVAILABLE or not texts or not self.load():
+            return
+
+        try:
+            logger.info(f"Adding {len(texts)} pre-computed embeddings to FAISS vector store.")
+            self._add_vectors(texts, vectors, metadatas)
+            if save:
+                self.save()
         except Exception as e:
-            logger.warning(f"Failed to add documents to FAISS index: {e}")
+            logger.warning(f"Failed to add embeddings to FAISS index: {e}")
+            if not save:
+                raise
+
+    # ── Index type ────────────────────────────────────────────────────────────
+
+    def rebuild_index(self, index_type=None, reembed=False):
+        """Retrains the index as index_type (default self.index_type) and saves it. Returns a report.
+
+        Vectors are copied out under the write lock, the new index is trained
+        without it (searches and adds continue on the old one) and adds made
+        meanwhile are replayed before the swap. reembed=True embeds the stored
+        texts again instead of reusing vectors, for leaving a lossy ivfpq index.
+        """
+        index_type = index_type or self.index_type
+        self.load()
+        if not ann_index.FAISS_AVAILABLE or not self._rebuild_lock.acquire(blocking=False):
+            return None                                     # unavailable, or already rebuilding
+        try:
+            started = time.perf_counter()
+            with self._rw.write():
+                store = self.vector_store
+                if store is None:
+                    return None
+                old_index = store.index
+                copied = old_index.ntotal
+                if reembed:
+                    texts = [store.docstore.search(store.index_to_docstore_id[i]).page_content
+                             for i in range(copied)]
+                else:
+                    vectors = ann_index.vectors_of(old_index)
+            if reembed:
+                vectors = self.embeddings.embed_documents(texts)
+            logger.info(f"Building {index_type} FAISS index from {copied:,} vectors.")
+            index = ann_index.build_index(vectors, index_type)
+            with self._rw.write():
+                if self.vector_store is not store:
+                    return None                             # reset while we were training
+                if old_index.ntotal > copied:
+                    index.add(ann_index.vectors_of(old_index, copied))
+                store.index = index
+                self.index_version += 1             # approximate neighbours may differ from the old index
+            seconds = round(time.perf_counter() - started, 2)
+            with self._lock:
+                self._rebuilds['rebuilds'] += 1
+                self._rebuilds['last_rebuild_sec'] = seconds
+                self._rebuilds['last_rebuild_error'] = None
+            logger.info(f"Rebuilt FAISS index as {index_type} in {seconds}s.")
+            self.save()
+            return {'index': ann_index.describe(index), 'seconds': seconds, 'reembedded': reembed}
+        except Exception as e:
+            with self._lock:
+                self._rebuilds['last_rebuild_error'] = str(e)[:120]
+            logger.warning(f"FAISS index rebuild failed, keeping the current index: {str(e)[:80]}")
+            return None
+        finally:
+            self._rebuild_lock.release()
+
+    # ── Upserts, deletes and compaction ───────────────────────────────────────
+
+    def filter_unchanged(self, texts: List[str], metadatas: List[Dict[str, Any]]):
+        """(texts, metadatas) without the records already stored with the same answer_id and text,
+        so re-running an import embeds and adds only what is new or changed."""
+        if not LANGCHAIN_AVAILABLE or not self.load():
+            return list(texts), list(metadatas)
+        keep = []
+        with self._rw.read():
+            store = self.vector_store
+            for text, metadata in zip(texts, metadatas):
+                row = (self._metadata.row_of(metadata[metadata_filter.ID_KEY])
+                       if store is not None and metadata.get(metadata_filter.ID_KEY) is not None else None)
+                if row is None or store.docstore.search(store.index_to_docstore_id[row]).page_content != text:
+                    keep.append((text, metadata))
+        return [text for text, _ in keep], [metadata for _, metadata in keep]
+
+    def record_ids(self):
+        """The answer_ids (as strings) that have a live record in the index."""
+        if not LANGCHAIN_AVAILABLE or not self.load():
+            return set()
+        with self._rw.read():
+            return self._metadata.record_ids() if self.vector_store is not None else set()
+
+    def get_records(self, answer_ids) -> Dict[str, Dict[str, Any]]:
+        """{answer_id (as a string): {'content', 'metadata'}} for the ids that have a live record."""
+        if not LANGCHAIN_AVAILABLE or not self.load():
+            return {}
+        found = {}
+        with self._rw.read():
+            store = self.vector_store
+            for answer_id in answer_ids if store is not None else ():
+                row = self._metadata.row_of(answer_id)
+                if row is not None:
+                    doc = store.docstore.search(store.index_to_docstore_id[row])
+                    found[str(answer_id)] = {'content': doc.page_content, 'metadata': doc.metadata}
+        return found
+
+    def delete_records(self, answer_ids) -> int:
+        """Removes the records of these answer_ids from search results. Returns how many were stored.
+        The rows stay in the index as tombstones (saved with it) until compact()."""
+        if not LANGCHAIN_AVAILABLE or not answer_ids or not self.load():
+            return 0
+        with self._rw.write():
+            if self.vector_store is None:
+                return 0
+            rows = self._metadata.remove_ids(answer_ids)
+            if not rows:
+                return 0
+            if hasattr(self.vector_store, 'delete_rows'):
+                self.vector_store.delete_rows(rows)
+            self.index_version += 1
+            due = self._mark_unflushed(len(rows))
+        self._ensure_flusher()
+        if due:
+            self._wake.set()
+        logger.info(f"Deleted {len(rows)} records from the FAISS vector store.")
+        return len(rows)
+
+    def compact(self, reembed=False):
+        """Rebuilds the index without tombstoned rows or duplicate texts and saves it. Returns a report.
+
+        Live rows are every row not superseded or deleted by answer_id; of the
+        rows without an answer_id, one whose text is also stored elsewhere is a
+        duplicate (the record with an id, or else the latest copy, is kept). The
+        index keeps its type unless too few vectors remain for it. Adds, deletes
+        and searches wait until the new index is in place.
+        """
+        self.load()
+        if not ann_index.FAISS_AVAILABLE or not self._rebuild_lock.acquire(blocking=False):
+            return None                                     # unavailable, or rebuilding
+        try:
+            started = time.perf_counter()
+            self._writer.flush()
+            with self._rw.write():
+                store = self.vector_store
+                if store is None:
+                    return None
+                self._metadata.prepare()
+                old_index = store.index
+                dead = set(self._metadata.dead_rows().tolist())
+                docs = {row: store.docstore.search(store.index_to_docstore_id[row])
+                        for row in range(old_index.ntotal) if row not in dead}
+                with_id = {doc.page_content for doc in docs.values()
+                           if doc.metadata.get(metadata_filter.ID_KEY) is not None}
+                latest = {doc.page_content: row for row, doc in docs.items()
+                          if doc.metadata.get(metadata_filter.ID_KEY) is None}
+                keep = [row for row, doc in docs.items()
+                        if doc.metadata.get(metadata_filter.ID_KEY) is not None
+                        or (doc.page_content not in with_id and latest[doc.page_content] == row)]
+                before = {'vectors': old_index.ntotal, 'dead': len(dead), 'duplicates': len(docs) - len(keep),
+                          'disk_mb': self._disk_mb(), 'index': ann_index.describe(old_index)}
+                texts = [docs[row].page_content for row in keep]
+                metadatas = [docs[row].metadata for row in keep]
+                if reembed:
+                    vectors = self.embeddings.embed_documents(texts) if texts else []
+                else:
+                    vectors = ann_index.vectors_of_rows(old_index, keep) if keep else []
+                index_kind = ann_index.kind(old_index)
+                compacted = None
+                if keep:
+                    compacted = FAISS.from_embeddings(zip(texts, vectors), self.embeddings, metadatas=metadatas)
+                    if index_kind != 'flat' and len(keep) >= ann_index.ANN_MIN_VECTORS:
+                        compacted.index = ann_index.build_index(vectors, index_kind)
+                self.vector_store = compacted
+                self._metadata.clear()
+                self._metadata.add(metadatas)
+                self._bm25.clear()
+                self._bm25.add(texts)
+                self.index_version += 1
+                self._mark_unflushed(len(keep))
+            if self.vector_store is None:
+                shutil.rmtree(self.index_path, ignore_errors=True)      # nothing left to save
+                with self._lock:
+                    self._unflushed, self._unflushed_since = 0, None
+            else:
+                self.save()
+            seconds = round(time.perf_counter() - started, 2)
+            after = {'vectors': len(keep), 'disk_mb': self._disk_mb(),
+                     'index': ann_index.describe(getattr(self.vector_store, 'index', None))}
+            logger.info(f"Compacted FAISS index from {before['vectors']:,} to {after['vectors']:,} vectors "
+                        f"in {seconds}s.")
+            return {'before': before, 'after': after, 'seconds': seconds, 'reembedded': reembed}
+        except Exception as e:
+            logger.warning(f"FAISS compaction failed, keeping the current index: {str(e)[:80]}")
+            return None
+        finally:
+            self._rebuild_lock.release()
+
+    def _disk_mb(self):
+        if not os.path.isdir(self.index_path):
+            return 0.0
+        size = sum(os.path.getsize(os.path.join(self.index_path, name)) for name in os.listdir(self.index_path))
+        return round(size / 2 ** 20, 2)
+
+    # ── Write-behind persistence ──────────────────────────────────────────────
+
+    def _mark_unflushed(self, count):
+        """Called under the write lock. True when the flusher should wake up."""
+        with self._lock:
+            self._unflushed += count
+            first = self._unflushed_since is None
+            if first:
+                self._unflushed_since = time.monotonic()
+            return first or self._unflushed >= self.flush_every
+
+    def _ensure_flusher(self):
+        if self._flusher and self._flusher.is_alive():
+            return
+        with self._lock:
+            if not (self._flusher and self._flusher.is_alive()):
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name='faiss-flush')
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                since = self._unflushed_since
+                timeout = None if since is None else since + self.flush_seconds - time.monotonic()
+                due = since is not None and (self._unflushed >= self.flush_every or timeout <= 0)
+            if due:
+                if not self._save_pending():
+                    time.sleep(self.flush_seconds)    # back off; the in-memory index is intact
+                continue
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def flush(self, timeout=None):
+        """Applies queued adds, then saves if anything is pending. Returns True when the disk copy is current."""
+        self._writer.flush(timeout)
+        return self._save_pending()
+
+    def _save_pending(self):
+        with self._lock:
+            if not self._unflushed:
+                return True
+        return self.save()
+
+    def save(self):
+        """Writes the in-memory index to disk atomically (full copy, then directory swap).
+        Holds the read lock: searches continue, adds wait until the copy is written."""
+        started = time.perf_counter()
+        with self._save_lock, self._rw.read():
+            if self.vector_store is None:
+                return True
+            with self._lock:
+                pending = self._unflushed
+            try:
+                self._write_atomic()
+            except Exception as e:
+                with self._lock:
+                    self._persist_stats['errors'] += 1
+                    self._persist_stats['last_error'] = str(e)[:120]
+                logger.warning(f"Failed to save FAISS index to {self.index_path}: {str(e)[:80]}")
+                return False
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._unflushed = 0
+                self._unflushed_since = None
+                s = self._persist_stats
+                s['flushes'] += 1
+                s['records_flushed'] += pending
+                s['last_flush_ms'] = round(elapsed_ms, 2)
+                s['max_flush_ms'] = round(max(s['max_flush_ms'], elapsed_ms), 2)
+                s['last_flush_at'] = time.time()
+        logger.info(f"Successfully saved FAISS index to {self.index_path} ({pending} new records)")
+        return True
+
+    def _write_atomic(self):
+        tmp, old = f'{self.index_path}.tmp', f'{self.index_path}.old'
+        shutil.rmtree(tmp, ignore_errors=True)
+        self.vector_store.save_local(tmp)
+        for name in os.listdir(tmp):
+            with open(os.path.join(tmp, name), 'rb') as fh:
+                os.fsync(fh.fileno())
+        # Swap: a crash between the two renames is repaired by _recover_interrupted_save
+        if os.path.exists(self.index_path):
+            shutil.rmtree(old, ignore_errors=True)
+            os.rename(self.index_path, old)
+        os.rename(tmp, self.index_path)
+        saved = getattr(self.vector_store, 'saved', None)
+        if saved:
+            saved(self.index_path)              # MappedFAISS reads documents from the new copy
+        shutil.rmtree(old, ignore_errors=True)
+
+    def _recover_interrupted_save(self):
+        tmp, old = f'{self.index_path}.tmp', f'{self.index_path}.old'
+        if not os.path.exists(self.index_path) and os.path.exists(old):
+            # Died between the renames: tmp was complete before the old copy moved away
+            os.rename(tmp if os.path.exists(tmp) else old, self.index_path)
+            logger.warning(f"Recovered FAISS index after an interrupted save at {self.index_path}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(old, ignore_errors=True)
+
+    def reset(self):
+        """Drops the in-memory index; the files on disk are replaced at the next save."""
+        self.load()                             # so a later first use does not load the old index back
+        self._writer.flush()
+        with self._rw.write(), self._lock:
+            self.vector_store = None
+            self._metadata.clear()
+            self._bm25.clear()
+            self.index_version += 1
+            self._unflushed = 0
+            self._unflushed_since = None
+
+    def stats(self):
+        with self._lock:
+            since = self._unflushed_since
+            return {
+                **self._persist_stats,
+                'enabled': self.langchain_enabled,
+                'state': self.state,
+                'load_seconds': self.load_seconds,
+                'unflushed': self._unflushed,
+                'oldest_unflushed_sec': round(time.monotonic() - since, 1) if since is not None else None,
+                'flush_every': self.flush_every,
+                'flush_seconds': self.flush_seconds,
+                'writer': self._writer.stats(),
+                'index_type': self.index_type,
+                'index': ann_index.describe(getattr(self.vector_store, 'index', None)),
+                'metadata': self._metadata.stats(),
+                'bm25': self._bm25.stats(),
+                'index_version': self.index_version,
+                'retrieval_cache': self.retrieval_cache.stats(),
+                **self._rebuilds,
+            }
 
     def add_interview_record(self, question: str, user_answer: str, ai_feedback: str, rating: float, metadata: Dict[str, Any] = None):
         """Helper method to format an interview record into a Document and add it to FAISS."""
-        if not LANGCHAIN_AVAILABLE:
+        if not LANGCHAIN_AVAILABLE or not self.load():
             return
             
         try:
-            page_content = f"Question: {question}\nAnswer: {user_answer}\nFeedback: {ai_feedback}\nScore: {rating}/10"
+            page_content = format_interview_record(question, user_answer, ai_feedback, rating)
             
             doc_metadata = {
                 "type": "interview_qa",
@@ -114,24 +644,112 @@ class VectorStoreManager:
         except Exception as e:
             logger.warning(f"Failed to record interview in FAISS: {e}")
 
-    def search_similar(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """Performs a similarity search against the FAISS index."""
-        if not LANGCHAIN_AVAILABLE or self.vector_store is None:
+    def search_similar(self, query: str, top_k: int = 5, filters: Dict[str, Any] = None,
+                       min_score: float = None) -> List[Dict[str, Any]]:
+        """Performs a similarity search against the FAISS index.
+
+        filters (e.g. {'field': 'Software Engineering', 'level': ['Senior', 'Lead']})
+        and min_score restrict the search to matching records inside the index.
+        Results are served from the retrieval cache until the index changes.
+        """
+        if not LANGCHAIN_AVAILABLE or not self.load() or self.vector_store is None:
             logger.debug("FAISS search unavailable - returning empty results")
             return []
             
         try:
-            results = self.vector_store.similarity_search(query, k=top_k)
+            key = retrieval_cache.cache_key(query, top_k, filters, min_score)
+            cached = self.retrieval_cache.get(key, self.index_version)
+            if cached is not None:
+                return cached
+            started = time.perf_counter()
+            vector = self.embeddings.embed_query(query)     # outside the lock
+            with self._rw.read():
+                store = self.vector_store
+                if store is None:
+                    return []
+                version = self.index_version
+                results = []
+                if filters or min_score is not None:
+                    rows = self._metadata.candidates(filters, min_score)
+                    if len(rows):
+                        results = self._documents(store, self._dense_rows(store, vector, top_k, rows))
+                elif ann_index.kind(getattr(store, 'index', None)) and len(self._metadata.dead_rows()):
+                    results = self._documents(store, self._dense_rows(store, vector, top_k))
+                else:
+                    results = store.similarity_search_by_vector(vector, k=top_k)
             # Convert langchain Documents back to dicts for compatibility
-            return [
+            docs = [
                 {
                     'content': doc.page_content,
                     'metadata': doc.metadata
                 } for doc in results
             ]
+            self.retrieval_cache.put(key, version, docs, (time.perf_counter() - started) * 1000)
+            return docs
         except Exception as e:
             logger.warning(f"Error executing similarity search: {e}")
             return []
 
-# Singleton instance with graceful fallback
-vector_store_manager = VectorStoreManager()
+    def search_hybrid(self, query: str, top_k: int = 5, filters: Dict[str, Any] = None,
+                      min_score: float = None, mode: str = 'hybrid') -> List[Dict[str, Any]]:
+        """Like search_similar, ranked by reciprocal-rank fusion of FAISS and BM25.
+
+        The top HYBRID_CANDIDATES rows of each retriever (under the same filters)
+        are fused and the best top_k returned. mode='bm25' ranks by keywords
+        only and mode='dense' is search_similar, for comparing them
+        (retrieval_eval.py). A store without a FAISS index searches dense only.
+        """
+        if mode == 'dense':
+            return self.search_similar(query, top_k, filters, min_score)
+        if not LANGCHAIN_AVAILABLE or not self.load() or self.vector_store is None:
+            return []
+        if not ann_index.kind(getattr(self.vector_store, 'index', None)):
+            return self.search_similar(query, top_k, filters, min_score)
+
+        try:
+            key = retrieval_cache.cache_key(query, top_k, filters, min_score, mode)
+            cached = self.retrieval_cache.get(key, self.index_version)
+            if cached is not None:
+                return cached
+            started = time.perf_counter()
+            vector = self.embeddings.embed_query(query) if mode == 'hybrid' else None
+            depth = max(top_k, bm25_index.HYBRID_CANDIDATES)
+            with self._rw.read():
+                store = self.vector_store
+                if store is None:
+                    return []
+                version = self.index_version
+                rows = None
+                if filters or min_score is not None:
+                    rows = self._metadata.candidates(filters, min_score)
+                results = []
+                if rows is None or len(rows):
+                    dead = self._metadata.dead_rows() if rows is None else None
+                    _, lexical = self._bm25.search(query, depth, rows=rows, dead=dead)
+                    rankings = [lexical]
+                    if mode == 'hybrid':
+                        rankings.insert(0, self._dense_rows(store, vector, depth, rows))
+                    results = self._documents(store, bm25_index.reciprocal_rank_fusion(rankings, top_k))
+            docs = [{'content': doc.page_content, 'metadata': doc.metadata} for doc in results]
+            self.retrieval_cache.put(key, version, docs, (time.perf_counter() - started) * 1000)
+            return docs
+        except Exception as e:
+            logger.warning(f"Error executing hybrid search: {str(e)[:80]}")
+            return []
+
+    def _dense_rows(self, store, vector, k, rows=None):
+        """FAISS row positions nearest to vector, among rows if given, skipping tombstones (read lock held)."""
+        if rows is not None:
+            return metadata_filter.search_rows(store.index, vector, k, rows)[1]
+        dead = self._metadata.dead_rows()
+        if len(dead):
+            return metadata_filter.search_excluding(store.index, vector, k, dead)[1]
+        _, positions = store.index.search(ann_index.np.asarray([vector], dtype='float32'), k)
+        return positions[0][positions[0] >= 0]
+
+    @staticmethod
+    def _documents(store, positions):
+        return [store.docstore.search(store.index_to_docstore_id[int(p)]) for p in positions]
+
+# Singleton instance with graceful fallback; loads on first use or warm_up()
+vector_store_manager = VectorStoreManager(lazy=True)
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Versioned Schema Migrations
+Ordered, idempotent steps recorded in a `schema_version` table so each one
+runs exactly once per database. A database that is already current costs a
+single SELECT at startup instead of ~40 PRAGMA table_info probes and a
+datetime rewrite over every row.
+
+    fresh database     -> create_all() from the models, then every step (cheap no-ops)
+    older database     -> run the pending steps in order, one transaction each
+    current database   -> SELECT MAX(version) FROM schema_version, done
+
+Adding a migration: append a @migration(N, 'name') function with the next
+version number. Steps must be idempotent (check before altering) because a
+pre-versioning database may already contain some of their changes.
+
+Usage:
+    python schema_migrations.py            # migrate the configured DATABASE_URL
+    python schema_migrations.py --status   # show applied / pending steps
+"""
+
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import (Column, DateTime, Float, Integer, MetaData, String, Table,
+                        inspect, select, text, func)
+from sqlalchemy.exc import IntegrityError
+
+from db_config import column_type
+import question_import
+import question_search
+import question_stats
+
+logger = logging.getLogger(__name__)
+
+_version_metadata = MetaData()
+schema_version = Table(
+    'schema_version', _version_metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+    Column('duration_ms', Float),
+)
+
+MIGRATIONS = []
+
+
+def migration(version, name):
+    """Register a step. Versions must be unique and strictly increasing."""
+    def register(fn):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} registered out of order")
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+class MigrationContext:
+    """What a step gets: the open connection, dialect and the models' metadata."""
+
+    def __init__(self, conn, metadata):
+        self.conn = conn
+        self.metadata = metadata
+        self.dialect = conn.dialect.name
+        self._inspector = inspect(conn)
+
+    @property
+    def is_sqlite(self):
+        return self.dialect == 'sqlite'
+
+    def table_names(self):
+        return set(self._inspector.get_table_names())
+
+    def add_columns(self, table, columns):
+        """Add each missing (name, sqlite_type, default) column. One table_info per table."""
+        if table not in self.table_names():
+            return []           # created later at full model shape
+        self._inspector.clear_cache()
+        existing = {c['name'] for c in self._inspector.get_columns(table)}
+        added = []
+        for name, col_type, default in columns:
+            if name in existing:
+                continue
+            col_type = column_type(self.dialect, col_type)
+            default_sql = f" DEFAULT '{default}'" if default is not None else ''
+            self.conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}{default_sql}"))
+            added.append(name)
+        if added:
+            logger.info(f"[Schema] Added {table}.{', '.join(added)}")
+        return added
+
+    def create_missing_tables(self):
+        missing = [t for t in self.metadata.sorted_tables if t.name not in self.table_names()]
+        if missing:
+            self.metadata.create_all(bind=self.conn, tables=missing, checkfirst=True)
+            self._inspector.clear_cache()
+            logger.info(f"[Schema] Created tables: {', '.join(t.name for t in missing)}")
+        return [t.name for t in missing]
+
+
+class SchemaMigrator:
+    """Bring a database up to latest_version(). Safe to run on every boot."""
+
+    def __init__(self, engine, metadata):
+        self.engine = engine
+        self.metadata = metadata
+        self.last_run = None
+
+    def current_version(self):
+        """Highest applied version, or None if the database predates versioning."""
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+        except Exception:
+            return None
+
+    def applied(self):
+        with self.engine.connect() as conn:
+            if not inspect(conn).has_table('schema_version'):
+                return []
+            return [dict(r._mapping) for r in
+                    conn.execute(select(schema_version).order_by(schema_version.c.version))]
+
+    def migrate(self):
+        started = time.perf_counter()
+        target = latest_version()
+        current = self.current_version()
+
+        if current is not None and current >= target:
+            return self._finish(started, current, [], 'current')
+
+        with self.engine.begin() as conn:
+            _version_metadata.create_all(bind=conn, checkfirst=True)
+            fresh = 'interviews' not in inspect(conn).get_table_names()
+            if fresh:
+                # Empty database: the models already have every column, so the
+                # steps below only add what the models can't express (FTS, triggers)
+                self.metadata.create_all(bind=conn, checkfirst=True)
+                logger.info("[Schema] Created tables from models")
+
+        done = {row['version'] for row in self.applied()}
+        ran = []
+        for version, name, fn in MIGRATIONS:
+            if version in done:
+                continue
+            step_started = time.perf_counter()
+            try:
+                with self.engine.begin() as conn:
+                    fn(MigrationContext(conn, self.metadata))
+                    conn.execute(schema_version.insert().values(
+                        version=version, name=name, applied_at=datetime.utcnow(),
+                        duration_ms=round((time.perf_counter() - step_started) * 1000, 2)))
+            except IntegrityError:
+                # A concurrent worker recording the same version is the only
+                # IntegrityError to swallow; a step failing on its own
+                # constraint leaves no version row and must surface.
+                if version not in {row['version'] for row in self.applied()}:
+                    raise
+                logger.info(f"[Schema] Migration {version} ({name}) already applied elsewhere")
+                continue
+            ran.append(version)
+            logger.info(f"[Schema] Applied migration {version}: {name}")
+        outcome = 'created' if fresh else ('migrated' if ran else 'current')
+        return self._finish(started, target, ran, outcome)
+
+    def _finish(self, started, version, ran, outcome):
+        self.last_run = {
+            'version': version,
+            'latest': latest_version(),
+            'outcome': outcome,
+            'applied_this_boot': ran,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+        return self.last_run
+
+    def stats(self):
+        return dict(self.last_run) if self.last_run else {'version': None, 'latest': latest_version()}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# Migration steps — append only, never renumber
+# ══════════════════════════════════════════════════════════════════════════════
+
+@migration(1, 'create_missing_tables')
+def _create_missing_tables(ctx):
+    """Tables added after the first release (was migrate_new_features.py, token tables)."""
+    ctx.create_missing_tables()
+
+
+@migration(2, 'interview_session_columns')
+def _interview_session_columns(ctx):
+    """Was fix_database_schema.py."""
+    ctx.add_columns('interviews', [
+        ('question_type',         'TEXT', 'mock'),
+        ('answer_type',           'TEXT', 'mock'),
+        ('mode',                  'TEXT', 'text'),
+        ('ai_model_used',         'TEXT', None),
+        ('user_profile_snapshot', 'TEXT', None),
+        ('question_prompt',       'TEXT', None),
+    ])
+
+
+@migration(3, 'multiple_choice_columns')
+def _multiple_choice_columns(ctx):
+    """Was migrate_mc_schema.py."""
+    ctx.add_columns('questions', [
+        ('is_multiple_choice', 'BOOLEAN', '0'),
+        ('options',            'TEXT',    None),
+        ('correct_answers',    'TEXT',    None),
+        ('multiple_allowed',   'BOOLEAN', '0'),
+    ])
+    ctx.add_columns('answers', [
+        ('selected_options', 'TEXT', None),
+    ])
+
+
+@migration(4, 'question_metadata_columns')
+def _question_metadata_columns(ctx):
+    ctx.add_columns('questions', [
+        ('question_number', 'INTEGER', '1'),
+        ('source',          'TEXT',    'ai_generated'),
+        ('topic_tags',      'TEXT',    None),
+        ('difficulty',      'TEXT',    None),
+        ('hint',            'TEXT',    None),
+        ('expected_points', 'TEXT',    None),
+        ('time_limit_secs', 'INTEGER', '300'),
+    ])
+    ctx.add_columns('question_bank', [
+        ('question_type', 'TEXT', 'mock'),
+        ('answer_type',   'TEXT', 'mock'),
+    ])
+
+
+@migration(5, 'scoring_columns')
+def _scoring_columns(ctx):
+    ctx.add_columns('answers', [
+        ('word_count',          'INTEGER', '0'),
+        ('score',               'REAL',    None),
+        ('technical_accuracy',  'REAL',    None),
+        ('depth_score',         'REAL',    None),
+        ('clarity_score',       'REAL',    None),
+        ('relevance_score',     'REAL',    None),
+        ('communication_score', 'REAL',    None),
+        ('confidence_score',    'REAL',    None),
+        ('time_spent_seconds',  'INTEGER', '0'),
+        ('submitted_at',        'DATETIME', None),
+    ])
+    ctx.add_columns('feedback', [
+        ('score',             'REAL',     None),
+        ('strengths',         'TEXT',     None),
+        ('improvements',      'TEXT',     None),
+        ('detailed_feedback', 'TEXT',     None),
+        ('improvement_plan',  'TEXT',     None),
+        ('model_used',        'TEXT',     None),
+        ('generated_at',      'DATETIME', None),
+    ])
+
+
+@migration(6, 'user_auth_columns')
+def _user_auth_columns(ctx):
+    """Login hardening columns plus migrate_password_reset.py."""
+    ctx.add_columns('users', [
+        ('created_at',                  'DATETIME',     None),
+        ('last_login',                  'DATETIME',     None),
+        ('failed_login_attempts',       'INTEGER',      '0'),
+        ('account_locked_until',        'DATETIME',     None),
+        ('last_failed_login',           'DATETIME',     None),
+        ('password_changed_at',         'DATETIME',     None),
+        ('password_reset_token',        'VARCHAR(255)', None),
+        ('password_reset_token_expiry', 'DATETIME',     None),
+    ])
+
+
+@migration(7, 'user_analytics_backfill')
+def _user_analytics_backfill(ctx):
+    """Give every existing user an analytics row (second half of migrate_new_features.py)."""
+    users = ctx.metadata.tables['users']
+    analytics = ctx.metadata.tables['user_analytics']
+    missing = ctx.conn.execute(
+        select(users.c.id).where(~users.c.id.in_(select(analytics.c.user_id)))).scalars().all()
+    if missing:
+        # Core insert applies the column defaults ('{}', '[]', 0 ...)
+        ctx.conn.execute(analytics.insert(), [{'user_id': uid} for uid in missing])
+        logger.info(f"[Schema] Created UserAnalytics for {len(missing)} existing users")
+
+
+# (table, [(column, is_date)]) — legacy rows written with a space separator
+_DATETIME_COLUMNS = [
+    ('users',         [('created_at', False), ('last_login', False), ('last_activity_date', True)]),
+    ('interviews',    [('started_at', False), ('completed_at', False)]),
+    ('questions',     [('created_at', False)]),
+    ('answers',       [('submitted_at', False)]),
+    ('feedback',      [('generated_at', False)]),
+    ('question_bank', [('created_at', False)]),
+]
+
+
+@migration(8, 'iso_datetimes')
+def _iso_datetimes(ctx):
+    """Was fix_datetime_formats.py / fix_remaining_datetimes.py and the per-boot normaliser.
+    SQLite only — PostgreSQL stores real TIMESTAMP values."""
+    if not ctx.is_sqlite:
+        return
+    tables = ctx.table_names()
+    for table, cols in _DATETIME_COLUMNS:
+        if table not in tables:
+            continue
+        existing = {c['name'] for c in inspect(ctx.conn).get_columns(table)}
+        for col, is_date in cols:
+            if col not in existing:
+                continue
+            if is_date:
+                ctx.conn.execute(text(
+                    f"UPDATE {table} SET {col} = substr({col}, 1, 10) "
+                    f"WHERE {col} IS NOT NULL AND length({col}) > 10"))
+            else:
+                ctx.conn.execute(text(
+                    f"UPDATE {table} SET {col} = replace({col}, ' ', 'T') "
+                    f"WHERE {col} LIKE '% %' AND {col} NOT LIKE '%T%'"))
+
+
+
+@migration(9, 'question_bank_fts')
+def _question_bank_fts(ctx):
+    """FTS5 index + sync triggers for library search (question_search.py)."""
+    if ctx.is_sqlite and question_search.fts5_available(ctx.conn):
+        ctx.add_columns('question_bank', [      # the sync triggers read all indexed columns
+            ('category',   'VARCHAR(50)',  None),
+            ('field',      'VARCHAR(100)', None),
+            ('difficulty', 'VARCHAR(20)',  'medium'),
+            ('topic_tags', 'TEXT',         None),
+        ])
+        question_search.create_index(ctx.conn)
+    else:
+        logger.info("[Schema] FTS5 unavailable, question search stays on LIKE queries")
+
+
+@migration(10, 'question_usage_stats')
+def _question_usage_stats(ctx):
+    """Ranking columns for question_stats.py and the bank link on served questions."""
+    ctx.add_columns('question_bank', [
+        ('times_used',            'INTEGER',     '0'),
+        ('avg_score',             'REAL',        '0'),
+        ('score_count',           'INTEGER',     '0'),
+        ('popularity',            'REAL',        '0'),
+        ('calibrated_difficulty', 'VARCHAR(20)', None),
+    ])
+    ctx.add_columns('questions', [
+        ('bank_question_id', 'INTEGER', None),
+    ])
+    ctx.conn.execute(text("CREATE INDEX IF NOT EXISTS ix_qbank_popularity ON question_bank (popularity)"))
+    ctx.conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_questions_bank_question_id ON questions (bank_question_id)"))
+    question_stats.refresh_ranking(ctx.conn)
+
+
+
+@migration(11, 'question_bank_text_hash')
+def _question_bank_text_hash(ctx):
+    """Unique dedup key for question_import.py and stored MC options."""
+    ctx.add_columns('question_bank', [
+        ('text_hash',  'VARCHAR(64)', None),
+        ('mc_options', 'TEXT',        None),
+    ])
+    # Later copies of duplicated texts keep a NULL hash (allowed by the unique index)
+    seen, updates = set(), []
+    for qid, question_text in ctx.conn.execute(text(
+            "SELECT id, text FROM question_bank WHERE text_hash IS NULL ORDER BY id")):
+        digest = question_import.text_hash(question_text)
+        if digest not in seen:
+            seen.add(digest)
+            updates.append({'id': qid, 'h': digest})
+    if updates:
+        ctx.conn.execute(text("UPDATE question_bank SET text_hash = :h WHERE id = :id"), updates)
+    ctx.conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_qbank_text_hash ON question_bank (text_hash)"))
+
+
+@migration(12, 'interview_archive_summary')
+def _interview_archive_summary(ctx):
+    """Summary columns kept on interviews moved to the archive tier (interview_archive.py)."""
+    ctx.add_columns('interviews', [
+        ('archived_at',  'DATETIME', None),
+        ('answer_count', 'INTEGER',  None),
+    ])
+
+
+if __name__ == '__main__':
+    import sys
+    from app import app, db, schema_migrator     # importing app already migrates
+
+    with app.app_context():
+        print(f"Database : {db.engine.url.render_as_string(hide_password=True)}")
+        print(f"Last run : {schema_migrator.stats()}")
+        if '--status' in sys.argv:
+            done = {r['version']: r for r in schema_migrator.applied()}
+            for version, name, _ in MIGRATIONS:
+                row = done.get(version)
+                state = f"applied {row['applied_at']}" if row else 'PENDING'
+                print(f"  {version:3d}  {name:28s} {state}")
+        sys.exit(0 if schema_migrator.current_version() == latest_version() else 1)
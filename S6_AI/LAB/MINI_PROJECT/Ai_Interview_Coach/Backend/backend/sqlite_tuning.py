@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+SQLite Operational Tuning
+Connection PRAGMAs (WAL, busy_timeout, mmap, cache, autocheckpoint) plus a
+background WAL checkpoint scheduler so the -wal file never grows unbounded.
+
+All knobs are read from the environment:
+    SQLITE_BUSY_TIMEOUT_MS        wait this long on a locked DB before raising   (5000)
+    SQLITE_MMAP_SIZE_MB           memory-mapped I/O window, 0 disables           (256)
+    SQLITE_CACHE_SIZE_MB          page cache per connection                       (32)
+    SQLITE_WAL_AUTOCHECKPOINT     pages before SQLite's own passive checkpoint    (10000)
+    SQLITE_CHECKPOINT_INTERVAL    seconds between scheduled checkpoints, 0 = off  (60)
+    SQLITE_CHECKPOINT_TRUNCATE_MB WAL size that upgrades PASSIVE → TRUNCATE       (16)
+
+SQLite's own autocheckpoint runs inside whichever COMMIT crosses the page
+limit, and that commit (plus the writers queued behind it) pays for the
+checkpoint's fsync. The limit is set well above SQLite's default 1000 so the
+scheduler does the checkpointing off the request path; the autocheckpoint is
+only a backstop when the scheduler is off or falls behind.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class SQLiteTuning:
+    """Resolved tuning settings (env → attributes)."""
+
+    def __init__(self):
+        self.busy_timeout_ms      = _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000)
+        self.mmap_size            = _env_int('SQLITE_MMAP_SIZE_MB', 256) * 1024 * 1024
+        self.cache_size_kb        = _env_int('SQLITE_CACHE_SIZE_MB', 32) * 1000
+        self.wal_autocheckpoint   = _env_int('SQLITE_WAL_AUTOCHECKPOINT', 10000)
+        self.checkpoint_interval  = _env_int('SQLITE_CHECKPOINT_INTERVAL', 60)
+        self.truncate_threshold   = _env_int('SQLITE_CHECKPOINT_TRUNCATE_MB', 16) * 1024 * 1024
+
+    def apply(self, dbapi_connection):
+        """Run the per-connection PRAGMAs. Safe to call on every new connection."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")   # set first: journal_mode may need the lock
+        cursor.execute("PRAGMA journal_mode=WAL")       # concurrent reads
+        cursor.execute("PRAGMA foreign_keys=ON")        # enforce FK contraints
+        cursor.execute("PRAGMA synchronous=NORMAL")     # safe + fast under WAL
+        cursor.execute(f"PRAGMA cache_size=-{self.cache_size_kb}")
+        cursor.execute("PRAGMA temp_store=MEMORY")      # temp tables in RAM
+        cursor.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        cursor.execute(f"PRAGMA wal_autocheckpoint={self.wal_autocheckpoint}")
+        cursor.close()
+
+    def to_dict(self):
+        return {
+            'busy_timeout_ms': self.busy_timeout_ms,
+            'mmap_size_mb': self.mmap_size // (1024 * 1024),
+            'cache_size_mb': self.cache_size_kb // 1000,
+            'wal_autocheckpoint_pages': self.wal_autocheckpoint,
+            'checkpoint_interval_sec': self.checkpoint_interval,
+            'checkpoint_truncate_mb': self.truncate_threshold // (1024 * 1024),
+        }
+
+
+def is_sqlite_connection(dbapi_connection):
+    return isinstance(dbapi_connection, sqlite3.Connection)
+
+
+class WALCheckpointScheduler:
+    """
+    Background thread that checkpoints the WAL on a fixed interval.
+
+    PASSIVE never blocks readers or writers; once the -wal file grows past
+    the truncate threshold a TRUNCATE checkpoint is attempted instead, which
+    resets the file to zero bytes when no reader is pinning old frames.
+    """
+
+    def __init__(self, db_path, tuning):
+        self.db_path = db_path
+        self.wal_path = db_path + '-wal'
+        self.tuning = tuning
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._stats = {
+            'runs': 0, 'passive': 0, 'truncate': 0, 'busy': 0, 'errors': 0,
+            'last_mode': None, 'last_log_frames': None, 'last_checkpointed_frames': None,
+            'last_duration_ms': None, 'last_run_at': None, 'last_error': None,
+        }
+
+    def wal_size_bytes(self):
+        try:
+            return os.path.getsize(self.wal_path)
+        except OSError:
+            return 0
+
+    def checkpoint(self, mode=None):
+        """Run one checkpoint. mode=None picks PASSIVE or TRUNCATE from the WAL size."""
+        if mode is None:
+            mode = 'TRUNCATE' if self.wal_size_bytes() >= self.tuning.truncate_threshold else 'PASSIVE'
+        started = time.perf_counter()
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=self.tuning.busy_timeout_ms / 1000)
+            try:
+                busy, log_frames, ckpt_frames = conn.execute(
+                    f"PRAGMA wal_checkpoint({mode})").fetchone()
+            finally:
+                conn.close()
+            with self._lock:
+                s = self._stats
+                s['runs'] += 1
+                s[mode.lower()] = s.get(mode.lower(), 0) + 1
+                s['busy'] += 1 if busy else 0
+                s['last_mode'] = mode
+                s['last_log_frames'] = log_frames
+                s['last_checkpointed_frames'] = ckpt_frames
+                s['last_duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                s['last_run_at'] = time.time()
+            return busy, log_frames, ckpt_frames
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += 1
+                self._stats['last_error'] = str(e)[:120]
+            logger.debug(f"[SQLite] Checkpoint ({mode}) failed: {str(e)[:80]}")
+            return None
+
+    def start(self):
+        if self.tuning.checkpoint_interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name='wal-checkpoint')
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.tuning.checkpoint_interval):
+            self.checkpoint()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._stats)
+        data['wal_size_bytes'] = self.wal_size_bytes()
+        data['scheduler_running'] = bool(self._thread and self._thread.is_alive())
+        if data['last_run_at']:
+            data['seconds_since_checkpoint'] = round(time.time() - data['last_run_at'], 1)
+        data.pop('last_run_at')
+        return data
+
+
+sqlite_tuning = SQLiteTuning()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+ANN INDEX TEST
+Checks rag/ann_index.py's sizing helpers, that each index type builds and
+finds the exact neighbours of stored vectors, and that VectorStoreManager
+switches a flat index to the configured type once it is large enough, keeps
+adds made during the rebuild, saves it and tunes it again on load.
+"""
+import os
+import pickle
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+import faiss
+import numpy as np
+
+import rag.ann_index as ann_index
+import rag.vector_store as vs
+
+DIM = 32
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class Document:
+    def __init__(self, page_content, metadata):
+        self.page_content, self.metadata = page_content, metadata
+
+
+class Docstore:
+    def __init__(self):
+        self._dict = {}
+
+    def search(self, key):
+        return self._dict[key]
+
+
+class FakeFAISS:
+    """The parts of LangChain's FAISS wrapper VectorStoreManager uses, over a real faiss index."""
+
+    def __init__(self, index):
+        self.index, self.docstore, self.index_to_docstore_id = index, Docstore(), {}
+
+    @classmethod
+    def from_embeddings(cls, pairs, embeddings, metadatas=None):
+        store = cls(faiss.IndexFlatL2(DIM))
+        store.add_embeddings(pairs, metadatas)
+        return store
+
+    def add_embeddings(self, pairs, metadatas=None):
+        texts, vectors = zip(*pairs)
+        for text, metadata in zip(texts, metadatas):
+            key = str(len(self.index_to_docstore_id))
+            self.index_to_docstore_id[len(self.index_to_docstore_id)] = key
+            self.docstore._dict[key] = Document(text, metadata)
+        self.index.add(np.array(vectors, dtype='float32'))
+
+    def similarity_search_by_vector(self, vector, k=4):
+        _, ids = self.index.search(np.array([vector], dtype='float32'), k)
+        return [self.docstore.search(self.index_to_docstore_id[i]) for i in ids[0] if i >= 0]
+
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+        faiss.write_index(self.index, os.path.join(folder_path, 'index.faiss'))
+        with open(os.path.join(folder_path, 'index.pkl'), 'wb') as fh:
+            pickle.dump((self.docstore._dict, self.index_to_docstore_id), fh)
+
+    @classmethod
+    def load_local(cls, folder_path, embeddings, allow_dangerous_deserialization=False):
+        store = cls(faiss.read_index(os.path.join(folder_path, 'index.faiss')))
+        with open(os.path.join(folder_path, 'index.pkl'), 'rb') as fh:
+            store.docstore._dict, store.index_to_docstore_id = pickle.load(fh)
+        return store
+
+
+rng = np.random.default_rng(3)
+centres = rng.normal(0, 1, (40, DIM)).astype('float32')
+
+
+def vector(i):
+    local = np.random.default_rng(i)
+    return (centres[i % len(centres)] + local.normal(0, 0.3, DIM)).astype('float32')
+
+
+class Embeddings:
+    """Deterministic 'embedding': the text 'record <i>' maps to vector(i)."""
+
+    def embed_documents(self, texts):
+        return [vector(int(t.split()[1])).tolist() for t in texts]
+
+    def embed_query(self, text):
+        return vector(int(text.split()[1])).tolist()
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+print("=" * 60)
+print("  ANN INDEX")
+print("=" * 60)
+
+print("\n[1] Sizing")
+check("nlist ~ 4 sqrt(n)", ann_index.choose_nlist(1_000_000), 4000)
+check("nlist capped at 39 vectors per cell", ann_index.choose_nlist(10_000), 256)
+check("PQ sub-quantisers divide d", (ann_index.pq_subquantizers(384), ann_index.pq_subquantizers(100, 48)), (96, 25))
+check("factory specs", [ann_index.factory_spec(t, 100_000, 384) for t in ann_index.INDEX_TYPES],
+      ['Flat', 'HNSW32,Flat', 'IVF1264,Flat', 'IVF1264,PQ96'])
+
+print("\n[2] Each type finds stored vectors")
+ann_index.PQ_M = 8                          # 4-dim sub-quantisers: quick to train at d=32
+data = np.array([vector(i) for i in range(4000)])
+for index_type in ann_index.INDEX_TYPES:
+    index = ann_index.build_index(data, index_type)
+    _, ids = index.search(data[:200], 1)
+    hit = float(np.mean(ids[:, 0] == np.arange(200)))
+    check(f"{index_type}: type and self-recall@1", (ann_index.kind(index), hit >= 0.9), (index_type, True))
+check("search parameters applied", ann_index.describe(ann_index.build_index(data, 'ivf'))['nprobe'],
+      ann_index.IVF_NPROBE)
+
+print("\n[3] Automatic upgrade in VectorStoreManager")
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = FakeFAISS, Document, EmbeddingService()
+ann_index.ANN_MIN_VECTORS = 2000
+tmp = tempfile.mkdtemp()
+index_path = os.path.join(tmp, 'vectors')
+manager = vs.VectorStoreManager(index_path=index_path, index_type='ivf', flush_every=10_000, flush_seconds=60)
+texts = [f'record {i}' for i in range(3000)]
+manager.add_embedded(texts[:1500], Embeddings().embed_documents(texts[:1500]), [{'i': i} for i in range(1500)],
+                     save=False)
+check("flat below the threshold", manager.stats()['index']['type'], 'flat')
+manager.add_embedded(texts[1500:], Embeddings().embed_documents(texts[1500:]),
+                     [{'i': i} for i in range(1500, 3000)], save=False)
+stats = manager.stats()
+check("switched to ivf at the threshold", (stats['index']['type'], stats['index']['vectors']), ('ivf', 3000))
+check("rebuild recorded and saved", (stats['rebuilds'], stats['unflushed'], stats['last_rebuild_error']),
+      (1, 0, None))
+found = manager.search_similar('record 2999', top_k=1)
+check("search maps back to the right document", found[0]['metadata'], {'i': 2999})
+
+print("\n[4] Rebuild command and reload")
+report = manager.rebuild_index('hnsw', reembed=True)
+check("rebuild as another type, re-embedding", (report['index']['type'], report['reembedded']), ('hnsw', True))
+check("documents still line up", manager.search_similar('record 17', top_k=1)[0]['metadata'], {'i': 17})
+reloaded = vs.VectorStoreManager(index_path=index_path, index_type='hnsw')
+check("saved index reloaded with its type", reloaded.stats()['index']['type'], 'hnsw')
+check("search parameters re-applied on load", reloaded.stats()['index']['ef_search'], ann_index.HNSW_EF_SEARCH)
+manager.reset()
+check("rebuild with nothing loaded is a no-op", manager.rebuild_index('ivf'), None)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
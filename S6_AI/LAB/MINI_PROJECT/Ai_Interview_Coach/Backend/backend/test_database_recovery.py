@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+DATABASE RECOVERY TEST
+Builds a small database with stale user stats and orphaned rows, then checks
+that database_recovery.py reports them, leaves the data alone on a dry run
+and fixes the stats with its set-based update.
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+from database_recovery import DatabaseRecovery
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+tmp = tempfile.mkdtemp()
+db_path = os.path.join(tmp, 'recovery.db')
+conn = sqlite3.connect(db_path)
+conn.executescript("""
+    PRAGMA journal_mode = WAL;
+    CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(120), total_interviews INTEGER DEFAULT 0,
+                        total_questions_answered INTEGER DEFAULT 0, total_practice_time INTEGER DEFAULT 0,
+                        average_score FLOAT DEFAULT 0, best_score FLOAT DEFAULT 0, last_activity_date DATE);
+    CREATE TABLE interviews (id INTEGER PRIMARY KEY, user_id INTEGER, status VARCHAR(20),
+                             overall_score FLOAT, duration_seconds INTEGER, completed_at DATETIME);
+    CREATE TABLE questions (id INTEGER PRIMARY KEY, interview_id INTEGER);
+    CREATE TABLE answers (id INTEGER PRIMARY KEY, interview_id INTEGER, question_id INTEGER, score FLOAT);
+    CREATE TABLE feedback (id INTEGER PRIMARY KEY, user_id INTEGER, answer_id INTEGER);
+
+    -- user 1: two completed interviews (one unscored), one in progress; stats stale
+    -- user 2: nothing completed but stats claim otherwise
+    -- user 3: already correct
+    INSERT INTO users VALUES (1, 'a@x.io', 0, 0, 0, 0, 0, NULL),
+                             (2, 'b@x.io', 5, 9, 600, 7.5, 9.0, '2024-01-01'),
+                             (3, 'c@x.io', 1, 1, 60, 6.0, 6.0, '2024-02-02');
+    INSERT INTO interviews VALUES (1, 1, 'completed', 7.456, 300, '2024-03-01T10:00:00'),
+                                  (2, 1, 'completed', NULL,  120, '2024-03-05T09:00:00'),
+                                  (3, 1, 'in_progress', NULL, NULL, NULL),
+                                  (4, 3, 'completed', 6.0, 60, '2024-02-02T08:00:00'),
+                                  (5, 99, 'completed', 5.0, 10, '2024-01-01T00:00:00');
+    INSERT INTO questions VALUES (1, 1), (2, 1), (3, 2), (4, 4), (5, 3), (6, 42);
+    INSERT INTO answers VALUES (1, 1, 1, 7.0), (2, 1, 2, 8.0), (3, 2, 3, 6.0), (4, 4, 4, 6.0),
+                               (5, 3, 5, 5.0), (6, 77, 1, 4.0), (7, 1, 555, 3.0);
+    INSERT INTO feedback VALUES (1, 1, 1), (2, 1, 999), (3, 50, 2);
+""")
+conn.commit()
+
+
+def users():
+    with sqlite3.connect(db_path) as c:
+        return {r[0]: r[1:] for r in c.execute(
+            "SELECT id, total_interviews, average_score, best_score, total_practice_time, "
+            "total_questions_answered, last_activity_date FROM users")}
+
+
+before = users()
+report_path = os.path.join(tmp, 'report.json')
+
+print("=" * 60)
+print("  DATABASE RECOVERY")
+print("=" * 60)
+
+print("\n[1] Dry run")
+dry = DatabaseRecovery(db_path, dry_run=True, report_path=report_path, verbose=False)
+check("dry run succeeds", dry.run_full_recovery(), True)
+found = {c['name']: c['found'] for c in dry.report['checks']}
+check("orphans found", found, {
+    'interviews_without_users': 1, 'questions_without_interviews': 1, 'answers_without_interviews': 1,
+    'answers_without_questions': 1, 'feedback_without_users': 1, 'feedback_without_answers': 1,
+    'completed_interviews_without_scores': 1})
+check("sample ids reported", next(c['sample_ids'] for c in dry.report['checks']
+                                  if c['name'] == 'feedback_without_answers'), [2])
+check("stale users counted", dry.report['fixes'][0]['users_stale'], 2)
+check("diff shows old and new values", dry.report['diffs'][0]['changes']['total_interviews'],
+      {'old': 0, 'new': 2})
+check("nothing written", users(), before)
+with open(report_path) as fh:
+    check("JSON report saved", json.load(fh)['dry_run'], True)
+
+print("\n[2] Recovery")
+real = DatabaseRecovery(db_path, report_path=report_path, verbose=False)
+check("recovery succeeds", real.run_full_recovery(), True)
+after = users()
+check("user 1 recomputed", after[1], (2, 7.46, 7.46, 420, 4, '2024-03-05'))
+check("user 2 zeroed, last activity kept", after[2], (0, 0.0, 0.0, 0, 0, '2024-01-01'))
+check("user 3 untouched", after[3], before[3])
+check("only stale users updated", real.report['fixes'][0]['users_fixed'], 2)
+
+print("\n[3] Second run is a no-op")
+again = DatabaseRecovery(db_path, report_path=None, verbose=False)
+again.run_full_recovery()
+check("no stale users left", again.report['fixes'][0]['users_stale'], 0)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+EMBEDDING BATCHER TEST
+rag/embedding_batcher.py with a slow counting model: concurrent single-text
+calls from many threads share forward passes, every caller gets its own
+text's vector, a lone call waits at most the batching delay, big lists skip
+the queue, a failed pass raises in each of its callers without stopping the
+worker, and EmbeddingService.embed_batch serves cache hits without a pass.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, '.')
+
+os.environ['EMBEDDING_CACHE_DIR'] = tempfile.mkdtemp()
+
+import rag.embedding_service as es
+from rag.embedding_batcher import BatchedEmbeddings
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class SlowModel:
+    """Each call costs 20 ms however many texts it gets (a forward pass); vector = [len(text), n]."""
+
+    def __init__(self):
+        self.calls, self.query_calls, self.fail_next = [], 0, False
+
+    def embed_documents(self, texts):
+        time.sleep(0.02)
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("out of memory")
+        self.calls.append(len(texts))
+        return [[float(len(t)), float(t.count('x'))] for t in texts]
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return [float(len(text)), -1.0]
+
+
+def concurrently(fn, args):
+    out = [None] * len(args)
+    def run(i):
+        out[i] = fn(args[i])
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(args))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return out
+
+
+print("=" * 60)
+print("  EMBEDDING BATCHER")
+print("=" * 60)
+
+print("\n[1] Concurrent single texts")
+model = SlowModel()
+batched = BatchedEmbeddings(model, max_batch=32, max_delay=0.005)
+texts = ['x' * i + 'y' * (40 - i) for i in range(40)]
+vectors = concurrently(batched.embed_query, texts)
+check("each caller gets its own vector", vectors, [[40.0, float(i)] for i in range(40)])
+check("40 calls in far fewer passes", len(model.calls) <= 8, True)
+check("no pass bigger than max_batch", max(model.calls) <= 32, True)
+stats = batched.stats()
+check("stats: texts", stats['texts'], 40)
+check("stats: average batch > 4", stats['avg_batch_size'] > 4, True)
+docs = concurrently(lambda t: batched.embed_documents([t, t + 'x']), texts[:10])
+check("small lists merge too, order kept", docs[3], [[40.0, 3.0], [41.0, 4.0]])
+
+print("\n[2] Latency and bypass")
+model.calls.clear()
+started = time.perf_counter()
+batched.embed_query('alone')
+elapsed = time.perf_counter() - started
+check("lone call: one pass, waited at most the delay", (model.calls, elapsed < 0.02 + 0.005 + 0.02), ([1], True))
+model.calls.clear()
+batched.embed_documents(texts[:32])
+check("a list of max_batch goes to the model directly", (model.calls, batched.stats()['direct_texts']), ([32], 32))
+
+print("\n[3] Failures")
+model.fail_next = True
+def attempt(text):
+    try:
+        batched.embed_query(text)
+        return 'ok'
+    except RuntimeError as e:
+        return str(e)
+outcomes = concurrently(attempt, ['a', 'bb', 'ccc'])
+check("callers in the failed pass see the error", 'out of memory' in outcomes, True)
+check("worker survives a failure", batched.embed_query('after'), [5.0, 0.0])
+check("errors counted", batched.stats()['errors'], 1)
+
+print("\n[4] Asymmetric models")
+model = SlowModel()
+asym = BatchedEmbeddings(model, max_batch=32, max_delay=0.005, symmetric=False)
+mixed = concurrently(lambda t: asym.embed_query(t) if t.startswith('q') else asym.embed_documents([t])[0],
+                     ['q1', 'd1', 'q2', 'd2'])
+check("queries use embed_query", (mixed[0], mixed[2], model.query_calls), ([2.0, -1.0], [2.0, -1.0], 2))
+check("documents batched", (mixed[1], mixed[3], sum(model.calls)), ([2.0, 0.0], [2.0, 0.0], 2))
+
+print("\n[5] EmbeddingService.embed_batch")
+model = SlowModel()
+es.BACKEND_AVAILABLE = True
+es._import_model_stack = lambda: (lambda model_name: model)
+es.EmbeddingService._instance = None
+service = es.EmbeddingService()
+check("embed_batch returns vectors", service.embed_batch(['ab', 'xxx']), [[2.0, 0.0], [3.0, 3.0]])
+check("model behind batcher and cache",
+      (type(service.get_embeddings()).__name__, type(service.batcher).__name__),
+      ('CachedEmbeddings', 'BatchedEmbeddings'))
+calls = len(model.calls)
+service.embed_batch(['ab', 'xxx'])
+check("cache hits skip the batcher", len(model.calls), calls)
+concurrently(lambda t: service.get_embeddings().embed_query(t), [f'q{i}' for i in range(16)])
+check("concurrent queries through the service share passes", len(model.calls) - calls < 16, True)
+check("batcher stats in status()", service.status()['batcher']['texts'] >= 18, True)
+es.EmbeddingService._instance = None
+es.BACKEND_AVAILABLE = False
+check("unavailable service returns None", es.EmbeddingService().embed_batch(['x']), None)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
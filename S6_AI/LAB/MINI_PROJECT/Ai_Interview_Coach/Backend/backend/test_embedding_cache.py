@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+EMBEDDING CACHE TEST
+rag/embedding_cache.py with a counting fake model: cached texts are not
+embedded again (also after a restart), whitespace variants share one entry,
+repeats in a batch are embedded once, queries and documents are kept apart,
+a new model name or a different dimension starts an empty cache, the vectors
+file grows past its initial capacity and two instances on one directory see
+each other's writes.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from rag.embedding_cache import CachedEmbeddings, EmbeddingCache, text_key
+
+DIM = 16
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class CountingModel:
+    """Deterministic embeddings per text; counts how many texts it was asked to embed."""
+
+    def __init__(self, dim=DIM):
+        self.dim, self.calls = dim, 0
+
+    def vector(self, text, salt=0):
+        seed = int.from_bytes(text_key(text)[:4], 'little') + salt
+        return np.random.default_rng(seed).normal(0, 1, self.dim).astype('float32').tolist()
+
+    def embed_documents(self, texts):
+        self.calls += len(texts)
+        return [self.vector(t) for t in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return self.vector(text, salt=1)
+
+
+tmp = tempfile.mkdtemp()
+
+print("=" * 60)
+print("  EMBEDDING CACHE")
+print("=" * 60)
+
+print("\n[1] Hits and misses")
+model = CountingModel()
+cache = EmbeddingCache('test/model-a', path=tmp, initial_capacity=8)
+cached = CachedEmbeddings(model, cache)
+texts = [f'answer number {i}' for i in range(5)]
+first = cached.embed_documents(texts)
+check("first call embeds every text", model.calls, 5)
+check("returns the model's vectors", np.allclose(first, model.embed_documents(texts)), True)
+model.calls = 0
+again = cached.embed_documents(texts + ['a new answer'])
+check("second call embeds only the new text", model.calls, 1)
+check("cached vectors unchanged", np.allclose(again[:5], first), True)
+check("returned as lists", type(again[0]), list)
+stats = cache.stats()
+check("hits counted", stats['hits'], 5)
+check("misses counted", stats['misses'], 6)
+check("hit rate", stats['hit_rate'], round(5 / 11, 4))
+check("entries", stats['entries'], 6)
+
+print("\n[2] Normalisation, batch dedupe, namespaces")
+model.calls = 0
+cached.embed_documents(['  answer   number 0\n', 'answer number 0'])
+check("whitespace variants hit the same entry", model.calls, 0)
+cached.embed_documents(['repeat me'] * 4)
+check("repeats in one batch embedded once", model.calls, 1)
+query = cached.embed_query('answer number 1')
+check("a query is not served the document vector", model.calls, 2)
+check("query vector comes from embed_query", np.allclose(query, model.vector('answer number 1', salt=1)), True)
+cached.embed_query('answer number 1')
+check("query cached", model.calls, 2)
+
+print("\n[3] Persistence and sharing")
+reopened = CachedEmbeddings(model, EmbeddingCache('test/model-a', path=tmp, initial_capacity=8))
+model.calls = 0
+check("vectors survive a restart", np.allclose(reopened.embed_documents(texts), first), True)
+check("nothing re-embedded after restart", model.calls, 0)
+bulk = [f'bulk text {i}' for i in range(50)]
+reopened.embed_documents(bulk)
+check("file grew past the initial capacity", os.path.getsize(os.path.join(cache.dir, 'vectors.f32')), 64 * DIM * 4)
+model.calls = 0
+check("other instance sees the new rows", np.allclose(cached.embed_documents(bulk), reopened.embed_documents(bulk)),
+      True)
+check("no re-embedding across instances", model.calls, 0)
+cached.embed_documents(['written by the first'])
+reopened.embed_documents(['written by the second'])
+rows = [row for (row,) in cache._db.execute("SELECT row FROM entries ORDER BY row")]
+check("interleaved writers never share a row", rows, list(range(len(rows))))
+
+print("\n[4] Versioning")
+other = CountingModel()
+cache_b = EmbeddingCache('test/model-b', path=tmp)
+CachedEmbeddings(other, cache_b).embed_documents(texts)
+check("another model has its own cache", other.calls, 5)
+check("model directories separate", cache_b.dir != cache.dir, True)
+with open(os.path.join(cache.dir, 'meta.json'), 'w') as fh:
+    fh.write('{"model": "test/model-old", "dim": 16, "format": 1}')
+check("cache from another model is wiped", EmbeddingCache('test/model-a', path=tmp).stats()['entries'], 0)
+wide = CountingModel(dim=DIM * 2)
+cache_wide = EmbeddingCache('test/model-b', path=tmp)
+vector = CachedEmbeddings(wide, cache_wide).embed_documents(['a longer vector'])[0]
+check("new dimension starts over", (len(vector), cache_wide.stats()['entries'], cache_wide.dim), (DIM * 2, 1, DIM * 2))
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+FAISS STORE TEST
+rag/faiss_store.py under VectorStoreManager with a real faiss index: saves
+write index.faiss + docstore.sqlite and no pickle, a load unpickles nothing,
+maps the index and reads no document until a hit needs it, a worker can add
+to a mapped index, documents added since the load move to the new file on
+save, and a directory in LangChain's pickled format is converted once.
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, '.')
+
+import faiss
+import numpy as np
+
+import rag.faiss_store as faiss_store
+import rag.vector_store as vs
+
+DIM = 32
+N = 20000
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+def vector(i):
+    return np.random.default_rng(i).normal(0, 1, DIM).astype('float32')
+
+
+class Embeddings:
+    """'record <i>' embeds to vector(i)."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        return vector(int(text.split()[1])).tolist()
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+def metadata(i):
+    return {'type': 'interview_qa', 'question_id': i % 50, 'field': ['SE', 'DS'][i % 2], 'score': float(i % 11),
+            'i': i}
+
+
+def manager_at(path, **kwargs):
+    return vs.VectorStoreManager(index_path=path, flush_every=100_000, flush_seconds=60, **kwargs)
+
+
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = faiss_store.MappedFAISS, faiss_store.Document, EmbeddingService()
+tmp = tempfile.mkdtemp()
+index_path = os.path.join(tmp, 'vectors')
+
+print("=" * 60)
+print("  FAISS STORE")
+print("=" * 60)
+
+print("\n[1] Save")
+writer = manager_at(index_path)
+texts = [f'record {i}' for i in range(N)]
+writer.add_embedded(texts, Embeddings().embed_documents(texts), [metadata(i) for i in range(N)])
+check("index.faiss and docstore.sqlite, no pickle", sorted(os.listdir(index_path)),
+      ['docstore.sqlite', 'index.faiss'])
+check("saved documents dropped from memory", len(writer.vector_store.docstore._pending), 0)
+check("still searchable from the file", writer.search_similar('record 77', top_k=1)[0]['metadata'], metadata(77))
+
+print("\n[2] Load")
+real_load, real_loads = pickle.load, pickle.loads
+def refuse(*args, **kwargs):
+    raise AssertionError("unpickled during load")
+pickle.load = pickle.loads = refuse
+started = time.perf_counter()
+reader = manager_at(index_path)
+load_ms = (time.perf_counter() - started) * 1000
+pickle.load, pickle.loads = real_load, real_loads
+store = reader.vector_store
+check("loaded without unpickling", (reader.state, store.index.ntotal), ('ready', N))
+check("index memory-mapped", store.index is store._mapped, hasattr(faiss, 'IO_FLAG_MMAP_IFC'))
+check("no document read, no posting list built",
+      (len(store.docstore._pending), reader.stats()['metadata']['deferred']), (0, True))
+check(f"load is fast ({load_ms:.0f} ms for {N:,} records)", load_ms < 500, True)
+found = reader.search_similar('record 4242', top_k=3)
+check("search reads its hits", [d['metadata']['i'] for d in found][0], 4242)
+found = reader.search_similar('record 4242', top_k=3, filters={'question_id': 42, 'field': 'SE'})
+check("filtered search builds the posting lists", (found[0]['metadata'], reader.stats()['metadata']['rows']),
+      (metadata(4242), N))
+
+print("\n[3] Adding to a mapped index")
+reader.add_embedded([f'record {N}'], [vector(N).tolist()], [metadata(N)], save=False)
+check("copied into memory on the first add", store.index is store._mapped, False)
+check("new record found", reader.search_similar(f'record {N}', top_k=1)[0]['metadata'], metadata(N))
+check("new record filtered", reader.search_similar(f'record {N}', top_k=1, filters={'question_id': N % 50})[0]
+      ['metadata']['i'], N)
+check("saved on flush", (reader.flush(), len(store.docstore._pending)), (True, 0))
+again = manager_at(index_path)
+check("next load sees it", (again.vector_store.index.ntotal,
+                            again.search_similar(f'record {N}', top_k=1)[0]['metadata']['i']), (N + 1, N))
+check("old copy cleaned up", sorted(os.listdir(tmp)), ['vectors'])
+
+print("\n[4] Mismatched files")
+broken = os.path.join(tmp, 'broken')
+os.makedirs(broken)
+faiss_store.SqliteDocstore().write(os.path.join(broken, 'docstore.sqlite'))
+index = faiss.IndexFlatL2(DIM)
+index.add(np.ones((2, DIM), dtype='float32'))
+faiss.write_index(index, os.path.join(broken, 'index.faiss'))
+check("documents / vectors mismatch starts fresh", manager_at(broken).vector_store, None)
+
+print("\n[5] LangChain's pickled format")
+legacy = os.path.join(tmp, 'legacy')
+os.makedirs(legacy)
+index = faiss.IndexFlatL2(DIM)
+index.add(np.array([vector(i) for i in range(3)]))
+faiss.write_index(index, os.path.join(legacy, 'index.faiss'))
+with open(os.path.join(legacy, 'index.pkl'), 'wb') as fh:
+    pickle.dump(({f'id-{i}': (f'record {i}', metadata(i)) for i in range(3)}, {i: f'id-{i}' for i in range(3)}), fh)
+
+
+class PickledFAISS:
+    """Reads what the pickle above holds, the way LangChain's FAISS.load_local reads its own."""
+
+    @classmethod
+    def load_local(cls, folder_path, embeddings, allow_dangerous_deserialization=False):
+        assert allow_dangerous_deserialization
+        store = cls()
+        store.index = faiss.read_index(os.path.join(folder_path, 'index.faiss'))
+        with open(os.path.join(folder_path, 'index.pkl'), 'rb') as fh:
+            docs, store.index_to_docstore_id = pickle.load(fh)
+        store.docstore = types.SimpleNamespace(search=lambda key: faiss_store.Document(*docs[key]))
+        return store
+
+
+sys.modules.setdefault('langchain_community', types.ModuleType('langchain_community'))
+sys.modules['langchain_community.vectorstores'] = types.SimpleNamespace(FAISS=PickledFAISS)
+converted = manager_at(legacy)
+check("converted on first load", sorted(os.listdir(legacy)), ['docstore.sqlite', 'index.faiss'])
+check("documents carried over", converted.search_similar('record 2', top_k=1)[0], {'content': 'record 2',
+                                                                                    'metadata': metadata(2)})
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
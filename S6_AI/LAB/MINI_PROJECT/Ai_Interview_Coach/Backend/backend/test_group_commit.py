@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+GROUP COMMIT TEST
+group_commit.GroupCommitWriter: a batch is applied when max_batch items are
+waiting or max_delay after its first item, flush() waits for everything
+submitted, failures are counted and the writer keeps going, stats() reports
+batch sizes and queue depth. Then app.py's _apply_analysis_batch: when a
+batch commit fails, its jobs are retried one by one so only the bad one is
+dropped.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, '.')
+
+tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'group_commit.db')}"
+
+from group_commit import GroupCommitWriter
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class Recorder:
+    """apply_batch that records each batch; can block or fail on demand."""
+
+    def __init__(self):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+
+    def __call__(self, items):
+        self.gate.wait()
+        self.batches.append(list(items))
+        if self.fail:
+            raise RuntimeError("simulated commit failure")
+        return 0
+
+
+print("=" * 60)
+print("  GROUP COMMIT")
+print("=" * 60)
+
+print("\n[1] Size trigger")
+recorder = Recorder()
+writer = GroupCommitWriter(recorder, max_batch=4, max_delay=10, name='test-size')
+for i in range(8):
+    writer.submit(i)
+deadline = time.monotonic() + 5
+while len(recorder.batches) < 2 and time.monotonic() < deadline:
+    time.sleep(0.01)
+check("two full batches without waiting for the delay", recorder.batches, [[0, 1, 2, 3], [4, 5, 6, 7]])
+
+print("\n[2] Time trigger")
+recorder = Recorder()
+writer = GroupCommitWriter(recorder, max_batch=100, max_delay=0.1, name='test-time')
+started = time.monotonic()
+for i in range(3):
+    writer.submit(i)
+while not recorder.batches and time.monotonic() - started < 5:
+    time.sleep(0.005)
+elapsed = time.monotonic() - started
+check("partial batch applied after max_delay", recorder.batches, [[0, 1, 2]])
+check(f"not before the delay ({elapsed * 1000:.0f} ms)", 0.09 <= elapsed < 2, True)
+
+print("\n[3] Explicit flush")
+recorder = Recorder()
+writer = GroupCommitWriter(recorder, max_batch=100, max_delay=30, name='test-flush')
+check("flush with nothing submitted", writer.flush(1), True)
+for i in range(5):
+    writer.submit(i)
+started = time.monotonic()
+check("flush applies the pending items", (writer.flush(5), recorder.batches), (True, [[0, 1, 2, 3, 4]]))
+check("without waiting for max_delay", time.monotonic() - started < 2, True)
+
+print("\n[4] Failures and stats")
+recorder = Recorder()
+writer = GroupCommitWriter(recorder, max_batch=3, max_delay=30, name='test-stats')
+recorder.gate.clear()                   # hold the writer inside its first batch
+for i in range(7):
+    writer.submit(i)
+deadline = time.monotonic() + 5
+while writer.stats()['queue_depth'] > 4 and time.monotonic() < deadline:
+    time.sleep(0.01)
+check("queue depth while the writer is busy", writer.stats()['queue_depth'], 4)
+recorder.fail = True
+recorder.gate.set()
+writer.flush(5)
+recorder.fail = False
+writer.submit(7)
+writer.flush(5)
+stats = writer.stats()
+check("a raising batch counts every item failed",
+      (stats['submitted'], stats['written'], stats['failed']), (8, 1, 7))
+check("writer keeps going after failures", recorder.batches[-1], [7])
+check("batch sizes", (stats['flushes'], stats['max_batch_size'], stats['last_batch_size']), (4, 3, 1))
+check("drained", (stats['queue_depth'], stats['running']), (0, True))
+
+print("\n[5] app._apply_analysis_batch retries one by one")
+from app import app, db, AnswerCache, _apply_analysis_batch
+
+with app.app_context():
+    db.create_all()
+good = ('cache', 'What is a closure?', 'A function with its scope.', {'score': 7})
+bad = ('cache', 'What is a mutex?', 'A lock.', {'score': object()})     # not JSON-serialisable
+check("only the bad job is reported failed", _apply_analysis_batch([good, bad]), 1)
+with app.app_context():
+    check("the good job still committed", AnswerCache.query.count(), 1)
+check("a clean batch reports no failures", _apply_analysis_batch([good]), 0)
+with app.app_context():
+    check("and lands in the same row", AnswerCache.query.one().hit_count, 1)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+HYBRID RETRIEVAL TEST
+rag/bm25_index.py, VectorStoreManager.search_hybrid and rag/retrieval_eval.py
+with a real faiss index: BM25 ranks by rare shared terms and is the same
+built incrementally or at once, reciprocal-rank fusion orders by both
+rankings, hybrid search honours filters and tombstones, the keyword index is
+built on first use after a load, and on a store where a bag-of-words
+embedding blurs topics the evaluation harness reports hybrid above dense.
+"""
+import os
+import sys
+import tempfile
+import zlib
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+import rag.faiss_store as faiss_store
+import rag.vector_store as vs
+from rag.bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+from rag.rag_engine import RAGEngine
+from rag.retrieval_eval import evaluate, sample_labelled, score
+
+DIM = 64
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+def word_vector(word):
+    return np.random.default_rng(zlib.crc32(word.encode())).normal(0, 1, DIM).astype('float32')
+
+
+class Embeddings:
+    """Mean of per-word vectors: every word counts the same, so shared filler blurs topics."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        words = text.lower().replace('?', ' ').replace('.', ' ').split()
+        return np.mean([word_vector(w) for w in words], axis=0).tolist()
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+TOPICS = ['deadlock', 'closures', 'sharding', 'memoization', 'idempotency', 'backpressure', 'tokenization',
+          'normalization', 'polymorphism', 'recursion', 'virtualization', 'serialization', 'replication',
+          'garbage collection', 'rate limiting', 'load balancing', 'dependency injection', 'eventual consistency',
+          'cache invalidation', 'binary search']
+FILLER = ('i would start by saying that it is an important concept in real systems and then give an example '
+          'from a project where we had to think about the trade offs and the team learned a lot').split()
+
+
+def record(i):
+    rng = np.random.default_rng(i)
+    topic = TOPICS[i % len(TOPICS)]
+    answer = ' '.join(rng.choice(FILLER, 25)) + f' {topic} ' + ' '.join(rng.choice(FILLER, 10))
+    text = vs.format_interview_record(f'How would you explain {topic} to a junior engineer?', answer,
+                                      'Good structure, add a concrete example.', float(i % 11))
+    return text, {'type': 'interview_qa', 'answer_id': i, 'question_id': i % len(TOPICS),
+                  'level': ['Junior', 'Senior'][i % 2], 'score': float(i % 11)}
+
+
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = faiss_store.MappedFAISS, faiss_store.Document, EmbeddingService()
+index_path = os.path.join(tempfile.mkdtemp(), 'vectors')
+
+print("=" * 60)
+print("  HYBRID RETRIEVAL")
+print("=" * 60)
+
+print("\n[1] BM25 index")
+check("tokenizer keeps c++, splits node.js, drops stopwords and labels",
+      tokenize("Question: How do C++ and Node.js differ?"), ['c++', 'node', 'js', 'differ'])
+texts = ['deadlock between two threads', 'threads and processes', 'deadlock deadlock avoidance by lock ordering',
+         'unrelated text about cooking']
+bm25 = BM25Index()
+bm25.add(texts)
+_, rows = bm25.search('how to avoid a deadlock', 10)
+check("only rows sharing a term, best first", rows.tolist(), [2, 0])
+check("a query sharing no term finds nothing", len(bm25.search('kubernetes', 10)[1]), 0)
+check("restricted to rows", bm25.search('deadlock threads', 10, rows=np.array([1, 2]))[1].tolist(), [2, 1])
+check("dead rows skipped", bm25.search('deadlock', 10, dead=np.array([2]))[1].tolist(), [0])
+incremental = BM25Index()
+incremental.add(texts[:1])
+incremental.add(texts[1:])
+check("incremental build ranks like a full one", incremental.search('threads deadlock', 10)[1].tolist(),
+      bm25.search('threads deadlock', 10)[1].tolist())
+
+print("\n[2] Reciprocal-rank fusion")
+check("rows high in both lists first", reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], 3), [1, 3, 2])
+check("score(): hit, precision, recall, MRR", score(['a', 'b', 'c'], {'b'}, 2),
+      {'hit': 1.0, 'precision': 0.5, 'recall': 1.0, 'mrr': 0.5})
+
+print("\n[3] search_hybrid")
+manager = vs.VectorStoreManager(index_path=index_path, flush_every=100_000, flush_seconds=60)
+records = [record(i) for i in range(400)]
+manager.add_embedded([t for t, _ in records], Embeddings().embed_documents([t for t, _ in records]),
+                     [m for _, m in records], save=False)
+query = 'Question: How would you explain sharding to a junior engineer?\nAnswer: split the data'
+found = manager.search_hybrid(query, top_k=3)
+check("keyword and vector agree on the topic", {d['metadata']['question_id'] for d in found},
+      {TOPICS.index('sharding')})
+found = manager.search_hybrid(query, top_k=5, filters={'level': 'Senior'})
+check("filters apply to both retrievers", {d['metadata']['level'] for d in found}, {'Senior'})
+first = manager.search_hybrid(query, top_k=1)[0]['metadata']['answer_id']
+manager.delete_records([first])
+check("deleted records are not returned", first in [d['metadata']['answer_id']
+                                                    for d in manager.search_hybrid(query, top_k=20)], False)
+check("bm25 mode ranks by keywords only", {d['metadata']['question_id'] for d in manager.search_hybrid(
+    'backpressure', top_k=10, mode='bm25')}, {TOPICS.index('backpressure')})
+check("keyword index sized in stats", manager.stats()['bm25']['rows'], 400)
+
+print("\n[4] Save and reload")
+before = [d['metadata']['answer_id'] for d in manager.search_hybrid(query, top_k=5)]
+manager.flush()
+reader = vs.VectorStoreManager(index_path=index_path)
+check("keyword index not built during the load", reader.stats()['bm25']['deferred'], True)
+check("same hybrid results after reload", [d['metadata']['answer_id'] for d in reader.search_hybrid(query, top_k=5)],
+      before)
+check("built on first use", (reader.stats()['bm25']['deferred'], reader.stats()['bm25']['terms']),
+      (False, manager.stats()['bm25']['terms']))
+
+print("\n[5] Evaluation harness")
+labelled = sample_labelled(reader, 80)
+check("sampled queries exclude their own answer", all(str(item['exclude'][0]) not in item['relevant']
+                                                      for item in labelled), True)
+report = evaluate(reader, labelled, ks=(2, 3))
+print(f"      dense  @2: {report['dense'][2]}")
+print(f"      hybrid @2: {report['hybrid'][2]}")
+check("hybrid beats dense on precision@2", report['hybrid'][2]['precision'] > report['dense'][2]['precision'], True)
+check("and on MRR", report['hybrid'][3]['mrr'] > report['dense'][3]['mrr'], True)
+check("fewer documents, fewer context characters", report['hybrid'][2]['context_chars'] <
+      report['hybrid'][3]['context_chars'], True)
+
+print("\n[6] RAGEngine")
+engine = RAGEngine()
+engine.vector_store_manager = reader
+docs = engine.retrieve_context(query, filters={'type': 'interview_qa'})
+check("hybrid by default, RAG_CONTEXT_DOCS records", [d['metadata']['question_id'] for d in docs],
+      [TOPICS.index('sharding')] * 2)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
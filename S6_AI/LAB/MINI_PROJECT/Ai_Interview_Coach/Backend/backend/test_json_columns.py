@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+JSON COLUMNS TEST
+JSONColumnMixin._json_col: values are decoded once per instance, callers get
+a deep copy (mutating a nested list or dict never reaches the cache),
+assigning a new raw string invalidates the memoised value, bad JSON falls
+back to the default. Then app.json: ORJSONProvider responses match Flask's
+stdlib provider for datetimes, dates, UUIDs, Decimals and non-str keys.
+"""
+import json
+import os
+import sys
+import tempfile
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+sys.path.insert(0, '.')
+
+tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'json_columns.db')}"
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import app, orjson, User, Question
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+print("=" * 60)
+print("  JSON COLUMNS")
+print("=" * 60)
+
+print("\n[1] Parse once, hand out deep copies")
+education = [{'school': 'MIT', 'degrees': ['BSc'], 'years': {'from': 2015, 'to': 2019}}]
+user = User(email='json@x.io', password_hash='x', education=json.dumps(education),
+            skills=json.dumps(['Python', 'SQL']))
+first = user.education_list()
+check("decoded", first, education)
+first[0]['degrees'].append('PhD')
+first[0]['years']['to'] = 2030
+first.append({'school': 'leaked'})
+check("nested mutations don't reach the next read", user.education_list(), education)
+check("each read is a fresh object", user.education_list() is user.education_list(), False)
+check("served from the cache", user._json_cache['education'][1], education)
+skills = user.skills_list()
+skills.append('Rust')
+check("flat lists too", user.skills_list(), ['Python', 'SQL'])
+
+print("\n[2] Invalidation and defaults")
+user.skills = json.dumps(['Go'])
+check("new raw string is re-decoded", user.skills_list(), ['Go'])
+user.skills = None
+check("missing column gives the default", user.skills_list(), [])
+user.skills = '["unterminated'
+check("bad JSON falls back to the default", user.skills_list(), [])
+user.skills = '{"not": "a list"}'
+check("any valid JSON is returned as stored", user.skills_list(), {'not': 'a list'})
+question = Question(text='Q', options='not json', correct_answers='[2]')
+check("per-column defaults", (question.options_list(), question.correct_answers_list()), ([], [2]))
+
+print("\n[3] orjson provider matches the stdlib provider")
+payload = {
+    'started_at': datetime(2024, 3, 1, 10, 5, 7, 123456),
+    'day': date(2024, 3, 2),
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'score': Decimal('7.50'),
+    'by_question': {1: 'first', 2: 'second', 10: 'tenth'},
+    'nested': [{'zeta': 1, 'alpha': [datetime(2024, 1, 1)]}, None, True, 1.5],
+    'text': 'unicode — ünïcödé',
+}
+if orjson is None:
+    print("  (orjson not installed: the stdlib provider is in use, nothing to compare)")
+else:
+    check("orjson provider installed", type(app.json).__name__, 'ORJSONProvider')
+    provider = app.json
+    stdlib = DefaultJSONProvider(app)
+    with app.test_request_context():
+        fast = provider.response(payload).get_data(as_text=True)
+        slow = stdlib.response(payload).get_data(as_text=True)
+    check("same decoded response", json.loads(fast), json.loads(slow))
+    check("same key order", list(json.loads(fast)), list(json.loads(slow)))
+    check("datetime as HTTP date", json.loads(fast)['started_at'], 'Fri, 01 Mar 2024 10:05:07 GMT')
+    check("int keys become strings", list(json.loads(fast)['by_question']), ['1', '10', '2'])
+    check("dumps() agrees", json.loads(provider.dumps(payload)), json.loads(stdlib.dumps(payload)))
+    check("loads() round-trips", provider.loads(provider.dumps({'a': [1, 2]})), {'a': [1, 2]})
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+ONNX EMBEDDINGS TEST
+rag/onnx_embeddings.py over a small BERT-shaped ONNX graph (token + segment
+embeddings and one dense layer) with a word-level tokenizer: output equals
+sentence-transformers pooling computed in NumPy, is independent of batch
+composition and order, truncates long texts, the int8 model stays within
+tolerance of fp32 and EmbeddingService serves it with its own cache.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+model_dir = tempfile.mkdtemp()
+os.environ['EMBEDDING_ONNX_DIR'] = model_dir
+os.environ['EMBEDDING_CACHE_DIR'] = tempfile.mkdtemp()
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+from tokenizers import Tokenizer, models, pre_tokenizers
+
+import rag.embedding_service as es
+from rag.onnx_embeddings import FP32_FILE, INT8_FILE, TOKENIZER_FILE, OnnxEmbeddings, compare, quantize
+
+VOCAB = ['[PAD]', '[UNK]'] + [f'w{i}' for i in range(200)]
+DIM = 64
+rng = np.random.default_rng(5)
+TOKENS = rng.normal(0, 1, (len(VOCAB), DIM)).astype('float32')
+SEGMENTS = rng.normal(0, 0.1, (2, DIM)).astype('float32')
+DENSE = rng.normal(0, 0.2, (DIM, DIM)).astype('float32')
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+def build_model(model_dir):
+    """last_hidden_state = (tokens[input_ids] + segments[token_type_ids]) @ dense."""
+    graph = helper.make_graph(
+        [helper.make_node('Gather', ['tokens', 'input_ids'], ['tok']),
+         helper.make_node('Gather', ['segments', 'token_type_ids'], ['seg']),
+         helper.make_node('Add', ['tok', 'seg'], ['emb']),
+         helper.make_node('MatMul', ['emb', 'dense'], ['last_hidden_state'])],
+        'tiny-bert',
+        [helper.make_tensor_value_info(name, TensorProto.INT64, ['batch', 'seq'])
+         for name in ('input_ids', 'attention_mask', 'token_type_ids')],
+        [helper.make_tensor_value_info('last_hidden_state', TensorProto.FLOAT, ['batch', 'seq', DIM])],
+        [numpy_helper.from_array(TOKENS, 'tokens'), numpy_helper.from_array(SEGMENTS, 'segments'),
+         numpy_helper.from_array(DENSE, 'dense')])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    onnx.save(model, os.path.join(model_dir, FP32_FILE))
+    tokenizer = Tokenizer(models.WordLevel({w: i for i, w in enumerate(VOCAB)}, unk_token='[UNK]'))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.save(os.path.join(model_dir, TOKENIZER_FILE))
+
+
+def reference(text, max_tokens=256):
+    """Mean of the token vectors, L2-normalised - sentence-transformers' pooling."""
+    ids = [VOCAB.index(w) if w in VOCAB else 1 for w in text.split()][:max_tokens]
+    hidden = (TOKENS[ids] + SEGMENTS[0]) @ DENSE
+    pooled = hidden.mean(axis=0)
+    return pooled / np.linalg.norm(pooled)
+
+
+build_model(model_dir)
+texts = [' '.join(f'w{j}' for j in rng.integers(0, 200, n)) for n in (3, 40, 7, 1, 120, 15)]
+
+print("=" * 60)
+print("  ONNX EMBEDDINGS")
+print("=" * 60)
+
+print("\n[1] fp32 model")
+fp32 = OnnxEmbeddings(model_dir, quantized=False, threads=2, batch_size=4)
+vectors = fp32.encode(texts)
+check("shape", vectors.shape, (len(texts), DIM))
+check("matches NumPy mean pooling", np.allclose(vectors, [reference(t) for t in texts], atol=1e-5), True)
+check("unit length", np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5), True)
+alone = np.array(fp32.embed_query(texts[0]))
+check("padding in a batch does not change a vector", np.allclose(alone, vectors[0], atol=1e-5), True)
+check("input order kept", np.allclose(fp32.encode(texts[::-1]), vectors[::-1], atol=1e-5), True)
+check("unknown words map to [UNK]", np.allclose(fp32.embed_query('hello w3'), reference('hello w3'), atol=1e-5), True)
+short = OnnxEmbeddings(model_dir, quantized=False, max_tokens=10)
+check("long texts truncated", np.allclose(short.encode([texts[4]])[0], reference(texts[4], 10), atol=1e-5), True)
+check("intra-op threads applied", fp32.session.get_session_options().intra_op_num_threads, 2)
+check("embed_documents returns lists", type(fp32.embed_documents(texts)[0]), list)
+check("empty input", fp32.encode([]).shape[0], 0)
+
+print("\n[2] int8 model")
+quantize(model_dir)
+check("int8 model written and smaller",
+      os.path.getsize(os.path.join(model_dir, INT8_FILE)) < os.path.getsize(os.path.join(model_dir, FP32_FILE)), True)
+int8 = OnnxEmbeddings(model_dir)
+agreement = compare(int8.encode(texts), vectors)
+print(f"    int8 vs fp32: {agreement}")
+check("int8 within tolerance (cosine >= 0.99)", agreement['min_cosine'] >= 0.99, True)
+check("compare: identical vectors", compare(vectors, vectors)['min_cosine'], 1.0)
+
+print("\n[3] EmbeddingService backend")
+es.EMBEDDING_BACKEND, es.BACKEND_AVAILABLE = 'onnx', True
+es.EmbeddingService._instance = None
+service = es.EmbeddingService()
+embeddings = service.get_embeddings()
+check("service ready on the onnx backend", (service.status()['state'], service.status()['backend']),
+      ('ready', 'onnx'))
+check("wrapped in the embedding cache", type(embeddings).__name__, 'CachedEmbeddings')
+check("cache kept apart from the torch model's", service.cache.model_name,
+      f'{es.DEFAULT_MODEL_NAME}@onnx-int8')
+check("served vectors are the int8 model's", np.allclose(embeddings.embed_documents(texts), int8.encode(texts),
+                                                          atol=1e-6), True)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+QUESTION IMPORT TEST
+Runs the bulk importer against a scratch database: JSONL and CSV parsing,
+text_hash dedup (within a file, across runs and against ORM inserts),
+dry runs, the deferred search-index rebuild, and enrichment of newly
+inserted rows only.
+"""
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'import.db')}"
+
+from app import app, db, QuestionBank
+from question_import import BulkImporter, enrich, text_hash
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+jsonl_path = os.path.join(tmp, 'questions.jsonl')
+with open(jsonl_path, 'w') as fh:
+    for i in range(250):
+        fh.write(json.dumps({'text': f'Explain design trade-off number {i}', 'field': 'Software Engineering',
+                             'category': 'technical', 'difficulty': 'hard', 'topic_tags': ['design']}) + '\n')
+    fh.write(json.dumps({'text': '  EXPLAIN design   trade-off number 7 '}) + '\n')   # same question
+    fh.write('{not json\n')
+    fh.write(json.dumps({'field': 'no text'}) + '\n')
+    fh.write('\n')
+
+csv_path = os.path.join(tmp, 'questions.csv')
+with open(csv_path, 'w', newline='') as fh:
+    fh.write('text,field,category,difficulty,topic_tags,is_verified\n')
+    fh.write('"Describe a conflict, and how you resolved it",Product Management,behavioral,easy,teamwork;conflict,yes\n')
+    fh.write('Explain design trade-off number 3,Software Engineering,technical,hard,,no\n')
+
+print("=" * 60)
+print("  QUESTION IMPORT")
+print("=" * 60)
+
+with app.app_context():
+    engine = db.engine
+    base = QuestionBank.query.count()
+
+    print("\n[1] JSONL import")
+    report = BulkImporter(engine, batch_size=100, progress=False).import_file(jsonl_path, collect_new=True)
+    check("rows read", report['read'], 252)
+    check("inserted", report['inserted'], 250)
+    check("in-file duplicate skipped", report['duplicates'], 1)
+    check("bad line and missing text counted", report['invalid'], 2)
+    check("malformed line reported", [e['line'] for e in report['errors']], [252])
+    check("batched", report['batches'], 3)
+    check("new rows returned for enrichment", len(report['new_rows']), 250)
+    check("bank grew", QuestionBank.query.count() - base, 250)
+    fts_hits = db.session.execute(db.text(
+        "SELECT COUNT(*) FROM question_bank_fts WHERE question_bank_fts MATCH 'design'")).scalar()
+    check("search index rebuilt after multi-batch import", fts_hits, 250)
+    triggers = db.session.execute(db.text(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'question_bank_fts_%'")).scalar()
+    check("search sync triggers restored", triggers, 3)
+    q = QuestionBank.query.filter_by(text='Explain design trade-off number 0').one()
+    check("columns mapped", (q.difficulty, q.question_type, q._json_col('topic_tags', '[]')),
+          ('hard', 'mock', ['design']))
+
+    print("\n[2] Re-import and CSV")
+    again = BulkImporter(engine, progress=False).import_file(jsonl_path)
+    check("re-run inserts nothing", (again['inserted'], again['duplicates']), (0, 251))
+    dry = BulkImporter(engine, dry_run=True, progress=False).import_file(csv_path)
+    check("dry run counts new rows", (dry['inserted'], dry['duplicates']), (1, 1))
+    check("dry run writes nothing", QuestionBank.query.count() - base, 250)
+    report = BulkImporter(engine, progress=False).import_file(csv_path)
+    check("csv inserted", (report['inserted'], report['duplicates']), (1, 1))
+    q = QuestionBank.query.filter_by(category='behavioral', field='Product Management').one()
+    check("csv quoting and list split", (q.text, q._json_col('topic_tags', '[]'), q.is_verified),
+          ('Describe a conflict, and how you resolved it', ['teamwork', 'conflict'], True))
+
+    print("\n[3] ORM inserts share the dedup key")
+    orm_q = QuestionBank(text='What is   eventual consistency?', category='technical')
+    db.session.add(orm_q)
+    db.session.commit()
+    check("text_hash set on insert", orm_q.text_hash, text_hash('what is eventual consistency?'))
+    report = BulkImporter(engine, progress=False).run([{'text': 'What is eventual consistency?'}])
+    check("importer skips ORM-inserted text", report['duplicates'], 1)
+
+    class Racing(BulkImporter):
+        """Another writer inserts the same rows between the existence check and the INSERT."""
+        def _existing(self, conn, hashes):
+            return set()
+
+    report = Racing(engine, progress=False).run([{'text': 'What is eventual consistency?'},
+                                                 {'text': 'What is a write-ahead log?'}])
+    check("rows skipped by ON CONFLICT count as duplicates", (report['inserted'], report['duplicates']), (1, 1))
+
+    print("\n[4] Enrichment of new rows")
+    new_rows = BulkImporter(engine, progress=False).run(
+        [{'text': f'Fresh question {i}', 'question_type': 'mock' if i % 2 else 'written'} for i in range(10)],
+        collect_new=True)['new_rows']
+
+    class Embeddings:
+        def embed_documents(self, texts):
+            return [[float(len(t)), 1.0] for t in texts]
+
+    class Store:
+        def add_embedded(self, texts, vectors, metadatas):
+            self.added = (len(texts), len(vectors), sorted(m['bank_question_id'] for m in metadatas))
+
+    store = Store()
+    mc = {'options': ['a', 'b', 'c', 'd'], 'correct_answers': [2], 'multiple_allowed': False}
+    done = enrich(engine, new_rows, generate_mc=lambda text, difficulty: mc,
+                  embeddings=Embeddings(), vector_store=store, workers=3, batch_size=2)
+    check("MC generated for mock rows only", (done['mc_options'], done['mc_failed']), (5, 0))
+    check("every new row embedded once", store.added, (10, 10, sorted(r[0] for r in new_rows)))
+    stored = QuestionBank.query.filter(QuestionBank.mc_options.isnot(None)).count()
+    check("mc_options stored", stored, 5)
+    sample = QuestionBank.query.filter_by(text='Fresh question 1').one()
+    check("mc_options decode", sample._json_col('mc_options', '{}')['correct_answers'], [2])
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
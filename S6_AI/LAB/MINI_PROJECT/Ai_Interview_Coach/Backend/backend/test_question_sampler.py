@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+QUESTION SAMPLER TEST
+Checks the in-memory fallback sampler used by _fallback_questions:
+distinct draws, field/category filtering, times_used weighting,
+signature-driven refresh, incremental usage updates and the slow rebuild.
+"""
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, '.')
+
+from question_sampler import QuestionSampler
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+# id, field, category, difficulty, times_used
+rows = [(i, 'Software Engineering', 'technical', 'medium', 0) for i in range(1, 101)]
+rows += [(i, 'Software Engineering', 'behavioral', 'easy', 0) for i in range(101, 131)]
+rows += [(i, 'Data Science', 'technical', 'hard', 0) for i in range(131, 181)]
+version = [1]
+
+sampler = QuestionSampler(lambda: list(rows), lambda: version[0], weighted=False)
+
+print("=" * 60)
+print("  QUESTION SAMPLER")
+print("=" * 60)
+
+print("\n[1] Before the first refresh")
+check("sample returns None", sampler.sample(5, 'software'), None)
+
+print("\n[2] Uniform draws")
+check("refresh indexes every row", sampler.refresh(), 180)
+ids = sampler.sample(10, 'software', ['technical'])
+check("k ids returned", len(ids), 10)
+check("ids are distinct", len(set(ids)), 10)
+check("field + category respected", all(1 <= i <= 100 for i in ids), True)
+check("field match is case-insensitive substring", len(sampler.sample(200, 'SCIENCE')), 50)
+check("empty field matches everything", len(sampler.sample(500)), 180)
+check("k >= population returns all",
+      sorted(sampler.sample(40, 'software', ['behavioral'])) == list(range(101, 131)), True)
+check("unknown category is empty", sampler.sample(5, 'software', ['hr']), [])
+check("difficulty filter", set(sampler.sample(100, '', None, 'hard')) == set(range(131, 181)), True)
+seen = Counter(i for _ in range(3000) for i in sampler.sample(5, 'data'))
+check("every question reachable", len(seen), 50)
+
+print("\n[3] times_used weighting")
+rows[:] = [(i, 'DevOps', 'technical', 'medium', 0 if i <= 10 else 99) for i in range(1, 101)]
+weighted = QuestionSampler(lambda: list(rows), lambda: version[0], weighted=True)
+weighted.refresh()
+draws = Counter(i <= 10 for _ in range(2000) for i in weighted.sample(3, 'devops'))
+share = draws[True] / sum(draws.values())
+print(f"    unused questions: 10% of the bank, {share:.0%} of draws")
+check("unused questions preferred", share > 0.5, True)
+skewed = weighted.sample(50, 'devops')
+check("skewed weights still give k distinct", (len(skewed), len(set(skewed))), (50, 50))
+
+print("\n[4] Background refresh follows the signature")
+weighted.refresh_interval = 0.2
+weighted.start()
+time.sleep(1.5)
+before = weighted.stats()['refreshes']
+rows.append((101, 'Security', 'technical', 'hard', 0))
+version[0] += 1
+time.sleep(2.5)
+check("signature change triggers refresh", weighted.stats()['refreshes'] > before, True)
+check("new row sampled", weighted.sample(1, 'security'), [101])
+stats = weighted.stats()
+check("stats report readiness", (stats['ready'], stats['questions']), (True, 101))
+
+print("\n[5] Usage updates without a rebuild")
+settled = weighted.stats()['refreshes']
+time.sleep(1.5)
+check("unchanged signature does not rebuild", weighted.stats()['refreshes'], settled)
+check("record_usage touches known ids only", weighted.record_usage({i: 500 for i in range(1, 11)} | {999: 1}), 10)
+draws = Counter(i <= 10 for _ in range(2000) for i in weighted.sample(3, 'devops'))
+share = draws[True] / sum(draws.values())
+print(f"    once-unused questions after heavy use: {share:.0%} of draws")
+check("weights follow recorded usage", share < 0.2, True)
+check("still no rebuild", weighted.stats()['refreshes'], settled)
+weighted.rebuild_interval = 0.5
+time.sleep(2.5)
+check("full rebuild on the slow schedule", weighted.stats()['refreshes'] > settled, True)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
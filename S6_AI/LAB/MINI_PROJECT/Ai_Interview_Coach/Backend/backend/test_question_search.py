@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+QUESTION SEARCH TEST
+question_search.py against a scratch database: match_expression() escaping
+(every query it builds is valid FTS5), prefix matching and bm25 column
+weights, the sync triggers on insert / update / delete, facet counts, the
+rebuild after suspend_triggers(), and /api/questions/library both with the
+index and on the ilike fallback.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'search.db')}"
+
+from flask_jwt_extended import create_access_token
+
+from app import app, db, User, QuestionBank
+from question_search import FTS_TABLE, create_index, match_expression, question_index, suspend_triggers
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+def matches(match):
+    """Sorted question texts for a MATCH string; raises if FTS5 rejects the syntax."""
+    ids = db.session.execute(question_index.matching_ids(match)).scalars().all()
+    return sorted(q.text for q in QuestionBank.query.filter(QuestionBank.id.in_(ids)).all())
+
+
+def search(match, ranked=True):
+    ids = question_index.search(db.session, match, ranked=ranked)
+    by_id = {q.id: q.text for q in QuestionBank.query.filter(QuestionBank.id.in_(ids)).all()}
+    return [by_id[i] for i in ids]
+
+
+FIELD = 'Quantum Platform Engineering'
+ROWS = [
+    # text, topic_tags, category, difficulty, popularity
+    ('How do you roll out a Kubernetes deployment safely?', '["deployment"]', 'technical', 'medium', 1.0),
+    ('Explain C++ move semantics', '["c++", "memory"]', 'technical', 'hard', 3.0),
+    ('How does the Node.js event loop schedule callbacks?', '["node.js"]', 'technical', 'medium', 2.0),
+    ('Describe a rollout that went wrong', '["kubernetes", "incident"]', 'behavioral', 'easy', 5.0),
+    ('Why say "AND" or "NOT" in a search query?', '["search"]', 'technical', 'easy', 0.0),
+]
+
+print("=" * 60)
+print("  QUESTION SEARCH")
+print("=" * 60)
+
+with app.app_context():
+    check("FTS5 index detected", question_index.enabled, True)
+    for text, tags, category, difficulty, popularity in ROWS:
+        db.session.add(QuestionBank(text=text, topic_tags=tags, category=category, field=FIELD,
+                                    difficulty=difficulty, popularity=popularity))
+    db.session.commit()
+
+    print("\n[1] match_expression escaping")
+    check("c++ keeps the word, drops the operators", match_expression('c++'), '{text topic_tags} : "c"*')
+    check("node.js splits on the dot", match_expression('node.js'),
+          '{text topic_tags} : "node"* AND {text topic_tags} : "js"*')
+    check("bare AND / NOT are quoted as words", match_expression('AND NOT'),
+          '{text topic_tags} : "and"* AND {text topic_tags} : "not"*')
+    check("filters are column-scoped phrases", match_expression(category='behav', field='quantum platform'),
+          'category : "behav"* AND field : "quantum platform"*')
+    check("nothing to match", (match_expression(), match_expression('"  ++ "')), (None, None))
+    # "c"* is a prefix, so any word starting with c matches too (callbacks); it must not be a syntax error
+    check("c++ is valid FTS5 and finds the C++ question",
+          'Explain C++ move semantics' in matches(match_expression('c++', field=FIELD)), True)
+    check("node.js finds the Node.js question", matches(match_expression('node.js')),
+          ['How does the Node.js event loop schedule callbacks?'])
+    check("quotes and operator words are valid FTS5", matches(match_expression('"AND" OR NOT', field=FIELD)),
+          ['Why say "AND" or "NOT" in a search query?'])
+    check("unbalanced quote and parenthesis", matches(match_expression('("kubernetes', field=FIELD)),
+          ['Describe a rollout that went wrong', 'How do you roll out a Kubernetes deployment safely?'])
+
+    print("\n[2] Prefix matching and ranking")
+    check("kube finds kubernetes", len(matches(match_expression('kube', field=FIELD))), 2)
+    check("hit in the text outranks a hit in the tags", search(match_expression('kubernetes', field=FIELD)),
+          ['How do you roll out a Kubernetes deployment safely?', 'Describe a rollout that went wrong'])
+    check("unranked order is most popular first", search(match_expression('kubernetes', field=FIELD), ranked=False),
+          ['Describe a rollout that went wrong', 'How do you roll out a Kubernetes deployment safely?'])
+
+    print("\n[3] Sync triggers")
+    added = QuestionBank(text='What is a zyxcache eviction policy?', category='technical', field=FIELD)
+    db.session.add(added)
+    db.session.commit()
+    check("insert is searchable", matches(match_expression('zyxcache')), ['What is a zyxcache eviction policy?'])
+    added.text = 'What is a qwvstore compaction policy?'
+    db.session.commit()
+    check("update drops the old words", matches(match_expression('zyxcache')), [])
+    check("and indexes the new ones", matches(match_expression('qwvstore')),
+          ['What is a qwvstore compaction policy?'])
+    db.session.delete(added)
+    db.session.commit()
+    check("delete leaves the index", matches(match_expression('qwvstore')), [])
+
+    print("\n[4] Facets")
+    facets = question_index.facets(db.session, match_expression(field=FIELD))
+    check("category counts", facets['category'], {'technical': 4, 'behavioral': 1})
+    check("difficulty counts", facets['difficulty'], {'medium': 2, 'easy': 2, 'hard': 1})
+    check("field counts", facets['field'], {FIELD: 5})
+    facets = question_index.facets(db.session, match_expression('kube', field=FIELD))
+    check("facets follow the free-text match", facets['category'], {'technical': 1, 'behavioral': 1})
+
+    print("\n[5] Bulk load with suspended triggers")
+    with db.engine.begin() as conn:
+        check("triggers suspended", suspend_triggers(conn), True)
+    db.session.add(QuestionBank(text='How would you shard a plxqueue?', category='technical', field=FIELD))
+    db.session.commit()
+    check("rows written while suspended are not indexed", matches(match_expression('plxqueue')), [])
+    with db.engine.begin() as conn:
+        check("nothing left to suspend", suspend_triggers(conn), False)
+        create_index(conn)
+    check("create_index rebuilds them in", matches(match_expression('plxqueue')),
+          ['How would you shard a plxqueue?'])
+    check("and restores the triggers", db.session.execute(db.text(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE '{FTS_TABLE}_%'")).scalar(), 3)
+
+    print("\n[6] Library endpoint")
+    user = User(email='search@x.io', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    auth = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    client = app.test_client()
+
+    def library(**params):
+        response = client.get('/api/questions/library', query_string=params, headers=auth)
+        return response.status_code, response.get_json()
+
+    status, body = library(search='kube', field='quantum platform', facets='1')
+    check("indexed: prefix search, bm25 order",
+          (status, [q['text'] for q in body['questions']]),
+          (200, ['How do you roll out a Kubernetes deployment safely?', 'Describe a rollout that went wrong']))
+    check("indexed: facets in the response", body['facets']['category'], {'technical': 1, 'behavioral': 1})
+
+    question_index.enabled = False
+    status, body = library(search='Kubernetes', field='quantum platform', facets='1')
+    check("fallback: ilike substring on the text",
+          (status, [q['text'] for q in body['questions']]),
+          (200, ['How do you roll out a Kubernetes deployment safely?']))
+    check("fallback: no facets", 'facets' in body, False)
+    status, body = library(field='Quantum Platform', category='behav')
+    check("fallback: filters, most popular first", [q['text'] for q in body['questions']],
+          ['Describe a rollout that went wrong'])
+    question_index.enabled = True
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+QUESTION STATS TEST
+Checks the batched usage counters behind the question library ranking:
+event aggregation, running averages with score corrections, Bayesian
+popularity and difficulty calibration.
+"""
+import sys
+
+sys.path.insert(0, '.')
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import question_stats
+from question_stats import aggregate, apply_usage, calibrated_difficulty, popularity, refresh_ranking
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+engine = create_engine('sqlite://')
+with engine.begin() as conn:
+    conn.execute(text("""CREATE TABLE question_bank (
+        id INTEGER PRIMARY KEY, times_used INTEGER DEFAULT 0, avg_score FLOAT,
+        score_count INTEGER DEFAULT 0, popularity FLOAT DEFAULT 0, calibrated_difficulty VARCHAR(20))"""))
+    conn.execute(text("INSERT INTO question_bank (id) VALUES (1), (2), (3)"))
+
+
+def row(qid):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT times_used, avg_score, score_count, popularity, "
+                                 "calibrated_difficulty FROM question_bank WHERE id = :id"),
+                            {'id': qid}).one()
+
+
+print("=" * 60)
+print("  QUESTION STATS")
+print("=" * 60)
+
+print("\n[1] Aggregation")
+deltas = aggregate([1, 1, 2], [(1, 8.0), (1, 6.0), (2, None)], corrections=[(1, 1.0), (2, 0)])
+check("served counted per id", {k: v[0] for k, v in deltas.items()}, {1: 2, 2: 1})
+check("scores summed, corrections add to sum only", deltas[1][1:], [15.0, 2])
+check("missing scores ignored", deltas[2][1:], [0.0, 0])
+
+print("\n[2] Ranking functions")
+check("unused question has zero popularity", popularity(0, None, 0), 0.0)
+check("better answers rank higher", popularity(10, 9.0, 20) > popularity(10, 3.0, 20), True)
+check("one perfect answer does not beat a proven question",
+      popularity(10, 10.0, 1) < popularity(10, 9.0, 40), True)
+check("no calibration below the minimum", calibrated_difficulty(9.0, question_stats.CALIBRATION_MIN - 1), None)
+check("high scores calibrate easy", calibrated_difficulty(8.0, 10), 'easy')
+check("middling scores calibrate medium", calibrated_difficulty(6.0, 10), 'medium')
+check("low scores calibrate hard", calibrated_difficulty(2.5, 10), 'hard')
+
+print("\n[3] Batched update")
+with Session(engine) as session:
+    check("rows touched", apply_usage(session, aggregate([1, 1, 2], [(1, 8.0), (1, 6.0)])), 2)
+    session.commit()
+times_used, avg, count, pop, _ = row(1)
+check("times_used incremented", times_used, 2)
+check("running average", (avg, count), (7.0, 2))
+check("popularity stored", pop, popularity(2, 7.0, 2))
+
+with Session(engine) as session:
+    # Provisional 6.0 replaced by an AI score of 9.0
+    apply_usage(session, aggregate([], [], corrections=[(1, 3.0)]))
+    session.commit()
+check("correction keeps the count", row(1)[1:3], (8.5, 2))
+
+with Session(engine) as session:
+    apply_usage(session, aggregate([3] * 6, [(3, 2.0)] * 6))
+    session.commit()
+check("calibrated after enough answers", row(3)[4], 'hard')
+check("served-only question has no score", row(2)[:3], (1, None, 0))
+
+print("\n[4] Full recompute")
+with engine.begin() as conn:
+    conn.execute(text("UPDATE question_bank SET popularity = 0, calibrated_difficulty = NULL"))
+with Session(engine) as session:
+    check("used questions recomputed", refresh_ranking(session), 3)
+    session.commit()
+check("popularity restored", row(3)[3], popularity(6, 2.0, 6))
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
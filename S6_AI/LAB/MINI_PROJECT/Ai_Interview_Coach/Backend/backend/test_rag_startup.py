@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+RAG STARTUP TEST
+Importing the rag package loads no model, index, faiss or openai and pings
+nothing; EmbeddingService, VectorStoreManager and RAGEngine each load on first
+use or warm_up(), exactly once even when several threads arrive together,
+and report their state without triggering a load.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, '.')
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+print("=" * 60)
+print("  RAG STARTUP")
+print("=" * 60)
+
+print("\n[1] Import is cheap")
+probe = subprocess.run([sys.executable, '-c', '''
+import json, sys, time
+sys.path.insert(0, '.')
+started = time.perf_counter()
+from rag.rag_engine import rag_engine
+from rag.vector_store import vector_store_manager
+print(json.dumps({"ms": (time.perf_counter() - started) * 1000,
+                  "heavy": [m for m in ("numpy", "faiss", "openai", "torch", "langchain_community") if m in sys.modules],
+                  "index": vector_store_manager.state, "pinged": hasattr(rag_engine, "client")}))
+'''], capture_output=True, text=True, timeout=60)
+report = json.loads(probe.stdout.strip().splitlines()[-1])
+check("no heavy module imported", report['heavy'], [])
+check("index not loaded", report['index'], 'not_loaded')
+check("Mistral not pinged", report['pinged'], False)
+check("import under 500 ms", report['ms'] < 500, True)
+
+import rag.embedding_cache as embedding_cache
+import rag.embedding_service as es
+import rag.rag_engine as rag_engine_module
+import rag.vector_store as vs
+
+print("\n[2] EmbeddingService")
+loads = []
+
+class FakeHuggingFaceEmbeddings:
+    def __init__(self, model_name):
+        loads.append(model_name)
+        time.sleep(0.2)                         # a model load takes a while
+
+    def embed_documents(self, texts):
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+es.BACKEND_AVAILABLE, embedding_cache.CACHE_ENABLED = True, False
+es._import_model_stack = lambda: FakeHuggingFaceEmbeddings
+es.EmbeddingService._instance = None
+service = es.EmbeddingService()
+check("constructed without loading", (service.state, loads), ('not_loaded', []))
+service.warm_up()
+check("warm_up returns before the load ends", service.state in ('not_loaded', 'loading'), True)
+got = []
+threads = [threading.Thread(target=lambda: got.append(service.get_embeddings())) for _ in range(4)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+check("callers during warm-up wait for it", all(e is not None and e is service.embeddings for e in got), True)
+check("model loaded once", len(loads), 1)
+check("state ready with load time", (service.state, service.load_seconds >= 0.2), ('ready', True))
+
+es.EmbeddingService._instance = None
+es._import_model_stack = lambda: (_ for _ in ()).throw(ImportError("no sentence_transformers"))
+broken = es.EmbeddingService()
+check("failed load reported", (broken.get_embeddings(), broken.state), (None, 'failed'))
+
+print("\n[3] VectorStoreManager")
+
+class Document:
+    def __init__(self, page_content, metadata):
+        self.page_content, self.metadata = page_content, metadata
+
+
+class FakeFAISS:
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    @classmethod
+    def from_embeddings(cls, pairs, embeddings, metadatas=None):
+        return cls(Document(t, m) for (t, _), m in zip(pairs, metadatas))
+
+    def add_embeddings(self, pairs, metadatas=None):
+        self.docs.extend(Document(t, m) for (t, _), m in zip(pairs, metadatas))
+
+    def similarity_search_by_vector(self, vector, k=4):
+        return self.docs[:k]
+
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+
+
+es.EmbeddingService._instance = None
+es._import_model_stack = lambda: FakeHuggingFaceEmbeddings
+loads.clear()
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = FakeFAISS, Document, es.EmbeddingService()
+manager = vs.VectorStoreManager(index_path=os.path.join(tempfile.mkdtemp(), 'vectors'), lazy=True)
+check("lazy manager loads nothing", (manager.state, loads), ('not_loaded', []))
+check("stats do not load", (manager.stats()['state'], loads), ('not_loaded', []))
+manager.warm_up()
+found = []
+threads = [threading.Thread(target=lambda: found.append(manager.search_similar('query'))) for _ in range(4)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+check("searches during warm-up return normally", found, [[]] * 4)
+check("loaded once", (manager.state, len(loads)), ('ready', 1))
+manager.add_embedded(['record'], [[6.0, 1.0]], [{'type': 'interview_qa'}], save=False)
+check("usable after load", [d['content'] for d in manager.search_similar('record')], ['record'])
+eager = vs.VectorStoreManager(index_path=os.path.join(tempfile.mkdtemp(), 'vectors'))
+check("non-lazy manager loads in the constructor", eager.state, 'ready')
+
+print("\n[4] RAGEngine")
+pings = []
+rag_engine_module.LANGCHAIN_AVAILABLE = True
+rag_engine_module.RAGEngine._check_online = lambda self: pings.append(1) or time.sleep(0.1) or True
+engine = rag_engine_module.RAGEngine()
+engine.vector_store_manager = vs.VectorStoreManager(index_path=os.path.join(tempfile.mkdtemp(), 'vectors'),
+                                                     lazy=True)
+check("constructed without a ping", (pings, engine.status()['mistral']), ([], 'unchecked'))
+engine.warm_up()
+check("warm-up pings and loads in the background",
+      wait_for(lambda: engine.status()['mistral'] == 'online' and engine.status()['index'] == 'ready'), True)
+readers = [threading.Thread(target=lambda: engine.is_available) for _ in range(4)]
+for t in readers:
+    t.start()
+for t in readers:
+    t.join()
+check("pinged once", len(pings), 1)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
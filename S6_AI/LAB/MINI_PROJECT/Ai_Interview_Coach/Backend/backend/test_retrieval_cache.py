@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+RETRIEVAL CACHE TEST
+rag/retrieval_cache.py and its use in VectorStoreManager.search_similar:
+repeated searches are answered without embedding or searching, spellings of
+the same query and filters share an entry, every add / rebuild / reset bumps
+index_version so a new record is found at once, a result computed before a
+write is never stored after it, the LRU stays bounded and stats report hit
+rate and saved time.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+import rag.vector_store as vs
+from rag.retrieval_cache import RetrievalCache, cache_key
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class Document:
+    def __init__(self, page_content, metadata):
+        self.page_content, self.metadata = page_content, metadata
+
+
+class FakeFAISS:
+    """Nearest = smallest |len(text) - len(query)|; counts searches."""
+    searches = 0
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    @classmethod
+    def from_embeddings(cls, pairs, embeddings, metadatas=None):
+        return cls(Document(t, m) for (t, _), m in zip(pairs, metadatas))
+
+    def add_embeddings(self, pairs, metadatas=None):
+        self.docs.extend(Document(t, m) for (t, _), m in zip(pairs, metadatas))
+
+    def similarity_search_by_vector(self, vector, k=4):
+        FakeFAISS.searches += 1
+        time.sleep(0.005)
+        return sorted(self.docs, key=lambda d: abs(len(d.page_content) - vector[0]))[:k]
+
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+
+
+class Embeddings:
+    queries = 0
+
+    def embed_documents(self, texts):
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        Embeddings.queries += 1
+        return [float(len(text)), 1.0]
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+print("=" * 60)
+print("  RETRIEVAL CACHE")
+print("=" * 60)
+
+print("\n[1] Keys and the LRU")
+check("query whitespace normalised",
+      cache_key('Explain  closures\n', 3), cache_key(' Explain closures', 3))
+check("filter values: case, spacing and list order ignored",
+      cache_key('q', 3, {'level': ['Senior', 'Mid'], 'field': ' software  engineering'}),
+      cache_key('q', 3, {'field': 'Software Engineering', 'level': ['mid', 'SENIOR']}))
+check("k and min_score are part of the key",
+      len({cache_key('q', 3), cache_key('q', 5), cache_key('q', 3, min_score=7)}), 3)
+cache = RetrievalCache(capacity=2)
+cache.put('a', 1, [{'content': 'A', 'metadata': {'i': 1}}], 10.0)
+hit = cache.get('a', 1)
+hit[0]['metadata']['i'] = 99
+check("hits are copies", cache.get('a', 1)[0]['metadata'], {'i': 1})
+check("other version misses", cache.get('a', 2), None)
+cache.put('b', 1, [], 1.0)
+cache.get('a', 1)
+cache.put('c', 1, [], 1.0)
+check("least recently used evicted", (cache.get('b', 1), cache.get('a', 1) is not None), (None, True))
+cache.put('d', 2, [], 1.0)
+check("a newer version drops older entries", (cache.stats()['entries'], cache.stats()['invalidations']), (1, 1))
+cache.put('e', 1, [], 1.0)
+check("results from an older version are not stored", cache.get('e', 1), None)
+check("disabled cache stores nothing", (lambda c: (c.put('a', 1, [], 1.0), c.get('a', 1))[1])(
+    RetrievalCache(enabled=False)), None)
+
+print("\n[2] VectorStoreManager.search_similar")
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = FakeFAISS, Document, EmbeddingService()
+manager = vs.VectorStoreManager(index_path=os.path.join(tempfile.mkdtemp(), 'vectors'), flush_every=100_000,
+                                flush_seconds=60, write_delay=0.01)
+manager.add_embedded(['a' * n for n in (10, 20, 30)], [[float(n), 1.0] for n in (10, 20, 30)],
+                     [{'type': 'interview_qa', 'n': n} for n in (10, 20, 30)], save=False)
+query = 'q' * 24
+first = manager.search_similar(query, top_k=1)
+searches, queries = FakeFAISS.searches, Embeddings.queries
+again = [manager.search_similar(q, top_k=1) for q in (query, query + '  ', ' ' + query)]
+check("repeats: same results", again, [first] * 3)
+check("repeats: no embedding, no search", (FakeFAISS.searches - searches, Embeddings.queries - queries), (0, 0))
+version = manager.index_version
+manager.add_embedded(['b' * 24], [[24.0, 1.0]], [{'type': 'interview_qa', 'n': 24}], save=False)
+check("add bumps index_version", manager.index_version, version + 1)
+check("new record found at once", manager.search_similar(query, top_k=1)[0]['metadata']['n'], 24)
+manager.add_interview_record('c' * 3, 'x', 'y', 9.0, {'n': 'queued'})
+manager.flush()
+check("queued add through the writer invalidates", manager.index_version, version + 2)
+stats = manager.stats()['retrieval_cache']
+check("stats: hits and hit rate", (stats['hits'], stats['hit_rate']), (3, 0.6))
+check("stats: saved latency reported", stats['saved_ms'] > 0 and stats['avg_miss_ms'] > stats['avg_hit_ms'], True)
+manager.reset()
+check("reset empties results", manager.search_similar(query, top_k=1), [])
+
+print("\n[3] A search racing a write")
+manager.add_embedded(['d' * 5], [[5.0, 1.0]], [{'n': 5}], save=False)
+real_embed = Embeddings.embed_query
+def embed_then_write(self, text):
+    Embeddings.embed_query = real_embed
+    manager.add_embedded(['e' * 6], [[6.0, 1.0]], [{'n': 6}], save=False)    # lands before the search runs
+    return real_embed(self, text)
+Embeddings.embed_query = embed_then_write
+manager.embeddings = Embeddings()
+check("search sees the write it raced", manager.search_similar('z' * 6, top_k=1)[0]['metadata'], {'n': 6})
+check("and its result is cached under the new version", manager.search_similar('z' * 6, top_k=1)[0]['metadata'],
+      {'n': 6})
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
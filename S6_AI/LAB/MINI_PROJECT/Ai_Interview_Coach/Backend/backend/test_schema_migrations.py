@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+SCHEMA MIGRATION TEST
+Builds a pre-versioning database (old column set, space-separated datetimes),
+points the app at it and checks that:
+  - every pending step runs once and is recorded in schema_version
+  - legacy datetimes are normalised and users get analytics rows
+  - the next boot takes the one-query "already current" path
+  - an empty database is created from the models at the latest version
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+tmp = tempfile.mkdtemp()
+legacy_db = os.path.join(tmp, 'legacy.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{legacy_db}'
+
+conn = sqlite3.connect(legacy_db)
+conn.executescript("""
+    CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(120) UNIQUE NOT NULL,
+                        password_hash VARCHAR(255), first_name VARCHAR(50), last_name VARCHAR(50),
+                        created_at DATETIME, last_login DATETIME, last_activity_date DATE);
+    CREATE TABLE interviews (id INTEGER PRIMARY KEY, uuid VARCHAR(36), user_id INTEGER,
+                             status VARCHAR(20), started_at DATETIME, completed_at DATETIME);
+    CREATE TABLE questions (id INTEGER PRIMARY KEY, interview_id INTEGER, text TEXT,
+                            created_at DATETIME);
+    CREATE TABLE answers (id INTEGER PRIMARY KEY, question_id INTEGER, text TEXT);
+    CREATE TABLE feedback (id INTEGER PRIMARY KEY, interview_id INTEGER);
+    CREATE TABLE question_bank (id INTEGER PRIMARY KEY, text TEXT, created_at DATETIME);
+    INSERT INTO users (id, email, created_at, last_activity_date)
+        VALUES (1, 'a@x.io', '2024-03-01 10:00:00', '2024-03-02 08:30:00'),
+               (2, 'b@x.io', '2024-03-01T11:00:00', NULL);
+    INSERT INTO interviews (id, uuid, user_id, status, started_at)
+        VALUES (1, 'u-1', 1, 'completed', '2024-03-01 10:05:00');
+""")
+conn.commit()
+conn.close()
+
+from app import app, db, schema_migrator
+from schema_migrations import SchemaMigrator, latest_version, MIGRATIONS
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+def columns(table):
+    with sqlite3.connect(legacy_db) as c:
+        return {row[1] for row in c.execute(f"PRAGMA table_info({table})")}
+
+
+def scalar(sql):
+    with sqlite3.connect(legacy_db) as c:
+        return c.execute(sql).fetchone()[0]
+
+
+print("=" * 60)
+print("  SCHEMA MIGRATIONS")
+print("=" * 60)
+
+print("\n[1] Upgrade of a pre-versioning database")
+first = schema_migrator.stats()
+check("outcome", first['outcome'], 'migrated')
+check("all steps applied", first['applied_this_boot'], [v for v, _, _ in MIGRATIONS])
+check("version", schema_migrator.current_version(), latest_version())
+check("interviews.mode added", 'mode' in columns('interviews'), True)
+check("questions.is_multiple_choice added", 'is_multiple_choice' in columns('questions'), True)
+check("users.password_reset_token added", 'password_reset_token' in columns('users'), True)
+check("answers.score added", 'score' in columns('answers'), True)
+check("token_blocklist created", 'jti' in columns('token_blocklist'), True)
+check("users.created_at normalised",
+      scalar("SELECT created_at FROM users WHERE id = 1"), '2024-03-01T10:00:00')
+check("users.last_activity_date truncated",
+      scalar("SELECT last_activity_date FROM users WHERE id = 1"), '2024-03-02')
+check("interviews.started_at normalised",
+      scalar("SELECT started_at FROM interviews WHERE id = 1"), '2024-03-01T10:05:00')
+check("question_bank.text_hash added", 'text_hash' in columns('question_bank'), True)
+check("interviews.archived_at added", 'archived_at' in columns('interviews'), True)
+check("analytics backfilled", scalar("SELECT COUNT(*) FROM user_analytics"), 2)
+check("question_bank FTS index created",
+      scalar("SELECT COUNT(*) FROM sqlite_master WHERE name = 'question_bank_fts'"), 1)
+check("analytics defaults applied",
+      scalar("SELECT weak_topics FROM user_analytics WHERE user_id = 1"), '[]')
+
+print("\n[2] Next boot is a single version check")
+with app.app_context():
+    again = SchemaMigrator(db.engine, db.metadata)
+    started = time.perf_counter()
+    report = again.migrate()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+check("outcome", report['outcome'], 'current')
+check("nothing re-applied", report['applied_this_boot'], [])
+check("fast path under 50 ms", elapsed_ms < 50, True)
+print(f"    (current-version check took {elapsed_ms:.2f} ms)")
+
+print("\n[3] Empty database is created at the latest version")
+fresh_engine = create_engine(f"sqlite:///{os.path.join(tmp, 'fresh.db')}")
+fresh = SchemaMigrator(fresh_engine, db.metadata)
+report = fresh.migrate()
+check("outcome", report['outcome'], 'created')
+check("every step stamped", len(fresh.applied()), len(MIGRATIONS))
+check("second run is current", fresh.migrate()['outcome'], 'current')
+
+print("\n[4] IntegrityError: concurrent stamp vs. a failing step")
+
+
+class StaleView(SchemaMigrator):
+    """Sees no applied steps on its first look, like a worker that lost the race."""
+    looks = 0
+
+    def applied(self):
+        self.looks += 1
+        return [] if self.looks == 1 else super().applied()
+
+
+def duplicate_row(ctx):
+    ctx.conn.exec_driver_sql("INSERT INTO schema_version (version, name, applied_at) "
+                             "VALUES (1, 'dup', '2024-01-01')")
+
+
+next_version = latest_version() + 1
+MIGRATIONS.append((next_version, 'violates_own_constraint', duplicate_row))
+try:
+    fresh.migrate()
+    raised = False
+except IntegrityError:
+    raised = True
+check("a step failing on its own constraint is raised", raised, True)
+check("and not stamped as applied", fresh.current_version(), next_version - 1)
+MIGRATIONS.pop()
+racer = StaleView(fresh_engine, db.metadata)
+with fresh_engine.begin() as c:
+    c.exec_driver_sql("DELETE FROM schema_version WHERE version = (SELECT MAX(version) FROM schema_version)")
+check("steps another worker stamped are skipped, the rest applied", racer.migrate()['applied_this_boot'],
+      [latest_version()])
+fresh_engine.dispose()
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,70 @@
+"""Test script for the in-memory JWT revocation cache."""
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, '.')
+
+from token_revocation import RevokedTokenCache
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual}, expected {expected}")
+    results.append(ok)
+    return ok
+
+print("=== TESTING TOKEN REVOCATION CACHE ===\n")
+
+now = datetime.utcnow()
+future = now + timedelta(hours=1)
+past = now - timedelta(minutes=1)
+
+# 1. Warm-up skips already-expired rows
+print("1. Warm-up:")
+cache = RevokedTokenCache()
+check("not_ready_before_warm", cache.ready, False)
+loaded = cache.warm([('live-jti', future), ('dead-jti', past)], last_event_id=7)
+check("loaded_count", loaded, 1)
+check("ready_after_warm", cache.ready, True)
+check("live_revoked", cache.is_revoked('live-jti'), True)
+check("expired_not_loaded", cache.is_revoked('dead-jti'), False)
+
+# 2. Local logout
+print("\n2. Local logout:")
+cache.add('logout-jti', future)
+check("logout_revoked", cache.is_revoked('logout-jti'), True)
+check("unknown_not_revoked", cache.is_revoked('other-jti'), False)
+
+# 3. Change-log events from other workers (de-duplicated by jti, not by id)
+print("\n3. Cross-worker events:")
+applied = cache.apply_events([(8, 'remote-jti', future), (9, 'remote-2', future)])
+check("applied_count", applied, 2)
+check("remote_revoked", cache.is_revoked('remote-jti'), True)
+check("last_event_id", cache.last_event_id, 9)
+# id 6 committed after 8 and 9 were read: the trailing re-poll still applies it
+applied = cache.apply_events([(6, 'late-commit', future), (8, 'remote-jti', future), (9, 'remote-2', future)])
+check("late_lower_id_applied", (applied, cache.is_revoked('late-commit')), (1, True))
+check("last_event_id_not_lowered", cache.last_event_id, 9)
+check("expired_event_skipped", cache.apply_events([(10, 'expired-event', past)]), 0)
+check("expired_event_not_revoked", cache.is_revoked('expired-event'), False)
+
+# 4. Pruning
+print("\n4. Pruning:")
+cache.add('short-lived', now + timedelta(seconds=1))
+dropped = cache.prune_expired(now + timedelta(seconds=5))
+check("pruned_count", dropped, 1)
+check("short_lived_gone", cache.is_revoked('short-lived'), False)
+check("long_lived_kept", cache.is_revoked('remote-2'), True)
+
+# Summary
+print("\n" + "=" * 50)
+passed = sum(results)
+total = len(results)
+print(f"Results: {passed}/{total} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+VECTOR STORE CONCURRENCY TEST
+Stress test for rag/vector_store.py: many threads add records (as
+submit_answer's background threads do) while others search. A fake FAISS
+class records any search that overlaps a mutation, the peak number of
+concurrent searches and every record it receives.
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, '.')
+
+import rag.vector_store as vs
+
+WRITERS, ADDS_PER_WRITER = 8, 50
+SEARCHERS, SEARCHES_PER_SEARCHER = 8, 60
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class Document:
+    def __init__(self, page_content, metadata):
+        self.page_content, self.metadata = page_content, metadata
+
+
+class Probe:
+    lock = threading.Lock()
+    mutating = False
+    searching = 0
+    peak_searching = 0
+    overlaps = 0
+    add_calls = 0
+
+
+class FakeFAISS:
+    def __init__(self, docs):
+        self.docs = []
+        self._append(list(docs))
+
+    def _append(self, docs):
+        with Probe.lock:
+            if Probe.searching:
+                Probe.overlaps += 1
+            Probe.mutating = True
+            Probe.add_calls += 1
+        for doc in docs:                    # slow, element by element: a torn read is visible
+            self.docs.append(doc)
+            time.sleep(0.0002)
+        with Probe.lock:
+            Probe.mutating = False
+
+    @classmethod
+    def from_embeddings(cls, pairs, embeddings, metadatas=None):
+        return cls(Document(t, m) for (t, _), m in zip(pairs, metadatas))
+
+    def add_embeddings(self, pairs, metadatas=None):
+        self._append([Document(t, m) for (t, _), m in zip(pairs, metadatas)])
+
+    def similarity_search_by_vector(self, vector, k=4):
+        with Probe.lock:
+            if Probe.mutating:
+                Probe.overlaps += 1
+            Probe.searching += 1
+            Probe.peak_searching = max(Probe.peak_searching, Probe.searching)
+        size = len(self.docs)
+        time.sleep(0.001)
+        torn = len(self.docs) != size
+        with Probe.lock:
+            Probe.searching -= 1
+            Probe.overlaps += torn
+        return self.docs[-k:]
+
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, 'index.faiss'), 'w') as fh:
+            json.dump([d.page_content for d in self.docs], fh)
+
+
+class Embeddings:
+    def embed_documents(self, texts):
+        time.sleep(0.002)                   # one model call per batch
+        return [[float(len(t))] for t in texts]
+
+    def embed_query(self, text):
+        return [float(len(text))]
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = FakeFAISS, Document, EmbeddingService()
+
+tmp = tempfile.mkdtemp()
+manager = vs.VectorStoreManager(index_path=os.path.join(tmp, 'vectors'), flush_every=100, flush_seconds=0.2)
+manager.add_documents([{'content': 'seed', 'metadata': {'i': -1}}])
+manager.flush()
+
+print("=" * 60)
+print(f"  VECTOR STORE CONCURRENCY: {WRITERS}x{ADDS_PER_WRITER} adds, "
+      f"{SEARCHERS}x{SEARCHES_PER_SEARCHER} searches")
+print("=" * 60)
+
+errors, empty = [], []
+
+
+def writer(w):
+    for n in range(ADDS_PER_WRITER):
+        try:
+            manager.add_interview_record(f'Q{w}-{n}', 'answer', 'feedback', 7.0, metadata={'i': w * 1000 + n})
+        except Exception as e:
+            errors.append(e)
+
+
+def searcher():
+    for _ in range(SEARCHES_PER_SEARCHER):
+        try:
+            if not manager.search_similar('Question: design a cache', top_k=3):
+                empty.append(1)
+        except Exception as e:
+            errors.append(e)
+
+
+started = time.perf_counter()
+threads = ([threading.Thread(target=writer, args=(w,)) for w in range(WRITERS)] +
+           [threading.Thread(target=searcher) for _ in range(SEARCHERS)])
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+flushed = manager.flush(timeout=10)
+elapsed = time.perf_counter() - started
+
+print("\n[1] Isolation")
+check("no exceptions", errors, [])
+check("no search overlapped a mutation", Probe.overlaps, 0)
+check("searches ran concurrently", Probe.peak_searching > 1, True)
+check("every search saw the seeded index", len(empty), 0)
+
+print("\n[2] Writes")
+check("flush drains the writer queue and saves", flushed, True)
+ids = [d.metadata['i'] for d in manager.vector_store.docs]
+check("every record applied once", (len(ids), len(set(ids))), (WRITERS * ADDS_PER_WRITER + 1,) * 2)
+writer_stats = manager.stats()['writer']
+check("writer stats", (writer_stats['written'], writer_stats['failed']), (WRITERS * ADDS_PER_WRITER + 1, 0))
+check("adds batched (fewer index mutations than records)", Probe.add_calls < WRITERS * ADDS_PER_WRITER // 2, True)
+with open(os.path.join(tmp, 'vectors', 'index.faiss')) as fh:
+    check("disk copy complete", len(json.load(fh)), WRITERS * ADDS_PER_WRITER + 1)
+print(f"  {Probe.add_calls} index mutations, avg batch {writer_stats['avg_batch_size']}, "
+      f"{elapsed:.2f} s total")
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+VECTOR FILTER TEST
+Metadata-filtered retrieval in rag/vector_store.py over a real FAISS index:
+every result matches the filter, results equal an exact search over the
+matching records (brute-force and IDSelector paths, flat and IVF), values are
+matched case-insensitively, the posting lists are rebuilt after a reload and
+RAGEngine.retrieve_context relaxes filters that match nothing.
+"""
+import os
+import pickle
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+import faiss
+import numpy as np
+
+import rag.ann_index as ann_index
+import rag.metadata_filter as metadata_filter
+import rag.vector_store as vs
+from rag.rag_engine import RAGEngine
+
+DIM = 32
+N = 6000
+FIELDS = ['Software Engineering', 'Data Science', 'Product Management']
+LEVELS = ['Junior', 'Mid', 'Senior']
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class Document:
+    def __init__(self, page_content, metadata):
+        self.page_content, self.metadata = page_content, metadata
+
+
+class Docstore:
+    def __init__(self):
+        self._dict = {}
+
+    def search(self, key):
+        return self._dict[key]
+
+
+class FakeFAISS:
+    """The parts of LangChain's FAISS wrapper VectorStoreManager uses, over a real faiss index."""
+
+    def __init__(self, index):
+        self.index, self.docstore, self.index_to_docstore_id = index, Docstore(), {}
+
+    @classmethod
+    def from_embeddings(cls, pairs, embeddings, metadatas=None):
+        store = cls(faiss.IndexFlatL2(DIM))
+        store.add_embeddings(pairs, metadatas)
+        return store
+
+    def add_embeddings(self, pairs, metadatas=None):
+        texts, vectors = zip(*pairs)
+        for text, metadata in zip(texts, metadatas):
+            key = str(len(self.index_to_docstore_id))
+            self.index_to_docstore_id[len(self.index_to_docstore_id)] = key
+            self.docstore._dict[key] = Document(text, metadata)
+        self.index.add(np.array(vectors, dtype='float32'))
+
+    def similarity_search_by_vector(self, vector, k=4):
+        _, ids = self.index.search(np.array([vector], dtype='float32'), k)
+        return [self.docstore.search(self.index_to_docstore_id[i]) for i in ids[0] if i >= 0]
+
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+        faiss.write_index(self.index, os.path.join(folder_path, 'index.faiss'))
+        with open(os.path.join(folder_path, 'index.pkl'), 'wb') as fh:
+            pickle.dump((self.docstore._dict, self.index_to_docstore_id), fh)
+
+    @classmethod
+    def load_local(cls, folder_path, embeddings, allow_dangerous_deserialization=False):
+        store = cls(faiss.read_index(os.path.join(folder_path, 'index.faiss')))
+        with open(os.path.join(folder_path, 'index.pkl'), 'rb') as fh:
+            store.docstore._dict, store.index_to_docstore_id = pickle.load(fh)
+        return store
+
+
+def vector(i):
+    return np.random.default_rng(i).normal(0, 1, DIM).astype('float32')
+
+
+class Embeddings:
+    """'record <i>' embeds to vector(i); any other text to vector(0)."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        parts = text.split()
+        return vector(int(parts[1]) if parts[0] == 'record' else 0).tolist()
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+def metadata(i):
+    return {'type': 'interview_qa', 'question_id': i % 50, 'field': FIELDS[i % 3], 'level': LEVELS[(i // 3) % 3],
+            'interview_type': 'technical' if i % 2 else 'behavioral', 'score': float(i % 11), 'i': i}
+
+
+def exact(query_i, k, keep):
+    """Ground truth: brute force over the records keep() accepts."""
+    rows = [i for i in range(N) if keep(metadata(i))]
+    distances = ((np.array([vector(i) for i in rows]) - vector(query_i)) ** 2).sum(axis=1)
+    return [rows[j] for j in np.argsort(distances)[:k]]
+
+
+def ids(found):
+    return [d['metadata']['i'] for d in found]
+
+
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = FakeFAISS, Document, EmbeddingService()
+tmp = tempfile.mkdtemp()
+index_path = os.path.join(tmp, 'vectors')
+manager = vs.VectorStoreManager(index_path=index_path, flush_every=100_000, flush_seconds=60)
+texts = [f'record {i}' for i in range(N)]
+manager.add_embedded(texts, Embeddings().embed_documents(texts), [metadata(i) for i in range(N)], save=False)
+
+print("=" * 60)
+print("  VECTOR FILTERS")
+print("=" * 60)
+
+senior_se = lambda m: m['field'] == 'Software Engineering' and m['level'] == 'Senior'
+
+print("\n[1] Flat index")
+found = manager.search_similar('record 7', top_k=5, filters={'field': 'Software Engineering', 'level': 'Senior'})
+check("every result matches", all(senior_se(d['metadata']) for d in found), True)
+check("same as exact search over the partition (brute force)", ids(found), exact(7, 5, senior_se))
+metadata_filter.FILTER_EXACT_MAX = 100
+manager.retrieval_cache.clear()         # the search settings changed, not the index
+found = manager.search_similar('record 7', top_k=5, filters={'field': 'Software Engineering', 'level': 'Senior'})
+check("same through the IDSelector path", ids(found), exact(7, 5, senior_se))
+manager.retrieval_cache.clear()
+found = manager.search_similar('record 7', top_k=5, filters={'field': '  software engineering ', 'level': 'SENIOR'})
+check("values matched case- and space-insensitively", ids(found), exact(7, 5, senior_se))
+found = manager.search_similar('record 7', top_k=5, filters={'level': ['Mid', 'Senior'], 'interview_type': 'technical'},
+                               min_score=8)
+check("any-of values, type and min score",
+      ids(found), exact(7, 5, lambda m: m['level'] in ('Mid', 'Senior') and m['interview_type'] == 'technical'
+                        and m['score'] >= 8))
+found = manager.search_similar('record 7', top_k=3, filters={'question_id': 7})
+check("single question", ids(found), exact(7, 3, lambda m: m['question_id'] == 7))
+check("no match returns nothing", manager.search_similar('record 7', filters={'field': 'Law'}), [])
+check("unknown key returns nothing", manager.search_similar('record 7', filters={'company': 'Acme'}), [])
+check("unfiltered search unchanged", ids(manager.search_similar('record 7', top_k=3)), exact(7, 3, lambda m: True))
+check("posting lists counted", manager.stats()['metadata']['rows'], N)
+
+print("\n[2] IVF index")
+ann_index.ANN_MIN_VECTORS, ann_index.IVF_NPROBE = 1000, 8
+manager.rebuild_index('ivf')
+check("rebuilt as ivf", manager.stats()['index']['type'], 'ivf')
+truth = exact(11, 10, senior_se)
+found = ids(manager.search_similar('record 11', top_k=10, filters={'field': 'Software Engineering',
+                                                                    'level': 'Senior'}))
+check("every result matches", all(senior_se(metadata(i)) for i in found), True)
+check("filtered recall@10 >= 0.8", len(set(found) & set(truth)) >= 8, True)
+metadata_filter.FILTER_EXACT_MAX = 4096
+manager.retrieval_cache.clear()         # the search settings changed, not the index
+found = ids(manager.search_similar('record 11', top_k=10, filters={'field': 'Software Engineering',
+                                                                    'level': 'Senior'}))
+check("brute force over an ivf partition is exact", found, truth)
+
+print("\n[3] Reload and relaxation")
+manager.save()
+reloaded = vs.VectorStoreManager(index_path=index_path)
+check("posting lists not built during the load", reloaded.stats()['metadata']['deferred'], True)
+check("same filtered results after reload",
+      ids(reloaded.search_similar('record 3', top_k=5, filters={'question_id': 3})),
+      exact(3, 5, lambda m: m['question_id'] == 3))
+check("posting lists rebuilt on first use", reloaded.stats()['metadata'], manager.stats()['metadata'])
+engine = RAGEngine()
+engine.vector_store_manager = reloaded
+docs = engine.retrieve_context('record 3', top_k=3, filters={'question_id': 3, 'interview_type': 'behavioral'})
+check("question + type that never co-occur relax to the type",
+      [d['metadata']['interview_type'] for d in docs], ['behavioral'] * 3)
+docs = engine.retrieve_context('record 3', top_k=3, filters={'field': 'Law', 'type': 'interview_qa'})
+check("nothing matches: falls back to an unfiltered search", len(docs), 3)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+VECTOR PERSISTENCE TEST
+Drives rag/vector_store.py's write-behind saves with a fake FAISS class:
+adds stay in memory until the count / age threshold or an explicit flush,
+saves swap in a complete copy, a failed save leaves the old index intact and
+a crash between the directory renames is repaired on the next load.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+import rag.vector_store as vs
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class Document:
+    def __init__(self, page_content, metadata):
+        self.page_content, self.metadata = page_content, metadata
+
+
+class FakeFAISS:
+    fail_saves = False
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    @classmethod
+    def from_embeddings(cls, pairs, embeddings, metadatas=None):
+        return cls(Document(t, m) for (t, _), m in zip(pairs, metadatas))
+
+    def add_embeddings(self, pairs, metadatas=None):
+        self.docs.extend(Document(t, m) for (t, _), m in zip(pairs, metadatas))
+
+    @classmethod
+    def load_local(cls, folder_path, embeddings, allow_dangerous_deserialization=False):
+        with open(os.path.join(folder_path, 'index.faiss')) as fh:
+            return cls(Document(t, {}) for t in json.load(fh))
+
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, 'index.faiss'), 'w') as fh:
+            json.dump([d.page_content for d in self.docs], fh)
+        if FakeFAISS.fail_saves:
+            raise OSError("disk full")
+        with open(os.path.join(folder_path, 'index.pkl'), 'w') as fh:
+            fh.write('docstore')
+
+
+class Embeddings:
+    def embed_documents(self, texts):
+        return [[float(len(t))] for t in texts]
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = FakeFAISS, Document, EmbeddingService()
+
+tmp = tempfile.mkdtemp()
+index_path = os.path.join(tmp, 'vectors')
+
+
+def on_disk(path=index_path):
+    try:
+        with open(os.path.join(path, 'index.faiss')) as fh:
+            return len(json.load(fh))
+    except OSError:
+        return None
+
+
+def add(manager, n, start=0):
+    for i in range(start, start + n):
+        manager.add_documents([{'content': f'record {i}', 'metadata': {'i': i}}])
+
+
+def wait_for(predicate, seconds=3.0):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not predicate():
+        time.sleep(0.02)
+    return predicate()
+
+
+print("=" * 60)
+print("  VECTOR PERSISTENCE")
+print("=" * 60)
+
+print("\n[1] Count-triggered flush")
+manager = vs.VectorStoreManager(index_path=index_path, flush_every=5, flush_seconds=60)
+add(manager, 4)
+wait_for(lambda: manager.stats()['unflushed'] == 4)
+check("adds below the threshold stay in memory", (on_disk(), manager.stats()['unflushed']), (None, 4))
+add(manager, 1, start=4)
+check("threshold triggers one save", wait_for(lambda: on_disk() == 5), True)
+stats = manager.stats()
+check("stats after flush", (stats['flushes'], stats['records_flushed'], stats['unflushed']), (1, 5, 0))
+check("flush latency recorded", stats['last_flush_ms'] is not None and stats['max_flush_ms'] >= 0, True)
+check("no temp or old copies left", sorted(os.listdir(tmp)), ['vectors'])
+
+print("\n[2] Age-triggered flush and shutdown flush")
+timed = vs.VectorStoreManager(index_path=index_path, flush_every=1000, flush_seconds=0.3)
+check("existing index loaded", len(timed.vector_store.docs), 5)
+add(timed, 2, start=5)
+wait_for(lambda: timed.stats()['unflushed'] == 2)
+check("pending record age reported", timed.stats()['oldest_unflushed_sec'] is not None, True)
+check("saved once the oldest record is flush_seconds old", wait_for(lambda: on_disk() == 7), True)
+slow = vs.VectorStoreManager(index_path=index_path, flush_every=1000, flush_seconds=60)
+add(slow, 3, start=7)
+check("flush() writes pending records (atexit hook)", (slow.flush(), on_disk()), (True, 10))
+check("flush() with nothing pending is a no-op", (slow.flush(), slow.stats()['flushes']), (True, 1))
+
+print("\n[3] Failed save")
+add(slow, 2, start=10)
+wait_for(lambda: slow.stats()['unflushed'] == 2)
+FakeFAISS.fail_saves = True
+check("save reports failure", slow.save(), False)
+FakeFAISS.fail_saves = False
+stats = slow.stats()
+check("old index intact, records still pending", (on_disk(), stats['unflushed'], stats['errors']), (10, 2, 1))
+check("error recorded", stats['last_error'], 'disk full')
+check("next save succeeds", (slow.flush(), on_disk()), (True, 12))
+
+print("\n[4] Crash between the directory renames")
+os.rename(index_path, f'{index_path}.old')
+slow.vector_store.save_local(f'{index_path}.tmp')
+recovered = vs.VectorStoreManager(index_path=index_path, flush_every=1000, flush_seconds=60)
+check("complete new copy promoted", (on_disk(), len(recovered.vector_store.docs)), (12, 12))
+check("leftovers removed", sorted(os.listdir(tmp)), ['vectors'])
+os.rename(index_path, f'{index_path}.old')
+recovered = vs.VectorStoreManager(index_path=index_path, flush_every=1000, flush_seconds=60)
+check("old copy restored when no new one exists", on_disk(), 12)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
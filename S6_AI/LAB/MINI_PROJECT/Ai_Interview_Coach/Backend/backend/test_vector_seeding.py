@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+VECTOR SEEDING TEST
+Runs rag/update_vectors.py's bulk path against a scratch database with a
+fake embedding model and index: one record per scored answer (archived
+sessions included), chunked embedding, saves only at checkpoints, resume
+from the checkpoint after an interrupted run, re-runs that embed nothing
+already stored, and pruning records of deleted answers.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, '.')
+
+tmp = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'seed.db')}"
+
+from app import app, db, User, Interview, Question, Answer, Feedback
+from interview_archive import InterviewArchiver
+from rag.update_vectors import prune_vectors, read_checkpoint, seed_vectors
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+class Embeddings:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(len(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class Store:
+    def __init__(self, fail_after=None):
+        self.items, self.saved, self.saves = [], 0, 0
+        self.fail_after = fail_after
+
+    def add_embedded(self, texts, vectors, metadatas, save=True):
+        if self.fail_after is not None and len(self.items) >= self.fail_after:
+            raise RuntimeError("simulated crash")
+        self.items.extend(zip(texts, metadatas))
+
+    def filter_unchanged(self, texts, metadatas):
+        stored = {m['answer_id']: t for t, m in self.items}
+        keep = [(t, m) for t, m in zip(texts, metadatas) if stored.get(m['answer_id']) != t]
+        return [t for t, _ in keep], [m for _, m in keep]
+
+    def record_ids(self):
+        return {str(m['answer_id']) for _, m in self.items}
+
+    def delete_records(self, answer_ids):
+        before = len(self.items)
+        self.items = [(t, m) for t, m in self.items if str(m['answer_id']) not in answer_ids]
+        return before - len(self.items)
+
+    def save(self):
+        self.saved = len(self.items)
+        self.saves += 1
+
+
+print("=" * 60)
+print("  VECTOR SEEDING")
+print("=" * 60)
+
+with app.app_context():
+    user = User(email='seed@x.io', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    for days_ago in (400, 300, 5):
+        interview = Interview(user_id=user.id, status='completed', overall_score=7.0,
+                              completed_at=datetime.utcnow() - timedelta(days=days_ago))
+        db.session.add(interview)
+        db.session.flush()
+        for n in range(10):
+            q = Question(interview_id=interview.id, text=f'Question {n} ({days_ago}d)', question_number=n + 1)
+            db.session.add(q)
+            db.session.flush()
+            a = Answer(interview_id=interview.id, question_id=q.id, text=f'Answer {n}',
+                       score=None if n == 9 else float(n))
+            db.session.add(a)
+            db.session.flush()
+            if n % 2 == 0:
+                db.session.add(Feedback(user_id=user.id, answer_id=a.id, detailed_feedback=f'Feedback {n}'))
+    db.session.commit()
+    InterviewArchiver(db.engine, older_than_days=180).run()
+    engine = db.engine
+    archived = db.session.execute(db.text("SELECT COUNT(*) FROM archive.answers")).scalar()
+    check("two sessions archived before seeding", archived, 20)
+
+    print("\n[1] Full seed")
+    embeddings, store = Embeddings(), Store()
+    checkpoint_path = os.path.join(tmp, 'checkpoint.json')
+    report = seed_vectors(engine, store, embeddings, chunk_size=4, checkpoint_every=10,
+                          checkpoint_path=checkpoint_path, progress=False)
+    check("one record per scored answer across tiers", report['records'], 27)
+    answer_ids = [m['answer_id'] for _, m in store.items]
+    check("answer id order, no duplicates", answer_ids == sorted(set(answer_ids)), True)
+    check("embedded in chunks", embeddings.calls, [4, 4, 4, 4, 4, 4, 3])
+    check("saved at checkpoints and at the end only", (store.saves, report['saves']), (3, 3))
+    check("checkpoint at the last answer", read_checkpoint(checkpoint_path)['last_answer_id'], answer_ids[-1])
+    first_text, first_meta = store.items[0]
+    check("record text", first_text,
+          "Question: Question 0 (400d)\nAnswer: Answer 0\nFeedback: Feedback 0\nScore: 0.0/10")
+    check("metadata", sorted(first_meta), ['answer_id', 'field', 'interview_id', 'interview_type', 'level',
+                                           'question_id', 'score', 'type'])
+    no_feedback = next(t for t, m in store.items if m['score'] == 1.0)
+    check("missing feedback placeholder", 'Feedback: No detailed feedback available.' in no_feedback, True)
+
+    print("\n[2] Interrupted run resumes from the checkpoint")
+    crashed = Store(fail_after=12)
+    try:
+        seed_vectors(engine, crashed, Embeddings(), chunk_size=4, checkpoint_every=8,
+                     checkpoint_path=checkpoint_path, progress=False)
+    except RuntimeError:
+        pass
+    state = read_checkpoint(checkpoint_path)
+    check("checkpoint names only saved records", state['last_answer_id'], answer_ids[crashed.saved - 1])
+    resumed = Store()
+    report = seed_vectors(engine, resumed, Embeddings(), after_id=state['last_answer_id'], chunk_size=4,
+                          checkpoint_path=checkpoint_path, progress=False)
+    check("resume picks up the rest", [m['answer_id'] for _, m in resumed.items], answer_ids[crashed.saved:])
+    check("throughput reported", report['records_per_second'] > 0, True)
+    again = seed_vectors(engine, Store(), Embeddings(), after_id=report['last_answer_id'],
+                         checkpoint_path=None, progress=False)
+    check("nothing left after the last id", (again['records'], again['saves']), (0, 0))
+
+    print("\n[3] Re-running and pruning")
+    rerun_embeddings = Embeddings()
+    rerun = seed_vectors(engine, store, rerun_embeddings, checkpoint_path=None, progress=False)
+    check("a full re-run embeds nothing stored", (rerun['records'], rerun['unchanged'], rerun_embeddings.calls),
+          (0, 27, []))
+    hot_answer = db.session.execute(db.text("SELECT MAX(id) FROM answers WHERE score IS NOT NULL")).scalar()
+    db.session.execute(db.text("DELETE FROM feedback WHERE answer_id = :a"), {'a': hot_answer})
+    db.session.execute(db.text("DELETE FROM answers WHERE id = :a"), {'a': hot_answer})
+    db.session.commit()
+    check("prune deletes only the removed answer", (prune_vectors(engine, store), len(store.items)), (1, 26))
+    check("archived answers are kept", prune_vectors(engine, store), 0)
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+VECTOR UPSERTS TEST
+Stable record ids in VectorStoreManager with a real faiss index: adding an
+answer_id again replaces its record, delete_records() removes records from
+filtered and unfiltered searches, both survive a save and reload (without
+building the posting lists), an import skips records it already stored, and
+compact() rebuilds the index without tombstones or duplicate texts, keeping
+its type.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, '.')
+
+import numpy as np
+
+import rag.ann_index as ann_index
+import rag.faiss_store as faiss_store
+import rag.vector_store as vs
+
+DIM = 32
+N = 400
+
+results = []
+
+def check(name, actual, expected):
+    ok = actual == expected
+    status = "PASS" if ok else "FAIL"
+    print(f"  [{status}] {name}: got {actual!r}" + ("" if ok else f", expected {expected!r}"))
+    results.append(ok)
+    return ok
+
+
+def vector(i):
+    return np.random.default_rng(i).normal(0, 1, DIM).astype('float32')
+
+
+class Embeddings:
+    """'record <i> ...' embeds to vector(i)."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        return vector(int(text.split()[1])).tolist()
+
+
+class EmbeddingService:
+    def get_embeddings(self):
+        return Embeddings()
+
+
+def record(i, version=1, answer_id=None):
+    metadata = {'type': 'interview_qa', 'question_id': i % 20, 'score': float(i % 11), 'version': version}
+    if answer_id is not None:
+        metadata['answer_id'] = answer_id
+    return f'record {i} v{version}', metadata
+
+
+def add(manager, records, save=False):
+    texts, metadatas = zip(*records)
+    manager.add_embedded(list(texts), Embeddings().embed_documents(texts), list(metadatas), save=save)
+
+
+def top(manager, i, **kwargs):
+    found = manager.search_similar(f'record {i}', top_k=1, **kwargs)
+    return found[0]['content'] if found else None
+
+
+def manager_at(path, **kwargs):
+    return vs.VectorStoreManager(index_path=path, flush_every=100_000, flush_seconds=60, **kwargs)
+
+
+vs.LANGCHAIN_AVAILABLE = True
+vs.FAISS, vs.Document, vs.embedding_service = faiss_store.MappedFAISS, faiss_store.Document, EmbeddingService()
+tmp = tempfile.mkdtemp()
+index_path = os.path.join(tmp, 'vectors')
+
+print("=" * 60)
+print("  VECTOR UPSERTS")
+print("=" * 60)
+
+print("\n[1] Upserts")
+manager = manager_at(index_path)
+add(manager, [record(i, answer_id=i) for i in range(N)])
+add(manager, [record(7, version=2, answer_id=7)])
+check("same answer_id replaces the record", top(manager, 7), 'record 7 v2')
+check("old row skipped in filtered search", [d['content'] for d in manager.search_similar(
+    'record 7', top_k=2, filters={'question_id': 7})], ['record 7 v2', 'record 27 v1'])
+check("one live id per answer, old row tombstoned",
+      (manager.stats()['metadata']['record_ids'], manager.stats()['metadata']['dead_rows']), (N, 1))
+texts, metadatas = manager.filter_unchanged(*zip(record(7, 2, 7), record(8, 2, 8), record(N, 1, N)))
+check("only new or changed records are left to embed", texts, ['record 8 v2', f'record {N} v1'])
+
+print("\n[2] Deletes")
+check("delete by answer_id", manager.delete_records([3, 5, 'missing']), 2)
+check("deleted records leave unfiltered search", {top(manager, 3), top(manager, 5)} & {'record 3 v1', 'record 5 v1'},
+      set())
+check("and filtered search", sorted(d['metadata']['answer_id'] for d in manager.search_similar(
+    'record 3', top_k=N, filters={'question_id': 3})), list(range(23, N, 20)))
+check("deleted twice is a no-op", manager.delete_records([3]), 0)
+check("record_ids", (len(manager.record_ids()), '3' in manager.record_ids()), (N - 2, False))
+
+print("\n[3] Save and reload")
+manager.flush()
+reader = manager_at(index_path)
+check("deletes survive a reload", top(reader, 5) == 'record 5 v1', False)
+check("an unfiltered search does not build the posting lists", reader.stats()['metadata']['deferred'], True)
+check("replaced record survives a reload", top(reader, 7), 'record 7 v2')
+check("ids rebuilt on first use", (len(reader.record_ids()), reader.stats()['metadata']['dead_rows']), (N - 2, 3))
+
+print("\n[4] Compaction")
+add(reader, [(f'record {i} v1', {'type': 'interview_qa', 'score': 1.0}) for i in (10, 10, 11)], save=True)
+report = reader.compact()
+check("report: before", {k: report['before'][k] for k in ('vectors', 'dead', 'duplicates')},
+      {'vectors': N + 4, 'dead': 3, 'duplicates': 3})
+check("report: after", (report['after']['vectors'], report['after']['disk_mb'] < report['before']['disk_mb']),
+      (N - 2, True))
+check("no tombstones left", reader.stats()['metadata']['dead_rows'], 0)
+check("live records unchanged", (top(reader, 7), top(reader, 10), top(reader, 399)),
+      ('record 7 v2', 'record 10 v1', 'record 399 v1'))
+reloaded = manager_at(index_path)
+check("compacted store reloads", (reloaded.vector_store.index.ntotal, len(reloaded.record_ids())), (N - 2, N - 2))
+
+print("\n[5] Approximate index")
+saved_min = ann_index.ANN_MIN_VECTORS
+ann_index.ANN_MIN_VECTORS = 100
+hnsw = manager_at(os.path.join(tmp, 'hnsw'), index_type='hnsw')
+add(hnsw, [record(i, answer_id=i) for i in range(N)])
+hnsw.delete_records(list(range(0, N, 2)))
+found = hnsw.search_similar('record 10', top_k=10)
+check("hnsw skips tombstones inside the search", all(d['metadata']['answer_id'] % 2 for d in found), True)
+report = hnsw.compact()
+check("compaction keeps the index type", (report['after']['index']['type'], report['after']['vectors']),
+      ('hnsw', N // 2))
+ann_index.ANN_MIN_VECTORS = saved_min
+
+print("\n[6] Docstore written before deletes")
+legacy = os.path.join(tmp, 'legacy')
+old = manager_at(legacy)
+add(old, [record(i, answer_id=i) for i in range(5)], save=True)
+db = sqlite3.connect(os.path.join(legacy, 'docstore.sqlite'))
+db.execute("DROP TABLE deleted")
+db.commit()
+db.close()
+old = manager_at(legacy)
+check("loads and deletes", (top(old, 2), old.delete_records([2]), top(old, 2) == 'record 2 v1'),
+      ('record 2 v1', 1, False))
+
+print("\n" + "=" * 50)
+print(f"Results: {sum(results)}/{len(results)} tests passed")
+if all(results):
+    print("=== ALL TESTS PASSED ===")
+else:
+    print("=== SOME TESTS FAILED ===")
+    sys.exit(1)
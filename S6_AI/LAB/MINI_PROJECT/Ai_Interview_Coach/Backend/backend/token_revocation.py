@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+In-process JWT revocation cache.
+Keeps every revoked-but-not-yet-expired jti in memory so the
+token_in_blocklist_loader answers without touching the database.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+class RevokedTokenCache:
+    """
+    Thread-safe map of revoked jti → expiry.
+
+    - warm()            : bulk load from token_blocklist at startup
+    - add()             : local logout (instant, no DB read)
+    - apply_events()    : changes made by other workers (token_revocation_log)
+    - prune_expired()   : drop entries whose token would be rejected anyway
+
+    A dict lookup is already O(1) and exact, so no probabilistic filter is
+    layered on top — a false positive would log a valid user out.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = {}          # jti → expires_at (naive UTC datetime)
+        self._last_event_id = 0     # highest token_revocation_log.id applied
+        self.ready = False          # False until warm() succeeds → callers use DB
+        self.hits = 0
+        self.lookups = 0
+        self.last_sync = None
+
+    # ── Loading ───────────────────────────────────────────────────────────────
+
+    def warm(self, rows, last_event_id=0):
+        """Replace contents with (jti, expires_at) rows and mark the cache ready."""
+        now = datetime.utcnow()
+        fresh = {jti: exp for jti, exp in rows if exp is None or exp > now}
+        with self._lock:
+            self._revoked = fresh
+            self._last_event_id = max(self._last_event_id, last_event_id or 0)
+            self.ready = True
+            self.last_sync = time.time()
+        return len(fresh)
+
+    def add(self, jti, expires_at=None):
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def apply_events(self, events):
+        """
+        Apply (event_id, jti, expires_at) rows pulled from the change log.
+
+        Log ids can become visible out of order (a slower transaction commits
+        a lower id after a higher one), so callers re-read a trailing window
+        below last_event_id and events are de-duplicated by jti, not by id.
+        Returns the number of jtis newly revoked.
+        """
+        now = datetime.utcnow()
+        applied = 0
+        with self._lock:
+            for event_id, jti, expires_at in events:
+                self._last_event_id = max(self._last_event_id, event_id)
+                if jti in self._revoked or (expires_at is not None and expires_at <= now):
+                    continue
+                self._revoked[jti] = expires_at
+                applied += 1
+            self.last_sync = time.time()
+        return applied
+
+    @property
+    def last_event_id(self):
+        with self._lock:
+            return self._last_event_id
+
+    # ── Lookup / maintenance ──────────────────────────────────────────────────
+
+    def is_revoked(self, jti):
+        # dict.get is atomic under the GIL, so reads skip the lock
+        self.lookups += 1
+        if jti in self._revoked:
+            self.hits += 1
+            return True
+        return False
+
+    def prune_expired(self, now=None):
+        now = now or datetime.utcnow()
+        with self._lock:
+            stale = [j for j, exp in self._revoked.items() if exp is not None and exp <= now]
+            for j in stale:
+                del self._revoked[j]
+        return len(stale)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._revoked)
+        return {
+            'ready': self.ready,
+            'size': size,
+            'lookups': self.lookups,
+            'revoked_hits': self.hits,
+            'last_event_id': self._last_event_id,
+            'seconds_since_sync': round(time.time() - self.last_sync, 1) if self.last_sync else None,
+        }